@@ -19,6 +19,10 @@ from src.connectors.acp_core.acp_subprocess_identity import (
     capture_acp_subprocess_identity,
     stale_kill_still_same_os_process,
 )
+from src.connectors.acp_core.stdio_transport import (
+    AcpStdioTransport,
+    parse_jsonrpc_line,
+)
 from src.connectors.acp_core.tool_markdown import (
     acp_tool_payload_should_emit,
     coalesce_acp_tool_call_update_session_dict,
@@ -45,6 +49,10 @@ from src.connectors.acp_core.types import (
     ACPUpdateContent,
     HistoryState,
 )
+from src.connectors.acp_core.warm_pool import (
+    AcpWarmPoolSettings,
+    AcpWarmRuntimePool,
+)
 from src.connectors.acp_core.workspace_policy import (
     ACP_MISSING_PROJECT_WORKSPACE_CODE,
     first_usable_workspace_dir,
@@ -92,6 +100,10 @@ ACP_GRACEFUL_CANCEL_TIMEOUT_SECONDS = 12.0
 # Override with ``stale_acp_agent_kill_idle_seconds`` (config / env / CLI).
 DEFAULT_STALE_ACP_AGENT_KILL_IDLE_SECONDS = 3600.0
 ACP_RATE_LIMIT_BACKOFF_DELAYS: tuple[float, ...] = (5.0, 10.0, 30.0, 60.0)
+# Client session id carried by pre-warmed runtimes until one is claimed
+_WARM_POOL_CLIENT_SESSION_ID = "__warm_pool__"
+# Grace period for the exit status to land after the child closes stdout
+_STDOUT_EOF_EXIT_GRACE_SECONDS = 0.05
 
 
 def is_rate_limit_error(message: str | None) -> bool:
@@ -226,6 +238,13 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         self._turn_pacing_delay_seconds: float = 0.0
         self._runtime_pool_lock = asyncio.Lock()
         self._runtimes: dict[tuple[str, str, str], RuntimeT] = {}
+        self._warm_pool: AcpWarmRuntimePool[RuntimeT] = AcpWarmRuntimePool(
+            AcpWarmPoolSettings(),
+            warm=self._start_warm_runtime,
+            retire=self._kill_runtime,
+            is_ready=self._is_warm_runtime_ready,
+            label=str(getattr(self, "backend_type", "acp")),
+        )
 
     @property
     def has_static_credentials(self) -> bool:
@@ -511,13 +530,75 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         async with self._runtime_pool_lock:
             runtime = self._runtimes.get(runtime_key)
             if runtime is None:
-                runtime = self._create_runtime(
-                    project_dir, requested_model, client_session_id
+                runtime = self._claim_or_create_runtime(
+                    project_dir,
+                    requested_model,
+                    client_session_id,
+                    warm_eligible=self._warm_pool_eligible(request),
                 )
                 self._runtimes[runtime_key] = runtime
 
         return await self._reap_idle_runtime(runtime_key, runtime)
 
+    def _configure_warm_pool(self, kwargs: dict[str, Any]) -> None:
+        """Apply ``warm_pool_*`` backend settings (``warm_pool_min_idle=0`` disables)."""
+        self._warm_pool.configure(AcpWarmPoolSettings.from_backend_kwargs(kwargs))
+
+    def _warm_pool_eligible(self, request: ConnectorChatCompletionsRequest) -> bool:
+        """Whether a new runtime for ``request`` may come from the warm pool.
+
+        Responses text-only turns spawn their child with a restricted mode, so
+        a generically warmed process cannot serve them.
+        """
+        return not self._is_responses_text_only_request(request)
+
+    def _claim_or_create_runtime(
+        self,
+        project_dir: Path,
+        model: str,
+        client_session_id: str,
+        *,
+        warm_eligible: bool,
+    ) -> RuntimeT:
+        """Return a pre-warmed runtime for the key when available, else a fresh one.
+
+        Called with ``_runtime_pool_lock`` held.
+        """
+        if warm_eligible:
+            runtime = self._warm_pool.claim(project_dir, model)
+            if runtime is not None:
+                runtime.client_session_id = client_session_id
+                # Idle reap measures from the last turn; time spent parked in
+                # the warm pool is bounded by the pool's own TTL instead.
+                runtime.last_activity = time.monotonic()
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "ACP runtime claimed from warm pool (backend=%s pid=%s "
+                        "project=%s model=%s client_session=%s)",
+                        self.backend_type,
+                        getattr(runtime.process, "pid", None),
+                        project_dir,
+                        model,
+                        client_session_id,
+                    )
+                return runtime
+        return self._create_runtime(project_dir, model, client_session_id)
+
+    async def _start_warm_runtime(self, project_dir: Path, model: str) -> RuntimeT:
+        """Spawn and handshake an unclaimed runtime for the warm pool."""
+        runtime = self._create_runtime(project_dir, model, _WARM_POOL_CLIENT_SESSION_ID)
+        try:
+            await self._spawn_process(runtime)
+            await self._initialize_runtime(runtime)
+        except BaseException:
+            await self._kill_runtime(runtime)
+            raise
+        return runtime
+
+    def _is_warm_runtime_ready(self, runtime: RuntimeT) -> bool:
+        process = runtime.process
+        return runtime.initialized and process is not None and process.poll() is None
+
     def _resolve_project_dir_for_request(
         self, request: ConnectorChatCompletionsRequest
     ) -> Path:
@@ -593,8 +674,11 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         async with self._runtime_pool_lock:
             current = self._runtimes.get(runtime_key)
             if current is runtime:
-                replacement = self._create_runtime(
-                    runtime.project_dir, runtime.model, runtime.client_session_id
+                replacement = self._claim_or_create_runtime(
+                    runtime.project_dir,
+                    runtime.model,
+                    runtime.client_session_id,
+                    warm_eligible=not runtime.responses_text_only_mode,
                 )
                 self._runtimes[runtime_key] = replacement
                 return replacement
@@ -631,19 +715,7 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
                     ),
                 )
                 runtime.process = new_process
-                runtime.stderr_drain_stop_event.clear()
-                # Clear diagnostics before the reader starts so bytes emitted
-                # immediately during process startup cannot be erased by a
-                # late reset.
-                with runtime.stderr_tail_lock:
-                    runtime.stderr_tail.clear()
-                runtime.stderr_drain_thread = threading.Thread(
-                    target=self._drain_stderr_thread,
-                    args=(new_process, runtime),
-                    name=f"acp-stderr-{new_process.pid}",
-                    daemon=True,
-                )
-                runtime.stderr_drain_thread.start()
+                await self._start_process_io(new_process, runtime)
                 await asyncio.sleep(0.1)
                 if new_process.poll() is not None:
                     stderr = await self._read_stderr(new_process, runtime)
@@ -668,6 +740,7 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
             except Exception as exc:
                 if new_process is not None:
                     self._stop_stderr_drain(runtime)
+                    self._close_stdio_transport(runtime)
                     self._cleanup_process(new_process)
                     self._join_stderr_drain_thread(runtime)
                 runtime.process = None
@@ -686,6 +759,55 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
                     },
                 ) from exc
 
+    async def _start_process_io(
+        self, process: subprocess.Popen[bytes], runtime: RuntimeT
+    ) -> None:
+        """Start consuming a freshly spawned child's stdout and stderr.
+
+        The pipes are registered with the event loop (one reader task per
+        runtime, see :mod:`src.connectors.acp_core.stdio_transport`) when
+        possible. Otherwise stdout is read through worker threads on demand and
+        a daemon thread drains stderr.
+        """
+        runtime.stderr_drain_stop_event.clear()
+        # Clear diagnostics before the reader starts so bytes emitted
+        # immediately during process startup cannot be erased by a late reset.
+        with runtime.stderr_tail_lock:
+            runtime.stderr_tail.clear()
+        runtime.stdio_transport = await AcpStdioTransport.attach(
+            process,
+            on_stderr=lambda chunk: self._append_stderr_tail(runtime, chunk),
+            max_line_bytes=MAX_RESPONSE_LINE_SIZE,
+        )
+        if runtime.stdio_transport is not None:
+            return
+        runtime.stderr_drain_thread = threading.Thread(
+            target=self._drain_stderr_thread,
+            args=(process, runtime),
+            name=f"acp-stderr-{process.pid}",
+            daemon=True,
+        )
+        runtime.stderr_drain_thread.start()
+
+    def _close_stdio_transport(self, runtime: RuntimeT) -> None:
+        transport = runtime.stdio_transport
+        if transport is None:
+            return
+        runtime.stdio_transport = None
+        transport.close()
+
+    def _close_process_stdin(
+        self, runtime: RuntimeT, process: subprocess.Popen[bytes]
+    ) -> None:
+        """Signal EOF on the child's stdin so it can shut down on its own."""
+        transport = runtime.stdio_transport
+        if transport is not None and runtime.process is process:
+            transport.close_stdin()
+            return
+        if process.stdin is not None:
+            with contextlib.suppress(OSError, ValueError):
+                process.stdin.close()
+
     async def _kill_runtime(self, runtime: RuntimeT) -> None:
         await self._cancel_stale_kill_timer(runtime)
         assert runtime.process_lock is not None
@@ -704,6 +826,7 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
                 self._cleanup_runtime_state(runtime, process)
 
     async def _kill_all_runtimes(self) -> None:
+        await self._warm_pool.close()
         async with self._runtime_pool_lock:
             runtimes = list(self._runtimes.values())
             self._runtimes.clear()
@@ -719,6 +842,7 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
     ) -> None:
         process_cwd = runtime.process_cwd
         self._stop_stderr_drain(runtime)
+        self._close_stdio_transport(runtime)
         self._cleanup_process(process or runtime.process)
         self._join_stderr_drain_thread(runtime)
         runtime.process = None
@@ -800,17 +924,23 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
                 chunk = _read_chunk()
                 if not chunk:
                     return
-                with runtime.stderr_tail_lock:
-                    runtime.stderr_tail.extend(chunk)
-                    if len(runtime.stderr_tail) > MAX_STDERR_TAIL_SIZE:
-                        del runtime.stderr_tail[:-MAX_STDERR_TAIL_SIZE]
+                self._append_stderr_tail(runtime, chunk)
         except (OSError, ValueError):
             return
 
+    def _append_stderr_tail(self, runtime: RuntimeT, chunk: bytes) -> None:
+        with runtime.stderr_tail_lock:
+            runtime.stderr_tail.extend(chunk)
+            if len(runtime.stderr_tail) > MAX_STDERR_TAIL_SIZE:
+                del runtime.stderr_tail[:-MAX_STDERR_TAIL_SIZE]
+
     async def _read_stderr(
         self, process: subprocess.Popen[bytes], runtime: RuntimeT | None = None
     ) -> str:
         if runtime is not None:
+            transport = runtime.stdio_transport
+            if transport is not None:
+                await transport.wait_stderr_closed(timeout=1.0)
             thread = runtime.stderr_drain_thread
             deadline = time.monotonic() + 1.0
             while (
@@ -876,7 +1006,8 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         self, runtime: RuntimeT, payload: dict[str, Any]
     ) -> None:
         process = runtime.process
-        if process is None or process.stdin is None:
+        transport = runtime.stdio_transport
+        if process is None or (transport is None and process.stdin is None):
             raise BackendError(message="ACP process not running")
         encoded = (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
 
@@ -887,7 +1018,12 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
 
         try:
             await asyncio.wait_for(
-                asyncio.to_thread(_write), timeout=self._process_timeout
+                (
+                    transport.write_line(encoded)
+                    if transport is not None
+                    else asyncio.to_thread(_write)
+                ),
+                timeout=self._process_timeout,
             )
         except asyncio.TimeoutError as exc:
             # A blocked pipe means the child is no longer making progress.  Tear
@@ -928,17 +1064,34 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         )
 
     async def _read_jsonrpc_message(self, runtime: RuntimeT) -> ACPNotification | None:
+        return await self._read_next_jsonrpc_message(runtime)
+
+    async def _read_next_jsonrpc_message(
+        self,
+        runtime: RuntimeT,
+        response_waiter: asyncio.Future[ACPNotification] | None = None,
+    ) -> ACPNotification | None:
         process = runtime.process
-        if process is None or process.stdout is None:
+        transport: AcpStdioTransport | None = runtime.stdio_transport
+        if process is None or (transport is None and process.stdout is None):
             raise BackendError(message="ACP process not running")
 
         def _read_limited() -> bytes:
             assert process.stdout is not None
             return bytes(process.stdout.readline(MAX_RESPONSE_LINE_SIZE + 1))
 
+        message: ACPNotification | None
         try:
-            line = await asyncio.to_thread(_read_limited)
-            if not line:
+            if transport is not None:
+                message = await transport.receive(response_waiter)
+                if message is None and process.poll() is None:
+                    await asyncio.sleep(_STDOUT_EOF_EXIT_GRACE_SECONDS)
+            else:
+                line = await asyncio.to_thread(_read_limited)
+                if len(line) > MAX_RESPONSE_LINE_SIZE:
+                    raise BackendError(message="Response too large from ACP process")
+                message = parse_jsonrpc_line(line) if line else None
+            if message is None:
                 if process.poll() is not None:
                     stderr = await self._read_stderr(process, runtime)
                     self._cleanup_runtime_state(runtime, process)
@@ -951,13 +1104,8 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
                         },
                     )
                 return None
-            if len(line) > MAX_RESPONSE_LINE_SIZE:
-                raise BackendError(message="Response too large from ACP process")
             runtime.last_activity = time.monotonic()
-            data = json.loads(line.decode("utf-8"))
-            if not isinstance(data, dict):
-                raise BackendError(message="Invalid non-object JSON response")
-            return ACPNotification(**data)
+            return message
         except json.JSONDecodeError as exc:
             raise BackendError(
                 message="Invalid JSON response from ACP process",
@@ -973,27 +1121,45 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
     async def _await_response(
         self, runtime: RuntimeT, request_id: int
     ) -> ACPNotification:
+        # With the asyncio transport the reader task hands the response to
+        # this waiter directly instead of queueing it behind the inbox.
+        transport = runtime.stdio_transport
+        waiter = (
+            transport.expect_response(request_id) if transport is not None else None
+        )
         deadline = time.monotonic() + self._process_timeout
-        while True:
-            remaining = deadline - time.monotonic()
-            if remaining <= 0:
-                raise APITimeoutError(
-                    message="Timeout waiting for ACP response",
-                    details={"timeout": self._process_timeout, "model": runtime.model},
-                )
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise APITimeoutError(
+                        message="Timeout waiting for ACP response",
+                        details={
+                            "timeout": self._process_timeout,
+                            "model": runtime.model,
+                        },
+                    )
 
-            response = await asyncio.wait_for(
-                self._read_jsonrpc_message(runtime), timeout=remaining
-            )
-            if response is None:
-                continue
-            deadline = time.monotonic() + self._process_timeout
-            if response.is_server_request:
-                await self._handle_server_request(runtime, response)
-                continue
-            if response.id != request_id:
-                continue
-            return response
+                response = await asyncio.wait_for(
+                    (
+                        self._read_jsonrpc_message(runtime)
+                        if waiter is None
+                        else self._read_next_jsonrpc_message(runtime, waiter)
+                    ),
+                    timeout=remaining,
+                )
+                if response is None:
+                    continue
+                deadline = time.monotonic() + self._process_timeout
+                if response.is_server_request:
+                    await self._handle_server_request(runtime, response)
+                    continue
+                if response.id != request_id:
+                    continue
+                return response
+        finally:
+            if transport is not None:
+                transport.forget_response(request_id)
 
     async def _initialize_runtime(self, runtime: RuntimeT) -> None:
         if runtime.initialized and runtime.session_id:
@@ -2158,9 +2324,8 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
             if exited:
                 return True
 
-        if process.stdin is not None:
-            with contextlib.suppress(OSError, ValueError):
-                process.stdin.close()
+        if process.stdin is not None or runtime.stdio_transport is not None:
+            self._close_process_stdin(runtime, process)
             remaining = deadline - time.monotonic()
             if remaining > 0 and await self._wait_for_process_exit(
                 process, timeout_s=min(remaining, 3.0)
@@ -2422,7 +2587,9 @@ class BaseAcpConnector(LLMBackend, UsageCalculationMixin, ABC, Generic[RuntimeT]
         runtimes = getattr(self, "_runtimes", None)
         if not isinstance(runtimes, dict):
             return
-        for runtime in runtimes.values():
+        warm_pool = getattr(self, "_warm_pool", None)
+        warm_runtimes = warm_pool.idle_runtimes() if warm_pool is not None else []
+        for runtime in [*runtimes.values(), *warm_runtimes]:
             process = getattr(runtime, "process", None)
             if process is None:
                 continue
@@ -0,0 +1,361 @@
+"""
+Event-loop-native stdio transport for ACP child processes.
+
+The child's pipes are registered with the running event loop instead of being
+read through ``asyncio.to_thread`` per JSON-RPC line and a dedicated stderr
+thread per runtime. One reader task per runtime frames stdout into lines with
+a ``StreamReader``, parses them, and demultiplexes them:
+
+* a response whose id is awaited (see :meth:`AcpStdioTransport.expect_response`)
+  resolves that waiter directly when nothing older is still queued;
+* everything else (notifications, server requests, unexpected responses, read
+  errors) goes to a bounded inbox in arrival order.
+
+The inbox bound keeps the old backpressure on the child: when nobody consumes
+messages the reader stops draining the pipe. Writes go through the loop's
+write-pipe transport and wait for its buffer to drain.
+
+Only real POSIX pipes can be registered; :meth:`AcpStdioTransport.attach`
+returns ``None`` otherwise (Windows, test doubles) and callers keep the
+thread-based I/O. The pipes are checked before any of them is registered,
+because registering puts them in non-blocking mode and closing a registered
+transport closes its pipe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import stat
+import subprocess
+from collections.abc import Callable
+from typing import Any
+
+from src.connectors.acp_core.types import ACPNotification
+from src.core.common.exceptions import BackendError
+
+logger = logging.getLogger(__name__)
+
+# Parsed stdout messages buffered before the reader stops draining the pipe
+_INBOX_MAX_MESSAGES = 256
+
+_STDERR_READ_SIZE = 4096
+
+_EOF = object()
+_CLOSED = object()
+
+
+def parse_jsonrpc_line(line: bytes) -> ACPNotification:
+    """Parse one newline-terminated JSON-RPC message from an ACP child.
+
+    Raises:
+        json.JSONDecodeError: The line is not valid JSON.
+        BackendError: The line is valid JSON but not an object.
+    """
+    data = json.loads(line.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise BackendError(message="Invalid non-object JSON response")
+    return ACPNotification(**data)
+
+
+def _is_pipe(pipe: Any) -> bool:
+    """Check whether the event loop accepts ``pipe`` for a pipe transport."""
+    if not isinstance(pipe, io.IOBase):
+        return False
+    try:
+        mode = os.fstat(pipe.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)
+
+
+async def _discard_line(stdout: asyncio.StreamReader, consumed: int) -> None:
+    # Drop an oversized line through its newline so the next message frames
+    # cleanly, even when the line arrives over many reads.
+    with contextlib.suppress(asyncio.IncompleteReadError):
+        while True:
+            await stdout.readexactly(consumed)
+            try:
+                await stdout.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as exc:
+                consumed = exc.consumed
+
+
+def _waiter_result(waiter: asyncio.Future[ACPNotification]) -> ACPNotification:
+    # Waiters are cancelled only when the transport closes
+    if waiter.cancelled():
+        raise ConnectionResetError("ACP stdio transport closed")
+    return waiter.result()
+
+
+class _StdinProtocol(asyncio.BaseProtocol):
+    """Flow control for the child's stdin write pipe."""
+
+    def __init__(self) -> None:
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+        self._lost = False
+        self._exc: Exception | None = None
+
+    def pause_writing(self) -> None:
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        self._can_write.set()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._lost = True
+        self._exc = exc
+        self._can_write.set()
+
+    async def drain(self) -> None:
+        await self._can_write.wait()
+        if self._lost:
+            raise self._exc or ConnectionResetError("ACP stdin closed")
+
+
+class AcpStdioTransport:
+    """Async stdin/stdout/stderr I/O for one ``subprocess.Popen`` ACP child.
+
+    Create with :meth:`attach` inside the event loop that will use it.
+    """
+
+    def __init__(
+        self,
+        *,
+        stdin: asyncio.WriteTransport,
+        stdin_protocol: _StdinProtocol,
+        stdout: asyncio.StreamReader,
+        stderr: asyncio.StreamReader,
+        read_transports: list[asyncio.ReadTransport],
+        on_stderr: Callable[[bytes], None],
+        name: str,
+    ) -> None:
+        self._stdin = stdin
+        self._stdin_protocol = stdin_protocol
+        self._stdout = stdout
+        self._stderr = stderr
+        self._read_transports = read_transports
+        self._on_stderr = on_stderr
+        self._inbox: asyncio.Queue[Any] = asyncio.Queue(_INBOX_MAX_MESSAGES)
+        self._response_waiters: dict[int, asyncio.Future[ACPNotification]] = {}
+        self._closed = False
+        self._reader_task = asyncio.create_task(
+            self._read_stdout(), name=f"{name}-stdout"
+        )
+        self._stderr_task = asyncio.create_task(
+            self._drain_stderr(), name=f"{name}-stderr"
+        )
+
+    @classmethod
+    async def attach(
+        cls,
+        process: subprocess.Popen[bytes],
+        *,
+        on_stderr: Callable[[bytes], None],
+        max_line_bytes: int,
+    ) -> AcpStdioTransport | None:
+        """Register ``process``'s pipes with the running loop.
+
+        Returns ``None`` when the pipes cannot be registered; they are left
+        untouched in that case.
+
+        Raises:
+            BackendError: Registration failed after some pipes were already
+                registered and closed; the process can no longer be used.
+        """
+        pipes = (process.stdin, process.stdout, process.stderr)
+        if os.name == "nt" or not all(_is_pipe(p) for p in pipes):
+            return None
+        loop = asyncio.get_running_loop()
+        stdout = asyncio.StreamReader(limit=max_line_bytes)
+        stderr = asyncio.StreamReader()
+        opened: list[asyncio.BaseTransport] = []
+        try:
+            stdout_transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(stdout), process.stdout
+            )
+            opened.append(stdout_transport)
+            stderr_transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(stderr), process.stderr
+            )
+            opened.append(stderr_transport)
+            stdin_transport, stdin_protocol = await loop.connect_write_pipe(
+                _StdinProtocol, process.stdin
+            )
+        except (OSError, ValueError, NotImplementedError) as exc:
+            if not opened:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "ACP pipes for pid %s not registrable with the event "
+                        "loop: %s",
+                        process.pid,
+                        exc,
+                    )
+                return None
+            # Closing a registered transport closes its pipe, so the
+            # thread-based fallback has nothing left to read
+            for transport in opened:
+                transport.close()
+            raise BackendError(
+                message=f"Failed to register ACP pipes for pid {process.pid}: {exc}"
+            ) from exc
+        return cls(
+            stdin=stdin_transport,
+            stdin_protocol=stdin_protocol,
+            stdout=stdout,
+            stderr=stderr,
+            read_transports=[stdout_transport, stderr_transport],
+            on_stderr=on_stderr,
+            name=f"acp-{process.pid}",
+        )
+
+    async def _read_stdout(self) -> None:
+        stdout = self._stdout
+        inbox = self._inbox
+        waiters = self._response_waiters
+        try:
+            while True:
+                try:
+                    line = await stdout.readuntil(b"\n")
+                except asyncio.IncompleteReadError as exc:
+                    # EOF; a trailing unterminated line is still a message
+                    line = exc.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError as exc:
+                    await _discard_line(stdout, exc.consumed)
+                    await inbox.put(
+                        BackendError(message="Response too large from ACP process")
+                    )
+                    continue
+                try:
+                    message = parse_jsonrpc_line(line)
+                except Exception as exc:
+                    await inbox.put(exc)
+                    continue
+                # Only bypass the inbox when nothing older is queued, so the
+                # consumer still sees messages in arrival order.
+                if message.is_response and waiters and inbox.empty():
+                    waiter = waiters.pop(message.id, None)  # type: ignore[arg-type]
+                    if waiter is not None and not waiter.done():
+                        waiter.set_result(message)
+                        continue
+                await inbox.put(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await inbox.put(exc)
+        await inbox.put(_EOF)
+
+    async def _drain_stderr(self) -> None:
+        stderr = self._stderr
+        with contextlib.suppress(Exception):
+            while True:
+                chunk = await stderr.read(_STDERR_READ_SIZE)
+                if not chunk:
+                    return
+                self._on_stderr(chunk)
+
+    def expect_response(self, request_id: int) -> asyncio.Future[ACPNotification]:
+        """Register interest in the response to ``request_id``.
+
+        Pass the future to :meth:`receive`; call :meth:`forget_response` once
+        done waiting.
+        """
+        waiter: asyncio.Future[ACPNotification] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._response_waiters[request_id] = waiter
+        return waiter
+
+    def forget_response(self, request_id: int) -> None:
+        waiter = self._response_waiters.pop(request_id, None)
+        if waiter is not None:
+            waiter.cancel()
+
+    async def receive(
+        self, response_waiter: asyncio.Future[ACPNotification] | None = None
+    ) -> ACPNotification | None:
+        """Return the next message, or ``None`` once stdout reached EOF.
+
+        With ``response_waiter``, the awaited response is returned as soon as
+        it arrives unless older messages are still queued.
+
+        Raises:
+            BackendError: A line was too large or not a JSON object.
+            json.JSONDecodeError: A line was not valid JSON.
+            ConnectionResetError: The transport was closed.
+        """
+        inbox = self._inbox
+        if response_waiter is not None and inbox.empty():
+            if response_waiter.done():
+                return _waiter_result(response_waiter)
+            getter = asyncio.ensure_future(inbox.get())
+            try:
+                await asyncio.wait(
+                    (getter, response_waiter), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                # A cancelled get leaves any delivered item in the queue
+                if not getter.done():
+                    getter.cancel()
+            if not getter.done() or getter.cancelled():
+                return _waiter_result(response_waiter)
+            item = getter.result()
+        else:
+            item = await inbox.get()
+        if item is _EOF or item is _CLOSED:
+            # Keep end-of-stream sticky for later reads
+            with contextlib.suppress(asyncio.QueueFull):
+                inbox.put_nowait(item)
+            if item is _CLOSED:
+                raise ConnectionResetError("ACP stdio transport closed")
+            return None
+        if isinstance(item, Exception):
+            raise item
+        return item  # type: ignore[no-any-return]
+
+    async def write_line(self, data: bytes) -> None:
+        """Write one encoded message and wait until the pipe accepts it."""
+        if self._closed or self._stdin.is_closing():
+            raise ConnectionResetError("ACP stdin closed")
+        self._stdin.write(data)
+        await self._stdin_protocol.drain()
+
+    def close_stdin(self) -> None:
+        """Send EOF to the child once buffered writes are flushed."""
+        if not self._stdin.is_closing():
+            self._stdin.close()
+
+    async def wait_stderr_closed(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for the child's stderr to reach EOF."""
+        await asyncio.wait((self._stderr_task,), timeout=timeout)
+
+    def close(self) -> None:
+        """Stop the reader tasks and release the pipes; idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._reader_task.cancel()
+        self._stderr_task.cancel()
+        for transport in self._read_transports:
+            transport.close()
+        if not self._stdin.is_closing():
+            self._stdin.abort()
+        for waiter in self._response_waiters.values():
+            waiter.cancel()
+        self._response_waiters.clear()
+        # Wake any pending receive(); queued messages are moot now
+        inbox = self._inbox
+        while not inbox.empty():
+            inbox.get_nowait()
+        inbox.put_nowait(_CLOSED)
+
+
+__all__ = ["AcpStdioTransport", "parse_jsonrpc_line"]
@@ -162,6 +162,9 @@ class ACPProcessRuntime:
     stale_kill_task: Any = field(default=None)  # asyncio.Task | None
     #: Captured when the child starts; used before idle-kill to detect PID reuse.
     acp_subprocess_identity: AcpSubprocessIdentity | None = None
+    #: Event-loop stdio transport for the live child process; ``None`` when its
+    #: pipes are read through threads instead.
+    stdio_transport: Any = field(default=None)
     #: Dedicated stderr reader thread for the live child process.
     stderr_drain_thread: Any = field(default=None)
     #: Stop signal for the dedicated stderr reader.
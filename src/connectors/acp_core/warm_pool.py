@@ -0,0 +1,422 @@
+"""Pre-warmed, handshaken ACP runtimes ready to be claimed by new sessions.
+
+Starting an ACP agent CLI and completing its ``initialize``/``session/new``
+handshake routinely takes several seconds. :class:`AcpWarmRuntimePool` keeps a
+small number of idle, already-handshaken runtimes per ``(workspace, model)``
+so the first turn of a new client session can skip that cost.
+
+The pool is demand driven: a key is only warmed after it has been asked for,
+and the number of idle runtimes kept for it follows recent claim traffic
+between ``min_idle`` and ``max_idle``. Idle runtimes are retired after
+``idle_ttl_seconds``; a key with no demand for that long stops being refilled.
+Refills run in background tasks so a claim never waits for a spawn.
+
+The pool is connector-agnostic. The owning connector supplies callables that
+build a warm runtime, retire one, and check that one is still usable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+_psutil: Any
+try:
+    import psutil as _psutil
+except ImportError:  # pragma: no cover - exercised when psutil missing from env
+    _psutil = None
+
+logger = logging.getLogger(__name__)
+
+RuntimeT = TypeVar("RuntimeT")
+
+#: ``(str(project_dir), model)``
+WarmPoolKey = tuple[str, str]
+
+DEFAULT_WARM_POOL_MAX_IDLE = 2
+DEFAULT_WARM_POOL_MAX_TOTAL_IDLE = 8
+DEFAULT_WARM_POOL_IDLE_TTL_SECONDS = 300.0
+#: Claims within this window raise a key's idle target above ``min_idle``.
+_DEMAND_WINDOW_SECONDS = 60.0
+_SWEEP_INTERVAL_MAX_SECONDS = 30.0
+_SWEEP_INTERVAL_MIN_SECONDS = 1.0
+
+
+def _coerce_int(raw: Any, default: int) -> int:
+    if isinstance(raw, bool):
+        return default
+    try:
+        return max(0, int(raw))
+    except (TypeError, ValueError):
+        return default
+
+
+def _coerce_float(raw: Any, default: float | None) -> float | None:
+    if raw is None or isinstance(raw, bool):
+        return default
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return default
+    if value != value or value <= 0:  # NaN or non-positive
+        return default
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class AcpWarmPoolSettings:
+    """Sizing and retention limits for :class:`AcpWarmRuntimePool`.
+
+    ``min_idle == 0`` disables the pool. ``max_idle_rss_mb`` caps the summed
+    resident memory of all idle runtimes; it is ignored when psutil is missing.
+    """
+
+    min_idle: int = 0
+    max_idle: int = DEFAULT_WARM_POOL_MAX_IDLE
+    max_total_idle: int = DEFAULT_WARM_POOL_MAX_TOTAL_IDLE
+    idle_ttl_seconds: float = DEFAULT_WARM_POOL_IDLE_TTL_SECONDS
+    max_idle_rss_mb: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.min_idle > 0 and self.max_total_idle > 0
+
+    @classmethod
+    def from_backend_kwargs(cls, kwargs: Mapping[str, Any]) -> AcpWarmPoolSettings:
+        """Read ``warm_pool_*`` keys from ACP backend ``initialize`` kwargs."""
+
+        min_idle = _coerce_int(kwargs.get("warm_pool_min_idle"), 0)
+        max_idle = max(
+            min_idle,
+            _coerce_int(kwargs.get("warm_pool_max_idle"), DEFAULT_WARM_POOL_MAX_IDLE),
+        )
+        max_total_idle = _coerce_int(
+            kwargs.get("warm_pool_max_total_idle"), DEFAULT_WARM_POOL_MAX_TOTAL_IDLE
+        )
+        idle_ttl = _coerce_float(
+            kwargs.get("warm_pool_idle_ttl_seconds"),
+            DEFAULT_WARM_POOL_IDLE_TTL_SECONDS,
+        )
+        return cls(
+            min_idle=min_idle,
+            max_idle=max_idle,
+            max_total_idle=max_total_idle,
+            idle_ttl_seconds=idle_ttl or DEFAULT_WARM_POOL_IDLE_TTL_SECONDS,
+            max_idle_rss_mb=_coerce_float(
+                kwargs.get("warm_pool_max_idle_rss_mb"), None
+            ),
+        )
+
+
+@dataclass(slots=True)
+class _WarmEntry(Generic[RuntimeT]):
+    runtime: RuntimeT
+    warmed_at: float
+
+
+@dataclass(slots=True)
+class _KeyDemand:
+    project_dir: Path
+    model: str
+    last_demand: float
+    recent_claims: deque[float]
+
+
+class AcpWarmRuntimePool(Generic[RuntimeT]):
+    """Idle, handshaken ACP runtimes keyed by ``(workspace, model)``.
+
+    All state is touched only from the event loop, so no locks are needed.
+    """
+
+    def __init__(
+        self,
+        settings: AcpWarmPoolSettings,
+        *,
+        warm: Callable[[Path, str], Awaitable[RuntimeT]],
+        retire: Callable[[RuntimeT], Awaitable[None]],
+        is_ready: Callable[[RuntimeT], bool],
+        label: str = "acp",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._settings = settings
+        self._warm = warm
+        self._retire = retire
+        self._is_ready = is_ready
+        self._label = label
+        self._clock = clock
+        self._idle: dict[WarmPoolKey, deque[_WarmEntry[RuntimeT]]] = {}
+        self._demand: dict[WarmPoolKey, _KeyDemand] = {}
+        self._refill_tasks: dict[WarmPoolKey, asyncio.Task[None]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._sweeper: asyncio.Task[None] | None = None
+
+    @property
+    def settings(self) -> AcpWarmPoolSettings:
+        return self._settings
+
+    def configure(self, settings: AcpWarmPoolSettings) -> None:
+        """Apply new limits; existing idle runtimes are trimmed on the next sweep."""
+
+        self._settings = settings
+
+    def idle_count(self, project_dir: Path | None = None, model: str = "") -> int:
+        if project_dir is None:
+            return sum(len(queue) for queue in self._idle.values())
+        return len(self._idle.get((str(project_dir), model), ()))
+
+    def idle_runtimes(self) -> list[RuntimeT]:
+        return [entry.runtime for queue in self._idle.values() for entry in queue]
+
+    def claim(self, project_dir: Path, model: str) -> RuntimeT | None:
+        """Hand out a ready idle runtime for ``(project_dir, model)``, if any.
+
+        Every claim records demand for the key and schedules a background
+        refill, whether or not a warm runtime was available. Must be called
+        from a running event loop.
+        """
+
+        if not self._settings.enabled:
+            return None
+        key: WarmPoolKey = (str(project_dir), model)
+        now = self._clock()
+        self._record_demand(key, project_dir, model, now)
+
+        claimed: RuntimeT | None = None
+        stale: list[RuntimeT] = []
+        queue = self._idle.get(key)
+        while queue:
+            entry = queue.popleft()
+            if self._is_expired(entry, now) or not self._is_ready(entry.runtime):
+                stale.append(entry.runtime)
+                continue
+            claimed = entry.runtime
+            break
+        if queue is not None and not queue:
+            del self._idle[key]
+
+        if stale:
+            self._run_in_background(self._retire_all(stale))
+        self._schedule_refill(key)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "ACP warm pool %s: project=%s model=%s (backend=%s idle_left=%d)",
+                "hit" if claimed is not None else "miss",
+                project_dir,
+                model,
+                self._label,
+                self.idle_count(project_dir, model),
+            )
+        return claimed
+
+    async def close(self) -> None:
+        """Cancel background work and retire every idle runtime."""
+
+        tasks = [*self._refill_tasks.values(), *self._background]
+        if self._sweeper is not None:
+            tasks.append(self._sweeper)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._refill_tasks.clear()
+        self._background.clear()
+        self._sweeper = None
+        self._demand.clear()
+        idle = self.idle_runtimes()
+        self._idle.clear()
+        await self._retire_all(idle)
+
+    def _record_demand(
+        self, key: WarmPoolKey, project_dir: Path, model: str, now: float
+    ) -> None:
+        demand = self._demand.get(key)
+        if demand is None:
+            demand = _KeyDemand(
+                project_dir=project_dir,
+                model=model,
+                last_demand=now,
+                recent_claims=deque(maxlen=max(1, self._settings.max_idle)),
+            )
+            self._demand[key] = demand
+        demand.last_demand = now
+        demand.recent_claims.append(now)
+
+    def _target_idle(self, key: WarmPoolKey, now: float) -> int:
+        """Predict how many idle runtimes ``key`` needs from recent claims."""
+
+        demand = self._demand.get(key)
+        if demand is None:
+            return 0
+        if now - demand.last_demand >= self._settings.idle_ttl_seconds:
+            return 0
+        recent = sum(
+            1 for ts in demand.recent_claims if now - ts < _DEMAND_WINDOW_SECONDS
+        )
+        return min(self._settings.max_idle, max(self._settings.min_idle, recent))
+
+    def _is_expired(self, entry: _WarmEntry[RuntimeT], now: float) -> bool:
+        return now - entry.warmed_at >= self._settings.idle_ttl_seconds
+
+    def _has_capacity(self) -> bool:
+        if self.idle_count() + len(self._refill_tasks) > self._settings.max_total_idle:
+            return False
+        cap = self._settings.max_idle_rss_mb
+        if cap is None:
+            return True
+        return self._idle_rss_bytes() < cap * 1024 * 1024
+
+    def _idle_rss_bytes(self) -> int:
+        if _psutil is None:
+            return 0
+        total = 0
+        for runtime in self.idle_runtimes():
+            pid = getattr(getattr(runtime, "process", None), "pid", None)
+            if not isinstance(pid, int) or pid <= 0:
+                continue
+            with contextlib.suppress(_psutil.Error):
+                total += int(_psutil.Process(pid).memory_info().rss)
+        return total
+
+    def _schedule_refill(self, key: WarmPoolKey) -> None:
+        if key in self._refill_tasks:
+            return
+        if self.idle_count(Path(key[0]), key[1]) >= self._target_idle(
+            key, self._clock()
+        ):
+            return
+        task = asyncio.get_running_loop().create_task(self._refill(key))
+        self._refill_tasks[key] = task
+        task.add_done_callback(functools.partial(self._forget_refill, key))
+        self._ensure_sweeper()
+
+    def _forget_refill(self, key: WarmPoolKey, _task: asyncio.Task[None]) -> None:
+        self._refill_tasks.pop(key, None)
+
+    async def _refill(self, key: WarmPoolKey) -> None:
+        demand = self._demand.get(key)
+        if demand is None:
+            return
+        while (
+            self._settings.enabled
+            and len(self._idle.get(key, ())) < self._target_idle(key, self._clock())
+            and self._has_capacity()
+        ):
+            started = self._clock()
+            try:
+                runtime = await self._warm(demand.project_dir, demand.model)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Stop on failure; the next claim retries instead of spinning.
+                logger.warning(
+                    "ACP warm pool failed to start a runtime (backend=%s project=%s "
+                    "model=%s)",
+                    self._label,
+                    demand.project_dir,
+                    demand.model,
+                    exc_info=True,
+                )
+                return
+            self._idle.setdefault(key, deque()).append(
+                _WarmEntry(runtime=runtime, warmed_at=self._clock())
+            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "ACP warm pool runtime ready in %.2fs (backend=%s project=%s "
+                    "model=%s idle=%d)",
+                    self._clock() - started,
+                    self._label,
+                    demand.project_dir,
+                    demand.model,
+                    len(self._idle[key]),
+                )
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        interval = min(
+            _SWEEP_INTERVAL_MAX_SECONDS,
+            max(_SWEEP_INTERVAL_MIN_SECONDS, self._settings.idle_ttl_seconds / 2),
+        )
+        while self._idle or self._refill_tasks or self._demand:
+            await asyncio.sleep(interval)
+            await self._sweep()
+
+    async def _sweep(self) -> None:
+        """Retire expired, dead or over-limit idle runtimes and top up live keys."""
+
+        now = self._clock()
+        retired: list[RuntimeT] = []
+        for key in list(self._idle):
+            queue = self._idle[key]
+            keep: list[_WarmEntry[RuntimeT]] = []
+            for entry in queue:
+                if self._is_expired(entry, now) or not self._is_ready(entry.runtime):
+                    retired.append(entry.runtime)
+                else:
+                    keep.append(entry)
+            limit = self._settings.max_idle if self._settings.enabled else 0
+            retired.extend(entry.runtime for entry in keep[limit:])
+            keep = keep[:limit]
+            if keep:
+                self._idle[key] = deque(keep)
+            else:
+                del self._idle[key]
+        retired.extend(self._trim_to_capacity())
+
+        for key, demand in list(self._demand.items()):
+            if now - demand.last_demand >= self._settings.idle_ttl_seconds:
+                del self._demand[key]
+
+        await self._retire_all(retired)
+        for key in list(self._demand):
+            self._schedule_refill(key)
+
+    def _trim_to_capacity(self) -> list[RuntimeT]:
+        """Drop the oldest idle runtimes until the global limits hold."""
+
+        trimmed: list[RuntimeT] = []
+        while self._idle and (
+            self.idle_count() > self._settings.max_total_idle
+            or (
+                self._settings.max_idle_rss_mb is not None
+                and self._idle_rss_bytes()
+                > self._settings.max_idle_rss_mb * 1024 * 1024
+            )
+        ):
+            key = min(self._idle, key=lambda k: self._idle[k][0].warmed_at)
+            queue = self._idle[key]
+            trimmed.append(queue.popleft().runtime)
+            if not queue:
+                del self._idle[key]
+        return trimmed
+
+    async def _retire_all(self, runtimes: list[RuntimeT]) -> None:
+        for runtime in runtimes:
+            try:
+                await self._retire(runtime)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "ACP warm pool failed to retire an idle runtime (backend=%s)",
+                    self._label,
+                    exc_info=True,
+                )
+
+    def _run_in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
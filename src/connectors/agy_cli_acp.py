@@ -348,6 +348,7 @@ class AgyCliAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
             mcp = kwargs.get("mcp_servers", [])
             self._mcp_servers = mcp if isinstance(mcp, list) else []
             extra = kwargs.get("wrapper_extra_args") or kwargs.get(
@@ -18,6 +18,7 @@ from src.connectors.contracts import (
     ConnectorChatCompletionsRequest,
     ConnectorRequestContext,
 )
+from src.connectors.utils.sse_framing import aiter_sse_events
 from src.core.app.constants.logging_constants import TRACE_LEVEL
 from src.core.common.capture_aware_httpx import (
     CaptureAwareAsyncClient,
@@ -593,13 +594,15 @@ class AnthropicBackend(LLMBackend):
 
                 prompt_tokens = 0
                 try:
-                    from src.core.utils.token_count import (
-                        count_tokens,
-                        extract_prompt_text,
+                    from src.core.common.token_counting import (
+                        get_token_counting_service,
                     )
 
-                    prompt_text = extract_prompt_text(processed_messages)
-                    prompt_tokens = count_tokens(prompt_text, model=effective_model)
+                    prompt_tokens = (
+                        await get_token_counting_service().count_messages_async(
+                            processed_messages, model=effective_model
+                        )
+                    )
                 except (
                     ImportError,
                     AttributeError,
@@ -1207,7 +1210,9 @@ class AnthropicBackend(LLMBackend):
 
         async def event_stream() -> AsyncGenerator[ProcessedResponse, None]:
             try:
-                async for chunk in response.aiter_text():
+                # One complete SSE event per chunk, however the bytes arrive
+                async for sse_event in aiter_sse_events(response.aiter_bytes()):
+                    chunk = sse_event.raw
                     _capture_message_id(chunk)
 
                     if logger.isEnabledFor(logging.DEBUG):
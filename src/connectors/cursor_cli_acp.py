@@ -521,6 +521,7 @@ class CursorCliAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
             self._models_cache_ttl_seconds = max(
                 0.0,
                 float(
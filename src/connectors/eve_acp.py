@@ -8,7 +8,6 @@ import logging
 import os
 import shutil
 import subprocess
-import threading
 import uuid
 from collections.abc import Sequence
 from pathlib import Path
@@ -725,6 +724,7 @@ class EveAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
             self._tool_pacing_ms = int(
                 kwargs.get("tool_pacing_ms", self._tool_pacing_ms)
             )
@@ -1075,16 +1075,7 @@ class EveAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                     ),
                 )
                 runtime.process = new_process
-                runtime.stderr_drain_stop_event.clear()
-                with runtime.stderr_tail_lock:
-                    runtime.stderr_tail.clear()
-                runtime.stderr_drain_thread = threading.Thread(
-                    target=self._drain_stderr_thread,
-                    args=(new_process, runtime),
-                    name=f"acp-stderr-{new_process.pid}",
-                    daemon=True,
-                )
-                runtime.stderr_drain_thread.start()
+                await self._start_process_io(new_process, runtime)
                 await asyncio.sleep(0.1)
                 if new_process.poll() is not None:
                     stderr = await self._read_stderr(new_process, runtime)
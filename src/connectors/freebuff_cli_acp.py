@@ -294,6 +294,7 @@ class FreebuffCliAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
             pace_ms = kwargs.get("pace_ms")
             self._pace_ms = int(pace_ms) if pace_ms is not None else None
 
@@ -809,10 +809,13 @@ class GeminiBackend(LLMBackend, UsageCalculationMixin):
 
             prompt_tokens = 0
             try:
-                from src.core.utils.token_count import count_tokens, extract_prompt_text
+                from src.core.common.token_counting import (
+                    get_token_counting_service,
+                )
 
-                prompt_text = extract_prompt_text(processed_messages)
-                prompt_tokens = count_tokens(prompt_text, model=effective_model)
+                prompt_tokens = await get_token_counting_service().count_messages_async(
+                    processed_messages, model=effective_model
+                )
             except (ValueError, TypeError, KeyError, AttributeError):
                 if logger.isEnabledFor(logging.WARNING):
                     logger.warning("Failed to calculate prompt tokens", exc_info=True)
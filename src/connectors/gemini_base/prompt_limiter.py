@@ -50,68 +50,77 @@ def serialize_part(part: Any) -> str | None:
     return str(part)
 
 
-def estimate_prompt_tokens(
-    code_assist_request: dict[str, Any],
-    encoding: Any,
-) -> int | None:
-    """Best-effort estimate of prompt token usage for a Code Assist request.
+def collect_prompt_text_parts(code_assist_request: dict[str, Any]) -> list[str]:
+    """Serialize the prompt-bearing fields of a Code Assist request.
 
     Args:
         code_assist_request: The Code Assist API request body.
-        encoding: A tiktoken encoding instance.
 
     Returns:
-        Estimated token count, or None if estimation fails.
+        Text of each system/content part, followed by serialized generation
+        config, tools, tool config and safety settings.
     """
     prompt_text_parts: list[str] = []
-    try:
-        system_instruction = code_assist_request.get("systemInstruction")
-        if isinstance(system_instruction, dict):
-            for part in system_instruction.get("parts", []):
-                serialized = serialize_part(part)
-                if serialized:
-                    prompt_text_parts.append(serialized)
-
-        for content in code_assist_request.get("contents", []):
-            if not isinstance(content, dict):
-                continue
-            for part in content.get("parts", []):
-                serialized = serialize_part(part)
-                if serialized:
-                    prompt_text_parts.append(serialized)
-
-        generation_config = code_assist_request.get("generationConfig")
-        if generation_config:
-            try:
-                prompt_text_parts.append(
-                    json.dumps(generation_config, ensure_ascii=False)
+    system_instruction = code_assist_request.get("systemInstruction")
+    if isinstance(system_instruction, dict):
+        for part in system_instruction.get("parts", []):
+            serialized = serialize_part(part)
+            if serialized:
+                prompt_text_parts.append(serialized)
+
+    for content in code_assist_request.get("contents", []):
+        if not isinstance(content, dict):
+            continue
+        for part in content.get("parts", []):
+            serialized = serialize_part(part)
+            if serialized:
+                prompt_text_parts.append(serialized)
+
+    generation_config = code_assist_request.get("generationConfig")
+    if generation_config:
+        try:
+            prompt_text_parts.append(json.dumps(generation_config, ensure_ascii=False))
+        except (TypeError, ValueError, OverflowError):
+            # Fallback to repr if JSON serialization fails
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Failed to serialize generation_config to JSON, using repr",
+                    exc_info=True,
                 )
+            prompt_text_parts.append(repr(generation_config))
+
+    for extra_key in ("tools", "toolConfig", "safetySettings"):
+        extra_value = code_assist_request.get(extra_key)
+        if extra_value:
+            try:
+                prompt_text_parts.append(json.dumps(extra_value, ensure_ascii=False))
             except (TypeError, ValueError, OverflowError):
                 # Fallback to repr if JSON serialization fails
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(
-                        "Failed to serialize generation_config to JSON, using repr",
+                        "Failed to serialize %s to JSON, using repr",
+                        extra_key,
                         exc_info=True,
                     )
-                prompt_text_parts.append(repr(generation_config))
-
-        for extra_key in ("tools", "toolConfig", "safetySettings"):
-            extra_value = code_assist_request.get(extra_key)
-            if extra_value:
-                try:
-                    prompt_text_parts.append(
-                        json.dumps(extra_value, ensure_ascii=False)
-                    )
-                except (TypeError, ValueError, OverflowError):
-                    # Fallback to repr if JSON serialization fails
-                    if logger.isEnabledFor(logging.DEBUG):
-                        logger.debug(
-                            "Failed to serialize %s to JSON, using repr",
-                            extra_key,
-                            exc_info=True,
-                        )
-                    prompt_text_parts.append(repr(extra_value))
+                prompt_text_parts.append(repr(extra_value))
+    return prompt_text_parts
+
+
+def estimate_prompt_tokens(
+    code_assist_request: dict[str, Any],
+    encoding: Any,
+) -> int | None:
+    """Best-effort estimate of prompt token usage for a Code Assist request.
 
+    Args:
+        code_assist_request: The Code Assist API request body.
+        encoding: A tiktoken encoding instance.
+
+    Returns:
+        Estimated token count, or None if estimation fails.
+    """
+    try:
+        prompt_text_parts = collect_prompt_text_parts(code_assist_request)
         if not prompt_text_parts:
             return 0
 
@@ -0,0 +1,279 @@
+"""
+Append-only persistence journal for thought signatures.
+
+Each record is one JSON line. ``{"k": key, "s": sig, "t": ts}`` stores or
+touches a cache key and ``{"k": key, "d": 1, "t": ts}`` removes it. A single
+daemon thread per journal drains a queue, coalesces records per key and appends
+them, so the cost of persistence follows the change rate instead of the cache
+size. The same thread compacts the file (rewrites only live, unexpired records
+and unexpired removals) once dead records outnumber live ones. Removals are kept
+for a full TTL because older records for the key may still sit in other
+processes' journals or legacy snapshots.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import mmap
+import os
+import pathlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".jsonl"
+
+# Journals are never compacted below this many records.
+_MIN_COMPACT_RECORDS = 1024
+_CLOSE_TIMEOUT_SECONDS = 5.0
+
+# Queue item: (cache_key, signature or None for a delete, timestamp).
+# Removals written before removal timestamps were recorded replay with 0.0.
+_Record = tuple[str, str | None, float]
+
+
+def iter_journal_records(path: pathlib.Path) -> Iterator[_Record]:
+    """Yield records from a journal file in write order.
+
+    The file is memory-mapped and split line by line, so replay never holds a
+    decoded copy of the whole journal. Malformed lines (e.g. a torn final
+    write) are skipped.
+    """
+    try:
+        with path.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for line in iter(mapped.readline, b""):
+                    record = _parse_record(line)
+                    if record is not None:
+                        yield record
+    except (OSError, ValueError):
+        logger.debug("Failed to replay thought signature journal %s", str(path))
+
+
+def _parse_record(line: bytes) -> _Record | None:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    key = data.get("k")
+    if not isinstance(key, str) or not key:
+        return None
+    ts = data.get("t")
+    if data.get("d"):
+        return key, None, float(ts) if isinstance(ts, int | float) else 0.0
+    sig = data.get("s")
+    if not isinstance(sig, str) or not sig or not isinstance(ts, int | float):
+        return None
+    return key, sig, float(ts)
+
+
+def _encode_record(key: str, sig: str | None, ts: float) -> str:
+    if sig is None:
+        return json.dumps({"k": key, "d": 1, "t": ts}, separators=(",", ":"))
+    return json.dumps({"k": key, "s": sig, "t": ts}, separators=(",", ":"))
+
+
+class ThoughtSignatureJournal:
+    """Single-writer append-only journal for one persistence file.
+
+    ``record``/``remove`` only enqueue and never touch the disk, so callers may
+    use them while holding their own locks. The writer thread starts lazily on
+    the first record.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._path = path
+        self._clock = clock if clock is not None else time.time
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.SimpleQueue[_Record | None] = queue.SimpleQueue()
+        # Latest record per key written by this journal, for compaction.
+        self._live: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        # Removal time per key removed by this journal, kept through compaction.
+        self._removed: dict[str, float] = {}
+        self._records_in_file = 0
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._unwritten = 0
+        self._unwritten_lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    def seed(
+        self,
+        records: dict[str, tuple[str, float]],
+        records_in_file: int,
+        removed: dict[str, float] | None = None,
+    ) -> None:
+        """Adopt state replayed from this journal's own file before writing.
+
+        Without it a journal reopened after a restart would compact away the
+        records and removals written by the previous process.
+        """
+        for key, (sig, ts) in sorted(records.items(), key=lambda item: item[1][1]):
+            self._live[key] = (sig, ts)
+        if removed:
+            self._removed.update(removed)
+        self._records_in_file = records_in_file
+
+    def record(self, key: str, sig: str, timestamp: float) -> None:
+        """Queue an insert or touch of ``key``."""
+        self._submit((key, sig, float(timestamp)))
+
+    def remove(self, key: str) -> None:
+        """Queue a removal of ``key``."""
+        self._submit((key, None, self._clock()))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued record has been written."""
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        """Write pending records and stop the writer thread."""
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(_CLOSE_TIMEOUT_SECONDS)
+
+    def _submit(self, item: _Record) -> None:
+        with self._unwritten_lock:
+            self._unwritten += 1
+            self._idle.clear()
+        self._queue.put(item)
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"thought-signature-journal-{self._path.stem}",
+                    daemon=True,
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        with contextlib.suppress(OSError):
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        stopping = False
+        while not stopping:
+            pending: dict[str, tuple[str | None, float]] = {}
+            consumed = 0
+            item = self._queue.get()
+            # Coalesce a burst of records into one append per key.
+            deadline = time.monotonic() + self._flush_interval_seconds
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    consumed += 1
+                    pending.pop(item[0], None)
+                    pending[item[0]] = (item[1], item[2])
+                try:
+                    if stopping:
+                        # Drain what is already queued so close() loses nothing.
+                        item = self._queue.get_nowait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if pending:
+                self._append(pending)
+                self._maybe_compact()
+            with self._unwritten_lock:
+                self._unwritten -= consumed
+                if self._unwritten <= 0:
+                    self._idle.set()
+
+    def _append(self, pending: dict[str, tuple[str | None, float]]) -> None:
+        lines = [_encode_record(key, sig, ts) for key, (sig, ts) in pending.items()]
+        try:
+            with self._path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+        except OSError:
+            logger.debug(
+                "Failed to append thought signature journal %s",
+                str(self._path),
+                exc_info=True,
+            )
+            return
+        self._records_in_file += len(lines)
+        for key, (sig, ts) in pending.items():
+            if sig is None:
+                self._live.pop(key, None)
+                self._removed[key] = ts
+                continue
+            self._removed.pop(key, None)
+            self._live[key] = (sig, ts)
+            self._live.move_to_end(key)
+        if self._max_entries > 0:
+            while len(self._live) > self._max_entries:
+                self._live.popitem(last=False)
+
+    def _maybe_compact(self) -> None:
+        if self._records_in_file <= max(
+            _MIN_COMPACT_RECORDS, 2 * (len(self._live) + len(self._removed))
+        ):
+            return
+        now = self._clock()
+        expired = [
+            key for key, (_, ts) in self._live.items() if now - ts > self._ttl_seconds
+        ]
+        for key in expired:
+            del self._live[key]
+        self._removed = {
+            key: ts
+            for key, ts in self._removed.items()
+            if now - ts <= self._ttl_seconds
+        }
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                for key, (sig, ts) in self._live.items():
+                    handle.write(_encode_record(key, sig, ts) + "\n")
+                for key, ts in self._removed.items():
+                    handle.write(_encode_record(key, None, ts) + "\n")
+            os.replace(str(tmp_path), str(self._path))
+        except OSError:
+            logger.debug(
+                "Failed to compact thought signature journal %s",
+                str(self._path),
+                exc_info=True,
+            )
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compacted thought signature journal %s (%d -> %d record(s))",
+                str(self._path),
+                self._records_in_file,
+                len(self._live) + len(self._removed),
+            )
+        self._records_in_file = len(self._live) + len(self._removed)
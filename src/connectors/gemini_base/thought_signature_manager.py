@@ -6,7 +6,6 @@ for clients (like Droid) that don't preserve extra_content.
 """
 
 import contextlib
-import hashlib
 import json
 import logging
 import os
@@ -16,6 +15,11 @@ import time
 from collections import OrderedDict
 from typing import Any
 
+from src.connectors.gemini_base.thought_signature_journal import (
+    JOURNAL_SUFFIX,
+    ThoughtSignatureJournal,
+    iter_journal_records,
+)
 from src.core.app.constants.logging_constants import TRACE_LEVEL
 
 logger = logging.getLogger(__name__)
@@ -32,7 +36,6 @@ class ThoughtSignatureManager:
     """
 
     _NAMESPACE_SEPARATOR = "|"
-    _PERSIST_NAMESPACE_PREFIX = "thought_signatures_ns_"
 
     def __init__(self, max_cache_size: int = 10000, ttl_seconds: int = 86400) -> None:
         # Allow runtime overrides for long-running interactive sessions.
@@ -52,13 +55,17 @@ class ThoughtSignatureManager:
         self._persist_path: pathlib.Path | None = None
         self._persist_dir: pathlib.Path | None = None
         self._load_legacy_persist_file = True
-        self._persist_min_interval_seconds = 5.0
-        self._persist_last_write = 0.0
-        self._persist_dirty = False
         self._persist_namespaced = False
-        self._persist_namespaced_last_write: dict[str, float] = {}
-        self._persist_namespaced_dirty: set[str] = set()
         self._configure_persistence()
+        # Append-only journal of anonymous (and, when enabled, namespaced)
+        # inserts, touches and removals; see thought_signature_journal.
+        self._journal: ThoughtSignatureJournal | None = None
+        if self._persist_path is not None:
+            self._journal = ThoughtSignatureJournal(
+                self._persist_path.with_suffix(JOURNAL_SUFFIX),
+                ttl_seconds=self._ttl_seconds,
+                max_entries=self._max_cache_size,
+            )
 
         # OrderedDict for LRU eviction with timestamps.
         # NOTE: Some tests and legacy paths may still assign raw strings as values.
@@ -181,7 +188,11 @@ class ThoughtSignatureManager:
         }
 
     def _iter_persist_files(self) -> list[pathlib.Path]:
-        """Return all persistence files to load for this process."""
+        """Return all persistence files to load for this process.
+
+        Legacy JSON snapshots and append-only journals are both returned,
+        oldest first, so later removals win over earlier inserts.
+        """
 
         files: list[pathlib.Path] = []
 
@@ -196,9 +207,15 @@ class ThoughtSignatureManager:
             with contextlib.suppress(Exception):
                 if persist_dir.exists() and persist_dir.is_dir():
                     files.extend(sorted(persist_dir.glob("thought_signatures_*.json")))
-
-        persist_path = self._persist_path
-        if persist_path is not None:
+                    journal_glob = f"thought_signatures_*{JOURNAL_SUFFIX}"
+                    files.extend(sorted(persist_dir.glob(journal_glob)))
+
+        candidates = [self._persist_path]
+        if self._journal is not None:
+            candidates.append(self._journal.path)
+        for persist_path in candidates:
+            if persist_path is None:
+                continue
             with contextlib.suppress(Exception):
                 if (
                     persist_path.exists()
@@ -207,6 +224,13 @@ class ThoughtSignatureManager:
                 ):
                     files.append(persist_path)
 
+        def _mtime(path: pathlib.Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        files.sort(key=_mtime)
         return files
 
     def _load_persisted_signatures(self) -> None:
@@ -220,6 +244,13 @@ class ThoughtSignatureManager:
         loaded_files = 0
 
         for path in persist_files:
+            if path.suffix == JOURNAL_SUFFIX:
+                if self._replay_journal(
+                    path, current_time, merged_anon, merged_namespaced
+                ):
+                    loaded_files += 1
+                continue
+
             try:
                 data = json.loads(path.read_text(encoding="utf-8"))
             except Exception:
@@ -261,33 +292,15 @@ class ThoughtSignatureManager:
                     continue
 
                 timestamp = float(ts) if isinstance(ts, int | float) else current_time
-                if current_time - timestamp > self._ttl_seconds:
-                    continue
-
-                if key.startswith("anon:"):
-                    tc_id = key.rsplit(":", 1)[1]
-                    existing = merged_anon.get(tc_id)
-                    if existing is None or timestamp > existing[1]:
-                        merged_anon[tc_id] = (sig, timestamp)
-                    continue
-
-                if self._is_namespaced_cache_key(key):
-                    if not self._persist_namespaced:
-                        continue
-                    namespace = self._extract_namespace_from_cache_key(key)
-                    if not namespace:
-                        continue
-                    if namespace_hint and namespace != namespace_hint:
-                        continue
-                    existing = merged_namespaced.get(key)
-                    if existing is None or timestamp > existing[1]:
-                        merged_namespaced[key] = (sig, timestamp)
-                    continue
-
-                tc_id = key.rsplit(":", 1)[1] if ":" in key else key
-                existing = merged_anon.get(tc_id)
-                if existing is None or timestamp > existing[1]:
-                    merged_anon[tc_id] = (sig, timestamp)
+                self._merge_persisted_entry(
+                    key,
+                    sig,
+                    timestamp,
+                    current_time,
+                    merged_anon,
+                    merged_namespaced,
+                    namespace_hint=namespace_hint,
+                )
 
         if not merged_anon and not merged_namespaced:
             return
@@ -327,156 +340,103 @@ class ThoughtSignatureManager:
                 len(namespaces),
             )
 
-    def _namespace_cache_filename(self, namespace: str) -> str:
-        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
-        return f"{self._PERSIST_NAMESPACE_PREFIX}{digest}.json"
-
-    def _get_namespaced_persist_path(self, namespace: str) -> pathlib.Path | None:
-        persist_dir = self._persist_dir
-        if persist_dir is None:
-            return None
-        return persist_dir / self._namespace_cache_filename(namespace)
+    def _merge_persisted_entry(
+        self,
+        key: str,
+        sig: str | None,
+        timestamp: float,
+        current_time: float,
+        merged_anon: dict[str, tuple[str, float]],
+        merged_namespaced: dict[str, tuple[str, float]],
+        *,
+        namespace_hint: str | None = None,
+    ) -> None:
+        """Fold one persisted entry into the load buffers (``sig=None`` removes)."""
+        if key.startswith("anon:") or not self._is_namespaced_cache_key(key):
+            tc_id = key.rsplit(":", 1)[1] if ":" in key else key
+            target = merged_anon
+            merged_key = tc_id
+        else:
+            if not self._persist_namespaced:
+                return
+            namespace = self._extract_namespace_from_cache_key(key)
+            if not namespace:
+                return
+            if namespace_hint and namespace != namespace_hint:
+                return
+            target = merged_namespaced
+            merged_key = key
 
-    def _mark_namespace_dirty(self, session_id: str) -> None:
-        if not self._persist_namespaced:
+        if sig is None:
+            target.pop(merged_key, None)
             return
-        namespace = self._extract_namespace_from_session_id(session_id)
-        if not namespace:
+        if current_time - timestamp > self._ttl_seconds:
             return
-        self._persist_namespaced_dirty.add(namespace)
+        existing = target.get(merged_key)
+        if existing is None or timestamp > existing[1]:
+            target[merged_key] = (sig, timestamp)
 
-    def _maybe_persist_locked(self, current_time: float | None = None) -> None:
-        """Persist anonymous thought signatures to disk (must hold lock)."""
-        if current_time is None:
-            current_time = time.time()
+    def _replay_journal(
+        self,
+        path: pathlib.Path,
+        current_time: float,
+        merged_anon: dict[str, tuple[str, float]],
+        merged_namespaced: dict[str, tuple[str, float]],
+    ) -> bool:
+        """Replay one journal into the load buffers; return True if it had records."""
+        journal = self._journal
+        own = journal is not None and path == journal.path
+        if not own:
+            # Every record in a journal untouched for a full TTL has expired.
+            with contextlib.suppress(OSError):
+                if current_time - path.stat().st_mtime > self._ttl_seconds:
+                    path.unlink()
+                    return False
+
+        own_live: dict[str, tuple[str, float]] = {}
+        own_removed: dict[str, float] = {}
+        record_count = 0
+        for key, sig, timestamp in iter_journal_records(path):
+            record_count += 1
+            self._merge_persisted_entry(
+                key, sig, timestamp, current_time, merged_anon, merged_namespaced
+            )
+            if own:
+                if sig is None:
+                    own_live.pop(key, None)
+                    # Removals replayed without a timestamp restart their TTL.
+                    own_removed[key] = timestamp or current_time
+                else:
+                    own_removed.pop(key, None)
+                    own_live[key] = (sig, timestamp)
 
-        path = self._persist_path
-        if path is None:
-            self._maybe_persist_namespaced_locked(current_time)
-            return
+        if own and journal is not None:
+            journal.seed(own_live, record_count, own_removed)
+        return record_count > 0
 
-        if not self._persist_dirty:
-            self._maybe_persist_namespaced_locked(current_time)
+    def _journal_record_locked(self, cache_key: str, sig: str, ts: float) -> None:
+        """Journal an insert/touch of a persisted key (must hold lock)."""
+        journal = self._journal
+        if journal is None:
             return
-
-        if (
-            current_time - self._persist_last_write
-        ) < self._persist_min_interval_seconds:
-            self._maybe_persist_namespaced_locked(current_time)
+        if self._is_namespaced_cache_key(cache_key) and not self._persist_namespaced:
             return
+        journal.record(cache_key, sig, ts)
 
-        # Serialize only anonymous entries, which are session-id independent.
-        entries_out: dict[str, dict[str, Any]] = {}
-        for key, entry in self._cache.items():
-            if not key.startswith("anon:"):
-                continue
-            tc_id = key.rsplit(":", 1)[1]
-            if isinstance(entry, tuple) and len(entry) == 2:
-                sig, ts = entry
-            else:
-                sig, ts = str(entry), current_time
-            if not sig:
-                continue
-            if current_time - float(ts) > self._ttl_seconds:
-                continue
-            entries_out[tc_id] = {"sig": sig, "ts": float(ts)}
-
-        payload = {
-            "version": 1,
-            "generated_at": float(current_time),
-            "ttl_seconds": int(self._ttl_seconds),
-            "entries": entries_out,
-        }
-
-        # Offload write to background thread to avoid blocking event loop
-        def _write_task(
-            p: pathlib.Path, data: dict[str, Any], timestamp: float
-        ) -> None:
-            try:
-                p.parent.mkdir(parents=True, exist_ok=True)
-                tmp_path = p.with_suffix(p.suffix + ".tmp")
-                tmp_path.write_text(
-                    json.dumps(data, separators=(",", ":")), encoding="utf-8"
-                )
-                os.replace(str(tmp_path), str(p))
-            except Exception:
-                logger.debug("Failed to persist thought signatures")
-
-        threading.Thread(
-            target=_write_task, args=(path, payload, current_time), daemon=True
-        ).start()
-
-        self._persist_last_write = float(current_time)
-        self._persist_dirty = False
-
-        self._maybe_persist_namespaced_locked(current_time)
-
-    def _maybe_persist_namespaced_locked(self, current_time: float) -> None:
-        if not self._persist_namespaced or not self._persist_namespaced_dirty:
+    def _journal_remove_locked(self, cache_key: str) -> None:
+        """Journal removal of a persisted key (must hold lock)."""
+        journal = self._journal
+        if journal is None:
             return
+        if self._is_namespaced_cache_key(cache_key) and not self._persist_namespaced:
+            return
+        journal.remove(cache_key)
 
-        for namespace in list(self._persist_namespaced_dirty):
-            last_write = self._persist_namespaced_last_write.get(namespace, 0.0)
-            if (current_time - last_write) < self._persist_min_interval_seconds:
-                continue
-
-            path = self._get_namespaced_persist_path(namespace)
-            if path is None:
-                continue
-
-            entries_out: dict[str, dict[str, Any]] = {}
-            for key, entry in self._cache.items():
-                if not self._is_namespaced_cache_key(key):
-                    continue
-                if self._extract_namespace_from_cache_key(key) != namespace:
-                    continue
-
-                if isinstance(entry, tuple) and len(entry) == 2:
-                    sig, ts = entry
-                else:
-                    sig, ts = str(entry), current_time
-                if not sig:
-                    continue
-                if current_time - float(ts) > self._ttl_seconds:
-                    continue
-                entries_out[key] = {"sig": sig, "ts": float(ts)}
-
-            payload = {
-                "version": 2,
-                "generated_at": float(current_time),
-                "ttl_seconds": int(self._ttl_seconds),
-                "namespace": namespace,
-                "entries": entries_out,
-            }
-
-            # Offload write to background thread
-            def _write_ns_task(p: pathlib.Path, data: dict[str, Any], ns: str) -> None:
-                try:
-                    p.parent.mkdir(parents=True, exist_ok=True)
-                    tmp_path = p.with_suffix(p.suffix + ".tmp")
-                    tmp_path.write_text(
-                        json.dumps(data, separators=(",", ":")), encoding="utf-8"
-                    )
-                    os.replace(str(tmp_path), str(p))
-                except Exception:
-                    logger.debug(
-                        "Failed to persist thought signatures for namespace %s",
-                        ns,
-                        exc_info=True,
-                    )
-
-            threading.Thread(
-                target=_write_ns_task, args=(path, payload, namespace), daemon=True
-            ).start()
-
-            self._persist_namespaced_last_write[namespace] = float(current_time)
-            self._persist_namespaced_dirty.discard(namespace)
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(
-                    "Scheduled persistence of %d namespaced thought_signature(s) for namespace %s",
-                    len(entries_out),
-                    namespace,
-                )
+    def flush_persistence(self, timeout: float | None = None) -> bool:
+        """Wait until journaled changes are on disk (no-op without persistence)."""
+        if self._journal is None:
+            return True
+        return self._journal.flush(timeout)
 
     @property
     def cache(self) -> dict[str, str]:
@@ -608,7 +568,7 @@ class ThoughtSignatureManager:
                 self._cache[cache_key] = (sig, current_time)
                 self._cache.move_to_end(cache_key)
                 if self._is_namespaced_session_id(session_id):
-                    self._mark_namespace_dirty(session_id)
+                    self._journal_record_locked(cache_key, sig, current_time)
 
             if use_anonymous_cache:
                 # Always keep an anonymous copy so signatures survive session-id changes
@@ -617,13 +577,9 @@ class ThoughtSignatureManager:
                 self._cache[anon_key] = (sig, current_time)
                 self._cache.move_to_end(anon_key)
                 self._by_tool_call[tc_id] = sig
-                self._persist_dirty = True
+                self._journal_record_locked(anon_key, sig, current_time)
 
             self._enforce_size_limit_locked()
-            if use_anonymous_cache:
-                self._maybe_persist_locked(current_time)
-            elif session_id and self._is_namespaced_session_id(session_id):
-                self._maybe_persist_namespaced_locked(current_time)
 
     def _lookup_signature(self, tc_id: str, session_id: str) -> str | None:
         """Look up a signature by tool_call_id and session_id.
@@ -650,6 +606,7 @@ class ThoughtSignatureManager:
                     if sig:
                         self._cache[cache_key] = (sig, current_time)
                         self._cache.move_to_end(cache_key)
+                        self._journal_record_locked(cache_key, sig, current_time)
                         self._enforce_size_limit_locked()
 
             if not sig:
@@ -657,8 +614,7 @@ class ThoughtSignatureManager:
                 anon_key = f"anon:{tc_id}"
                 sig = self._get_cache_entry_locked(anon_key, current_time)
                 if sig:
-                    self._persist_dirty = True
-                    self._maybe_persist_locked(current_time)
+                    self._journal_record_locked(anon_key, sig, current_time)
 
             if not sig:
                 # Fallback to global index by tool_call_id (handles session re-keying)
@@ -675,8 +631,7 @@ class ThoughtSignatureManager:
                     anon_key = f"anon:{tc_id}"
                     self._cache[anon_key] = (sig, current_time)
                     self._cache.move_to_end(anon_key)
-                    self._persist_dirty = True
-                    self._maybe_persist_locked(current_time)
+                    self._journal_record_locked(anon_key, sig, current_time)
 
             return sig
 
@@ -757,7 +712,6 @@ class ThoughtSignatureManager:
             )
             store_anonymous = True
             current_time = time.time()
-            namespaced_dirty = False
 
             # Clean expired entries first
             self._clean_expired_entries_locked(current_time)
@@ -784,7 +738,7 @@ class ThoughtSignatureManager:
                     if use_anonymous_cache:
                         self._by_tool_call[tc_id] = sig
                     elif session_id and self._is_namespaced_session_id(session_id):
-                        namespaced_dirty = True
+                        self._journal_record_locked(cache_key, sig, current_time)
 
                     # Always store an anonymous copy for restart/session-id safety.
                     if store_anonymous:
@@ -792,7 +746,7 @@ class ThoughtSignatureManager:
                         self._cache[anon_key] = (sig, current_time)
                         self._cache.move_to_end(anon_key)
                         self._by_tool_call[tc_id] = sig
-                        self._persist_dirty = True
+                        self._journal_record_locked(anon_key, sig, current_time)
 
                     # Move to end for LRU
                     self._cache.move_to_end(cache_key)
@@ -807,12 +761,6 @@ class ThoughtSignatureManager:
                             len(self._cache),
                         )
 
-            if store_anonymous:
-                self._maybe_persist_locked(current_time)
-            if namespaced_dirty and session_id:
-                self._mark_namespace_dirty(session_id)
-                self._maybe_persist_namespaced_locked(current_time)
-
     def log_signature_state(
         self,
         canonical_request: Any,
@@ -933,6 +881,7 @@ class ThoughtSignatureManager:
             # Remove all keys first
             for key in keys_to_remove:
                 self._cache.pop(key, None)
+                self._journal_remove_locked(key)
 
             self._rebuild_by_tool_call_locked()
 
@@ -967,7 +916,6 @@ class ThoughtSignatureManager:
                 for key in self._cache
                 if key.startswith((prefix, namespaced_prefix))
             ]
-            namespaces_to_dirty: set[str] = set()
 
             # Also collect tool_call_ids to remove from secondary index
             tool_call_ids_to_remove: list[str] = []
@@ -976,22 +924,19 @@ class ThoughtSignatureManager:
                 parts = key.rsplit(":", 1)
                 if len(parts) == 2:
                     tool_call_ids_to_remove.append(parts[1])
-                namespace = self._extract_namespace_from_cache_key(key)
-                if namespace:
-                    namespaces_to_dirty.add(namespace)
 
             # Remove from primary cache and anonymous cache
             for key in keys_to_remove:
                 del self._cache[key]
+                if self._is_namespaced_cache_key(key):
+                    self._journal_remove_locked(key)
 
             for tc_id in tool_call_ids_to_remove:
-                self._cache.pop(f"anon:{tc_id}", None)
+                anon_key = f"anon:{tc_id}"
+                if self._cache.pop(anon_key, None) is not None:
+                    self._journal_remove_locked(anon_key)
                 self._by_tool_call.pop(tc_id, None)
 
-            if self._persist_namespaced and namespaces_to_dirty:
-                self._persist_namespaced_dirty.update(namespaces_to_dirty)
-                self._maybe_persist_namespaced_locked(time.time())
-
             if keys_to_remove and logger.isEnabledFor(logging.INFO):
                 logger.info(
                     "Cleared %d thought_signature(s) for session %s",
@@ -3,6 +3,8 @@ Token estimation service for Gemini OAuth connectors.
 
 This module provides async-safe token estimation using tiktoken,
 wrapped in an injectable service to avoid global state and enable testing.
+Unless an encoding is injected, counts go through the shared
+TokenCountingService so unchanged prompt parts are not re-encoded.
 """
 
 import logging
@@ -10,9 +12,13 @@ import threading
 from functools import lru_cache
 from typing import Any, Protocol, runtime_checkable
 
+from src.connectors.gemini_base.prompt_limiter import (
+    collect_prompt_text_parts,
+)
 from src.connectors.gemini_base.prompt_limiter import (
     estimate_prompt_tokens as estimate_prompt_tokens_for_request,
 )
+from src.core.common.token_counting import get_token_counting_service
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +75,8 @@ class TiktokenEstimator:
 
         Args:
             encoding: Optional tiktoken encoding to use. If not provided,
-                     uses the cached cl100k_base encoding.
+                     counts use the shared token counting service
+                     (cl100k_base, cached per prompt part).
         """
         self._encoding = encoding
 
@@ -90,6 +97,8 @@ class TiktokenEstimator:
             Estimated number of tokens.
         """
         try:
+            if self._encoding is None:
+                return get_token_counting_service().count(text)
             return len(self.encoding.encode(text))
         except Exception as e:
             logger.warning("Failed to estimate tokens: %s", e, exc_info=True)
@@ -108,6 +117,10 @@ class TiktokenEstimator:
             Estimated prompt token count, or None if estimation fails.
         """
         try:
+            if self._encoding is None:
+                return get_token_counting_service().count_joined(
+                    collect_prompt_text_parts(code_assist_request)
+                )
             return estimate_prompt_tokens_for_request(
                 code_assist_request, self.encoding
             )
@@ -81,6 +81,7 @@ class GeminiCliAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
 
             if not await self._check_gemini_cli_available():
                 raise ConfigurationError(
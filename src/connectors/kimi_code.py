@@ -19,7 +19,8 @@ from src.core.interfaces.configuration_interface import IAppIdentityConfig
 from src.core.security.loop_prevention import LOOP_GUARD_HEADER
 from src.core.services.backend_registry import backend_registry
 
-from .openai import MAX_SSE_BUFFER_SIZE, OpenAIConnector
+from .openai import OpenAIConnector
+from .utils.sse_framing import MAX_SSE_BUFFER_SIZE, aiter_sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -228,10 +229,6 @@ class KimiCodeConnector(OpenAIConnector):
             )
 
         try:
-            buffer = ""
-            separator = "\n\n"
-            alt_separator = "\r\n\r\n"
-
             # Moonshot/Kimi may stream as proper deltas OR as accumulated text.
             # In some cases (seen in live capture) it mixes both styles within one response.
             # Track the total accumulated values so we can convert accumulated chunks
@@ -243,124 +240,107 @@ class KimiCodeConnector(OpenAIConnector):
             # Common reasoning fields used by Kimi and other OpenAI-compatible backends
             reasoning_keys = ["reasoning_content", "reasoning", "thinking", "thought"]
 
-            async for chunk_bytes in response.aiter_bytes():
-                chunk_text = chunk_bytes.decode("utf-8", errors="replace")
-                # DoS protection: cap buffer growth.
-                if len(buffer) + len(chunk_text) > MAX_SSE_BUFFER_SIZE:
-                    buffer = buffer[-MAX_SSE_BUFFER_SIZE:] if buffer else ""
-                buffer += chunk_text
-
-                while True:
-                    if alt_separator in buffer:
-                        event, buffer = buffer.split(alt_separator, 1)
-                        separator_used = alt_separator
-                    elif separator in buffer:
-                        event, buffer = buffer.split(separator, 1)
-                        separator_used = separator
+            async for sse_event in aiter_sse_events(
+                response.aiter_bytes(), max_buffer_bytes=MAX_SSE_BUFFER_SIZE
+            ):
+                event = sse_event.raw
+                if event.endswith("\r\n\r\n"):
+                    separator_used = "\r\n\r\n"
+                elif event.endswith("\n\n"):
+                    separator_used = "\n\n"
+                else:
+                    # Unterminated trailing data at end of stream: forward as-is
+                    yield event.encode("utf-8")
+                    continue
+
+                if not event.startswith("data:"):
+                    yield event.encode("utf-8")
+                    continue
+
+                # OpenAI/Kimi SSE events are typically "data: {json}\n\n"
+                # Some backends might send multiple data lines per event (standard SSE)
+                # which the parser joins per the SSE spec.
+                data_str = (sse_event.data or "").strip()
+                if data_str == "[DONE]":
+                    yield event.encode("utf-8")
+                    continue
+
+                try:
+                    data = json.loads(data_str)
+                except json.JSONDecodeError:
+                    yield event.encode("utf-8")
+                    continue
+
+                # Extract the delta container
+                choices = data.get("choices")
+                if not choices or not isinstance(choices, list):
+                    yield event.encode("utf-8")
+                    continue
+
+                delta = choices[0].get("delta")
+                if not delta or not isinstance(delta, dict):
+                    yield event.encode("utf-8")
+                    continue
+
+                # 1. Handle content delta/accumulator
+                raw_content = delta.get("content")
+                if isinstance(raw_content, str):
+                    if last_content and raw_content.startswith(last_content):
+                        # Accumulated chunk: forward only the new suffix.
+                        delta_text = raw_content[len(last_content) :]
+                        last_content = raw_content
+                        if delta_text:
+                            delta["content"] = delta_text
+                        else:
+                            delta.pop("content", None)
                     else:
+                        # Delta chunk: forward as-is and update accumulator.
+                        last_content += raw_content
+                        delta["content"] = raw_content
+                elif raw_content is None:
+                    # Some clients/backends omit content key if empty; preserve semantics
+                    pass
+
+                # 2. Handle reasoning delta/accumulator (Kimi uses multiple aliases)
+                # We find the first available reasoning field to use as the master value.
+                raw_reasoning = None
+                for key in reasoning_keys:
+                    val = delta.get(key)
+                    if isinstance(val, str):
+                        raw_reasoning = val
                         break
 
-                    if not event:
-                        continue
-
-                    if not event.startswith("data:"):
-                        yield (event + separator_used).encode("utf-8")
-                        continue
-
-                    # OpenAI/Kimi SSE events are typically "data: {json}\n\n"
-                    # Some backends might send multiple data lines per event (standard SSE)
-                    # We normalize this by taking all data lines.
-                    event_lines = event.split("\n")
-                    data_parts = []
-                    for line in event_lines:
-                        line = line.strip()
-                        if line.startswith("data:"):
-                            data_parts.append(line[5:].strip())
-
-                    data_str = " ".join(data_parts)
-                    if data_str == "[DONE]":
-                        yield (event + separator_used).encode("utf-8")
-                        continue
-
-                    try:
-                        data = json.loads(data_str)
-                    except json.JSONDecodeError:
-                        yield (event + separator_used).encode("utf-8")
-                        continue
-
-                    # Extract the delta container
-                    choices = data.get("choices")
-                    if not choices or not isinstance(choices, list):
-                        yield (event + separator_used).encode("utf-8")
-                        continue
-
-                    delta = choices[0].get("delta")
-                    if not delta or not isinstance(delta, dict):
-                        yield (event + separator_used).encode("utf-8")
-                        continue
-
-                    # 1. Handle content delta/accumulator
-                    raw_content = delta.get("content")
-                    if isinstance(raw_content, str):
-                        if last_content and raw_content.startswith(last_content):
-                            # Accumulated chunk: forward only the new suffix.
-                            delta_text = raw_content[len(last_content) :]
-                            last_content = raw_content
-                            if delta_text:
-                                delta["content"] = delta_text
-                            else:
-                                delta.pop("content", None)
-                        else:
-                            # Delta chunk: forward as-is and update accumulator.
-                            last_content += raw_content
-                            delta["content"] = raw_content
-                    elif raw_content is None:
-                        # Some clients/backends omit content key if empty; preserve semantics
-                        pass
-
-                    # 2. Handle reasoning delta/accumulator (Kimi uses multiple aliases)
-                    # We find the first available reasoning field to use as the master value.
-                    raw_reasoning = None
-                    for key in reasoning_keys:
-                        val = delta.get(key)
-                        if isinstance(val, str):
-                            raw_reasoning = val
-                            break
-
-                    if raw_reasoning is not None:
-                        if last_reasoning and raw_reasoning.startswith(last_reasoning):
-                            # Accumulated chunk: forward only the new suffix.
-                            delta_reasoning = raw_reasoning[len(last_reasoning) :]
-                            last_reasoning = raw_reasoning
-                        else:
-                            # Delta chunk: forward as-is and update accumulator.
-                            last_reasoning += raw_reasoning
-                            delta_reasoning = raw_reasoning
-
-                        if delta_reasoning:
-                            delta_is_whitespace = delta_reasoning.strip() == ""
-                            if delta_is_whitespace and not reasoning_started:
-                                # Drop leading whitespace-only reasoning to avoid empty thinking sections.
-                                for key in reasoning_keys:
-                                    delta.pop(key, None)
-                            else:
-                                if not delta_is_whitespace:
-                                    reasoning_started = True
-                                # Update ALL reasoning fields present in the delta with the new delta text.
-                                # This prevents the client from receiving accumulated fields that would cause duplication.
-                                for key in reasoning_keys:
-                                    if key in delta:
-                                        delta[key] = delta_reasoning
-                        else:
-                            # If no new reasoning content, remove all reasoning fields
+                if raw_reasoning is not None:
+                    if last_reasoning and raw_reasoning.startswith(last_reasoning):
+                        # Accumulated chunk: forward only the new suffix.
+                        delta_reasoning = raw_reasoning[len(last_reasoning) :]
+                        last_reasoning = raw_reasoning
+                    else:
+                        # Delta chunk: forward as-is and update accumulator.
+                        last_reasoning += raw_reasoning
+                        delta_reasoning = raw_reasoning
+
+                    if delta_reasoning:
+                        delta_is_whitespace = delta_reasoning.strip() == ""
+                        if delta_is_whitespace and not reasoning_started:
+                            # Drop leading whitespace-only reasoning to avoid empty thinking sections.
                             for key in reasoning_keys:
                                 delta.pop(key, None)
+                        else:
+                            if not delta_is_whitespace:
+                                reasoning_started = True
+                            # Update ALL reasoning fields present in the delta with the new delta text.
+                            # This prevents the client from receiving accumulated fields that would cause duplication.
+                            for key in reasoning_keys:
+                                if key in delta:
+                                    delta[key] = delta_reasoning
+                    else:
+                        # If no new reasoning content, remove all reasoning fields
+                        for key in reasoning_keys:
+                            delta.pop(key, None)
 
-                    rewritten_event = f"data: {json.dumps(data)}"
-                    yield (rewritten_event + separator_used).encode("utf-8")
-
-            if buffer:
-                yield buffer.encode("utf-8")
+                rewritten_event = f"data: {json.dumps(data)}"
+                yield (rewritten_event + separator_used).encode("utf-8")
         finally:
             with contextlib.suppress(BaseException):
                 await response.aclose()
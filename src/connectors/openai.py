@@ -25,6 +25,10 @@ from src.connectors.contracts.wire_capture_context import (
     WIRE_CAPTURE_IS_RETRY_KEY,
     WIRE_CAPTURE_RETRY_ATTEMPT_KEY,
 )
+from src.connectors.utils.sse_framing import (
+    MAX_SSE_BUFFER_SIZE,
+    IncrementalSSEParser,
+)
 from src.core.app.constants.logging_constants import TRACE_LEVEL
 from src.core.common.capture_aware_httpx import (
     CaptureAwareAsyncClient,
@@ -64,11 +68,6 @@ from src.core.services.translation_service import TranslationService
 
 from .base import LLMBackend, add_vendor_prefix
 
-# Maximum SSE buffer size to prevent DoS attacks. Reasoning-heavy models can emit
-# large single ``data:`` JSON lines; a tiny cap truncates incomplete frames and
-# stalls or truncates streams (see NVIDIA / NIM long-reasoning traffic).
-MAX_SSE_BUFFER_SIZE = 262_144
-
 # Internal-only keys passed via CanonicalChatRequest.extra_body so streaming uses the
 # same resolved URL and headers as the canonical chat_completions path. Stripped from
 # outbound JSON in _clean_openai_payload.
@@ -1028,10 +1027,13 @@ class OpenAIConnector(LLMBackend):
             # Calculate prompt tokens for usage tracking
             prompt_tokens = 0
             try:
-                from src.core.utils.token_count import count_tokens, extract_prompt_text
+                from src.core.common.token_counting import (
+                    get_token_counting_service,
+                )
 
-                prompt_text = extract_prompt_text(processed_messages)
-                prompt_tokens = count_tokens(prompt_text, model=effective_model)
+                prompt_tokens = await get_token_counting_service().count_messages_async(
+                    processed_messages, model=effective_model
+                )
             except (ImportError, AttributeError, TypeError, KeyError, ValueError):
                 logger.warning(
                     "Failed to calculate prompt tokens",
@@ -1893,9 +1895,7 @@ class OpenAIConnector(LLMBackend):
 
             async def text_generator() -> AsyncGenerator[dict[Any, Any] | Any, None]:
                 async def iter_sse_messages() -> AsyncGenerator[str, None]:
-                    buffer = ""
-                    separator = "\n\n"
-                    alt_separator = "\r\n\r\n"
+                    parser = IncrementalSSEParser(max_buffer_bytes=MAX_SSE_BUFFER_SIZE)
                     _first_byte_logged = False
                     try:
                         async for chunk_bytes in response.aiter_bytes():
@@ -1912,33 +1912,13 @@ class OpenAIConnector(LLMBackend):
                                     preview,
                                     extra=log_extra if log_extra else None,
                                 )
-                            chunk_text = chunk_bytes.decode("utf-8", errors="replace")
-                            # DoS protection: Limit buffer size to prevent memory exhaustion
-                            if len(buffer) + len(chunk_text) > MAX_SSE_BUFFER_SIZE:
-                                logger.warning(
-                                    "SSE buffer overflow: truncating to prevent DoS",
-                                    extra=log_extra if log_extra else None,
-                                )
-                                buffer = buffer[-MAX_SSE_BUFFER_SIZE:] if buffer else ""
-                            buffer += chunk_text
-                            while True:
-                                if alt_separator in buffer:
-                                    event, buffer = buffer.split(alt_separator, 1)
-                                    separator_used = alt_separator
-                                elif separator in buffer:
-                                    event, buffer = buffer.split(separator, 1)
-                                    separator_used = separator
-                                else:
-                                    break
-                                if event:
-                                    yield event + separator_used
-                        if buffer:
-                            yield buffer
-                            buffer = ""
+                            for event in parser.feed(chunk_bytes):
+                                yield event.raw
+                        for event in parser.flush():
+                            yield event.raw
                     except httpx.ReadTimeout as exc:
-                        if buffer:
-                            yield buffer
-                            buffer = ""
+                        for event in parser.flush():
+                            yield event.raw
                         if logger.isEnabledFor(logging.WARNING):
                             logger.warning(
                                 "Streaming read timeout during SSE for %s",
@@ -1954,9 +1934,8 @@ class OpenAIConnector(LLMBackend):
                             status_code=504,
                         ) from exc
                     except httpx.ReadError as exc:
-                        if buffer:
-                            yield buffer
-                            buffer = ""
+                        for event in parser.flush():
+                            yield event.raw
                         if logger.isEnabledFor(logging.WARNING):
                             logger.warning(
                                 "Streaming read error during SSE for %s",
@@ -1971,9 +1950,8 @@ class OpenAIConnector(LLMBackend):
                             status_code=502,
                         ) from exc
                     except httpx.RequestError as exc:
-                        if buffer:
-                            yield buffer
-                            buffer = ""
+                        for event in parser.flush():
+                            yield event.raw
                         raise ServiceUnavailableError(
                             message=f"Streaming connection interrupted ({exc!s})"
                         ) from exc
@@ -2830,9 +2808,7 @@ class OpenAIConnector(LLMBackend):
 
         # Stream SSE messages
         try:
-            buffer = ""
-            separator = "\n\n"
-            alt_separator = "\r\n\r\n"
+            parser = IncrementalSSEParser(max_buffer_bytes=MAX_SSE_BUFFER_SIZE)
             _sc_first_byte_logged = False
 
             async for chunk_bytes in response.aiter_bytes():
@@ -2845,30 +2821,13 @@ class OpenAIConnector(LLMBackend):
                         len(chunk_bytes),
                         preview,
                     )
-                chunk_text = chunk_bytes.decode("utf-8", errors="replace")
-                # DoS protection: Limit buffer size to prevent memory exhaustion
-                if len(buffer) + len(chunk_text) > MAX_SSE_BUFFER_SIZE:
-                    logger.warning("SSE buffer overflow: truncating to prevent DoS")
-                    buffer = buffer[-MAX_SSE_BUFFER_SIZE:] if buffer else ""
-                buffer += chunk_text
-
-                while True:
-                    if alt_separator in buffer:
-                        event, buffer = buffer.split(alt_separator, 1)
-                        separator_used = alt_separator
-                    elif separator in buffer:
-                        event, buffer = buffer.split(separator, 1)
-                        separator_used = separator
-                    else:
-                        break
-
-                    if event:
-                        # Yield the raw SSE message (including separator)
-                        yield event + separator_used
+                # Yield the raw SSE message (including separator)
+                for event in parser.feed(chunk_bytes):
+                    yield event.raw
 
             # Yield any remaining buffer
-            if buffer:
-                yield buffer
+            for event in parser.flush():
+                yield event.raw
 
         except httpx.ReadTimeout as exc:
             if logger.isEnabledFor(logging.WARNING):
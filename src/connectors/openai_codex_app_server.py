@@ -176,6 +176,7 @@ class OpenAICodexAppServerConnector(BaseAcpConnector[CodexAppServerRuntime]):
                 kwargs.get("process_timeout", self._process_timeout)
             )
             self._idle_timeout = float(kwargs.get("idle_timeout", self._idle_timeout))
+            self._configure_warm_pool(kwargs)
             self._progress_mode = str(kwargs.get("progress_mode", self._progress_mode))
 
             overrides = kwargs.get("codex_config_overrides") or []
@@ -961,9 +962,8 @@ class OpenAICodexAppServerConnector(BaseAcpConnector[CodexAppServerRuntime]):
                 break
         if process.poll() is not None:
             return True
-        if process.stdin is not None:
-            with contextlib.suppress(OSError, ValueError):
-                process.stdin.close()
+        if process.stdin is not None or runtime.stdio_transport is not None:
+            self._close_process_stdin(runtime, process)
             await self._wait_for_process_exit(process, timeout_s=5.0)
         return process.poll() is not None
 
@@ -20,6 +20,7 @@ from src.connectors.utils.reasoning_models import (
     ReasoningDetectionMetadata,
 )
 from src.core.app.constants.logging_constants import TRACE_LEVEL
+from src.core.common.token_counting import heuristic_token_count
 from src.core.interfaces.response_processor_interface import ProcessedResponse
 from src.core.ports.streaming_contracts import StreamingContent
 
@@ -708,8 +709,7 @@ class ReasoningStreamProcessor:
         Returns:
             Estimated token count
         """
-        # Simple heuristic: ~4 chars per token
-        return len(text) // 4
+        return heuristic_token_count(text)
 
     async def _normalize_via_provider(
         self, raw_content: Any, provider: str
@@ -0,0 +1,215 @@
+"""
+Incremental Server-Sent Events framing for backend HTTP streams.
+
+Upstream bytes are appended to one ``bytearray`` and scanned for event
+boundaries (``\\n\\n`` or ``\\r\\n\\r\\n``) starting where the previous
+chunk's scan stopped, so every byte is examined once per boundary kind
+however the stream is chunked, and chunks without a newline are not scanned
+at all. Large events are decoded straight from a ``memoryview`` of the
+buffer, and consumed bytes are dropped in one step per chunk.
+
+Framing happens before decoding: boundaries are ASCII newlines, which never
+occur inside a multi-byte UTF-8 sequence, so each event decodes on its own
+and characters split across network chunks are reassembled instead of being
+replaced with U+FFFD. ``event``/``data``/``id`` fields are parsed lazily, on
+first access, because most callers forward the raw event text.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Maximum bytes buffered for one incomplete event before the oldest bytes are
+# dropped. Reasoning-heavy models can emit large single ``data:`` JSON lines;
+# a tiny cap truncates incomplete frames and stalls or truncates streams (see
+# NVIDIA / NIM long-reasoning traffic).
+MAX_SSE_BUFFER_SIZE = 262_144
+
+# Events at least this large are decoded through a memoryview instead of a
+# copied slice
+_ZERO_COPY_MIN_BYTES = 4096
+
+# Longest boundary minus one: a boundary split across chunks starts no earlier
+_BOUNDARY_OVERLAP = 3
+
+_LINE_BREAK_RE = re.compile(r"\r\n|\r|\n")
+
+
+class SSEEvent:
+    """One framed SSE event.
+
+    ``raw`` is the event text as received, including its terminating blank
+    line (absent only for a trailing event flushed at end of stream).
+    """
+
+    __slots__ = ("_fields", "raw")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self._fields: tuple[str | None, str | None, str | None] | None = None
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(raw={self.raw!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SSEEvent) and other.raw == self.raw
+
+    def __hash__(self) -> int:
+        return hash(self.raw)
+
+    @property
+    def event(self) -> str | None:
+        """Value of the last ``event:`` field, if any."""
+        return (self._fields or self._parse())[0]
+
+    @property
+    def data(self) -> str | None:
+        """``data:`` field values joined by newlines; ``None`` without any."""
+        return (self._fields or self._parse())[1]
+
+    @property
+    def id(self) -> str | None:
+        """Value of the last ``id:`` field, if any."""
+        return (self._fields or self._parse())[2]
+
+    def _parse(self) -> tuple[str | None, str | None, str | None]:
+        raw = self.raw
+        lines = _LINE_BREAK_RE.split(raw) if "\r" in raw else raw.split("\n")
+        event: str | None = None
+        event_id: str | None = None
+        data_lines: list[str] = []
+        for line in lines:
+            if not line or line[0] == ":":
+                continue
+            name, colon, value = line.partition(":")
+            if colon and value[:1] == " ":
+                value = value[1:]
+            if name == "data":
+                data_lines.append(value)
+            elif name == "event":
+                event = value
+            elif name == "id":
+                event_id = value
+        data = "\n".join(data_lines) if data_lines else None
+        self._fields = (event, data, event_id)
+        return self._fields
+
+
+class IncrementalSSEParser:
+    """Split a byte stream into :class:`SSEEvent` objects as chunks arrive.
+
+    Not thread-safe; use one parser per stream.
+    """
+
+    def __init__(self, *, max_buffer_bytes: int = MAX_SSE_BUFFER_SIZE) -> None:
+        self._max_buffer_bytes = max(1, max_buffer_bytes)
+        self._buffer = bytearray()
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes held for the current incomplete event."""
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes | bytearray | memoryview) -> list[SSEEvent]:
+        """Append ``chunk`` and return the events it completed, in order."""
+        buffer = self._buffer
+        # Every boundary ends in a newline, so tiny token-sized chunks without
+        # one never trigger a scan (``10 in chunk`` is far cheaper than a
+        # bytes substring test).
+        if 10 not in chunk:
+            buffer += chunk
+            if len(buffer) > self._max_buffer_bytes:
+                self._truncate()
+            return []
+        # Bytes before the chunk were scanned already; only a boundary that
+        # straddles the chunk start can begin earlier.
+        scan_from = len(buffer) - _BOUNDARY_OVERLAP
+        if scan_from < 0:
+            scan_from = 0
+        # A CRLF boundary completed by this chunk has its last CR in the chunk
+        # or at the very end of the buffered bytes.
+        may_crlf = 13 in chunk or buffer.endswith(b"\r")
+        buffer += chunk
+        find = buffer.find
+        lf = find(b"\n\n", scan_from)
+        crlf = find(b"\r\n\r\n", scan_from) if may_crlf else -1
+        events: list[SSEEvent] = []
+        consumed = 0
+        while lf >= 0 or crlf >= 0:
+            if crlf < 0 or 0 <= lf < crlf:
+                start, end = lf, lf + 2
+            else:
+                start, end = crlf, crlf + 4
+            # An empty block (stray blank lines) carries no event
+            if start > consumed:
+                if end - consumed < _ZERO_COPY_MIN_BYTES:
+                    # Copying a small slice is cheaper than exporting a view
+                    raw = buffer[consumed:end].decode("utf-8", "replace")
+                else:
+                    with memoryview(buffer) as view:
+                        raw = str(view[consumed:end], "utf-8", "replace")
+                events.append(SSEEvent(raw))
+            consumed = end
+            # Each pattern is searched forward from its last hit only, so the
+            # chunk is scanned once per boundary kind.
+            if 0 <= lf < end:
+                lf = find(b"\n\n", end)
+            if 0 <= crlf < end:
+                crlf = find(b"\r\n\r\n", end)
+        if consumed:
+            del buffer[:consumed]
+        if len(buffer) > self._max_buffer_bytes:
+            self._truncate()
+        return events
+
+    def _truncate(self) -> None:
+        # DoS protection: an event that never terminates must not grow the
+        # buffer without bound.
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("SSE buffer overflow: truncating to prevent DoS")
+        buffer = self._buffer
+        del buffer[: len(buffer) - self._max_buffer_bytes]
+
+    def flush(self) -> list[SSEEvent]:
+        """Return any unterminated trailing event and reset the parser."""
+        buffer = self._buffer
+        if not buffer:
+            return []
+        raw = buffer.decode("utf-8", "replace")
+        buffer.clear()
+        return [SSEEvent(raw)]
+
+
+async def aiter_sse_events(
+    chunks: AsyncIterable[bytes],
+    *,
+    max_buffer_bytes: int = MAX_SSE_BUFFER_SIZE,
+) -> AsyncIterator[SSEEvent]:
+    """Frame an async byte stream (e.g. ``response.aiter_bytes()``) into events.
+
+    If the byte stream raises, the buffered trailing event is yielded before
+    the exception propagates.
+    """
+    parser = IncrementalSSEParser(max_buffer_bytes=max_buffer_bytes)
+    try:
+        async for chunk in chunks:
+            for event in parser.feed(chunk):
+                yield event
+    except Exception:
+        for event in parser.flush():
+            yield event
+        raise
+    for event in parser.flush():
+        yield event
+
+
+__all__ = [
+    "MAX_SSE_BUFFER_SIZE",
+    "IncrementalSSEParser",
+    "SSEEvent",
+    "aiter_sse_events",
+]
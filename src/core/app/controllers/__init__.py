@@ -657,6 +657,7 @@ async def _get_memory_health_info(sp: IServiceProvider) -> MemoryHealthInfo:
     analysis_worker = sp.get_service(AnalysisWorker)
     if analysis_worker is not None:
         info.analysis_worker_running = analysis_worker.is_running
+        info.queue_depth = analysis_worker.get_queue_size()
 
     repo = sp.get_service(cast(type, IMemoryRepository))
     if repo is None:
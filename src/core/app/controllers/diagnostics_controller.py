@@ -6,6 +6,7 @@ import time
 from typing import Any, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from src.core.app.controllers.models_controller import get_backend_service
@@ -15,6 +16,7 @@ from src.core.interfaces.backend_lifecycle_manager_interface import (
 )
 from src.core.interfaces.backend_service import IBackendService
 from src.core.interfaces.resilience_interface import IResilienceCoordinator
+from src.core.services import metrics_service
 
 logger = logging.getLogger(__name__)
 
@@ -594,3 +596,20 @@ async def get_activity() -> GlobalActivityInfo:
             total_bytes_rx=0,
             total_bytes_tx=0,
         )
+
+
+@router.get(
+    "/v1/diagnostics/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(verify_local_access)],
+)
+async def get_metrics() -> PlainTextResponse:
+    """Export process metrics in the Prometheus text exposition format.
+
+    Counters are exported as ``*_total`` and timers (TTFT, backend stream
+    duration, tool-call processing, ...) as summaries with p50/p90/p99.
+    """
+    return PlainTextResponse(
+        metrics_service.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
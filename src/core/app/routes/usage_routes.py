@@ -325,12 +325,8 @@ async def get_recent_usage(
             model=model,
         )
 
-        # Get all matching records
-        all_records = usage_store.get_records(filters)
-
-        # Filter by session_id if provided
-        if session_id:
-            all_records = [r for r in all_records if r.session_id == session_id]
+        # Get all matching records, restricted to the session if provided
+        all_records = usage_store.get_records(filters, session_id=session_id or None)
 
         # Sort by timestamp descending (most recent first)
         all_records.sort(key=lambda r: r.timestamp, reverse=True)
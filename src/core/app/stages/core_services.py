@@ -190,7 +190,7 @@ class CoreServicesStage(InitializationStage):
         _ = _response_processor_factory_reference
 
         # Register session repository
-        self._register_session_repository(services)
+        self._register_session_repository(services, config)
 
         # Register session service
         self._register_session_service(services)
@@ -201,13 +201,52 @@ class CoreServicesStage(InitializationStage):
         if logger.isEnabledFor(logging.INFO):
             logger.info("Core services initialized successfully")
 
-    def _register_session_repository(self, services: ServiceCollection) -> None:
+    def _register_session_repository(
+        self, services: ServiceCollection, config: AppConfig
+    ) -> None:
         """Register session repository services."""
         from src.core.interfaces.repositories_interface import ISessionRepository
         from src.core.repositories.in_memory_session_repository import (
             InMemorySessionRepository,
         )
 
+        session_store_path = getattr(config.session, "session_store_path", None)
+        if session_store_path:
+            from src.core.repositories.session_repository import (
+                PersistentSessionRepository,
+            )
+
+            hot_cache_size = config.session.session_store_hot_cache_size
+
+            def persistent_repository_factory(
+                provider: IServiceProvider,
+            ) -> PersistentSessionRepository:
+                return PersistentSessionRepository(
+                    session_store_path, hot_cache_size=hot_cache_size
+                )
+
+            services.add_singleton(
+                PersistentSessionRepository,
+                implementation_factory=persistent_repository_factory,
+            )
+
+            def session_repository_factory(
+                provider: IServiceProvider,
+            ) -> ISessionRepository:
+                return provider.get_required_service(PersistentSessionRepository)
+
+            services.add_singleton(
+                cast(type, ISessionRepository),
+                implementation_factory=session_repository_factory,
+            )
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Registered persistent session repository (store: %s)",
+                    session_store_path,
+                )
+            return
+
         # Register concrete implementation
         services.add_singleton(InMemorySessionRepository)
 
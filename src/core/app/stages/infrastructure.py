@@ -65,7 +65,7 @@ class InfrastructureStage(InitializationStage):
             self._register_http_client(services)
 
             # Register rate limiter
-            self._register_rate_limiter(services)
+            self._register_rate_limiter(services, config)
 
             # Register loop detector
             self._register_loop_detector(services, config)
@@ -145,12 +145,17 @@ class InfrastructureStage(InitializationStage):
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Registered shared HTTP client")
 
-    def _register_rate_limiter(self, services: ServiceCollection) -> None:
+    def _register_rate_limiter(
+        self, services: ServiceCollection, config: AppConfig
+    ) -> None:
         """Register rate limiter service."""
-        from src.core.services.rate_limiter import RateLimiter
+        from src.core.services.rate_limiter import RateLimiter, create_rate_limiter
 
-        # Register as singleton (no dependencies)
-        services.add_singleton(RateLimiter)
+        # Register as singleton; the engine and limits come from config
+        services.add_singleton(
+            RateLimiter,
+            implementation_factory=lambda _provider: create_rate_limiter(config),
+        )
 
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Registered rate limiter service")
@@ -180,6 +185,7 @@ class InfrastructureStage(InitializationStage):
                     "content_loop_threshold": internal.content_loop_threshold,
                     "content_chunk_size": internal.content_chunk_size,
                     "max_history_length": internal.max_history_length,
+                    "engine": internal.short_detector_engine,
                 }
 
                 long_threshold = internal.long_pattern_threshold
@@ -145,6 +145,14 @@ class MemoryApplicator:
             with contextlib.suppress(ValueError):
                 memory_overrides["max_concurrent_analyses"] = int(max_concurrent)
 
+        if batch_size := os.environ.get("MEMORY_ANALYSIS_BATCH_SIZE"):
+            with contextlib.suppress(ValueError):
+                memory_overrides["analysis_batch_size"] = int(batch_size)
+
+        if batch_max_bytes := os.environ.get("MEMORY_ANALYSIS_BATCH_MAX_BYTES"):
+            with contextlib.suppress(ValueError):
+                memory_overrides["analysis_batch_max_bytes"] = int(batch_max_bytes)
+
         if context_template := os.environ.get("MEMORY_CONTEXT_TEMPLATE"):
             memory_overrides["context_template"] = context_template
 
@@ -0,0 +1,13 @@
+"""Connector-safe re-export of the shared token counting service."""
+
+from __future__ import annotations
+
+from src.core.services.token_counting_service import (
+    get_token_counting_service,
+    heuristic_token_count,
+)
+
+__all__ = [
+    "get_token_counting_service",
+    "heuristic_token_count",
+]
@@ -105,6 +105,7 @@ class AppConfig(AppConfigModel):
             "context_window_override",
             "default_rate_limit",
             "default_rate_window",
+            "rate_limiter_engine",
             "model_defaults",
             "failover_routes",
             "identity",
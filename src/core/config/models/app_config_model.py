@@ -94,6 +94,8 @@ class AppConfigModel(DomainModel, IConfig):
 
     default_rate_limit: int = 60
     default_rate_window: int = 60
+    #: Base rate limiter: "exact" (timestamp per request) or "sliding_window".
+    rate_limiter_engine: str = "exact"
 
     backends: BackendSettings = Field(default_factory=BackendSettings)
     model_defaults: dict[str, ModelDefaults] = Field(default_factory=dict)
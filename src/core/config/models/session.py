@@ -287,6 +287,11 @@ class SessionConfig(DomainModel):
     streaming_loop_detection_enabled: bool = False
     planning_phase: PlanningPhaseConfig = Field(default_factory=PlanningPhaseConfig)
     max_per_session_backends: int = 32
+    # Durable session store (SQLite/WAL). When unset, sessions are memory-only
+    # and are lost on restart. A directory path stores ``sessions.sqlite3``.
+    session_store_path: str | None = None
+    # Sessions kept resident in memory when the durable store is enabled.
+    session_store_hot_cache_size: int = 5000
     session_continuity: SessionContinuityConfig = Field(
         default_factory=SessionContinuityConfig
     )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import ConfigDict, Field, field_validator
 
 from src.core.interfaces.model_bases import DomainModel
@@ -42,6 +44,36 @@ class DatabaseConfig(DomainModel):
         description="Seconds to wait for a connection from pool",
     )
 
+    # SQLite file database settings (ignored for other backends and :memory:)
+    sqlite_pool_mode: Literal["null", "pooled"] = Field(
+        default="null",
+        description=(
+            "'null' opens a new connection for every session; 'pooled' keeps "
+            "one WAL-mode writer connection and a pool of reader connections"
+        ),
+    )
+    sqlite_reader_pool_size: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Reader connections kept open in pooled mode",
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=16 * 1024,
+        ge=0,
+        description="Page cache size per connection in pooled mode (KiB)",
+    )
+    sqlite_mmap_size_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Memory-mapped I/O size per connection in pooled mode",
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        ge=0,
+        description="Milliseconds to wait for a database lock in pooled mode",
+    )
+
     # SQLAlchemy settings
     echo: bool = Field(
         default=False,
@@ -79,6 +111,15 @@ class DatabaseConfig(DomainModel):
         """Check if using SQLite backend."""
         return self.url.startswith("sqlite")
 
+    @property
+    def is_sqlite_memory(self) -> bool:
+        """Check if using an in-memory SQLite database."""
+        return self.is_sqlite and (
+            self.url.endswith(":memory:")
+            or ":memory:?" in self.url
+            or "/:memory:" in self.url
+        )
+
     @property
     def is_async(self) -> bool:
         """Check if using async driver."""
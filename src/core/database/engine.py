@@ -7,21 +7,23 @@ import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import sqlalchemy.exc
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 from sqlmodel import SQLModel
 
 from src.core.database.config import DatabaseConfig
 
 if TYPE_CHECKING:
-    pass
+    from sqlalchemy.engine import Engine
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +66,52 @@ async def _await_shielded(awaitable: object) -> None:
         await awaitable  # type: ignore[misc]
 
 
+class _ReadOnlySession(Session):
+    """Session for read-only work that runs SELECTs on a reader engine.
+
+    ``session.get``, ``SELECT ... FOR UPDATE``, a flush or any statement other
+    than a SELECT moves the session to the writer for the rest of its life, so
+    it reads its own writes and lookups it may act on are not served from a
+    reader snapshot.
+    """
+
+    def __init__(self, *args: Any, reader_bind: Engine, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._reader_bind = reader_bind
+        self._writing = False
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        self._writing = True
+        return super().get(*args, **kwargs)
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kw: Any) -> Any:
+        if not self._writing:
+            if (
+                not self._flushing
+                and getattr(clause, "is_select", False)
+                and getattr(clause, "_for_update_arg", None) is None
+            ):
+                return self._reader_bind
+            self._writing = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def _sqlite_pragmas(config: DatabaseConfig, *, readonly: bool) -> list[str]:
+    """Build the pragmas applied to each pooled SQLite connection."""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        # NORMAL is durable across application crashes in WAL mode
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={config.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{config.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={config.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if readonly:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
 class DatabaseEngine:
     """Manages async database engine and session factory.
 
@@ -82,7 +130,9 @@ class DatabaseEngine:
         """
         self._config = config
         self._engine: AsyncEngine | None = None
+        self._reader_engine: AsyncEngine | None = None
         self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._read_session_factory: async_sessionmaker[AsyncSession] | None = None
         self._initialized = False
 
     @property
@@ -97,6 +147,15 @@ class DatabaseEngine:
             self._engine = self._create_engine()
         return self._engine
 
+    @property
+    def is_pooled_sqlite(self) -> bool:
+        """Check if sessions use the pooled SQLite writer/reader connections."""
+        return (
+            self._config.is_sqlite
+            and not self._config.is_sqlite_memory
+            and self._config.sqlite_pool_mode == "pooled"
+        )
+
     @property
     def session_factory(self) -> async_sessionmaker[AsyncSession]:
         """Get the session factory, creating it if necessary."""
@@ -110,12 +169,43 @@ class DatabaseEngine:
             )
         return self._session_factory
 
-    def _create_engine(self) -> AsyncEngine:
-        """Create the async engine with proper configuration."""
+    @property
+    def read_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        """Get the factory for read-only sessions.
+
+        In pooled SQLite mode their SELECTs run on the reader connections;
+        otherwise this is :attr:`session_factory`.
+        """
+        if not self.is_pooled_sqlite:
+            return self.session_factory
+        if self._read_session_factory is None:
+            if self._reader_engine is None:
+                self._reader_engine = self._create_engine(readonly=True)
+            self._read_session_factory = async_sessionmaker(
+                bind=self.engine,
+                class_=AsyncSession,
+                sync_session_class=_ReadOnlySession,
+                reader_bind=self._reader_engine.sync_engine,
+                expire_on_commit=False,
+                autocommit=False,
+                autoflush=False,
+            )
+        return self._read_session_factory
+
+    def _create_engine(self, *, readonly: bool = False) -> AsyncEngine:
+        """Create the async engine with proper configuration.
+
+        Args:
+            readonly: Create the reader engine of pooled SQLite mode instead
+                of the primary (writer) engine.
+        """
         # Ensure parent directory exists for SQLite
         if self._config.is_sqlite:
             self._ensure_sqlite_directory()
 
+        if self.is_pooled_sqlite:
+            return self._create_pooled_sqlite_engine(readonly=readonly)
+
         # Build engine kwargs
         engine_kwargs: dict = {
             "echo": self._config.echo,
@@ -138,12 +228,7 @@ class DatabaseEngine:
             # during request cancellation. SQLite doesn't benefit from connection pooling
             # like server databases do. This prevents "Exception terminating connection"
             # errors when requests are cancelled.
-            is_in_memory = (
-                self._config.url.endswith(":memory:")
-                or ":memory:?" in self._config.url
-                or "/:memory:" in self._config.url
-            )
-            if is_in_memory:
+            if self._config.is_sqlite_memory:
                 from sqlalchemy.pool import StaticPool
 
                 engine_kwargs["poolclass"] = StaticPool
@@ -156,6 +241,46 @@ class DatabaseEngine:
         logger.info("Creating async database engine for: %s", self._config.url)
         return create_async_engine(self._config.url, **engine_kwargs)
 
+    def _create_pooled_sqlite_engine(self, *, readonly: bool) -> AsyncEngine:
+        """Create a fixed-size pool of WAL-mode SQLite connections.
+
+        The writer engine holds a single connection, so writers queue for it
+        instead of failing with "database is locked"; readers run concurrently
+        with it under WAL. Connections stay open, so a session no longer pays
+        for a new connection and aiosqlite worker thread. Cleanup in
+        session() and close() is shielded from cancellation, so a cancelled
+        request still returns its connection to the pool intact.
+        """
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        engine = create_async_engine(
+            self._config.url,
+            echo=self._config.echo,
+            echo_pool=self._config.echo_pool,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=self._config.sqlite_reader_pool_size if readonly else 1,
+            max_overflow=0,
+            pool_timeout=self._config.pool_timeout,
+            connect_args={"check_same_thread": False},
+        )
+        pragmas = _sqlite_pragmas(self._config, readonly=readonly)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+        logger.info(
+            "Creating pooled SQLite %s engine for: %s",
+            "reader" if readonly else "writer",
+            self._config.url,
+        )
+        return engine
+
     def _ensure_sqlite_directory(self) -> None:
         """Ensure the SQLite database directory exists."""
         # Extract path from URL: sqlite+aiosqlite:///./var/db/proxy.db
@@ -187,6 +312,10 @@ class DatabaseEngine:
 
     async def close(self) -> None:
         """Close the database engine and release resources."""
+        if self._reader_engine is not None:
+            await _await_shielded(self._reader_engine.dispose())
+            self._reader_engine = None
+            self._read_session_factory = None
         if self._engine is not None:
             await _await_shielded(self._engine.dispose())
             self._engine = None
@@ -203,17 +332,24 @@ class DatabaseEngine:
         await self.close()
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session(
+        self, *, readonly: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
         """Get a database session as async context manager.
 
         Usage:
             async with engine.session() as session:
                 result = await session.execute(...)
 
+        Args:
+            readonly: The session only queries. In pooled SQLite mode its
+                SELECTs may then run on a reader connection.
+
         Yields:
             AsyncSession: Database session that auto-commits on success
         """
-        session = self.session_factory()
+        factory = self.read_session_factory if readonly else self.session_factory
+        session = factory()
         try:
             yield session
             await session.commit()
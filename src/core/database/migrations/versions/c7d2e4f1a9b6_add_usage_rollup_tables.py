@@ -0,0 +1,100 @@
+"""add_usage_rollup_tables
+
+Revision ID: c7d2e4f1a9b6
+Revises: f8bb5b9e8b83
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e4f1a9b6"
+down_revision: str | None = "f8bb5b9e8b83"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_ROLLUP_TABLES = (
+    ("usage_rollups_minute", "idx_usage_rollups_minute"),
+    ("usage_rollups_hour", "idx_usage_rollups_hour"),
+)
+
+
+def _rollup_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column(
+            "backend_type", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column(
+            "backend_instance_id",
+            sqlmodel.sql.sqltypes.AutoString(length=128),
+            nullable=True,
+        ),
+        sa.Column(
+            "model", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=False
+        ),
+        sa.Column(
+            "frontend_type", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column("leg", sqlmodel.sql.sqltypes.AutoString(length=8), nullable=False),
+        sa.Column(
+            "proxy_user", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=True
+        ),
+        sa.Column("http_status_code", sa.Integer(), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.Column("total_turns", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.Integer(), nullable=False),
+        sa.Column("tool_call_count", sa.Integer(), nullable=False),
+        sa.Column("first_timestamp", sa.DateTime(), nullable=True),
+        sa.Column("last_timestamp", sa.DateTime(), nullable=True),
+        sa.Column("ttft_count", sa.Integer(), nullable=False),
+        sa.Column("ttft_sum", sa.Float(), nullable=False),
+        sa.Column("ttft_min", sa.Float(), nullable=True),
+        sa.Column("ttft_max", sa.Float(), nullable=True),
+        sa.Column("proxy_processing_sum", sa.Float(), nullable=False),
+        sa.Column("proxy_processing_min", sa.Float(), nullable=True),
+        sa.Column("proxy_processing_max", sa.Float(), nullable=True),
+        sa.Column("duration_sum", sa.Float(), nullable=False),
+        sa.Column("duration_min", sa.Float(), nullable=True),
+        sa.Column("duration_max", sa.Float(), nullable=True),
+        sa.Column("ttft_sketch_json", sa.Text(), nullable=True),
+        sa.Column("proxy_processing_sketch_json", sa.Text(), nullable=True),
+        sa.Column("sessions_sketch_json", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    ]
+
+
+def upgrade() -> None:
+    for table_name, index_prefix in _ROLLUP_TABLES:
+        op.create_table(table_name, *_rollup_columns())
+        op.create_index(f"{index_prefix}_bucket", table_name, ["bucket_start"])
+        op.create_index(
+            f"{index_prefix}_backend_model_bucket",
+            table_name,
+            ["backend_type", "model", "bucket_start"],
+        )
+
+    # Rollups start empty; UsageRecordRepository records from which point they
+    # cover usage records on first use (rebuild_rollups() backfills them).
+    op.create_table(
+        "usage_rollup_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("covered_since", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("usage_rollup_state")
+    for table_name, index_prefix in reversed(_ROLLUP_TABLES):
+        op.drop_index(f"{index_prefix}_backend_model_bucket", table_name=table_name)
+        op.drop_index(f"{index_prefix}_bucket", table_name=table_name)
+        op.drop_table(table_name)
@@ -0,0 +1,91 @@
+"""add_session_summary_search_index
+
+Revision ID: d3a8f6b2c5e1
+Revises: c7d2e4f1a9b6
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8f6b2c5e1"
+down_revision: str | None = "c7d2e4f1a9b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The index starts empty; SQLModelMemoryRepository.rebuild_search_index()
+    # backfills summaries saved before this revision.
+    op.create_table(
+        "session_summary_search_docs",
+        sa.Column(
+            "summary_id", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column(
+            "user_id", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=False
+        ),
+        sa.Column(
+            "tenant_id", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=True
+        ),
+        sa.Column(
+            "project_id", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=True
+        ),
+        sa.Column(
+            "project_root",
+            sqlmodel.sql.sqltypes.AutoString(length=1024),
+            nullable=True,
+        ),
+        sa.Column("session_start", sa.DateTime(), nullable=False),
+        sa.Column("term_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("summary_id"),
+    )
+    op.create_index(
+        "idx_session_summary_search_docs_user",
+        "session_summary_search_docs",
+        ["user_id", "session_start"],
+    )
+    op.create_index(
+        "idx_session_summary_search_docs_session_start",
+        "session_summary_search_docs",
+        ["session_start"],
+    )
+
+    op.create_table(
+        "session_summary_terms",
+        sa.Column(
+            "summary_id", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column("term", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column(
+            "user_id", sqlmodel.sql.sqltypes.AutoString(length=256), nullable=False
+        ),
+        sa.Column("term_frequency", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("summary_id", "term"),
+    )
+    op.create_index(
+        "idx_session_summary_terms_user_term",
+        "session_summary_terms",
+        ["user_id", "term"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_session_summary_terms_user_term", table_name="session_summary_terms"
+    )
+    op.drop_table("session_summary_terms")
+    op.drop_index(
+        "idx_session_summary_search_docs_session_start",
+        table_name="session_summary_search_docs",
+    )
+    op.drop_index(
+        "idx_session_summary_search_docs_user",
+        table_name="session_summary_search_docs",
+    )
+    op.drop_table("session_summary_search_docs")
@@ -4,7 +4,9 @@ This module contains all SQLModel table definitions for the application.
 """
 
 from src.core.database.models.memory import (
+    SessionSummarySearchDocTable,
     SessionSummaryTable,
+    SessionSummaryTermTable,
     UserProjectDirTable,
 )
 from src.core.database.models.sso import (
@@ -17,7 +19,9 @@ from src.core.database.models.sso import (
 
 __all__ = [
     # Memory models
+    "SessionSummarySearchDocTable",
     "SessionSummaryTable",
+    "SessionSummaryTermTable",
     "UserProjectDirTable",
     # SSO models
     "AgentTokenTable",
@@ -102,3 +102,45 @@ class UserProjectDirTable(SQLModel, table=True):
     __table_args__ = (
         Index("idx_user_project_dirs_unique", "user_id", "project_root", unique=True),
     )
+
+
+class SessionSummarySearchDocTable(SQLModel, table=True):
+    """SQLModel table for documents of the session summary search index.
+
+    One row per indexed summary, holding the scoping fields and the
+    summary's length in terms needed for BM25 ranking.
+    """
+
+    __tablename__ = "session_summary_search_docs"  # type: ignore[assignment]
+
+    summary_id: str = Field(primary_key=True, max_length=64)
+
+    # Identity fields (for scoping), copied from the summary
+    user_id: str = Field(nullable=False, max_length=256)
+    tenant_id: str | None = Field(default=None, max_length=256)
+    project_id: str | None = Field(default=None, max_length=256)
+    project_root: str | None = Field(default=None, max_length=1024)
+
+    session_start: datetime = Field(nullable=False)
+    term_count: int = Field(nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_session_summary_search_docs_user", "user_id", "session_start"),
+        Index("idx_session_summary_search_docs_session_start", "session_start"),
+    )
+
+
+class SessionSummaryTermTable(SQLModel, table=True):
+    """SQLModel table for postings of the session summary search index.
+
+    One row per (summary, term) with the term's frequency in the summary.
+    """
+
+    __tablename__ = "session_summary_terms"  # type: ignore[assignment]
+
+    summary_id: str = Field(primary_key=True, max_length=64)
+    term: str = Field(primary_key=True, max_length=64)
+    user_id: str = Field(nullable=False, max_length=256)
+    term_frequency: int = Field(nullable=False, default=1)
+
+    __table_args__ = (Index("idx_session_summary_terms_user_term", "user_id", "term"),)
@@ -260,6 +260,103 @@ class SessionMetricsTable(SQLModel, table=True):
     )
 
 
+class UsageRollupColumns(SQLModel):
+    """Columns shared by the per-minute and per-hour usage rollup tables.
+
+    Each row summarises the usage records that fall into one time bucket and
+    share the same dimensions. Counters and sums are exact; the TTFT and proxy
+    processing sketches (``LatencySketch``) give percentiles and the session
+    sketch (``DistinctCountSketch``) gives distinct session counts.
+    """
+
+    # Hash of bucket_start and all dimensions (nullable columns cannot be
+    # part of a primary key)
+    id: str = Field(primary_key=True, max_length=32)
+    bucket_start: datetime = Field(nullable=False)
+
+    # Dimensions
+    backend_type: str = Field(nullable=False, max_length=64)
+    backend_instance_id: str | None = Field(default=None, max_length=128)
+    model: str = Field(nullable=False, max_length=256)
+    frontend_type: str = Field(nullable=False, max_length=64)
+    leg: str = Field(nullable=False, max_length=8)
+    proxy_user: str | None = Field(default=None, max_length=256)
+    http_status_code: int | None = Field(default=None)
+
+    # Counters and sums
+    request_count: int = Field(nullable=False, default=0)
+    total_turns: int = Field(nullable=False, default=0)
+    prompt_tokens: int = Field(nullable=False, default=0)
+    completion_tokens: int = Field(nullable=False, default=0)
+    total_tokens: int = Field(nullable=False, default=0)
+    tool_call_count: int = Field(nullable=False, default=0)
+    first_timestamp: datetime | None = Field(default=None)
+    last_timestamp: datetime | None = Field(default=None)
+
+    # Timing aggregates (in milliseconds)
+    ttft_count: int = Field(nullable=False, default=0)
+    ttft_sum: float = Field(nullable=False, default=0.0)
+    ttft_min: float | None = Field(default=None)
+    ttft_max: float | None = Field(default=None)
+    proxy_processing_sum: float = Field(nullable=False, default=0.0)
+    proxy_processing_min: float | None = Field(default=None)
+    proxy_processing_max: float | None = Field(default=None)
+    duration_sum: float = Field(nullable=False, default=0.0)
+    duration_min: float | None = Field(default=None)
+    duration_max: float | None = Field(default=None)
+
+    # Serialized sketches
+    ttft_sketch_json: str | None = Field(default=None, sa_type=Text)
+    proxy_processing_sketch_json: str | None = Field(default=None, sa_type=Text)
+    sessions_sketch_json: str | None = Field(default=None, sa_type=Text)
+
+
+class UsageRollupMinuteTable(UsageRollupColumns, table=True):
+    """Per-minute usage rollups."""
+
+    __tablename__ = "usage_rollups_minute"  # type: ignore[assignment]
+
+    __table_args__ = (
+        Index("idx_usage_rollups_minute_bucket", "bucket_start"),
+        Index(
+            "idx_usage_rollups_minute_backend_model_bucket",
+            "backend_type",
+            "model",
+            "bucket_start",
+        ),
+    )
+
+
+class UsageRollupHourTable(UsageRollupColumns, table=True):
+    """Per-hour usage rollups."""
+
+    __tablename__ = "usage_rollups_hour"  # type: ignore[assignment]
+
+    __table_args__ = (
+        Index("idx_usage_rollups_hour_bucket", "bucket_start"),
+        Index(
+            "idx_usage_rollups_hour_backend_model_bucket",
+            "backend_type",
+            "model",
+            "bucket_start",
+        ),
+    )
+
+
+class UsageRollupStateTable(SQLModel, table=True):
+    """Single-row table recording which usage records the rollups cover.
+
+    Records with a timestamp before ``covered_since`` predate the rollup
+    tables and are only present in ``usage_records``; NULL means the rollups
+    cover every record.
+    """
+
+    __tablename__ = "usage_rollup_state"  # type: ignore[assignment]
+
+    id: int = Field(default=1, primary_key=True)
+    covered_since: datetime | None = Field(default=None)
+
+
 class BackendQuotaTable(SQLModel, table=True):
     """SQLModel table for backend quotas and rate limits.
 
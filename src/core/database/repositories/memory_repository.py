@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from src.core.database.models.memory import (
+    SessionSummarySearchDocTable,
     SessionSummaryTable,
+    SessionSummaryTermTable,
     UserProjectDirTable,
 )
 from src.core.database.repositories.base import AsyncRepository
@@ -21,6 +26,12 @@ from src.core.memory.models import (
     TaskItem,
     TestRun,
 )
+from src.core.memory.search_index import (
+    SessionSearchHit,
+    bm25_scores,
+    query_terms,
+    summary_terms,
+)
 
 if TYPE_CHECKING:
     from src.core.database.engine import DatabaseEngine
@@ -31,7 +42,9 @@ logger = logging.getLogger(__name__)
 class SQLModelMemoryRepository(AsyncRepository[SessionSummaryTable]):
     """SQLModel-based repository for memory data persistence.
 
-    Implements IMemoryRepository interface using SQLModel.
+    Implements IMemoryRepository interface using SQLModel. Summaries are
+    also kept in a term index (``session_summary_search_docs`` and
+    ``session_summary_terms``) that ``search_sessions`` ranks with BM25.
     """
 
     def __init__(self, engine: DatabaseEngine) -> None:
@@ -104,6 +117,7 @@ class SQLModelMemoryRepository(AsyncRepository[SessionSummaryTable]):
         async with self._engine.session() as session:
             # Use merge for upsert behavior
             await session.merge(table_record)
+            await self._index_summary(session, summary)
 
         logger.debug(
             "Saved session summary %s for user %s", summary.id, summary.user_id
@@ -159,6 +173,159 @@ class SQLModelMemoryRepository(AsyncRepository[SessionSummaryTable]):
 
             return [self._table_to_domain(row) for row in rows]
 
+    async def search_sessions(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        tenant_id: str | None = None,
+        project_id: str | None = None,
+        project_root: str | None = None,
+    ) -> list[SessionSearchHit]:
+        """Retrieve the session summaries most relevant to a query.
+
+        Searches the user's whole history (within the same scope as
+        ``get_recent_sessions``) and ranks summaries by BM25 over their
+        indexed terms, breaking ties by recency. Only the postings of the
+        query's terms are read.
+
+        Args:
+            user_id: User identifier
+            query: Free-text query, e.g. the current prompt
+            limit: Maximum number of summaries to return
+            tenant_id: Optional tenant filter
+            project_id: Optional project ID filter
+            project_root: Optional project root filter (used if project_id not set)
+
+        Returns:
+            Matching summaries with their BM25 scores, best first
+        """
+        if not self._initialized:
+            await self.initialize_schema()
+
+        terms = query_terms(query)
+        if not terms or limit <= 0:
+            return []
+
+        doc = SessionSummarySearchDocTable
+        conditions: list[Any] = [doc.user_id == user_id]
+        if tenant_id is not None:
+            conditions.append(doc.tenant_id == tenant_id)
+        if project_id is not None:
+            conditions.append(doc.project_id == project_id)
+        elif project_root is not None:
+            conditions.append(doc.project_root == project_root)
+
+        async with self._engine.session() as session:
+            stats = await session.execute(
+                select(func.count(), func.avg(doc.term_count)).where(*conditions)
+            )
+            document_count, average_length = stats.one()
+            if not document_count:
+                return []
+
+            result = await session.execute(
+                select(  # type: ignore[call-overload]
+                    SessionSummaryTermTable.summary_id,
+                    SessionSummaryTermTable.term,
+                    SessionSummaryTermTable.term_frequency,
+                    doc.term_count,
+                    doc.session_start,
+                )
+                .join(doc, doc.summary_id == SessionSummaryTermTable.summary_id)  # type: ignore[arg-type]
+                .where(
+                    SessionSummaryTermTable.user_id == user_id,
+                    SessionSummaryTermTable.term.in_(terms),  # type: ignore[attr-defined]
+                    *conditions,
+                )
+            )
+            rows = result.all()
+            session_starts = {row[0]: row[4] for row in rows}
+            scores = bm25_scores(
+                ((row[0], row[1], row[2], row[3]) for row in rows),
+                document_count,
+                float(average_length or 0.0),
+            )
+            best = heapq.nlargest(
+                limit,
+                scores.items(),
+                key=lambda item: (item[1], session_starts[item[0]]),
+            )
+            if not best:
+                return []
+
+            summaries = await session.execute(
+                select(SessionSummaryTable).where(
+                    SessionSummaryTable.id.in_([summary_id for summary_id, _ in best])  # type: ignore[attr-defined]
+                )
+            )
+            by_id = {row.id: row for row in summaries.scalars().all()}
+
+        return [
+            SessionSearchHit(
+                summary=self._table_to_domain(by_id[summary_id]), score=score
+            )
+            for summary_id, score in best
+            if summary_id in by_id
+        ]
+
+    async def rebuild_search_index(self) -> int:
+        """Rebuild the search index from all stored session summaries.
+
+        Summaries saved before the index existed are only found by recency
+        until this has run once.
+
+        Returns:
+            Number of summaries indexed
+        """
+        if not self._initialized:
+            await self.initialize_schema()
+
+        async with self._engine.session() as session:
+            await session.execute(delete(SessionSummaryTermTable))
+            await session.execute(delete(SessionSummarySearchDocTable))
+            result = await session.execute(select(SessionSummaryTable))
+            rows = result.scalars().all()
+            for row in rows:
+                await self._index_summary(
+                    session, self._table_to_domain(row), replace=False
+                )
+
+        logger.info("Rebuilt memory search index for %d session summaries", len(rows))
+        return len(rows)
+
+    async def _index_summary(
+        self, session: AsyncSession, summary: SessionSummary, *, replace: bool = True
+    ) -> None:
+        """Write the search index rows of a summary in the given session."""
+        if replace:
+            await session.execute(
+                delete(SessionSummaryTermTable).where(
+                    SessionSummaryTermTable.summary_id == summary.id  # type: ignore[arg-type]
+                )
+            )
+        terms = summary_terms(summary)
+        await session.merge(
+            SessionSummarySearchDocTable(
+                summary_id=summary.id,
+                user_id=summary.user_id,
+                tenant_id=summary.tenant_id,
+                project_id=summary.project_id,
+                project_root=summary.project_root,
+                session_start=summary.session_start,
+                term_count=sum(terms.values()),
+            )
+        )
+        session.add_all(
+            SessionSummaryTermTable(
+                summary_id=summary.id,
+                term=term,
+                user_id=summary.user_id,
+                term_frequency=frequency,
+            )
+            for term, frequency in terms.items()
+        )
+
     async def delete_old_sessions(self, before_date: datetime) -> int:
         """Delete sessions older than the specified date.
 
@@ -181,6 +348,21 @@ class SQLModelMemoryRepository(AsyncRepository[SessionSummaryTable]):
             for row in rows:
                 await session.delete(row)
 
+            await session.execute(
+                delete(SessionSummaryTermTable).where(
+                    SessionSummaryTermTable.summary_id.in_(  # type: ignore[attr-defined]
+                        select(SessionSummarySearchDocTable.summary_id).where(
+                            SessionSummarySearchDocTable.session_start < before_date
+                        )
+                    )
+                )
+            )
+            await session.execute(
+                delete(SessionSummarySearchDocTable).where(
+                    SessionSummarySearchDocTable.session_start < before_date  # type: ignore[arg-type]
+                )
+            )
+
             deleted = len(rows)
             if deleted > 0:
                 logger.info("Deleted %d old session summaries", deleted)
@@ -12,18 +12,39 @@ These are false positives - the comparisons work correctly at runtime.
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 import sqlalchemy.exc
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database.models.usage import SessionMetricsTable, UsageRecordTable
+from src.core.database.models.usage import (
+    SessionMetricsTable,
+    UsageRecordTable,
+    UsageRollupStateTable,
+)
 from src.core.database.repositories.base import AsyncRepository
 from src.core.database.repositories.usage_repository_types import (
     RepositoryAggregatedStats,
     RepositoryUsageStats,
 )
+from src.core.database.repositories.usage_rollups import (
+    DIMENSIONS,
+    HOUR,
+    RAW_CONTRIBUTION_COLUMNS,
+    ROLLUP_TABLES,
+    RollupContribution,
+    RollupQueryPlan,
+    UsageRollupAccumulator,
+    apply_contributions,
+    ceil_bucket,
+    floor_bucket,
+    plan_rollup_query,
+    rebuild_range,
+    to_utc,
+)
 from src.core.domain.statistics_filter import StatisticsFilter
 from src.core.domain.usage_record import UsageRecord
 
@@ -32,12 +53,76 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Filters honored by each query, matching the raw SQL they replace
+_AGGREGATED_FILTER_FIELDS = (
+    "backend_type",
+    "model",
+    "frontend_type",
+    "leg",
+    "proxy_user",
+    "http_status_code",
+)
+_BREAKDOWN_FILTER_FIELDS = ("backend_type", "backend_instance_id", "model")
+_USAGE_STATS_FILTER_FIELDS = (
+    "backend_type",
+    "backend_instance_id",
+    "model",
+    "frontend_type",
+    "leg",
+    "proxy_user",
+    "http_status_code",
+)
+
+_COVERAGE_UNKNOWN: Any = object()
+
+
+def _where_dimensions(
+    statement: Any,
+    source: Any,
+    filters: StatisticsFilter | None,
+    fields: tuple[str, ...],
+) -> Any:
+    """Apply equality filters on dimension columns shared by records and rollups."""
+    if filters is None:
+        return statement
+    for name in fields:
+        value = getattr(filters, name)
+        if value:
+            if name == "leg":
+                value = value.value
+            statement = statement.where(getattr(source, name) == value)
+    return statement
+
+
+def _where_range(
+    statement: Any, column: Any, start: datetime | None, end: datetime | None
+) -> Any:
+    """Restrict ``column`` to the half-open range ``[start, end)``."""
+    if start is not None:
+        statement = statement.where(column >= start)
+    if end is not None:
+        statement = statement.where(column < end)
+    return statement
+
+
+def _needs_raw_records(filters: StatisticsFilter | None) -> bool:
+    """Whether filters use columns the rollups do not keep."""
+    return filters is not None and (
+        bool(filters.user_agent)
+        or filters.day_of_week is not None
+        or filters.hour_of_day is not None
+    )
+
 
 class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
     """Repository for usage record CRUD operations.
 
     Provides batch operations for efficient database writes and
     filtered queries for statistics aggregation.
+
+    Batch inserts and updates also maintain per-minute and per-hour rollups
+    (see ``usage_rollups``), from which the statistics queries are answered
+    without scanning ``usage_records``.
     """
 
     def __init__(self, engine: DatabaseEngine) -> None:
@@ -47,6 +132,7 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
             engine: Database engine for session creation
         """
         super().__init__(engine)
+        self._covered_since: datetime | None = _COVERAGE_UNKNOWN
 
     @property
     def model_class(self) -> type[UsageRecordTable]:
@@ -67,6 +153,8 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
 
         async with self._engine.session() as session:
             try:
+                covered_since = await self._rollup_coverage(session)
+
                 # Convert domain records to table models
                 table_records = [
                     UsageRecordTable.from_domain(record) for record in records
@@ -76,6 +164,17 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
                 session.add_all(table_records)
                 await session.flush()
 
+                await apply_contributions(
+                    session,
+                    self._covered_changes(
+                        covered_since,
+                        (
+                            (RollupContribution.from_record(table_record), 1)
+                            for table_record in table_records
+                        ),
+                    ),
+                )
+
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug("Batch inserted %d usage records", len(records))
 
@@ -99,7 +198,9 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
 
         async with self._engine.session() as session:
             try:
+                covered_since = await self._rollup_coverage(session)
                 updated_count = 0
+                rollup_changes: list[tuple[RollupContribution, int]] = []
 
                 for record in records:
                     # Get existing record
@@ -107,6 +208,9 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
                     if existing:
                         # Update from domain record
                         table_record = UsageRecordTable.from_domain(record)
+                        rollup_changes.append(
+                            (RollupContribution.from_record(existing), -1)
+                        )
 
                         # Copy all fields
                         existing.timestamp = table_record.timestamp
@@ -152,8 +256,14 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
 
                         session.add(existing)
                         updated_count += 1
+                        rollup_changes.append(
+                            (RollupContribution.from_record(existing), 1)
+                        )
 
                 await session.flush()
+                await apply_contributions(
+                    session, self._covered_changes(covered_since, rollup_changes)
+                )
 
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug("Batch updated %d usage records", updated_count)
@@ -194,7 +304,7 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             List of domain UsageRecord instances
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
             statement = select(UsageRecordTable)
 
             # Apply filters
@@ -224,7 +334,7 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             Count of matching records
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
             statement = select(func.count()).select_from(UsageRecordTable)
 
             if filters:
@@ -268,7 +378,9 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
     ) -> RepositoryAggregatedStats:
         """Get aggregated statistics from the database.
 
-        This performs aggregation directly in SQL for efficiency.
+        Answered from the usage rollups (which also provide TTFT and proxy
+        processing percentiles) when they cover the requested range, otherwise
+        aggregated directly in SQL over the raw records.
 
         Args:
             filters: Optional statistics filter
@@ -276,7 +388,11 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             RepositoryAggregatedStats with aggregated statistics
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
+            plan = await self._rollup_plan(session, filters)
+            if plan is not None:
+                return await self._aggregated_stats_from_rollups(session, plan, filters)
+
             # Base query for aggregations
             statement = select(
                 func.count().label("request_count"),
@@ -382,7 +498,11 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             Dictionary mapping "backend_instance_id:model" to status code counts
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
+            plan = await self._rollup_plan(session, filters)
+            if plan is not None:
+                return await self._status_breakdown_from_rollups(session, plan, filters)
+
             statement = select(  # type: ignore[call-overload]
                 UsageRecordTable.backend_instance_id,  # type: ignore[arg-type]
                 UsageRecordTable.backend_type,  # type: ignore[arg-type]
@@ -447,7 +567,16 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             Dictionary mapping frontend_type to RepositoryUsageStats
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
+            plan = await self._rollup_plan(session, filters)
+            if plan is not None:
+                return await self._usage_stats_from_rollups(
+                    session,
+                    plan,
+                    filters,
+                    lambda values: values["frontend_type"],
+                )
+
             statement = select(  # type: ignore[call-overload]
                 UsageRecordTable.frontend_type,  # type: ignore[arg-type]
                 func.count().label("total_requests"),
@@ -493,7 +622,18 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
         Returns:
             Dictionary mapping backend_instance_id to RepositoryUsageStats
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
+            plan = await self._rollup_plan(session, filters)
+            if plan is not None:
+                # Prefer backend_instance_id if available, fallback to backend_type
+                return await self._usage_stats_from_rollups(
+                    session,
+                    plan,
+                    filters,
+                    lambda values: values["backend_instance_id"]
+                    or values["backend_type"],
+                )
+
             statement = select(  # type: ignore[call-overload]
                 UsageRecordTable.backend_instance_id,  # type: ignore[arg-type]
                 UsageRecordTable.backend_type,  # type: ignore[arg-type]
@@ -544,12 +684,21 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
             Number of records deleted
         """
         async with self._engine.session() as session:
-            from sqlalchemy import delete
-
             statement = delete(UsageRecordTable).where(  # type: ignore[arg-type]
                 UsageRecordTable.timestamp < cutoff_date  # type: ignore[operator]
             )
             result = await session.execute(statement)
+
+            # Drop rollup buckets before the cutoff hour and recompute the
+            # partially deleted hour from the remaining records
+            covered_since = await self._rollup_coverage(session)
+            boundary = floor_bucket(cutoff_date, HOUR)
+            for table, _ in ROLLUP_TABLES:
+                await session.execute(
+                    delete(table).where(table.bucket_start < boundary)
+                )
+            if covered_since is None or covered_since <= boundary:
+                await rebuild_range(session, boundary, boundary + HOUR)
             await session.commit()
 
             deleted_count = result.rowcount
@@ -560,6 +709,204 @@ class UsageRecordRepository(AsyncRepository[UsageRecordTable]):
             )
             return deleted_count
 
+    async def rebuild_rollups(self) -> int:
+        """Recompute the usage rollups from all raw records.
+
+        Needed once for databases that held usage records before the rollup
+        tables existed; until then, queries reaching back before the rollups
+        are answered from the raw records.
+
+        Returns:
+            Number of usage records rolled up
+        """
+        async with self._engine.session() as session:
+            record_count = await rebuild_range(session)
+            state = await session.get(UsageRollupStateTable, 1)
+            if state is None:
+                session.add(UsageRollupStateTable(id=1, covered_since=None))
+            else:
+                state.covered_since = None
+                session.add(state)
+        self._covered_since = None
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Rebuilt usage rollups from %d usage records", record_count)
+        return record_count
+
+    async def _rollup_coverage(self, session: AsyncSession) -> datetime | None:
+        """Return the timestamp from which the rollups cover usage records.
+
+        None means they cover every record. On first use against a database
+        that already holds records, the rollups start at the next hour.
+        """
+        if self._covered_since is not _COVERAGE_UNKNOWN:
+            return self._covered_since
+
+        state = await session.get(UsageRollupStateTable, 1)
+        if state is None:
+            latest = (
+                await session.execute(select(func.max(UsageRecordTable.timestamp)))
+            ).scalar()
+            covered_since = (
+                None
+                if latest is None
+                else ceil_bucket(latest + timedelta(microseconds=1), HOUR)
+            )
+            state = UsageRollupStateTable(id=1, covered_since=covered_since)
+            session.add(state)
+            await session.flush()
+            if covered_since is not None and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Usage rollups start at %s; run rebuild_rollups() to include "
+                    "older usage records",
+                    covered_since.isoformat(),
+                )
+
+        covered_since = state.covered_since
+        self._covered_since = None if covered_since is None else to_utc(covered_since)
+        return self._covered_since
+
+    @staticmethod
+    def _covered_changes(
+        covered_since: datetime | None,
+        changes: Iterable[tuple[RollupContribution, int]],
+    ) -> list[tuple[RollupContribution, int]]:
+        """Drop contributions of records that predate the rollups."""
+        if covered_since is None:
+            return list(changes)
+        return [
+            (contribution, sign)
+            for contribution, sign in changes
+            if contribution.timestamp >= covered_since
+        ]
+
+    async def _rollup_plan(
+        self, session: AsyncSession, filters: StatisticsFilter | None
+    ) -> RollupQueryPlan | None:
+        """Plan a query over the rollups, or None if it needs raw records."""
+        if _needs_raw_records(filters):
+            return None
+        covered_since = await self._rollup_coverage(session)
+        return plan_rollup_query(
+            filters.start_date if filters else None,
+            filters.end_date if filters else None,
+            covered_since,
+        )
+
+    async def _aggregated_stats_from_rollups(
+        self,
+        session: AsyncSession,
+        plan: RollupQueryPlan,
+        filters: StatisticsFilter | None,
+    ) -> RepositoryAggregatedStats:
+        accumulator = UsageRollupAccumulator()
+        for table, start, end in plan.rollup_segments:
+            statement = select(*table.__table__.columns)
+            statement = _where_dimensions(
+                statement, table, filters, _AGGREGATED_FILTER_FIELDS
+            )
+            statement = _where_range(statement, table.bucket_start, start, end)
+            for row in await session.execute(statement):
+                accumulator.merge_row(row)
+
+        for start, end in plan.raw_segments:
+            statement = select(*RAW_CONTRIBUTION_COLUMNS)
+            statement = _where_dimensions(
+                statement, UsageRecordTable, filters, _AGGREGATED_FILTER_FIELDS
+            )
+            statement = _where_range(statement, UsageRecordTable.timestamp, start, end)
+            for record in await session.execute(statement):
+                accumulator.add(RollupContribution.from_record(record))
+
+        return accumulator.to_aggregated_stats()
+
+    async def _status_breakdown_from_rollups(
+        self,
+        session: AsyncSession,
+        plan: RollupQueryPlan,
+        filters: StatisticsFilter | None,
+    ) -> dict[str, dict[int, int]]:
+        breakdown: dict[str, dict[int, int]] = {}
+        totals = await self._dimension_totals(
+            session, plan, filters, _BREAKDOWN_FILTER_FIELDS
+        )
+        for dimensions, (requests, _, _) in totals.items():
+            values = dict(zip(DIMENSIONS, dimensions, strict=True))
+            status = values["http_status_code"]
+            if status is None:
+                continue
+            # Prefer backend_instance_id if available, fallback to backend_type
+            instance_id = values["backend_instance_id"] or values["backend_type"]
+            codes = breakdown.setdefault(f"{instance_id}:{values['model']}", {})
+            codes[status] = codes.get(status, 0) + requests
+        return breakdown
+
+    async def _dimension_totals(
+        self,
+        session: AsyncSession,
+        plan: RollupQueryPlan,
+        filters: StatisticsFilter | None,
+        fields: tuple[str, ...],
+    ) -> dict[tuple[Any, ...], tuple[int, int, int]]:
+        """Sum requests, prompt and completion tokens per dimension tuple."""
+        totals: dict[tuple[Any, ...], tuple[int, int, int]] = {}
+        statements = []
+        for table, start, end in plan.rollup_segments:
+            dimensions = [getattr(table, name) for name in DIMENSIONS]
+            statement = select(
+                *dimensions,
+                func.sum(table.request_count),
+                func.sum(table.prompt_tokens),
+                func.sum(table.completion_tokens),
+            )
+            statement = _where_dimensions(statement, table, filters, fields)
+            statement = _where_range(statement, table.bucket_start, start, end)
+            statements.append(statement.group_by(*dimensions))
+        for start, end in plan.raw_segments:
+            dimensions = [getattr(UsageRecordTable, name) for name in DIMENSIONS]
+            statement = select(
+                *dimensions,
+                func.count(),
+                func.sum(UsageRecordTable.mutated_prompt_tokens),
+                func.sum(UsageRecordTable.mutated_completion_tokens),
+            )
+            statement = _where_dimensions(statement, UsageRecordTable, filters, fields)
+            statement = _where_range(statement, UsageRecordTable.timestamp, start, end)
+            statements.append(statement.group_by(*dimensions))
+
+        width = len(DIMENSIONS)
+        for statement in statements:
+            for row in await session.execute(statement):
+                key = tuple(row[:width])
+                requests, sent, received = totals.get(key, (0, 0, 0))
+                totals[key] = (
+                    requests + (row[width] or 0),
+                    sent + (row[width + 1] or 0),
+                    received + (row[width + 2] or 0),
+                )
+        return totals
+
+    async def _usage_stats_from_rollups(
+        self,
+        session: AsyncSession,
+        plan: RollupQueryPlan,
+        filters: StatisticsFilter | None,
+        group_key: Callable[[dict[str, Any]], str],
+    ) -> dict[str, RepositoryUsageStats]:
+        stats: dict[str, RepositoryUsageStats] = {}
+        totals = await self._dimension_totals(
+            session, plan, filters, _USAGE_STATS_FILTER_FIELDS
+        )
+        for dimensions, (requests, sent, received) in totals.items():
+            values = dict(zip(DIMENSIONS, dimensions, strict=True))
+            entry = stats.setdefault(group_key(values), RepositoryUsageStats())
+            entry.total_requests += requests
+            if values["http_status_code"] == 200:
+                entry.successful_requests += requests
+            entry.tokens_sent += sent
+            entry.tokens_received += received
+        return stats
+
     def _apply_filters(self, statement, filters: StatisticsFilter):
         """Apply filters to a select statement.
 
@@ -686,7 +1033,7 @@ class SessionMetricsRepository(AsyncRepository[SessionMetricsTable]):
         Returns:
             List of session metrics
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
             statement = (
                 select(SessionMetricsTable)
                 .where(SessionMetricsTable.last_activity >= since)  # type: ignore[arg-type]
@@ -773,7 +1120,7 @@ class SessionMetricsRepository(AsyncRepository[SessionMetricsTable]):
         Raises:
             Database errors are logged and re-raised for upstream handling.
         """
-        async with self._engine.session() as session:
+        async with self._engine.session(readonly=True) as session:
             try:
                 statement = select(SessionMetricsTable.eos_emitted_at).where(  # type: ignore[call-overload,arg-type]
                     SessionMetricsTable.session_id == session_id
@@ -23,9 +23,15 @@ class RepositoryAggregatedStats(BaseModel):
     min_ttft: float | None = None
     max_ttft: float | None = None
     avg_ttft: float | None = None
+    p50_ttft: float | None = None
+    p95_ttft: float | None = None
+    p99_ttft: float | None = None
     min_proxy_processing: float | None = None
     max_proxy_processing: float | None = None
     avg_proxy_processing: float | None = None
+    p50_proxy_processing: float | None = None
+    p95_proxy_processing: float | None = None
+    p99_proxy_processing: float | None = None
     min_duration: float | None = None
     max_duration: float | None = None
     avg_duration: float | None = None
@@ -0,0 +1,485 @@
+"""Time-bucketed rollups of usage records.
+
+Usage records are summarised into per-minute and per-hour rollup rows keyed
+by bucket and dimensions (backend, instance, model, frontend, leg, user and
+status code). ``UsageRecordRepository`` keeps them up to date in the same
+transaction as its batch writes, and answers statistics queries from whole
+buckets plus the raw records in the partial minutes at either end of the
+requested time range.
+
+Note: This module has mypy type: ignore comments on SQLAlchemy column
+expressions for the same reasons as ``usage_repository``.
+"""
+
+# mypy: disable-error-code="arg-type,attr-defined,union-attr,call-overload"
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database.models.usage import (
+    UsageRecordTable,
+    UsageRollupColumns,
+    UsageRollupHourTable,
+    UsageRollupMinuteTable,
+)
+from src.core.database.repositories.usage_repository_types import (
+    RepositoryAggregatedStats,
+)
+from src.core.domain.usage_sketches import DistinctCountSketch, LatencySketch
+
+MINUTE = timedelta(minutes=1)
+HOUR = timedelta(hours=1)
+
+# Finest bucket first; every hour bucket is made of whole minute buckets.
+ROLLUP_TABLES: tuple[tuple[type[UsageRollupColumns], timedelta], ...] = (
+    (UsageRollupMinuteTable, MINUTE),
+    (UsageRollupHourTable, HOUR),
+)
+
+DIMENSIONS = (
+    "backend_type",
+    "backend_instance_id",
+    "model",
+    "frontend_type",
+    "leg",
+    "proxy_user",
+    "http_status_code",
+)
+
+# Raw usage record columns needed to build a RollupContribution
+RAW_CONTRIBUTION_COLUMNS = (
+    UsageRecordTable.timestamp,
+    UsageRecordTable.session_id,
+    UsageRecordTable.turn_number,
+    UsageRecordTable.backend_type,
+    UsageRecordTable.backend_instance_id,
+    UsageRecordTable.model,
+    UsageRecordTable.frontend_type,
+    UsageRecordTable.leg,
+    UsageRecordTable.proxy_user,
+    UsageRecordTable.http_status_code,
+    UsageRecordTable.mutated_prompt_tokens,
+    UsageRecordTable.mutated_completion_tokens,
+    UsageRecordTable.total_tokens,
+    UsageRecordTable.tool_call_count,
+    UsageRecordTable.ttft_ms,
+    UsageRecordTable.proxy_processing_ms,
+    UsageRecordTable.total_duration_ms,
+)
+
+_STREAM_PARTITION_SIZE = 5000
+
+
+def to_utc(value: datetime) -> datetime:
+    """Normalize a timestamp to aware UTC; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_bucket(value: datetime, width: timedelta) -> datetime:
+    """Return the start of the ``width`` bucket containing ``value``."""
+    value = to_utc(value)
+    if width == HOUR:
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def ceil_bucket(value: datetime, width: timedelta) -> datetime:
+    """Return the first ``width`` bucket boundary at or after ``value``."""
+    floored = floor_bucket(value, width)
+    return floored if floored == to_utc(value) else floored + width
+
+
+def rollup_id(bucket_start: datetime, dimensions: Sequence[Any]) -> str:
+    """Return the primary key of the rollup row for a bucket and dimensions."""
+    key = repr((bucket_start.isoformat(), *dimensions)).encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class RollupContribution:
+    """The part of one usage record that feeds the rollups."""
+
+    timestamp: datetime
+    session_id: str
+    turn_number: int
+    backend_type: str
+    backend_instance_id: str | None
+    model: str
+    frontend_type: str
+    leg: str
+    proxy_user: str | None
+    http_status_code: int | None
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    tool_call_count: int
+    ttft_ms: float | None
+    proxy_processing_ms: float
+    total_duration_ms: float
+
+    @classmethod
+    def from_record(cls, record: Any) -> RollupContribution:
+        """Build from a ``UsageRecordTable`` or a row of RAW_CONTRIBUTION_COLUMNS."""
+        return cls(
+            timestamp=to_utc(record.timestamp),
+            session_id=record.session_id,
+            turn_number=record.turn_number or 0,
+            backend_type=record.backend_type,
+            backend_instance_id=record.backend_instance_id,
+            model=record.model,
+            frontend_type=record.frontend_type,
+            leg=record.leg,
+            proxy_user=record.proxy_user,
+            http_status_code=record.http_status_code,
+            prompt_tokens=record.mutated_prompt_tokens or 0,
+            completion_tokens=record.mutated_completion_tokens or 0,
+            total_tokens=record.total_tokens or 0,
+            tool_call_count=record.tool_call_count or 0,
+            ttft_ms=record.ttft_ms,
+            proxy_processing_ms=record.proxy_processing_ms or 0.0,
+            total_duration_ms=record.total_duration_ms or 0.0,
+        )
+
+    @property
+    def dimensions(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in DIMENSIONS)
+
+
+def _min(current: Any, value: Any) -> Any:
+    return value if current is None or value < current else current
+
+
+def _max(current: Any, value: Any) -> Any:
+    return value if current is None or value > current else current
+
+
+@dataclass(slots=True)
+class UsageRollupAccumulator:
+    """Mergeable rollup state for one rollup row or for a query result.
+
+    Removing a contribution (``sign=-1``) reverses counters, sums and the
+    latency sketches exactly. Minimums, maximums, first/last timestamps and
+    the session sketch cannot be reversed and keep the removed value; the
+    write path only removes contributions when a record is updated, which
+    normally leaves those values unchanged.
+    """
+
+    request_count: int = 0
+    response_count: int = 0
+    total_turns: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    tool_call_count: int = 0
+    first_timestamp: datetime | None = None
+    last_timestamp: datetime | None = None
+    ttft_count: int = 0
+    ttft_sum: float = 0.0
+    ttft_min: float | None = None
+    ttft_max: float | None = None
+    proxy_processing_sum: float = 0.0
+    proxy_processing_min: float | None = None
+    proxy_processing_max: float | None = None
+    duration_sum: float = 0.0
+    duration_min: float | None = None
+    duration_max: float | None = None
+    ttft_sketch: LatencySketch = field(default_factory=LatencySketch)
+    proxy_processing_sketch: LatencySketch = field(default_factory=LatencySketch)
+    sessions: DistinctCountSketch = field(default_factory=DistinctCountSketch)
+
+    def add(self, contribution: RollupContribution, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) one record's contribution."""
+        self.request_count += sign
+        if contribution.http_status_code is not None:
+            self.response_count += sign
+        self.total_turns += sign * contribution.turn_number
+        self.prompt_tokens += sign * contribution.prompt_tokens
+        self.completion_tokens += sign * contribution.completion_tokens
+        self.total_tokens += sign * contribution.total_tokens
+        self.tool_call_count += sign * contribution.tool_call_count
+        self.proxy_processing_sum += sign * contribution.proxy_processing_ms
+        self.proxy_processing_sketch.add(contribution.proxy_processing_ms, sign)
+        self.duration_sum += sign * contribution.total_duration_ms
+        ttft = contribution.ttft_ms
+        if ttft is not None:
+            self.ttft_count += sign
+            self.ttft_sum += sign * ttft
+            self.ttft_sketch.add(ttft, sign)
+        if sign < 0:
+            return
+
+        self.first_timestamp = _min(self.first_timestamp, contribution.timestamp)
+        self.last_timestamp = _max(self.last_timestamp, contribution.timestamp)
+        self.proxy_processing_min = _min(
+            self.proxy_processing_min, contribution.proxy_processing_ms
+        )
+        self.proxy_processing_max = _max(
+            self.proxy_processing_max, contribution.proxy_processing_ms
+        )
+        self.duration_min = _min(self.duration_min, contribution.total_duration_ms)
+        self.duration_max = _max(self.duration_max, contribution.total_duration_ms)
+        if ttft is not None:
+            self.ttft_min = _min(self.ttft_min, ttft)
+            self.ttft_max = _max(self.ttft_max, ttft)
+        self.sessions.add(contribution.session_id)
+
+    def merge_row(self, row: UsageRollupColumns) -> None:
+        """Merge a persisted rollup row into this accumulator."""
+        self.request_count += row.request_count
+        if row.http_status_code is not None:
+            self.response_count += row.request_count
+        self.total_turns += row.total_turns
+        self.prompt_tokens += row.prompt_tokens
+        self.completion_tokens += row.completion_tokens
+        self.total_tokens += row.total_tokens
+        self.tool_call_count += row.tool_call_count
+        if row.first_timestamp is not None:
+            self.first_timestamp = _min(
+                self.first_timestamp, to_utc(row.first_timestamp)
+            )
+        if row.last_timestamp is not None:
+            self.last_timestamp = _max(self.last_timestamp, to_utc(row.last_timestamp))
+        self.ttft_count += row.ttft_count
+        self.ttft_sum += row.ttft_sum
+        if row.ttft_min is not None:
+            self.ttft_min = _min(self.ttft_min, row.ttft_min)
+        if row.ttft_max is not None:
+            self.ttft_max = _max(self.ttft_max, row.ttft_max)
+        self.proxy_processing_sum += row.proxy_processing_sum
+        if row.proxy_processing_min is not None:
+            self.proxy_processing_min = _min(
+                self.proxy_processing_min, row.proxy_processing_min
+            )
+        if row.proxy_processing_max is not None:
+            self.proxy_processing_max = _max(
+                self.proxy_processing_max, row.proxy_processing_max
+            )
+        self.duration_sum += row.duration_sum
+        if row.duration_min is not None:
+            self.duration_min = _min(self.duration_min, row.duration_min)
+        if row.duration_max is not None:
+            self.duration_max = _max(self.duration_max, row.duration_max)
+        self.ttft_sketch.merge(LatencySketch.from_json(row.ttft_sketch_json))
+        self.proxy_processing_sketch.merge(
+            LatencySketch.from_json(row.proxy_processing_sketch_json)
+        )
+        self.sessions.merge(DistinctCountSketch.from_json(row.sessions_sketch_json))
+
+    def write_to(self, row: UsageRollupColumns) -> None:
+        """Store this accumulator's totals and sketches on a rollup row."""
+        row.request_count = self.request_count
+        row.total_turns = self.total_turns
+        row.prompt_tokens = self.prompt_tokens
+        row.completion_tokens = self.completion_tokens
+        row.total_tokens = self.total_tokens
+        row.tool_call_count = self.tool_call_count
+        row.first_timestamp = self.first_timestamp
+        row.last_timestamp = self.last_timestamp
+        row.ttft_count = self.ttft_count
+        row.ttft_sum = self.ttft_sum
+        row.ttft_min = self.ttft_min
+        row.ttft_max = self.ttft_max
+        row.proxy_processing_sum = self.proxy_processing_sum
+        row.proxy_processing_min = self.proxy_processing_min
+        row.proxy_processing_max = self.proxy_processing_max
+        row.duration_sum = self.duration_sum
+        row.duration_min = self.duration_min
+        row.duration_max = self.duration_max
+        row.ttft_sketch_json = self.ttft_sketch.to_json() if self.ttft_count else None
+        row.proxy_processing_sketch_json = self.proxy_processing_sketch.to_json()
+        row.sessions_sketch_json = self.sessions.to_json()
+
+    def to_aggregated_stats(self) -> RepositoryAggregatedStats:
+        count = self.request_count
+        return RepositoryAggregatedStats(
+            request_count=count,
+            response_count=self.response_count,
+            unique_sessions=self.sessions.estimate() if count else 0,
+            total_turns=self.total_turns,
+            total_prompt_tokens=self.prompt_tokens,
+            total_completion_tokens=self.completion_tokens,
+            total_tokens=self.total_tokens,
+            total_tool_calls=self.tool_call_count,
+            first_timestamp=self.first_timestamp,
+            last_timestamp=self.last_timestamp,
+            min_ttft=self.ttft_min,
+            max_ttft=self.ttft_max,
+            avg_ttft=self.ttft_sum / self.ttft_count if self.ttft_count else None,
+            p50_ttft=self.ttft_sketch.quantile(0.50),
+            p95_ttft=self.ttft_sketch.quantile(0.95),
+            p99_ttft=self.ttft_sketch.quantile(0.99),
+            min_proxy_processing=self.proxy_processing_min,
+            max_proxy_processing=self.proxy_processing_max,
+            avg_proxy_processing=self.proxy_processing_sum / count if count else None,
+            p50_proxy_processing=self.proxy_processing_sketch.quantile(0.50),
+            p95_proxy_processing=self.proxy_processing_sketch.quantile(0.95),
+            p99_proxy_processing=self.proxy_processing_sketch.quantile(0.99),
+            min_duration=self.duration_min,
+            max_duration=self.duration_max,
+            avg_duration=self.duration_sum / count if count else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RollupQueryPlan:
+    """How to answer a time range from rollup buckets and raw records.
+
+    ``rollup_segments`` are ``(table, start, end)`` half-open bucket ranges
+    (None means unbounded); ``raw_segments`` are the bounded, half-open
+    sub-minute ranges at either end that must be read from usage_records.
+    """
+
+    rollup_segments: tuple[
+        tuple[type[UsageRollupColumns], datetime | None, datetime | None], ...
+    ]
+    raw_segments: tuple[tuple[datetime, datetime], ...]
+
+
+def plan_rollup_query(
+    start: datetime | None,
+    end: datetime | None,
+    covered_since: datetime | None,
+) -> RollupQueryPlan | None:
+    """Split ``[start, end]`` into rollup buckets and raw edges.
+
+    Returns None when part of the range predates the rollups, in which case
+    the query must be answered from the raw records alone.
+    """
+    lo = to_utc(start) if start is not None else None
+    # The raw filters are inclusive of end_date; buckets are half-open.
+    hi = to_utc(end) + timedelta(microseconds=1) if end is not None else None
+    if covered_since is not None and (lo is None or lo < covered_since):
+        return None
+    if lo is not None and hi is not None and lo >= hi:
+        return RollupQueryPlan((), ())
+
+    m0 = ceil_bucket(lo, MINUTE) if lo is not None else None
+    m1 = floor_bucket(hi, MINUTE) if hi is not None else None
+    if m0 is not None and m1 is not None and m0 >= m1:
+        return RollupQueryPlan((), ((lo, hi),))  # type: ignore[arg-type]
+
+    raw: list[tuple[datetime, datetime]] = []
+    if lo is not None and m0 is not None and lo < m0:
+        raw.append((lo, m0))
+    if hi is not None and m1 is not None and m1 < hi:
+        raw.append((m1, hi))
+
+    h0 = ceil_bucket(m0, HOUR) if m0 is not None else None
+    h1 = floor_bucket(m1, HOUR) if m1 is not None else None
+    segments: list[tuple[type[UsageRollupColumns], datetime | None, datetime | None]]
+    if h0 is not None and h1 is not None and h0 >= h1:
+        segments = [(UsageRollupMinuteTable, m0, m1)]
+    else:
+        segments = [(UsageRollupHourTable, h0, h1)]
+        if m0 is not None and h0 is not None and m0 < h0:
+            segments.append((UsageRollupMinuteTable, m0, h0))
+        if m1 is not None and h1 is not None and h1 < m1:
+            segments.append((UsageRollupMinuteTable, h1, m1))
+    return RollupQueryPlan(tuple(segments), tuple(raw))
+
+
+async def apply_contributions(
+    session: AsyncSession,
+    changes: Iterable[tuple[RollupContribution, int]],
+) -> None:
+    """Apply signed record contributions to the minute and hour rollups."""
+    changes = list(changes)
+    if not changes:
+        return
+    for table, width in ROLLUP_TABLES:
+        grouped: dict[str, tuple[datetime, RollupContribution, list[Any]]] = {}
+        for contribution, sign in changes:
+            bucket_start = floor_bucket(contribution.timestamp, width)
+            key = rollup_id(bucket_start, contribution.dimensions)
+            entry = grouped.get(key)
+            if entry is None:
+                entry = grouped[key] = (bucket_start, contribution, [])
+            entry[2].append((contribution, sign))
+
+        result = await session.execute(
+            select(table).where(table.id.in_(list(grouped))).with_for_update()
+        )
+        existing = {row.id: row for row in result.scalars()}
+
+        for key, (bucket_start, sample, items) in grouped.items():
+            accumulator = UsageRollupAccumulator()
+            row = existing.get(key)
+            if row is not None:
+                accumulator.merge_row(row)
+            for contribution, sign in items:
+                accumulator.add(contribution, sign)
+            if accumulator.request_count <= 0:
+                if row is not None:
+                    await session.delete(row)
+                continue
+            if row is None:
+                row = table(
+                    id=key,
+                    bucket_start=bucket_start,
+                    **{name: getattr(sample, name) for name in DIMENSIONS},
+                )
+                session.add(row)
+            accumulator.write_to(row)
+
+
+async def rebuild_range(
+    session: AsyncSession,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> int:
+    """Recompute all rollup rows for buckets in ``[start, end)`` from raw records.
+
+    ``start`` and ``end`` must be hour-aligned (or None for unbounded).
+    Returns the number of raw records rolled up.
+    """
+    for table, _ in ROLLUP_TABLES:
+        statement = delete(table)
+        if start is not None:
+            statement = statement.where(table.bucket_start >= start)
+        if end is not None:
+            statement = statement.where(table.bucket_start < end)
+        await session.execute(statement)
+
+    raw = select(*RAW_CONTRIBUTION_COLUMNS)
+    if start is not None:
+        raw = raw.where(UsageRecordTable.timestamp >= start)
+    if end is not None:
+        raw = raw.where(UsageRecordTable.timestamp < end)
+
+    accumulators: list[dict[str, tuple[UsageRollupColumns, Any]]] = [
+        {} for _ in ROLLUP_TABLES
+    ]
+    record_count = 0
+    stream = await session.stream(raw)
+    async for partition in stream.partitions(_STREAM_PARTITION_SIZE):
+        for record in partition:
+            contribution = RollupContribution.from_record(record)
+            record_count += 1
+            for (table, width), rows in zip(ROLLUP_TABLES, accumulators, strict=True):
+                bucket_start = floor_bucket(contribution.timestamp, width)
+                key = rollup_id(bucket_start, contribution.dimensions)
+                entry = rows.get(key)
+                if entry is None:
+                    row = table(
+                        id=key,
+                        bucket_start=bucket_start,
+                        **{name: getattr(contribution, name) for name in DIMENSIONS},
+                    )
+                    entry = rows[key] = (row, UsageRollupAccumulator())
+                entry[1].add(contribution)
+
+    for rows in accumulators:
+        for row, accumulator in rows.values():
+            accumulator.write_to(row)
+            session.add(row)
+    await session.flush()
+    return record_count
@@ -416,6 +416,7 @@ def _create_hybrid_detector_config() -> HybridDetectorConfig:
         "content_loop_threshold": internal_config.content_loop_threshold,
         "content_chunk_size": internal_config.content_chunk_size,
         "max_history_length": internal_config.max_history_length,
+        "engine": internal_config.short_detector_engine,
     }
     long_config = {
         "min_pattern_length": long_threshold.min_total_length,
@@ -95,11 +95,17 @@ def register_http_client(services: ServiceCollection) -> None:
 def register_rate_limiter(services: ServiceCollection) -> None:
     """Register rate limiter service and IRateLimiter interface alias."""
     from src.core.interfaces.rate_limiter_interface import IRateLimiter
-    from src.core.services.rate_limiter import RateLimiter
+    from src.core.services.rate_limiter import RateLimiter, create_rate_limiter
 
-    register_singleton_if_absent(services, RateLimiter)
+    def _rate_limiter_factory(provider: IServiceProvider) -> IRateLimiter:
+        app_config = provider.get_service(AppConfig)
+        return create_rate_limiter(app_config if app_config is not None else {})
 
-    def _rate_limiter_alias_factory(provider: IServiceProvider) -> RateLimiter:
+    register_singleton_if_absent(
+        services, RateLimiter, implementation_factory=_rate_limiter_factory
+    )
+
+    def _rate_limiter_alias_factory(provider: IServiceProvider) -> IRateLimiter:
         return provider.get_required_service(RateLimiter)
 
     register_singleton_if_absent(
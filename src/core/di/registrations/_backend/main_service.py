@@ -46,6 +46,7 @@ def register_backend_service(services: ServiceCollection) -> None:
     from src.core.interfaces.planning_phase_manager_interface import (
         IPlanningPhaseManager,
     )
+    from src.core.interfaces.rate_limiter_interface import IRateLimiter
     from src.core.interfaces.reasoning_config_applicator_interface import (
         IReasoningConfigApplicator,
     )
@@ -80,7 +81,7 @@ def register_backend_service(services: ServiceCollection) -> None:
         )
 
         backend_factory: BackendFactory = provider.get_required_service(BackendFactory)
-        rate_limiter: RateLimiter = provider.get_required_service(RateLimiter)
+        rate_limiter: IRateLimiter = provider.get_required_service(RateLimiter)
         config: IConfig = provider.get_required_service(cast(type, IConfig))
 
         session_service: ISessionService = provider.get_required_service(
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import time
 import zlib
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import Any
@@ -648,7 +649,7 @@ class CaptureSession:
     """
 
     header: CaptureFileHeader
-    entries: list[CapturedWireEvent] = field(default_factory=list)
+    entries: Sequence[CapturedWireEvent] = field(default_factory=list)
 
     def get_client_entries(self) -> list[CapturedWireEvent]:
         """Get entries for client-side traffic (directions 0 and 1)."""
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from pydantic import Field, field_validator
+from pydantic import ConfigDict, Field, field_validator
 
 from src.core.domain.base import ValueObject
 from src.core.domain.configuration.failover_models import FailoverRoute
@@ -19,6 +19,12 @@ class BackendConfiguration(ValueObject, IBackendConfig):
     It replaces the backend-related functionality of ProxyState.
     """
 
+    # Accept field names as well as aliases so ``to_dict()`` output round-trips
+    # through ``from_dict()`` (e.g. when sessions are restored from storage).
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True, frozen=True, populate_by_name=True
+    )
+
     # Primary fields with aliases for interface compatibility
     backend_type_value: str | None = Field(default=None, alias="backend_type")
     model_value: str | None = Field(default=None, alias="model")
@@ -12,7 +12,9 @@ from src.core.domain.base import ValueObject
 class PlanningPhaseOverrides(ValueObject):
     """Optional parameter overrides applied during planning phase."""
 
-    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+    model_config = ConfigDict(
+        frozen=True, arbitrary_types_allowed=True, populate_by_name=True
+    )
 
     temperature: float | None = Field(default=None, alias="temperature")
     top_p: float | None = Field(default=None, alias="top_p")
@@ -34,7 +36,9 @@ class PlanningPhaseConfiguration(ValueObject, IPlanningPhaseConfig):
     model for better planning and initial analysis, then switching back to a faster model.
     """
 
-    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+    model_config = ConfigDict(
+        frozen=True, arbitrary_types_allowed=True, populate_by_name=True
+    )
 
     # Backing fields with default values
     enabled_value: bool = Field(default=False, alias="enabled")
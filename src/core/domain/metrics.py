@@ -9,3 +9,6 @@ class TimerStats(BaseModel):
     average: float
     min: float
     max: float
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
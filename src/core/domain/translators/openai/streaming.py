@@ -183,6 +183,15 @@ def from_domain_to_openai_stream_chunk(chunk: Any) -> dict[str, Any]:
     """Translate a domain stream chunk to the canonical OpenAI SSE format."""
     if isinstance(chunk, dict):
         chunk_dict = chunk
+    elif isinstance(chunk, CanonicalStreamChunk):
+        # Only the first choice is forwarded, so only it is dumped
+        chunk_dict = {
+            "id": chunk.id,
+            "object": chunk.object,
+            "created": chunk.created,
+            "model": chunk.model,
+            "choices": [chunk.choices[0].model_dump()] if chunk.choices else [],
+        }
     else:
         dumped = getattr(chunk, "model_dump", lambda: None)()
         if isinstance(dumped, dict):
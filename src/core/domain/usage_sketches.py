@@ -0,0 +1,150 @@
+"""Mergeable sketches used by the usage statistics rollups.
+
+Rollup rows cannot keep every latency sample or session id they summarise,
+but dashboards still need percentiles and distinct-session counts across any
+set of rows. These sketches trade a small, bounded error for constant-size
+state that can be merged row by row:
+
+- ``LatencySketch`` is a log-bucketed histogram (DDSketch style) whose
+  quantiles are within ``RELATIVE_ACCURACY`` of the true value. Bucket counts
+  are additive, so samples can also be removed when a record is updated.
+- ``DistinctCountSketch`` is a sparse HyperLogLog for distinct session counts.
+  It is exact in practice for small cardinalities (linear counting) and has
+  roughly 1.6% standard error for large ones. It only supports additions.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+
+RELATIVE_ACCURACY = 0.01
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Values at or below this many milliseconds are counted as zero.
+_MIN_TRACKED_VALUE = 0.01
+
+_HLL_PRECISION = 12
+_HLL_REGISTERS = 1 << _HLL_PRECISION
+_HLL_REMAINDER_BITS = 64 - _HLL_PRECISION
+_HLL_ALPHA = 0.7213 / (1 + 1.079 / _HLL_REGISTERS)
+
+
+class LatencySketch:
+    """Log-bucketed histogram of non-negative latencies in milliseconds."""
+
+    __slots__ = ("_buckets", "_zero_count")
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of samples currently in the sketch."""
+        return self._zero_count + sum(self._buckets.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add ``count`` samples of ``value``; a negative count removes them."""
+        if value <= _MIN_TRACKED_VALUE:
+            self._zero_count = max(0, self._zero_count + count)
+            return
+        index = math.ceil(math.log(value) / _LOG_GAMMA)
+        remaining = self._buckets.get(index, 0) + count
+        if remaining > 0:
+            self._buckets[index] = remaining
+        else:
+            self._buckets.pop(index, None)
+
+    def remove(self, value: float) -> None:
+        """Remove one previously added sample of ``value``."""
+        self.add(value, -1)
+
+    def merge(self, other: LatencySketch) -> None:
+        """Add all samples of ``other`` to this sketch."""
+        self._zero_count += other._zero_count
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Return the ``q`` quantile (0..1), or None for an empty sketch.
+
+        Uses the same rank rule as ``TimingStats.from_values``: the value at
+        index ``int(count * q)`` of the sorted samples.
+        """
+        total = self.count
+        if total == 0:
+            return None
+        rank = min(int(total * q), total - 1)
+        if rank < self._zero_count:
+            return 0.0
+        seen = self._zero_count
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                return 2 * _GAMMA**index / (_GAMMA + 1)
+        return None  # pragma: no cover - counts always cover rank
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"z": self._zero_count, "b": sorted(self._buckets.items())},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str | None) -> LatencySketch:
+        sketch = cls()
+        if data:
+            payload = json.loads(data)
+            sketch._zero_count = int(payload.get("z", 0))
+            sketch._buckets = {int(i): int(c) for i, c in payload.get("b", ())}
+        return sketch
+
+
+class DistinctCountSketch:
+    """Sparse HyperLogLog counting distinct strings."""
+
+    __slots__ = ("_registers",)
+
+    def __init__(self) -> None:
+        self._registers: dict[int, int] = {}
+
+    def add(self, value: str) -> None:
+        hashed = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        register = hashed >> _HLL_REMAINDER_BITS
+        remainder = hashed & ((1 << _HLL_REMAINDER_BITS) - 1)
+        rank = _HLL_REMAINDER_BITS - remainder.bit_length() + 1
+        if rank > self._registers.get(register, 0):
+            self._registers[register] = rank
+
+    def merge(self, other: DistinctCountSketch) -> None:
+        registers = self._registers
+        for register, rank in other._registers.items():
+            if rank > registers.get(register, 0):
+                registers[register] = rank
+
+    def estimate(self) -> int:
+        """Return the estimated number of distinct values added."""
+        if not self._registers:
+            return 0
+        empty = _HLL_REGISTERS - len(self._registers)
+        harmonic = empty + sum(2.0**-rank for rank in self._registers.values())
+        estimate = _HLL_ALPHA * _HLL_REGISTERS * _HLL_REGISTERS / harmonic
+        if estimate <= 2.5 * _HLL_REGISTERS and empty:
+            estimate = _HLL_REGISTERS * math.log(_HLL_REGISTERS / empty)
+        return round(estimate)
+
+    def to_json(self) -> str:
+        return json.dumps(sorted(self._registers.items()), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str | None) -> DistinctCountSketch:
+        sketch = cls()
+        if data:
+            sketch._registers = {int(r): int(rank) for r, rank in json.loads(data)}
+        return sketch
@@ -58,6 +58,39 @@ class IB2buaMappingStore(ABC):
     ) -> None:
         """Record attempt metadata and retain it for diagnostics."""
 
+    async def allocate_attempt(
+        self,
+        *,
+        a_session_id: str,
+        create_b_session_id: Callable[[int], str],
+        backend_type: str | None,
+        effective_model: str | None,
+        reason: str | None,
+    ) -> B2buaAttemptRecord:
+        """Allocate the next B-leg sequence and record the attempt for it.
+
+        ``create_b_session_id`` maps the allocated sequence to the B-leg id.
+        Stores that can do both in one transaction should override this.
+        """
+        seq = await self.allocate_next_b_seq(a_session_id)
+        record = B2buaAttemptRecord(
+            b_session_id=create_b_session_id(seq),
+            a_session_id=a_session_id,
+            seq=seq,
+            backend_type=backend_type,
+            effective_model=effective_model,
+            reason=reason,
+        )
+        await self.record_attempt(
+            a_session_id=record.a_session_id,
+            b_session_id=record.b_session_id,
+            seq=record.seq,
+            backend_type=backend_type,
+            effective_model=effective_model,
+            reason=reason,
+        )
+        return record
+
     @abstractmethod
     async def get_attempt_records(self, a_session_id: str) -> list[B2buaAttemptRecord]:
         """Return recorded backend attempts for a single A-leg session."""
@@ -0,0 +1,74 @@
+"""Interfaces for durable session stores backing the session repository."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StoredSessionRecord:
+    """One persisted session row.
+
+    ``None`` payload/metadata fields mean "leave the stored value unchanged" when
+    the record is written, so partial updates (e.g. a fingerprint refresh for a
+    session whose payload has already been flushed) do not clobber earlier data.
+    """
+
+    session_id: str
+    last_access: float
+    payload: str | None = None
+    user_id: str | None = None
+    client_key: str | None = None
+    fingerprint: str | None = None
+    fingerprint_bundle: str | None = None
+    last_active_at: float | None = None
+
+
+class ISessionStore(ABC):
+    """Synchronous, batch-oriented storage backend for sessions.
+
+    Implementations are called from worker threads by
+    ``PersistentSessionRepository`` and must be safe to use from any thread.
+    """
+
+    @abstractmethod
+    def load_many(self, session_ids: Sequence[str]) -> dict[str, StoredSessionRecord]:
+        """Load the given sessions in a single round trip."""
+
+    @abstractmethod
+    def save_many(self, records: Sequence[StoredSessionRecord]) -> None:
+        """Upsert records in a single transaction."""
+
+    @abstractmethod
+    def delete_many(self, session_ids: Sequence[str]) -> int:
+        """Delete sessions and return how many rows were removed."""
+
+    @abstractmethod
+    def list_session_ids(self) -> list[str]:
+        """Return every stored session id."""
+
+    @abstractmethod
+    def find_session_ids_by_user(self, user_id: str) -> list[str]:
+        """Return ids of sessions owned by ``user_id``."""
+
+    @abstractmethod
+    def find_session_ids_by_client(
+        self, client_key: str, min_last_access: float | None = None
+    ) -> list[str]:
+        """Return ids of sessions for ``client_key``, most recently used first."""
+
+    @abstractmethod
+    def find_session_id_by_client_and_fingerprint(
+        self, client_key: str, fingerprint: str
+    ) -> str | None:
+        """Return the most recently used session matching client and fingerprint."""
+
+    @abstractmethod
+    def delete_inactive_before(self, cutoff: float) -> list[str]:
+        """Delete sessions inactive since ``cutoff`` and return their ids."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release any resources held by the store."""
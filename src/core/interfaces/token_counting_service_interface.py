@@ -0,0 +1,63 @@
+"""Interfaces for tokenizer-aware token counting."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class ITokenEncoder(Protocol):
+    """Counts tokens for one tokenizer."""
+
+    @property
+    def name(self) -> str:
+        """Stable identifier; cached counts are keyed by it."""
+        ...
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in ``text``."""
+        ...
+
+
+class ITokenCountingService(ABC):
+    """Count tokens with per-model encoders and cached per-text results."""
+
+    @abstractmethod
+    def register_encoder(
+        self, model_needles: Sequence[str], encoder: ITokenEncoder
+    ) -> None:
+        """Use ``encoder`` for models whose name contains any of ``model_needles``.
+
+        Later registrations take precedence over earlier ones and the built-in
+        model families. An empty needle matches every model.
+        """
+
+    @abstractmethod
+    def count(self, text: str, model: str | None = None) -> int:
+        """Count tokens in ``text`` with the encoder for ``model``."""
+
+    @abstractmethod
+    def count_many(self, texts: Sequence[str], model: str | None = None) -> list[int]:
+        """Count tokens for each of ``texts``."""
+
+    @abstractmethod
+    async def count_many_async(
+        self, texts: Sequence[str], model: str | None = None
+    ) -> list[int]:
+        """Count tokens for each of ``texts`` without blocking the event loop."""
+
+    @abstractmethod
+    def count_joined(self, texts: Sequence[str], model: str | None = None) -> int:
+        """Count tokens of ``texts`` joined by newlines, one cached count per text."""
+
+    @abstractmethod
+    def count_messages(self, messages: Sequence[Any], model: str | None = None) -> int:
+        """Count prompt tokens of chat messages, one cached count per message."""
+
+    @abstractmethod
+    async def count_messages_async(
+        self, messages: Sequence[Any], model: str | None = None
+    ) -> int:
+        """Async variant of :meth:`count_messages` for large prompts."""
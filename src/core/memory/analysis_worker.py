@@ -7,9 +7,14 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import heapq
+import itertools
 import logging
+import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from src.core.memory.summary_generator import SummaryRequest, SummaryResult
 from src.core.services import metrics_service
 
 if TYPE_CHECKING:
@@ -19,13 +24,38 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# How long the dispatcher waits on an empty queue before letting the memory
+# service expire stale in-progress entries
+_IDLE_WAIT_SECONDS = 30.0
+
+
+@dataclass(order=True)
+class _PendingAnalysis:
+    """Dequeued session waiting for a free worker.
+
+    Orders oldest sessions first; sessions of the same age go smallest first.
+    """
+
+    enabled_at: float
+    size_bytes: int
+    sequence: int
+    session_id: str = field(compare=False)
+    owner: tuple[str | None, str] | None = field(compare=False)
+    queued_at: float = field(compare=False)
+
 
 class AnalysisWorker:
-    """Worker that processes the analysis queue and generates summaries.
+    """Worker pool that processes the analysis queue and generates summaries.
+
+    A dispatcher task awaits sessions from the MemoryService analysis queue
+    and moves them into a priority queue ordered by session age and captured
+    size. ``max_concurrent_analyses`` worker tasks drain it; a worker that
+    picks a small session also takes up to ``analysis_batch_size - 1`` other
+    small sessions of the same user and summarizes them in one LLM call.
 
-    Drains sessions from the MemoryService analysis queue, constructs
-    SessionData objects, and calls SummaryGenerator to create and persist
-    summaries.
+    The priority queue holds at most ``analysis_batch_size`` sessions per
+    worker; while it is full the dispatcher stops taking sessions, so the
+    bounded MemoryService queue keeps applying backpressure.
     """
 
     def __init__(
@@ -46,23 +76,40 @@ class AnalysisWorker:
         self._config = config
         self._running = False
         self._tasks: list[asyncio.Task] = []
-        self._semaphore: asyncio.Semaphore | None = None
+        # Sessions survive stop()/start() so a restart resumes them
+        self._pending: list[_PendingAnalysis] = []
+        self._max_pending = max(1, config.max_concurrent_analyses) * max(
+            1, config.analysis_batch_size
+        )
+        pending_lock = asyncio.Lock()
+        self._pending_ready = asyncio.Condition(pending_lock)
+        self._pending_space = asyncio.Condition(pending_lock)
+        self._sequence = itertools.count()
 
     async def start(self) -> None:
-        """Start the analysis worker."""
+        """Start the dispatcher and the worker tasks."""
         if self._running:
             logger.warning("Analysis worker already running")
             return
 
         self._running = True
-        self._semaphore = asyncio.Semaphore(self._config.max_concurrent_analyses)
 
-        # Start worker task
-        task = asyncio.create_task(self._worker_loop(), name="memory_analysis_worker")
-        self._tasks.append(task)
+        self._tasks.append(
+            asyncio.create_task(
+                self._dispatch_loop(), name="memory_analysis_dispatcher"
+            )
+        )
+        worker_count = max(1, self._config.max_concurrent_analyses)
+        for index in range(worker_count):
+            self._tasks.append(
+                asyncio.create_task(
+                    self._worker_loop(), name=f"memory_analysis_worker_{index}"
+                )
+            )
         logger.info(
-            "Started analysis worker (max_concurrent=%d, timeout=%ds)",
-            self._config.max_concurrent_analyses,
+            "Started analysis worker (max_concurrent=%d, batch_size=%d, timeout=%ds)",
+            worker_count,
+            self._config.analysis_batch_size,
             self._config.analysis_timeout_seconds,
         )
 
@@ -78,28 +125,63 @@ class AnalysisWorker:
         self._tasks.clear()
         logger.info("Stopped analysis worker")
 
-    async def _worker_loop(self) -> None:
-        """Main worker loop that processes the analysis queue."""
+    async def _dispatch_loop(self) -> None:
+        """Move sessions from the analysis queue into the priority queue."""
+        wait_for_session = getattr(
+            self._memory_service, "wait_for_pending_analysis_session", None
+        )
         while self._running:
             try:
-                metrics_service.inc(
-                    "memory.analysis.queue_depth.sample",
-                    self._memory_service.get_analysis_queue_size(),
-                )
-                # Get next session from queue
-                session_id = await self._memory_service.get_pending_analysis_session()
-
-                if session_id is None:
-                    # Queue is empty, wait before checking again
-                    await asyncio.sleep(1.0)
-                    continue
-
-                # Process with semaphore for concurrency control
-                if self._semaphore:
-                    async with self._semaphore:
-                        await self._process_session(session_id)
+                async with self._pending_space:
+                    await self._pending_space.wait_for(
+                        lambda: len(self._pending) < self._max_pending
+                    )
+                if wait_for_session is not None:
+                    session_id = await wait_for_session(timeout=_IDLE_WAIT_SECONDS)
                 else:
-                    await self._process_session(session_id)
+                    session_id = (
+                        await self._memory_service.get_pending_analysis_session()
+                    )
+                    if session_id is None:
+                        await asyncio.sleep(1.0)
+                if session_id is not None:
+                    await self._enqueue(session_id)
+
+            except asyncio.CancelledError:
+                logger.debug("Analysis dispatcher cancelled")
+                raise
+            except Exception as e:
+                logger.exception("Error in analysis dispatcher: %s", e)
+                await asyncio.sleep(1.0)  # Avoid tight loop on errors
+
+    async def _enqueue(self, session_id: str) -> None:
+        """Add a dequeued session to the priority queue."""
+        state = await self._memory_service.get_session_state(session_id)
+        size_bytes = await self._memory_service.get_captured_size(session_id)
+        entry = _PendingAnalysis(
+            # Sessions without state sort first; they are only skipped
+            enabled_at=state.enabled_at.timestamp() if state else 0.0,
+            size_bytes=size_bytes,
+            sequence=next(self._sequence),
+            session_id=session_id,
+            owner=(state.tenant_id, state.user_id) if state else None,
+            queued_at=(
+                state.queued_at
+                if state and state.queued_at is not None
+                else time.monotonic()
+            ),
+        )
+        async with self._pending_ready:
+            heapq.heappush(self._pending, entry)
+            self._pending_ready.notify()
+        metrics_service.set_gauge("memory.analysis.queue_depth", self.get_queue_size())
+
+    async def _worker_loop(self) -> None:
+        """Worker loop that processes sessions from the priority queue."""
+        while self._running:
+            try:
+                batch = await self._next_batch()
+                await self._process_batch(batch)
 
             except asyncio.CancelledError:
                 logger.debug("Analysis worker loop cancelled")
@@ -108,90 +190,196 @@ class AnalysisWorker:
                 logger.exception("Error in analysis worker loop: %s", e)
                 await asyncio.sleep(1.0)  # Avoid tight loop on errors
 
+    async def _next_batch(self) -> list[_PendingAnalysis]:
+        """Wait for the highest-priority session and any small companions."""
+        async with self._pending_ready:
+            await self._pending_ready.wait_for(lambda: bool(self._pending))
+            first = heapq.heappop(self._pending)
+            self._pending_space.notify()
+            batch = [first]
+            limit = self._config.analysis_batch_size
+            if limit > 1 and self._is_batchable(first):
+                companions = heapq.nsmallest(
+                    limit - 1,
+                    (
+                        entry
+                        for entry in self._pending
+                        if entry.owner == first.owner and self._is_batchable(entry)
+                    ),
+                )
+                if companions:
+                    taken = {entry.sequence for entry in companions}
+                    self._pending = [
+                        entry for entry in self._pending if entry.sequence not in taken
+                    ]
+                    heapq.heapify(self._pending)
+                    batch.extend(companions)
+        metrics_service.set_gauge("memory.analysis.queue_depth", self.get_queue_size())
+        return batch
+
+    def _is_batchable(self, entry: _PendingAnalysis) -> bool:
+        """Check whether a session is small enough to share an LLM call."""
+        return (
+            entry.owner is not None
+            and entry.size_bytes <= self._config.analysis_batch_max_bytes
+        )
+
+    async def _process_batch(self, batch: list[_PendingAnalysis]) -> None:
+        """Process sessions taken from the priority queue and record latency."""
+        started = time.monotonic()
+        for entry in batch:
+            metrics_service.record_duration(
+                "memory.analysis.queue_wait.duration", started - entry.queued_at
+            )
+        if len(batch) > 1:
+            metrics_service.inc("memory.analysis.batched", len(batch))
+
+        await self._process_sessions([entry.session_id for entry in batch])
+
+        finished = time.monotonic()
+        for entry in batch:
+            metrics_service.record_duration(
+                "memory.analysis.end_to_end.duration", finished - entry.queued_at
+            )
+
     async def _process_session(self, session_id: str) -> None:
         """Process a single session for summary generation.
 
         Args:
             session_id: The session identifier to process.
         """
-        logger.debug("Processing session %s for summary generation", session_id)
+        await self._process_sessions([session_id])
 
-        try:
-            with metrics_service.timer("memory.analysis.process.duration"):
-                # Get session state
-                state = await self._memory_service.get_session_state(session_id)
-                if state is None:
-                    logger.warning("Session %s state not found, skipping", session_id)
-                    metrics_service.inc("memory.analysis.skipped")
-                    await self._memory_service.complete_analysis(session_id)
-                    return
+    async def _process_sessions(self, session_ids: list[str]) -> None:
+        """Generate summaries for sessions, batching them when there are several.
 
-                # Get captured interactions
-                interactions, is_partial = (
-                    await self._memory_service.get_captured_interactions(session_id)
-                )
+        A batch gets the per-session analysis timeout for every session it
+        summarizes.
 
-                # Get deterministic tool events (file edits and git commits)
-                file_edits, git_commits = (
-                    await self._memory_service.get_captured_tool_events(session_id)
-                )
+        Args:
+            session_ids: The session identifiers to process.
+        """
+        logger.debug("Processing sessions %s for summary generation", session_ids)
 
-                if not interactions:
-                    logger.debug("No interactions for session %s, skipping", session_id)
-                    metrics_service.inc("memory.analysis.empty")
-                    await self._memory_service.complete_analysis(session_id)
+        try:
+            with metrics_service.timer("memory.analysis.process.duration"):
+                requests: list[SummaryRequest] = []
+                for session_id in session_ids:
+                    request = await self._load_request(session_id)
+                    if request is not None:
+                        requests.append(request)
+                if not requests:
                     return
 
                 # Apply timeout to summary generation
+                timeout = self._config.analysis_timeout_seconds * len(requests)
                 try:
-                    result = await asyncio.wait_for(
-                        self._summary_generator.generate_summary(
-                            session_id=session_id,
-                            user_id=state.user_id,
-                            interactions=interactions,
-                            tenant_id=state.tenant_id,
-                            project_id=state.project_id,
-                            project_root=state.project_root,
-                            backend_model=state.backend_model,
-                            client_agent=state.client_id,
-                            is_partial=is_partial,
-                            deterministic_file_edits=file_edits,
-                            deterministic_git_commits=git_commits,
-                        ),
-                        timeout=self._config.analysis_timeout_seconds,
+                    results = await asyncio.wait_for(
+                        self._generate(requests), timeout=timeout
                     )
-
-                    if result.success:
-                        metrics_service.inc("memory.analysis.success")
-                        logger.info(
-                            "Summary generated for session %s (title: %s)",
-                            session_id,
-                            result.summary.title if result.summary else "N/A",
-                        )
-                    else:
-                        metrics_service.inc("memory.analysis.failure")
-                        logger.warning(
-                            "Summary generation failed for session %s: %s",
-                            session_id,
-                            result.error,
-                        )
-
                 except asyncio.TimeoutError:
-                    metrics_service.inc("memory.analysis.timeout")
+                    metrics_service.inc("memory.analysis.timeout", len(requests))
                     logger.warning(
-                        "Summary generation timed out for session %s (limit: %ds)",
-                        session_id,
-                        self._config.analysis_timeout_seconds,
+                        "Summary generation timed out for sessions %s (limit: %ds)",
+                        [request.session_id for request in requests],
+                        timeout,
                         exc_info=True,
                     )
+                    return
+
+                for request, result in zip(requests, results, strict=True):
+                    self._record_result(request.session_id, result)
 
         except Exception as e:
-            metrics_service.inc("memory.analysis.error")
-            logger.exception("Error processing session %s: %s", session_id, e)
+            metrics_service.inc("memory.analysis.error", len(session_ids))
+            logger.exception("Error processing sessions %s: %s", session_ids, e)
 
         finally:
             # Always mark analysis complete to clean up state
-            await self._memory_service.complete_analysis(session_id)
+            for session_id in session_ids:
+                await self._memory_service.complete_analysis(session_id)
+
+    async def _load_request(self, session_id: str) -> SummaryRequest | None:
+        """Collect what is needed to summarize a session.
+
+        Returns:
+            The summary request, or None if the session has nothing to summarize.
+        """
+        # Get session state
+        state = await self._memory_service.get_session_state(session_id)
+        if state is None:
+            logger.warning("Session %s state not found, skipping", session_id)
+            metrics_service.inc("memory.analysis.skipped")
+            return None
+
+        # Get captured interactions
+        interactions, is_partial = await self._memory_service.get_captured_interactions(
+            session_id
+        )
+
+        # Get deterministic tool events (file edits and git commits)
+        file_edits, git_commits = await self._memory_service.get_captured_tool_events(
+            session_id
+        )
+
+        if not interactions:
+            logger.debug("No interactions for session %s, skipping", session_id)
+            metrics_service.inc("memory.analysis.empty")
+            return None
+
+        return SummaryRequest(
+            session_id=session_id,
+            user_id=state.user_id,
+            interactions=interactions,
+            tenant_id=state.tenant_id,
+            project_id=state.project_id,
+            project_root=state.project_root,
+            backend_model=state.backend_model,
+            client_agent=state.client_id,
+            is_partial=is_partial,
+            deterministic_file_edits=file_edits,
+            deterministic_git_commits=git_commits,
+        )
+
+    async def _generate(self, requests: list[SummaryRequest]) -> list[SummaryResult]:
+        """Summarize sessions, using one LLM call when there are several."""
+        if len(requests) > 1 and hasattr(
+            self._summary_generator, "generate_summary_batch"
+        ):
+            return await self._summary_generator.generate_summary_batch(requests)
+        return [
+            await self._summary_generator.generate_summary(
+                session_id=request.session_id,
+                user_id=request.user_id,
+                interactions=request.interactions,
+                tenant_id=request.tenant_id,
+                project_id=request.project_id,
+                project_root=request.project_root,
+                backend_model=request.backend_model,
+                client_agent=request.client_agent,
+                is_partial=request.is_partial,
+                deterministic_file_edits=request.deterministic_file_edits,
+                deterministic_git_commits=request.deterministic_git_commits,
+            )
+            for request in requests
+        ]
+
+    def _record_result(self, session_id: str, result: SummaryResult) -> None:
+        """Record the outcome of summarizing a session."""
+        if result.success:
+            metrics_service.inc("memory.analysis.success")
+            logger.info(
+                "Summary generated for session %s (title: %s)",
+                session_id,
+                result.summary.title if result.summary else "N/A",
+            )
+        else:
+            metrics_service.inc("memory.analysis.failure")
+            logger.warning(
+                "Summary generation failed for session %s: %s",
+                session_id,
+                result.error,
+            )
 
     @property
     def is_running(self) -> bool:
@@ -199,5 +387,9 @@ class AnalysisWorker:
         return self._running
 
     def get_queue_size(self) -> int:
-        """Get the current analysis queue size."""
-        return self._memory_service.get_analysis_queue_size()
+        """Get the number of sessions waiting for analysis.
+
+        Counts sessions still in the MemoryService queue and sessions already
+        dispatched to the worker pool but not yet picked up.
+        """
+        return self._memory_service.get_analysis_queue_size() + len(self._pending)
@@ -58,6 +58,9 @@ class MemoryConfiguration(DomainModel):
     analysis_queue_maxsize: int = 100
     analysis_timeout_seconds: int = 30
     max_concurrent_analyses: int = 4
+    # Small sessions of the same user are summarized together in one LLM call
+    analysis_batch_size: int = Field(default=4, ge=1)  # 1 disables batching
+    analysis_batch_max_bytes: int = 16 * 1024  # captured size that counts as small
 
     # Context injection template
     context_template: str | None = None
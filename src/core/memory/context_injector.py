@@ -13,6 +13,8 @@ from typing import TYPE_CHECKING
 from src.core.memory.config import MemoryConfiguration
 from src.core.memory.interfaces import LLMCaller
 from src.core.memory.prompt_loader import PromptLoader
+from src.core.memory.repository import ISessionSearchRepository
+from src.core.memory.search_index import STOP_WORDS
 from src.core.services import metrics_service
 
 if TYPE_CHECKING:
@@ -24,6 +26,11 @@ logger = logging.getLogger(__name__)
 # Marker per Req 8.11 - inserted when no context is injected
 NO_PRIOR_CONTEXT_MARKER = "[NO_PRIOR_CONTEXT_PROVIDED]"
 
+# Full-text relevance contributes at most this much to a summary's score ...
+_TEXT_SCORE_WEIGHT = 0.6
+# ... reaching half of it at this BM25 score.
+_TEXT_SCORE_HALF_POINT = 2.0
+
 
 @dataclass
 class ScoredSummary:
@@ -116,13 +123,26 @@ class ContextInjector:
             project_root=project_root,
         )
 
+        # Add the best full-text matches from the user's whole history
+        text_scores: dict[str, float] | None = None
+        if isinstance(self._repository, ISessionSearchRepository):
+            text_scores = await self._search_history(
+                self._repository,
+                summaries,
+                user_id=user_id,
+                current_prompt=current_prompt,
+                tenant_id=tenant_id,
+                project_id=project_id,
+                project_root=project_root,
+            )
+
         if not summaries:
             logger.debug("No historical sessions found for user %s", user_id)
             metrics_service.inc("memory.context.no_history")
             return None
 
         # Score summaries by relevance (Req 8.10)
-        scored = self._score_summaries(summaries, current_prompt)
+        scored = self._score_summaries(summaries, current_prompt, text_scores)
 
         # Filter by relevance threshold (Req 8.10)
         threshold = self._config.context_relevance_threshold
@@ -174,20 +194,60 @@ class ContextInjector:
 
         return None
 
+    async def _search_history(
+        self,
+        repository: ISessionSearchRepository,
+        summaries: list[SessionSummary],
+        *,
+        user_id: str,
+        current_prompt: str,
+        tenant_id: str | None,
+        project_id: str | None,
+        project_root: str | None,
+    ) -> dict[str, float] | None:
+        """Merge full-text search hits into ``summaries``.
+
+        Returns:
+            BM25 scores by summary id, or None if the search failed.
+        """
+        try:
+            hits = await repository.search_sessions(
+                user_id,
+                current_prompt,
+                limit=self._config.max_sessions_to_consider,
+                tenant_id=tenant_id,
+                project_id=project_id,
+                project_root=project_root,
+            )
+        except Exception as e:
+            logger.warning("Memory search failed, using recent sessions: %s", e)
+            metrics_service.inc("memory.context.search_failure")
+            return None
+
+        known = {summary.id for summary in summaries}
+        summaries.extend(hit.summary for hit in hits if hit.summary.id not in known)
+        return {hit.summary.id: hit.score for hit in hits}
+
     def _score_summaries(
-        self, summaries: list[SessionSummary], current_prompt: str
+        self,
+        summaries: list[SessionSummary],
+        current_prompt: str,
+        text_scores: dict[str, float] | None = None,
     ) -> list[ScoredSummary]:
         """Score summaries by relevance to current prompt.
 
         Scoring strategy (Req 8.10):
-        - File/feature overlap: +0.3 per matching file/component
-        - Topic/goal match: +0.2 per matching keyword
+        - File/feature overlap: +0.15 per matching file/component
+        - Topic/goal match: BM25 score from the repository's search index,
+          scaled to at most +0.6; summaries without one get +0.1 per
+          matching keyword
         - Recency bonus: +0.2 for sessions within last 24h, +0.1 within 7d
-        - Branch match: +0.1 if same branch
+        - Open tasks bonus: +0.15 if the session left open tasks
 
         Args:
             summaries: List of session summaries.
             current_prompt: The current user prompt.
+            text_scores: Optional BM25 scores by summary id.
 
         Returns:
             List of scored summaries.
@@ -210,40 +270,26 @@ class ContextInjector:
                         score += 0.15
                         break
 
-            # Topic/goal match - keywords from goals and scope
-            keywords = set()
-            if summary.scope:
-                keywords.update(summary.scope.lower().split())
-            for goal in summary.goals:
-                keywords.update(goal.lower().split())
-            if summary.title:
-                keywords.update(summary.title.lower().split())
-
-            # Filter common words
-            common_words = {
-                "the",
-                "a",
-                "an",
-                "and",
-                "or",
-                "to",
-                "for",
-                "in",
-                "on",
-                "of",
-                "with",
-                "is",
-                "are",
-                "was",
-                "were",
-                "be",
-                "been",
-                "being",
-            }
-            keywords = keywords - common_words
-
-            matching_keywords = prompt_words & keywords
-            score += len(matching_keywords) * 0.1  # +0.1 per matching keyword
+            text_score = text_scores.get(summary.id) if text_scores else None
+            if text_score is not None:
+                # Saturating transform of the (unbounded) BM25 score
+                score += (
+                    _TEXT_SCORE_WEIGHT
+                    * text_score
+                    / (text_score + _TEXT_SCORE_HALF_POINT)
+                )
+            else:
+                # Topic/goal match - keywords from goals and scope
+                keywords = set()
+                if summary.scope:
+                    keywords.update(summary.scope.lower().split())
+                for goal in summary.goals:
+                    keywords.update(goal.lower().split())
+                if summary.title:
+                    keywords.update(summary.title.lower().split())
+
+                matching_keywords = (prompt_words & keywords) - STOP_WORDS
+                score += len(matching_keywords) * 0.1  # +0.1 per matching keyword
 
             # Recency bonus
             age = now - summary.session_start
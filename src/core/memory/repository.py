@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from src.core.memory.models import SessionSummary
+from src.core.memory.search_index import SessionSearchHit
 
 
 class IMemoryRepository(Protocol):
@@ -37,3 +38,20 @@ class IMemoryRepository(Protocol):
     async def get_or_create_project_id(self, user_id: str, project_root: str) -> str:
         """Get or create a stable project_id for a user+project_root pair."""
         ...
+
+
+@runtime_checkable
+class ISessionSearchRepository(Protocol):
+    """Interface for repositories that rank summaries by full-text relevance."""
+
+    async def search_sessions(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        tenant_id: str | None = None,
+        project_id: str | None = None,
+        project_root: str | None = None,
+    ) -> list[SessionSearchHit]:
+        """Retrieve the summaries most relevant to a query, best first."""
+        ...
@@ -0,0 +1,131 @@
+"""Full-text retrieval support for ProxyMem session summaries.
+
+Summaries are indexed as bags of terms taken from their title, scope, goals,
+key decisions, remaining tasks and modified file paths. Repositories store one
+posting per (summary, term) and rank the summaries containing a prompt's terms
+with Okapi BM25, so retrieval cost follows the postings of those terms rather
+than the number of stored sessions.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.memory.models import SessionSummary
+
+# Common words that carry no topical signal
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "to",
+        "for",
+        "in",
+        "on",
+        "of",
+        "with",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+    }
+)
+
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 32
+
+# Standard Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class SessionSearchHit:
+    """Session summary with its BM25 relevance to a search query."""
+
+    summary: SessionSummary
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase index terms, dropping stop words.
+
+    Args:
+        text: Free text, e.g. a prompt, goal or file path.
+
+    Returns:
+        Terms in order of appearance; repeated terms are kept.
+    """
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def query_terms(text: str) -> list[str]:
+    """Return the distinct terms of a search query, capped at MAX_QUERY_TERMS."""
+    return list(dict.fromkeys(tokenize(text)))[:MAX_QUERY_TERMS]
+
+
+def summary_terms(summary: SessionSummary) -> Counter[str]:
+    """Return the term frequencies of a session summary's searchable text.
+
+    Args:
+        summary: Summary to index.
+
+    Returns:
+        Counter mapping each term to its frequency in the summary.
+    """
+    fields: list[str] = [summary.title, summary.scope or ""]
+    fields.extend(summary.goals)
+    fields.extend(summary.key_decisions)
+    fields.extend(task.description for task in summary.remaining_tasks)
+    fields.extend(file_change.path for file_change in summary.modified_files)
+    terms: Counter[str] = Counter()
+    for field in fields:
+        terms.update(tokenize(field))
+    return terms
+
+
+def bm25_scores(
+    postings: Iterable[tuple[str, str, int, int]],
+    document_count: int,
+    average_length: float,
+) -> dict[str, float]:
+    """Score documents by Okapi BM25 from the postings of the query terms.
+
+    Args:
+        postings: ``(document_id, term, term_frequency, document_length)``
+            rows for every query term in every document of the searched scope.
+        document_count: Number of documents in the searched scope.
+        average_length: Average document length (in terms) in that scope.
+
+    Returns:
+        Mapping of document id to BM25 score for documents with any match.
+    """
+    rows = list(postings)
+    document_frequency = Counter(term for _, term, _, _ in rows)
+    average_length = average_length or 1.0
+    scores: dict[str, float] = {}
+    for document_id, term, frequency, length in rows:
+        df = document_frequency[term]
+        idf = math.log(1.0 + (document_count - df + 0.5) / (df + 0.5))
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * length / average_length)
+        weight = idf * frequency * (BM25_K1 + 1.0) / (frequency + norm)
+        scores[document_id] = scores.get(document_id, 0.0) + weight
+    return scores
@@ -77,6 +77,7 @@ class SessionMemoryState:
     backend_model: str | None = None
     enabled_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     queued_for_analysis: bool = False
+    queued_at: float | None = None  # time.monotonic() when put on the analysis queue
     summary_task: asyncio.Task | None = (
         None  # Background task for delayed summarization
     )
@@ -329,6 +330,7 @@ class MemoryService:
 
         try:
             self._analysis_queue.put_nowait(session_id)
+            state.queued_at = time.monotonic()
             metrics_service.inc("memory.analysis.requeued")
             return RequeueResult(
                 success=True, message="Session queued for summary regeneration."
@@ -407,6 +409,7 @@ class MemoryService:
             # Immediate summarization for delay=0 (backwards compatibility)
             try:
                 self._analysis_queue.put_nowait(session_id)
+                state.queued_at = time.monotonic()
                 metrics_service.inc("memory.analysis.queued")
                 logger.info("Session %s queued for analysis immediately", session_id)
             except asyncio.QueueFull:
@@ -474,6 +477,10 @@ class MemoryService:
         """
         return await self._capture_buffer.get_and_clear(session_id)
 
+    async def get_captured_size(self, session_id: str) -> int:
+        """Get the size in bytes of the interactions captured for a session."""
+        return await self._capture_buffer.get_buffer_size(session_id)
+
     async def get_captured_tool_events(
         self, session_id: str
     ) -> tuple[list[FileEditEvent], list[GitCommitEvent]]:
@@ -491,34 +498,59 @@ class MemoryService:
         """
         try:
             session_id = self._analysis_queue.get_nowait()
-            metrics_service.inc("memory.analysis.dequeued")
-            # Clean up stale entries before adding new one
-            await self._cleanup_stale_analysis_in_progress()
-            # Track when session entered analysis_in_progress for TTL cleanup
-            # Enforce max limit to prevent unbounded growth
-            async with self._analysis_lock:
-                if len(self._analysis_in_progress) >= _MAX_ANALYSIS_IN_PROGRESS:
-                    # If still at limit, evict oldest entries (by timestamp)
-                    sorted_entries = sorted(
-                        self._analysis_in_progress.items(), key=lambda x: x[1]
-                    )
-                    excess_count = (
-                        len(self._analysis_in_progress) - _MAX_ANALYSIS_IN_PROGRESS + 1
-                    )
-                    for sid, _ in sorted_entries[:excess_count]:
-                        self._analysis_in_progress.pop(sid, None)
-                    if logger.isEnabledFor(logging.DEBUG):
-                        logger.debug(
-                            "Evicted %d oldest analysis_in_progress entries (max=%d reached)",
-                            excess_count,
-                            _MAX_ANALYSIS_IN_PROGRESS,
-                        )
-                self._analysis_in_progress[session_id] = time.time()
-            return session_id
         except asyncio.QueueEmpty:
             # Still clean up stale entries even if queue is empty
             await self._cleanup_stale_analysis_in_progress()
             return None
+        await self._track_analysis_in_progress(session_id)
+        return session_id
+
+    async def wait_for_pending_analysis_session(
+        self, timeout: float | None = None
+    ) -> str | None:
+        """Wait for the next session ID pending analysis.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            The session ID, or None if the timeout expired first.
+        """
+        try:
+            session_id = await asyncio.wait_for(
+                self._analysis_queue.get(), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            await self._cleanup_stale_analysis_in_progress()
+            return None
+        await self._track_analysis_in_progress(session_id)
+        return session_id
+
+    async def _track_analysis_in_progress(self, session_id: str) -> None:
+        """Record a dequeued session as in progress for TTL cleanup."""
+        metrics_service.inc("memory.analysis.dequeued")
+        # Clean up stale entries before adding new one
+        await self._cleanup_stale_analysis_in_progress()
+        # Track when session entered analysis_in_progress for TTL cleanup
+        # Enforce max limit to prevent unbounded growth
+        async with self._analysis_lock:
+            if len(self._analysis_in_progress) >= _MAX_ANALYSIS_IN_PROGRESS:
+                # If still at limit, evict oldest entries (by timestamp)
+                sorted_entries = sorted(
+                    self._analysis_in_progress.items(), key=lambda x: x[1]
+                )
+                excess_count = (
+                    len(self._analysis_in_progress) - _MAX_ANALYSIS_IN_PROGRESS + 1
+                )
+                for sid, _ in sorted_entries[:excess_count]:
+                    self._analysis_in_progress.pop(sid, None)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Evicted %d oldest analysis_in_progress entries (max=%d reached)",
+                        excess_count,
+                        _MAX_ANALYSIS_IN_PROGRESS,
+                    )
+            self._analysis_in_progress[session_id] = time.time()
 
     async def complete_analysis(self, session_id: str) -> None:
         """Mark analysis as complete for a session."""
@@ -549,6 +581,7 @@ class MemoryService:
             # Queue for actual analysis processing
             try:
                 self._analysis_queue.put_nowait(session_id)
+                state.queued_at = time.monotonic()
                 metrics_service.inc("memory.analysis.queued")
                 logger.info("Session %s queued for delayed analysis", session_id)
             except asyncio.QueueFull:
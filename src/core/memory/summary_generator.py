@@ -10,6 +10,7 @@ import contextlib
 import logging
 import re
 import xml.etree.ElementTree as ElementTree
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Literal
@@ -35,6 +36,40 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_BLOCK_PATTERN = re.compile(
+    r"<session_summary[^>]*>.*?</session_summary>", re.DOTALL
+)
+
+# Wraps the per-session summary prompts of a batched summarization call
+_BATCH_PROMPT = """You will summarize {count} independent sessions in one response.
+Each <summary_request> below is complete on its own. Follow the instructions
+of every request separately and never mix information between sessions.
+
+Respond with exactly {count} <session_summary> blocks, one per request, and
+set <metadata><session_id> in each block to the session_id of its request.
+
+{tasks}
+"""
+
+
+@dataclass
+class SummaryRequest:
+    """Inputs for summarizing one session."""
+
+    session_id: str
+    user_id: str
+    interactions: list[CapturedInteraction]
+    tenant_id: str | None = None
+    project_id: str | None = None
+    project_root: str | None = None
+    backend_model: str | None = None
+    client_agent: str | None = None
+    branch: str | None = None
+    head_sha: str | None = None
+    is_partial: bool = False
+    deterministic_file_edits: list[FileEditEvent] | None = None
+    deterministic_git_commits: list[GitCommitEvent] | None = None
+
 
 @dataclass
 class SummaryResult:
@@ -258,43 +293,87 @@ class SummaryGenerator:
         Returns:
             SummaryResult with success status and summary or error.
         """
+        request = SummaryRequest(
+            session_id=session_id,
+            user_id=user_id,
+            interactions=interactions,
+            tenant_id=tenant_id,
+            project_id=project_id,
+            project_root=project_root,
+            backend_model=backend_model,
+            client_agent=client_agent,
+            branch=branch,
+            head_sha=head_sha,
+            is_partial=is_partial,
+            deterministic_file_edits=deterministic_file_edits,
+            deterministic_git_commits=deterministic_git_commits,
+        )
         metrics_service.inc("memory.summary.requested")
         with metrics_service.timer("memory.summary.generate.duration"):
-            return await self._generate_summary_impl(
-                session_id=session_id,
-                user_id=user_id,
-                interactions=interactions,
-                tenant_id=tenant_id,
-                project_id=project_id,
-                project_root=project_root,
-                backend_model=backend_model,
-                client_agent=client_agent,
-                branch=branch,
-                head_sha=head_sha,
-                is_partial=is_partial,
-                deterministic_file_edits=deterministic_file_edits,
-                deterministic_git_commits=deterministic_git_commits,
-            )
+            return await self._generate_summary_impl(request)
 
-    async def _generate_summary_impl(
-        self,
-        session_id: str,
-        user_id: str,
-        interactions: list[CapturedInteraction],
-        *,
-        tenant_id: str | None = None,
-        project_id: str | None = None,
-        project_root: str | None = None,
-        backend_model: str | None = None,
-        client_agent: str | None = None,
-        branch: str | None = None,
-        head_sha: str | None = None,
-        is_partial: bool = False,
-        deterministic_file_edits: list[FileEditEvent] | None = None,
-        deterministic_git_commits: list[GitCommitEvent] | None = None,
-    ) -> SummaryResult:
+    async def generate_summary_batch(
+        self, requests: Sequence[SummaryRequest]
+    ) -> list[SummaryResult]:
+        """Generate summaries for several sessions with a single LLM call.
+
+        Each session's prompt is built exactly as for generate_summary and
+        the prompts are sent together, asking for one <session_summary> block
+        per session. Sessions whose block is missing or invalid are retried
+        on their own, so a batch never yields fewer summaries than
+        summarizing the sessions one at a time.
+
+        Args:
+            requests: The sessions to summarize.
+
+        Returns:
+            One SummaryResult per request, in request order.
+        """
+        metrics_service.inc("memory.summary.requested", len(requests))
+        metrics_service.inc("memory.summary.batch.requested")
+        with metrics_service.timer("memory.summary.batch.duration"):
+            results: list[SummaryResult | None] = [None] * len(requests)
+            prompts: dict[int, str] = {}
+            for index, request in enumerate(requests):
+                prompt = await self._build_summary_prompt(request)
+                if isinstance(prompt, SummaryResult):
+                    results[index] = prompt
+                else:
+                    prompts[index] = prompt
+
+            blocks = await self._call_llm_for_batch(
+                [
+                    (requests[index].session_id, prompt)
+                    for index, prompt in prompts.items()
+                ]
+            )
+            for index, prompt in prompts.items():
+                request = requests[index]
+                block = blocks.get(request.session_id)
+                if block is not None and self._validator.validate(block).is_valid:
+                    results[index] = await self._complete_summary(request, block)
+                    continue
+                metrics_service.inc("memory.summary.batch.fallback")
+                results[index] = await self._summarize_prompt(request, prompt)
+
+        return [result for result in results if result is not None]
+
+    async def _generate_summary_impl(self, request: SummaryRequest) -> SummaryResult:
         """Generate a summary for a session (implementation)."""
-        if not interactions:
+        prompt = await self._build_summary_prompt(request)
+        if isinstance(prompt, SummaryResult):
+            return prompt
+        return await self._summarize_prompt(request, prompt)
+
+    async def _build_summary_prompt(
+        self, request: SummaryRequest
+    ) -> str | SummaryResult:
+        """Build the summary prompt for a session.
+
+        Returns:
+            The prompt, or a failed SummaryResult if no prompt can be built.
+        """
+        if not request.interactions:
             metrics_service.inc("memory.summary.failure")
             return SummaryResult(
                 success=False,
@@ -302,7 +381,7 @@ class SummaryGenerator:
             )
 
         # Build transcript
-        transcript = self._build_transcript(interactions)
+        transcript = self._build_transcript(request.interactions)
 
         # Apply redaction
         transcript = self._apply_redaction(transcript)
@@ -313,7 +392,8 @@ class SummaryGenerator:
                 transcript = await self._process_large_transcript(transcript)
             except Exception as e:
                 logger.exception(
-                    "Failed to process large transcript for session %s", session_id
+                    "Failed to process large transcript for session %s",
+                    request.session_id,
                 )
                 metrics_service.inc("memory.summary.failure")
                 return SummaryResult(
@@ -327,24 +407,24 @@ class SummaryGenerator:
 
         # Format deterministic file edits for prompt injection
         file_edits_str = self._format_file_edits_for_prompt(
-            deterministic_file_edits or []
+            request.deterministic_file_edits or []
         )
 
         # Format deterministic git commits for prompt injection
         git_commits_str = self._format_git_commits_for_prompt(
-            deterministic_git_commits or []
+            request.deterministic_git_commits or []
         )
 
         variables = {
             "session_transcript": transcript,
-            "session_id": session_id,
-            "user_id": user_id,
-            "tenant_id": tenant_id or "NONE",
-            "project_id": project_id or "NONE",
-            "project_root": project_root or "UNKNOWN",
-            "model": backend_model or "UNKNOWN",
-            "branch": branch or "UNKNOWN",
-            "head_sha": head_sha or "UNKNOWN",
+            "session_id": request.session_id,
+            "user_id": request.user_id,
+            "tenant_id": request.tenant_id or "NONE",
+            "project_id": request.project_id or "NONE",
+            "project_root": request.project_root or "UNKNOWN",
+            "model": request.backend_model or "UNKNOWN",
+            "branch": request.branch or "UNKNOWN",
+            "head_sha": request.head_sha or "UNKNOWN",
             "analysis_timestamp": now.isoformat(),
             "summary_schema_version": self._config.summary_schema_version,
             "summary_prompt_version": self._config.summary_prompt_version,
@@ -353,8 +433,12 @@ class SummaryGenerator:
             "deterministic_git_commits": git_commits_str,
         }
 
-        prompt = self._prompt_loader.substitute_variables(prompt_template, variables)
+        return self._prompt_loader.substitute_variables(prompt_template, variables)
 
+    async def _summarize_prompt(
+        self, request: SummaryRequest, prompt: str
+    ) -> SummaryResult:
+        """Call the LLM with a single-session prompt and persist the summary."""
         # Call LLM with retry
         xml_response = await self._call_llm_with_retry(prompt)
         if xml_response is None:
@@ -364,6 +448,13 @@ class SummaryGenerator:
                 success=False,
                 error="LLM call failed after retries",
             )
+        return await self._complete_summary(request, xml_response)
+
+    async def _complete_summary(
+        self, request: SummaryRequest, xml_response: str
+    ) -> SummaryResult:
+        """Validate, parse and persist the LLM response for a session."""
+        session_id = request.session_id
 
         # Validate response
         validation_result = self._validator.validate(xml_response)
@@ -384,18 +475,18 @@ class SummaryGenerator:
             summary = self._parse_xml_to_summary(
                 xml_response,
                 session_id=session_id,
-                user_id=user_id,
-                tenant_id=tenant_id,
-                project_id=project_id,
-                project_root=project_root,
-                backend_model=backend_model or "unknown:unknown",
-                client_agent=client_agent,
-                branch=branch,
-                head_sha=head_sha,
-                is_partial=is_partial,
-                session_start=interactions[0].timestamp,
-                deterministic_file_edits=deterministic_file_edits or [],
-                deterministic_git_commits=deterministic_git_commits or [],
+                user_id=request.user_id,
+                tenant_id=request.tenant_id,
+                project_id=request.project_id,
+                project_root=request.project_root,
+                backend_model=request.backend_model or "unknown:unknown",
+                client_agent=request.client_agent,
+                branch=request.branch,
+                head_sha=request.head_sha,
+                is_partial=request.is_partial,
+                session_start=request.interactions[0].timestamp,
+                deterministic_file_edits=request.deterministic_file_edits or [],
+                deterministic_git_commits=request.deterministic_git_commits or [],
             )
         except Exception as e:
             logger.exception("Failed to parse summary XML for session %s", session_id)
@@ -420,6 +511,49 @@ class SummaryGenerator:
         metrics_service.inc("memory.summary.success")
         return SummaryResult(success=True, summary=summary)
 
+    async def _call_llm_for_batch(
+        self, prompts: list[tuple[str, str]]
+    ) -> dict[str, str]:
+        """Send several session prompts in one LLM call.
+
+        Args:
+            prompts: ``(session_id, prompt)`` pairs.
+
+        Returns:
+            Mapping of session ID to the <session_summary> block returned for
+            it. Sessions the response does not cover are absent.
+        """
+        if not prompts:
+            return {}
+        if self._llm_caller is None:
+            response: str | None = "\n".join(
+                self._generate_mock_response(session_id=session_id)
+                for session_id, _ in prompts
+            )
+        else:
+            tasks = "\n\n".join(
+                f'<summary_request session_id="{session_id}">\n{prompt}\n</summary_request>'
+                for session_id, prompt in prompts
+            )
+            response = await self._call_llm_with_retry(
+                _BATCH_PROMPT.format(count=len(prompts), tasks=tasks)
+            )
+        if response is None:
+            metrics_service.inc("memory.summary.llm_failure")
+            return {}
+
+        blocks: dict[str, str] = {}
+        for block in _SUMMARY_BLOCK_PATTERN.findall(response):
+            try:
+                session_id = ElementTree.fromstring(block).findtext(
+                    "metadata/session_id"
+                )
+            except ElementTree.ParseError:
+                continue
+            if session_id:
+                blocks.setdefault(session_id.strip(), block)
+        return blocks
+
     def _build_transcript(self, interactions: list[CapturedInteraction]) -> str:
         """Build a transcript string from interactions."""
         parts = []
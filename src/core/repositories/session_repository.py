@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
 import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, TypeVar
 
 from src.core.domain.session import Session
 from src.core.interfaces.repositories_interface import ISessionRepository
+from src.core.interfaces.session_store_interface import (
+    ISessionStore,
+    StoredSessionRecord,
+)
 from src.core.services.conversation_fingerprint_service import (
+    ConversationFingerprint,
     ConversationFingerprintBundle,
 )
 
@@ -13,113 +28,353 @@ logger = logging.getLogger(__name__)
 
 # Import the canonical implementation
 from src.core.repositories.in_memory_session_repository import InMemorySessionRepository
+from src.core.repositories.sqlite_session_store import (
+    SqliteSessionStore,
+    resolve_session_store_path,
+)
+
+_T = TypeVar("_T")
+
+# Number of sessions kept resident in memory; the rest live only in the store
+# and are restored on demand.
+_DEFAULT_HOT_CACHE_SIZE = 5_000
+
+# Write-behind delay: updates to the same session within this window are
+# coalesced into a single row write.
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 0.5
+
+# Pending-write backlog size that forces an immediate flush (backpressure).
+_DEFAULT_MAX_PENDING_WRITES = 512
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, set | frozenset):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _serialize_session(session: Session) -> str:
+    return json.dumps(session.to_dict(), default=_json_default, separators=(",", ":"))
+
+
+def _deserialize_session(payload: str) -> Session:
+    return Session.from_dict(json.loads(payload))
+
+
+def _serialize_bundle(bundle: ConversationFingerprintBundle) -> str:
+    return json.dumps(
+        {
+            "primary": {
+                "fingerprint": bundle.primary.fingerprint,
+                "message_count": bundle.primary.message_count,
+                "last_role": bundle.primary.last_role,
+            },
+            "rolling_fingerprints": sorted(bundle.rolling_fingerprints),
+            "topic_tokens": sorted(bundle.topic_tokens),
+            "topic_hash": bundle.topic_hash,
+            "last_user_hash": bundle.last_user_hash,
+            "message_count": bundle.message_count,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _deserialize_bundle(payload: str) -> ConversationFingerprintBundle:
+    data = json.loads(payload)
+    primary = data["primary"]
+    return ConversationFingerprintBundle(
+        primary=ConversationFingerprint(
+            fingerprint=primary["fingerprint"],
+            message_count=int(primary["message_count"]),
+            last_role=primary.get("last_role"),
+        ),
+        rolling_fingerprints=frozenset(data.get("rolling_fingerprints", ())),
+        topic_tokens=frozenset(data.get("topic_tokens", ())),
+        topic_hash=data.get("topic_hash"),
+        last_user_hash=data.get("last_user_hash"),
+        message_count=int(data.get("message_count", 0)),
+    )
+
+
+@dataclass
+class _PendingWrite:
+    """Coalesced, not-yet-flushed changes for one session."""
+
+    last_access: float
+    session: Session | None = None
+    user_id: str | None = None
+    client_key: str | None = None
+    fingerprint: str | None = None
+    fingerprint_bundle: ConversationFingerprintBundle | None = None
+
+    def absorb_older(self, older: _PendingWrite) -> None:
+        """Fill fields this (newer) write does not set from an older one."""
+        if self.session is None:
+            self.session = older.session
+        if self.user_id is None:
+            self.user_id = older.user_id
+        if self.client_key is None:
+            self.client_key = older.client_key
+        if self.fingerprint is None:
+            self.fingerprint = older.fingerprint
+        if self.fingerprint_bundle is None:
+            self.fingerprint_bundle = older.fingerprint_bundle
 
 
 class PersistentSessionRepository(ISessionRepository):
     """Persistent implementation of session repository.
 
-    This repository persists sessions to storage (future implementation).
-    It would use file-based storage, a database, or another persistence mechanism.
+    Hot sessions live in a bounded ``InMemorySessionRepository`` (LRU); every
+    session, including evicted ones, is kept in a durable ``ISessionStore``
+    (SQLite/WAL by default). Writes are coalesced per session and flushed
+    write-behind in batches; evicted sessions are restored lazily with a single
+    bulk load that brings back payload, fingerprint metadata and client mapping.
+
+    Without a ``storage_path`` or ``store`` the repository is memory-only.
+    Call ``dispose()`` on shutdown to flush pending writes.
     """
 
-    def __init__(self, storage_path: str | None = None):
+    def __init__(
+        self,
+        storage_path: str | None = None,
+        *,
+        store: ISessionStore | None = None,
+        hot_cache_size: int = _DEFAULT_HOT_CACHE_SIZE,
+        flush_interval_seconds: float = _DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_pending_writes: int = _DEFAULT_MAX_PENDING_WRITES,
+    ):
         """Initialize the persistent session repository.
 
         Args:
-            storage_path: Optional path to store sessions
+            storage_path: Optional path to store sessions (a SQLite file or a
+                directory that will hold ``sessions.sqlite3``)
+            store: Optional explicit store; takes precedence over ``storage_path``
+            hot_cache_size: Maximum number of sessions kept resident in memory
+            flush_interval_seconds: Write-behind delay used to coalesce updates
+            max_pending_writes: Pending backlog size that forces a flush
         """
-        self._memory_repo = InMemorySessionRepository()  # Use in-memory as cache
+        if hot_cache_size < 1:
+            raise ValueError("hot_cache_size must be >= 1")
+        if max_pending_writes < 1:
+            raise ValueError("max_pending_writes must be >= 1")
+
+        self._memory_repo = InMemorySessionRepository(max_sessions=hot_cache_size)
         self._storage_path = storage_path
-        # Future: Initialize storage adapter based on storage_path
+        if store is None and storage_path is not None:
+            store = SqliteSessionStore(resolve_session_store_path(Path(storage_path)))
+        self._store = store
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending_writes = max_pending_writes
+
+        self._pending: dict[str, _PendingWrite] = {}
+        self._pending_deletes: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
 
     async def get_by_id(self, id: str) -> Session | None:
         """Get a session by its ID."""
-        # First check in-memory cache
         session = await self._memory_repo.get_by_id(id)
-        if session:
+        if session is not None or self._store is None:
             return session
 
-        # Future: If not in cache, load from storage
-        # session = await self._load_session_from_storage(id)
-        # if session:
-        #     await self._memory_repo.add(session)
-        #     return session
-
-        return None
+        restored = await self._restore([id])
+        return restored.get(id)
 
     async def get_all(self) -> list[Session]:
-        """Get all sessions."""
-        # Future: Load all sessions from storage, but for now just return in-memory
-        return await self._memory_repo.get_all()
+        """Get all sessions.
+
+        Stored sessions that are not resident are deserialized for the caller
+        but not promoted into the hot cache.
+        """
+        sessions = await self._memory_repo.get_all()
+        if self._store is None:
+            return sessions
+
+        await self.flush()
+        resident_ids = {session.id for session in sessions}
+        stored_ids: list[str] = await self._call_store(
+            "list sessions", self._store.list_session_ids, default=[]
+        )
+        cold_ids = [sid for sid in stored_ids if sid not in resident_ids]
+        records = await self._load_records(cold_ids)
+        for session_id in cold_ids:
+            record = records.get(session_id)
+            if record is None or record.payload is None:
+                continue
+            session = self._decode_session(record)
+            if session is not None:
+                sessions.append(session)
+        return sessions
 
     async def add(self, entity: Session) -> Session:
         """Add a new session."""
-        # Add to in-memory cache
         await self._memory_repo.add(entity)
 
-        # Future: Persist to storage
-        # await self._save_session_to_storage(entity)
+        pending = self._pending_for(entity.id)
+        if pending is not None:
+            pending.session = entity
+            pending.user_id = getattr(entity, "user_id", None)
+            await self._after_write()
 
         return entity
 
     async def update(self, entity: Session) -> Session:
         """Update an existing session."""
-        # Update in-memory cache
         await self._memory_repo.update(entity)
 
-        # Future: Persist to storage
-        # await self._save_session_to_storage(entity)
+        pending = self._pending_for(entity.id)
+        if pending is not None:
+            pending.session = entity
+            pending.user_id = getattr(entity, "user_id", None)
+            await self._after_write()
 
         return entity
 
     async def delete(self, id: str) -> bool:
         """Delete a session by its ID."""
-        # Delete from in-memory cache
         result = await self._memory_repo.delete(id)
+        if self._store is None:
+            return result
 
-        # Future: Delete from storage
-        # if result:
-        #     await self._delete_session_from_storage(id)
+        had_pending = self._pending.pop(id, None) is not None
+        if not result and not had_pending:
+            result = id in await self._load_records([id])
+        self._pending_deletes.add(id)
+        await self._after_write()
 
-        return result
+        return result or had_pending
 
     async def get_by_user_id(self, user_id: str) -> list[Session]:
         """Get all sessions for a specific user."""
-        # For now, just use the in-memory implementation
-        return await self._memory_repo.get_by_user_id(user_id)
+        sessions = await self._memory_repo.get_by_user_id(user_id)
+        if self._store is None:
+            return sessions
+
+        await self._flush_if_pending()
+        stored_ids: list[str] = await self._call_store(
+            "find sessions by user",
+            self._store.find_session_ids_by_user,
+            user_id,
+            default=[],
+        )
+        known_ids = {session.id for session in sessions}
+        missing_ids = [sid for sid in stored_ids if sid not in known_ids]
+        if missing_ids:
+            restored = await self._restore(missing_ids)
+            sessions.extend(restored[sid] for sid in missing_ids if sid in restored)
+        return sessions
 
     async def cleanup_expired(self, max_age_seconds: int) -> int:
-        """Clean up expired sessions."""
-        # For now, just use the in-memory implementation
-        return await self._memory_repo.cleanup_expired(max_age_seconds)
+        """Clean up expired sessions in memory and in the store."""
+        if self._store is None:
+            return await self._memory_repo.cleanup_expired(max_age_seconds)
+
+        before_ids = {session.id for session in await self._memory_repo.get_all()}
+        count = await self._memory_repo.cleanup_expired(max_age_seconds)
+        after_ids = {session.id for session in await self._memory_repo.get_all()}
+        removed_ids = before_ids - after_ids
+
+        for session_id in removed_ids:
+            self._pending.pop(session_id, None)
+            self._pending_deletes.add(session_id)
+        await self.flush()
+
+        cutoff = time.time() - max_age_seconds
+        stored_expired: list[str] = await self._call_store(
+            "delete expired sessions",
+            self._store.delete_inactive_before,
+            cutoff,
+            default=[],
+        )
+        count += len(set(stored_expired) - removed_ids - after_ids)
+
+        return count
 
     async def update_fingerprint(self, session_id: str, fingerprint: str) -> None:
         """Update the conversation fingerprint for a session."""
         await self._memory_repo.update_fingerprint(session_id, fingerprint)
 
+        pending = self._pending_for(session_id)
+        if pending is not None:
+            pending.fingerprint = fingerprint
+            await self._after_write()
+
     async def update_client_session(self, session_id: str, client_key: str) -> None:
         """Associate a session with a client identifier."""
         await self._memory_repo.update_client_session(session_id, client_key)
 
+        pending = self._pending_for(session_id)
+        if pending is not None:
+            pending.client_key = client_key
+            await self._after_write()
+
     async def find_by_client_and_fingerprint(
         self, client_key: str, fingerprint: str
     ) -> Session | None:
         """Find a session by client key and conversation fingerprint."""
-        return await self._memory_repo.find_by_client_and_fingerprint(
+        session = await self._memory_repo.find_by_client_and_fingerprint(
             client_key, fingerprint
         )
+        if session is not None or self._store is None:
+            return session
+
+        await self._flush_if_pending()
+        session_id = await self._call_store(
+            "find session by fingerprint",
+            self._store.find_session_id_by_client_and_fingerprint,
+            client_key,
+            fingerprint,
+            default=None,
+        )
+        if session_id is None:
+            return None
+        restored = await self._restore([session_id])
+        return restored.get(session_id)
 
     async def find_recent_sessions_by_client(
         self, client_key: str, max_age_seconds: int
     ) -> list[Session]:
-        """Find recent sessions for a client."""
-        return await self._memory_repo.find_recent_sessions_by_client(
+        """Find recent sessions for a client.
+
+        Resident sessions come first (most recent first), followed by restored
+        ones in store recency order.
+        """
+        sessions = await self._memory_repo.find_recent_sessions_by_client(
             client_key, max_age_seconds
         )
+        if self._store is None:
+            return sessions
+
+        await self._flush_if_pending()
+        stored_ids: list[str] = await self._call_store(
+            "find recent sessions by client",
+            self._store.find_session_ids_by_client,
+            client_key,
+            time.time() - max_age_seconds,
+            default=[],
+        )
+        known_ids = {session.id for session in sessions}
+        missing_ids = [sid for sid in stored_ids if sid not in known_ids]
+        if missing_ids:
+            restored = await self._restore(missing_ids)
+            sessions.extend(restored[sid] for sid in missing_ids if sid in restored)
+        return sessions
 
     async def get_session_fingerprint(self, session_id: str) -> str | None:
         """Get the conversation fingerprint for a session."""
-        return await self._memory_repo.get_session_fingerprint(session_id)
+        fingerprint = await self._memory_repo.get_session_fingerprint(session_id)
+        if fingerprint is not None or self._store is None:
+            return fingerprint
+
+        pending = self._pending.get(session_id)
+        if pending is not None and pending.fingerprint is not None:
+            return pending.fingerprint
+        record = (await self._load_records([session_id])).get(session_id)
+        return record.fingerprint if record is not None else None
 
     async def update_fingerprint_bundle(
         self, session_id: str, bundle: ConversationFingerprintBundle
@@ -127,22 +382,288 @@ class PersistentSessionRepository(ISessionRepository):
         """Update fingerprint metadata for a session."""
         await self._memory_repo.update_fingerprint_bundle(session_id, bundle)
 
+        pending = self._pending_for(session_id)
+        if pending is not None:
+            pending.fingerprint_bundle = bundle
+            await self._after_write()
+
     async def get_fingerprint_bundle(
         self, session_id: str
     ) -> ConversationFingerprintBundle | None:
         """Get fingerprint metadata for a session."""
-        return await self._memory_repo.get_fingerprint_bundle(session_id)
+        bundle = await self._memory_repo.get_fingerprint_bundle(session_id)
+        if bundle is not None or self._store is None:
+            return bundle
+
+        pending = self._pending.get(session_id)
+        if pending is not None and pending.fingerprint_bundle is not None:
+            return pending.fingerprint_bundle
+        record = (await self._load_records([session_id])).get(session_id)
+        if record is None or record.fingerprint_bundle is None:
+            return None
+        return self._decode_bundle(record)
 
     async def get_session_last_access(self, session_id: str) -> float | None:
         """Get last access timestamp for a session."""
-        return await self._memory_repo.get_session_last_access(session_id)
-
-    # Future methods for storage persistence
-    # async def _save_session_to_storage(self, session: Session) -> None:
-    #     ...
-    #
-    # async def _load_session_from_storage(self, id: str) -> Optional[Session]:
-    #     ...
-    #
-    # async def _delete_session_from_storage(self, id: str) -> None:
-    #     ...
+        last_access = await self._memory_repo.get_session_last_access(session_id)
+        if last_access is not None or self._store is None:
+            return last_access
+
+        pending = self._pending.get(session_id)
+        if pending is not None:
+            return pending.last_access
+        record = (await self._load_records([session_id])).get(session_id)
+        return record.last_access if record is not None else None
+
+    async def flush(self) -> None:
+        """Write all pending session changes to the store in one batch."""
+        if self._store is None:
+            return
+
+        async with self._flush_lock:
+            if not self._pending and not self._pending_deletes:
+                return
+
+            pending = self._pending
+            deletes = self._pending_deletes
+            self._pending = {}
+            self._pending_deletes = set()
+
+            try:
+                records = [
+                    self._to_record(session_id, write)
+                    for session_id, write in pending.items()
+                ]
+                await asyncio.to_thread(self._write_batch, records, sorted(deletes))
+            except Exception as exc:
+                self._requeue(pending, deletes)
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "Failed to flush %d session writes to store; will retry: %s",
+                        len(pending) + len(deletes),
+                        exc,
+                        exc_info=True,
+                    )
+                return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Flushed %d session writes and %d deletes to store",
+                len(records),
+                len(deletes),
+            )
+
+    async def dispose(self) -> None:
+        """Stop the write-behind task, flush pending writes and close the store."""
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        if self._store is None:
+            return
+        await self.flush()
+        await self._call_store("close store", self._store.close, default=None)
+
+    def _pending_for(self, session_id: str) -> _PendingWrite | None:
+        """Return the coalescing pending-write entry for a session."""
+        if self._store is None:
+            return None
+
+        self._pending_deletes.discard(session_id)
+        now = time.time()
+        pending = self._pending.get(session_id)
+        if pending is None:
+            pending = _PendingWrite(last_access=now)
+            self._pending[session_id] = pending
+        else:
+            pending.last_access = now
+        return pending
+
+    async def _after_write(self) -> None:
+        if len(self._pending) + len(self._pending_deletes) >= self._max_pending_writes:
+            await self.flush()
+            return
+        self._ensure_flush_task()
+
+    def _ensure_flush_task(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._pending or self._pending_deletes:
+            await asyncio.sleep(self._flush_interval_seconds)
+            await self.flush()
+
+    async def _flush_if_pending(self) -> None:
+        if self._pending or self._pending_deletes:
+            await self.flush()
+
+    def _write_batch(
+        self, records: Sequence[StoredSessionRecord], deletes: Sequence[str]
+    ) -> None:
+        assert self._store is not None
+        if deletes:
+            self._store.delete_many(deletes)
+        if records:
+            self._store.save_many(records)
+
+    def _requeue(self, pending: dict[str, _PendingWrite], deletes: set[str]) -> None:
+        """Put a failed batch back, letting writes made since then take priority."""
+        for session_id, older in pending.items():
+            if session_id in self._pending_deletes:
+                continue
+            newer = self._pending.get(session_id)
+            if newer is None:
+                self._pending[session_id] = older
+            else:
+                newer.absorb_older(older)
+        for session_id in deletes:
+            if session_id not in self._pending:
+                self._pending_deletes.add(session_id)
+
+    @staticmethod
+    def _to_record(session_id: str, write: _PendingWrite) -> StoredSessionRecord:
+        session = write.session
+        return StoredSessionRecord(
+            session_id=session_id,
+            last_access=write.last_access,
+            payload=_serialize_session(session) if session is not None else None,
+            user_id=write.user_id,
+            client_key=write.client_key,
+            fingerprint=write.fingerprint,
+            fingerprint_bundle=(
+                _serialize_bundle(write.fingerprint_bundle)
+                if write.fingerprint_bundle is not None
+                else None
+            ),
+            last_active_at=(
+                session.last_active_at.timestamp() if session is not None else None
+            ),
+        )
+
+    async def _restore(self, session_ids: Sequence[str]) -> dict[str, Session]:
+        """Return sessions by id, bulk-loading non-resident ones into the cache."""
+        restored: dict[str, Session] = {}
+        missing_ids: list[str] = []
+        for session_id in session_ids:
+            if session_id in self._pending_deletes:
+                continue
+            session = await self._memory_repo.get_by_id(session_id)
+            if session is not None:
+                restored[session_id] = session
+            else:
+                missing_ids.append(session_id)
+
+        if not missing_ids:
+            return restored
+
+        # Evicted-but-unflushed sessions: flush so the bulk load sees them whole.
+        if any(session_id in self._pending for session_id in missing_ids):
+            await self.flush()
+
+        records = await self._load_records(missing_ids)
+        for session_id in missing_ids:
+            # Another coroutine may have restored it while we were loading.
+            session = await self._memory_repo.get_by_id(session_id)
+            if session is None:
+                record = records.get(session_id)
+                if record is not None and record.payload is not None:
+                    session = await self._make_resident(record)
+                else:
+                    pending = self._pending.get(session_id)
+                    if pending is not None and pending.session is not None:
+                        session = pending.session
+                        await self._memory_repo.add(session)
+            if session is not None:
+                restored[session_id] = session
+
+        return restored
+
+    async def _make_resident(self, record: StoredSessionRecord) -> Session | None:
+        session = self._decode_session(record)
+        if session is None:
+            return None
+
+        await self._memory_repo.add(session)
+        if record.fingerprint is not None:
+            await self._memory_repo.update_fingerprint(
+                record.session_id, record.fingerprint
+            )
+        if record.fingerprint_bundle is not None:
+            bundle = self._decode_bundle(record)
+            if bundle is not None:
+                await self._memory_repo.update_fingerprint_bundle(
+                    record.session_id, bundle
+                )
+        if record.client_key is not None:
+            await self._memory_repo.update_client_session(
+                record.session_id, record.client_key
+            )
+        return session
+
+    @staticmethod
+    def _decode_session(record: StoredSessionRecord) -> Session | None:
+        assert record.payload is not None
+        try:
+            return _deserialize_session(record.payload)
+        except Exception as exc:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Discarding unreadable stored session %s: %s",
+                    record.session_id,
+                    exc,
+                )
+            return None
+
+    @staticmethod
+    def _decode_bundle(
+        record: StoredSessionRecord,
+    ) -> ConversationFingerprintBundle | None:
+        assert record.fingerprint_bundle is not None
+        try:
+            return _deserialize_bundle(record.fingerprint_bundle)
+        except Exception as exc:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Discarding unreadable fingerprint bundle for session %s: %s",
+                    record.session_id,
+                    exc,
+                )
+            return None
+
+    async def _load_records(
+        self, session_ids: Sequence[str]
+    ) -> dict[str, StoredSessionRecord]:
+        if self._store is None or not session_ids:
+            return {}
+        return await self._call_store(
+            "load sessions", self._store.load_many, list(session_ids), default={}
+        )
+
+    async def _call_store(
+        self,
+        operation: str,
+        func: Callable[..., _T],
+        *args: Any,
+        default: _T,
+    ) -> _T:
+        """Run a blocking store call off the event loop, failing soft on errors."""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as exc:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Session store operation failed (%s): %s",
+                    operation,
+                    exc,
+                    exc_info=True,
+                )
+            return default
@@ -0,0 +1,314 @@
+"""SQLite (WAL) implementation of the durable session store."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Final
+
+from src.core.interfaces.session_store_interface import (
+    ISessionStore,
+    StoredSessionRecord,
+)
+
+logger = logging.getLogger(__name__)
+
+_SQLITE_BUSY_TIMEOUT_SECONDS: Final[float] = 30.0
+_DEFAULT_DB_FILENAME: Final[str] = "sessions.sqlite3"
+_SQLITE_FILE_SUFFIXES: Final[frozenset[str]] = frozenset({".db", ".sqlite", ".sqlite3"})
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds.
+_MAX_IN_CLAUSE_PARAMS: Final[int] = 500
+
+_UPSERT_SQL: Final[str] = """
+    INSERT INTO sessions (
+        session_id,
+        payload,
+        user_id,
+        client_key,
+        fingerprint,
+        fingerprint_bundle,
+        last_active_at,
+        last_access
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        payload = COALESCE(excluded.payload, sessions.payload),
+        user_id = COALESCE(excluded.user_id, sessions.user_id),
+        client_key = COALESCE(excluded.client_key, sessions.client_key),
+        fingerprint = COALESCE(excluded.fingerprint, sessions.fingerprint),
+        fingerprint_bundle = COALESCE(
+            excluded.fingerprint_bundle, sessions.fingerprint_bundle
+        ),
+        last_active_at = COALESCE(excluded.last_active_at, sessions.last_active_at),
+        last_access = MAX(excluded.last_access, sessions.last_access)
+"""
+
+_SELECT_COLUMNS: Final[str] = """
+    session_id, payload, user_id, client_key, fingerprint,
+    fingerprint_bundle, last_active_at, last_access
+"""
+
+
+def resolve_session_store_path(storage_path: str | Path) -> Path:
+    """Map a configured storage path to the SQLite database file.
+
+    Paths with a SQLite-like suffix are used as-is; anything else is treated as
+    a directory that holds ``sessions.sqlite3``.
+    """
+    path = Path(storage_path)
+    if path.suffix.lower() in _SQLITE_FILE_SUFFIXES:
+        return path
+    return path / _DEFAULT_DB_FILENAME
+
+
+def _chunks(items: Sequence[str], size: int) -> list[Sequence[str]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _row_to_record(row: sqlite3.Row) -> StoredSessionRecord:
+    return StoredSessionRecord(
+        session_id=str(row["session_id"]),
+        last_access=float(row["last_access"]),
+        payload=row["payload"],
+        user_id=row["user_id"],
+        client_key=row["client_key"],
+        fingerprint=row["fingerprint"],
+        fingerprint_bundle=row["fingerprint_bundle"],
+        last_active_at=(
+            float(row["last_active_at"]) if row["last_active_at"] is not None else None
+        ),
+    )
+
+
+class SqliteSessionStore(ISessionStore):
+    """Session store backed by a single WAL-mode SQLite database.
+
+    A single long-lived connection is shared between worker threads and guarded
+    by a lock; batching happens in the caller (write-behind), so each flush is
+    one short transaction.
+    """
+
+    def __init__(self, database_path: str | Path) -> None:
+        self._database_path = Path(database_path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def database_path(self) -> Path:
+        return self._database_path
+
+    def load_many(self, session_ids: Sequence[str]) -> dict[str, StoredSessionRecord]:
+        if not session_ids:
+            return {}
+        unique_ids = list(dict.fromkeys(session_ids))
+        records: dict[str, StoredSessionRecord] = {}
+        with self._lock:
+            conn = self._connection()
+            for chunk in _chunks(unique_ids, _MAX_IN_CLAUSE_PARAMS):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT {_SELECT_COLUMNS} FROM sessions "
+                    f"WHERE session_id IN ({placeholders})",
+                    tuple(chunk),
+                ).fetchall()
+                for row in rows:
+                    record = _row_to_record(row)
+                    records[record.session_id] = record
+        return records
+
+    def save_many(self, records: Sequence[StoredSessionRecord]) -> None:
+        if not records:
+            return
+        params = [
+            (
+                record.session_id,
+                record.payload,
+                record.user_id,
+                record.client_key,
+                record.fingerprint,
+                record.fingerprint_bundle,
+                record.last_active_at,
+                record.last_access,
+            )
+            for record in records
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_UPSERT_SQL, params)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def delete_many(self, session_ids: Sequence[str]) -> int:
+        if not session_ids:
+            return 0
+        unique_ids = list(dict.fromkeys(session_ids))
+        deleted = 0
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for chunk in _chunks(unique_ids, _MAX_IN_CLAUSE_PARAMS):
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = conn.execute(
+                        f"DELETE FROM sessions WHERE session_id IN ({placeholders})",
+                        tuple(chunk),
+                    )
+                    deleted += max(cursor.rowcount, 0)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        return deleted
+
+    def list_session_ids(self) -> list[str]:
+        with self._lock:
+            rows = (
+                self._connection().execute("SELECT session_id FROM sessions").fetchall()
+            )
+        return [str(row["session_id"]) for row in rows]
+
+    def find_session_ids_by_user(self, user_id: str) -> list[str]:
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    """
+                SELECT session_id
+                FROM sessions
+                WHERE user_id = ?
+                ORDER BY last_access ASC
+                """,
+                    (user_id,),
+                )
+                .fetchall()
+            )
+        return [str(row["session_id"]) for row in rows]
+
+    def find_session_ids_by_client(
+        self, client_key: str, min_last_access: float | None = None
+    ) -> list[str]:
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    """
+                SELECT session_id
+                FROM sessions
+                WHERE client_key = ? AND last_access >= ?
+                ORDER BY last_access DESC
+                """,
+                    (
+                        client_key,
+                        min_last_access if min_last_access is not None else 0.0,
+                    ),
+                )
+                .fetchall()
+            )
+        return [str(row["session_id"]) for row in rows]
+
+    def find_session_id_by_client_and_fingerprint(
+        self, client_key: str, fingerprint: str
+    ) -> str | None:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    """
+                SELECT session_id
+                FROM sessions
+                WHERE client_key = ? AND fingerprint = ?
+                ORDER BY last_access DESC
+                LIMIT 1
+                """,
+                    (client_key, fingerprint),
+                )
+                .fetchone()
+            )
+        return str(row["session_id"]) if row is not None else None
+
+    def delete_inactive_before(self, cutoff: float) -> list[str]:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT session_id
+                    FROM sessions
+                    WHERE COALESCE(last_active_at, last_access) < ?
+                    """,
+                    (cutoff,),
+                ).fetchall()
+                conn.execute(
+                    """
+                    DELETE FROM sessions
+                    WHERE COALESCE(last_active_at, last_access) < ?
+                    """,
+                    (cutoff,),
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        return [str(row["session_id"]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use (lock held)."""
+        if self._conn is not None:
+            return self._conn
+
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self._database_path),
+            timeout=_SQLITE_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                payload TEXT,
+                user_id TEXT,
+                client_key TEXT,
+                fingerprint TEXT,
+                fingerprint_bundle TEXT,
+                last_active_at REAL,
+                last_access REAL NOT NULL
+            )
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_user_id
+            ON sessions(user_id)
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_client_access
+            ON sessions(client_key, last_access)
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_client_fingerprint
+            ON sessions(client_key, fingerprint)
+            """)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Opened session store at %s", self._database_path)
+        self._conn = conn
+        return conn
+
+
+__all__ = ["SqliteSessionStore", "resolve_session_store_path"]
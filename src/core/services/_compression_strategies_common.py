@@ -23,19 +23,6 @@ _POSITIVE_FAILURE_COUNT_RE = re.compile(
 )
 logger = logging.getLogger("src.core.services.compression_strategies")
 
-_REGEX_EVAL_SUBPROCESS_SNIPPET = (
-    "import json\n"
-    "import re\n"
-    "import sys\n"
-    "payload = json.loads(sys.stdin.read())\n"
-    "try:\n"
-    "    compiled = re.compile(payload['pattern'], payload['flags'])\n"
-    "    matched = compiled.search(payload['text']) is not None\n"
-    "except Exception:\n"
-    "    matched = False\n"
-    "sys.stdout.write('1' if matched else '0')\n"
-)
-
 
 def _line_indicates_failure(line: str) -> bool:
     if not _FAILURE_INDICATOR_RE.search(line):
@@ -2,21 +2,17 @@
 
 from __future__ import annotations
 
-import json
 import re
-import subprocess
-import sys
-from contextlib import suppress
 from dataclasses import dataclass
 from re import Pattern
 
 from src.core.domain.configuration.dynamic_compression_config import CompressionLevel
 from src.core.domain.dynamic_compression import ToolOutputContext
 from src.core.services._compression_strategies_common import (
-    _REGEX_EVAL_SUBPROCESS_SNIPPET,
     _preserve_trailing_newline,
     logger,
 )
+from src.core.services.regex_worker_pool import RegexWorkerError, get_regex_worker_pool
 
 
 @dataclass(frozen=True)
@@ -50,6 +46,9 @@ class OutputPatternMatchStrategy:
     ) -> None:
         self._regex_timeout_ms = max(1, int(regex_timeout_ms))
         self._rules = self._compile_rules(rules or [])
+        if self._rules:
+            # Start the shared workers before the first request needs one
+            get_regex_worker_pool()
 
     def compress(
         self,
@@ -125,48 +124,25 @@ class OutputPatternMatchStrategy:
         pattern: Pattern[str],
         text: str,
     ) -> tuple[bool, bool]:
-        timeout_seconds = self._regex_timeout_ms / 1000.0
-        if sys.platform.startswith("win"):
-            timeout_seconds = max(timeout_seconds, 0.2)
-        payload = json.dumps(
-            {
-                "pattern": pattern.pattern,
-                "flags": int(pattern.flags),
-                "text": text,
-            }
-        )
-        worker: subprocess.Popen[str] | None = None
         try:
-            worker = subprocess.Popen(
-                [sys.executable, "-c", _REGEX_EVAL_SUBPROCESS_SNIPPET],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                text=True,
+            (matched,) = get_regex_worker_pool().run(
+                [
+                    {
+                        "op": "search",
+                        "pattern": pattern.pattern,
+                        "flags": int(pattern.flags),
+                        "text": text,
+                    }
+                ],
+                self._regex_timeout_ms / 1000.0,
             )
-            stdout_data, _ = worker.communicate(payload, timeout=timeout_seconds)
-            if worker.returncode not in (0, None):
-                return False, True
-            return stdout_data.strip() == "1", False
-        except subprocess.TimeoutExpired:
-            if worker is not None:
-                with suppress(Exception):
-                    worker.kill()
-                with suppress(Exception):
-                    worker.communicate(timeout=0.05)
-            return False, True
-        except Exception:
+        except RegexWorkerError:
             logger.debug(
                 "output_pattern_match bounded regex evaluation failed",
                 exc_info=True,
             )
             return False, True
-        finally:
-            if worker is not None:
-                with suppress(Exception):
-                    worker.kill()
-                with suppress(Exception):
-                    worker.communicate(timeout=0.05)
+        return matched is True, False
 
     def _resolve_empty_fallback_message(self) -> str:
         for rule in self._rules:
@@ -307,7 +283,9 @@ class DiffCompactStrategy:
                 if hunk_count:
                     parts.append(f"{hunk_count} hunks")
                 if parts:
-                    result[file_name_line_index] = f"{current_file}  ({' | '.join(parts)})"
+                    result[file_name_line_index] = (
+                        f"{current_file}  ({' | '.join(parts)})"
+                    )
             file_name_line_index = None
 
         def begin_file(file_name: str) -> None:
@@ -37,14 +37,13 @@ class B2buaBlegAllocator:
         reason: str | None,
     ) -> BlegAllocation:
         """Allocate B-leg identity and persist attempt diagnostics."""
-        seq = await self._mapping_store.allocate_next_b_seq(a_session_id)
-        b_session_id = self._session_id_factory.generate_b_session_id(a_session_id, seq)
-        await self._mapping_store.record_attempt(
+        record = await self._mapping_store.allocate_attempt(
             a_session_id=a_session_id,
-            b_session_id=b_session_id,
-            seq=seq,
+            create_b_session_id=lambda seq: (
+                self._session_id_factory.generate_b_session_id(a_session_id, seq)
+            ),
             backend_type=backend_type,
             effective_model=effective_model,
             reason=reason,
         )
-        return BlegAllocation(b_session_id=b_session_id, seq=seq)
+        return BlegAllocation(b_session_id=record.b_session_id, seq=record.seq)
@@ -5,8 +5,11 @@ from __future__ import annotations
 import asyncio
 import logging
 import sqlite3
+import threading
 import time
-from collections.abc import Callable
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Final
@@ -24,6 +27,9 @@ _DEFAULT_MAX_MAPPINGS: Final[int] = 50_000
 _DEFAULT_CONTINUITY_TTL_SECONDS: Final[int] = 3600
 _DEFAULT_PERSISTENT_DB_PATH: Final[Path] = Path("var/state/b2bua_continuity.sqlite3")
 _SQLITE_BUSY_TIMEOUT_SECONDS: Final[float] = 30.0
+_SQLITE_CACHED_STATEMENTS: Final[int] = 64
+_DEFAULT_SWEEP_INTERVAL_SECONDS: Final[float] = 30.0
+_SWEEP_BATCH_SIZE: Final[int] = 1_000
 
 # Must stay aligned with ``b2bua_session_resolver_service`` anonymous bootstrap prefix.
 _ANON_AUTH_SCOPE_PREFIX: Final[str] = "__b2bua-anon-auth__"
@@ -339,8 +345,108 @@ class InMemoryB2buaMappingStore(IB2buaMappingStore):
                 self._attempt_records.pop(entry.a_session_id, None)
 
 
+class _ThreadLocalSqliteConnections:
+    """Long-lived SQLite connections for one database file, one per thread.
+
+    Connections are opened on first use in a thread with WAL journaling,
+    ``synchronous=NORMAL`` and foreign keys enabled. Reusing them keeps the
+    sqlite3 statement cache warm, so the store's fixed SQL stays prepared.
+    """
+
+    def __init__(self, database_path: Path) -> None:
+        self._database_path = database_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[tuple[threading.Thread, sqlite3.Connection]] = []
+        self._closed = False
+
+    def get(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        connection = sqlite3.connect(
+            str(self._database_path),
+            timeout=_SQLITE_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=_SQLITE_CACHED_STATEMENTS,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        with self._lock:
+            if self._closed:
+                connection.close()
+                raise sqlite3.ProgrammingError("B2BUA mapping store is closed")
+            # Connections of exited threads are never used again.
+            stale = [c for t, c in self._connections if not t.is_alive()]
+            self._connections = [(t, c) for t, c in self._connections if t.is_alive()]
+            self._connections.append((threading.current_thread(), connection))
+        for stale_connection in stale:
+            stale_connection.close()
+        self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a ``BEGIN IMMEDIATE`` transaction on this thread's connection."""
+        connection = self.get()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+        for _thread, connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Failed to close B2BUA store connection", exc_info=True
+                    )
+
+
+def _run_sweeper(
+    store_ref: weakref.ref[PersistentB2buaMappingStore],
+    stop: threading.Event,
+    interval_seconds: float,
+) -> None:
+    """Sweep periodically until stopped or the store is garbage collected."""
+    while not stop.wait(interval_seconds):
+        store = store_ref()
+        if store is None:
+            return
+        try:
+            removed = store.sweep()
+        except sqlite3.Error as exc:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "B2BUA continuity store sweep failed: %s", exc, exc_info=True
+                )
+        else:
+            if removed and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("B2BUA continuity store swept %d mappings", removed)
+        del store
+
+
 class PersistentB2buaMappingStore(IB2buaMappingStore):
-    """SQLite-backed continuity mapping store for restart and worker safety."""
+    """SQLite-backed continuity mapping store for restart and worker safety.
+
+    Each thread reuses one WAL-mode connection. Request-path queries ignore
+    expired mappings instead of deleting them; a background sweeper thread
+    removes expired mappings and evicts the least recently used ones above
+    ``max_entries`` every ``sweep_interval_seconds`` (``0`` disables it; call
+    :meth:`sweep` directly).
+    """
 
     def __init__(
         self,
@@ -351,6 +457,7 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         sliding_expiration: bool | None = None,
         max_entries: int = _DEFAULT_MAX_MAPPINGS,
         time_provider: Callable[[], float] | None = None,
+        sweep_interval_seconds: float = _DEFAULT_SWEEP_INTERVAL_SECONDS,
     ) -> None:
         if max_entries < 1:
             raise ValueError("max_entries must be >= 1")
@@ -373,9 +480,21 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         self._max_entries = max_entries
         self._time_provider = time_provider if time_provider is not None else time.time
         self._lock = asyncio.Lock()
+        self._connections = _ThreadLocalSqliteConnections(self._database_path)
 
         self._initialize_database()
 
+        self._sweeper_stop = threading.Event()
+        self._sweeper: threading.Thread | None = None
+        if sweep_interval_seconds > 0:
+            self._sweeper = threading.Thread(
+                target=_run_sweeper,
+                args=(weakref.ref(self), self._sweeper_stop, sweep_interval_seconds),
+                name="b2bua-mapping-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
     async def resolve_or_create_a_session_id(
         self,
         *,
@@ -422,59 +541,31 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         now = self._time_provider()
         try:
             async with self._lock:
-                with self._connect() as conn:
-                    conn.execute("BEGIN IMMEDIATE")
-                    self._cleanup_expired_entries(conn, now)
-                    row = conn.execute(
-                        """
-                        SELECT auth_scope_id, expires_at
-                        FROM b2bua_mappings
-                        WHERE a_session_id = ?
-                        """,
-                        (normalized_a,),
-                    ).fetchone()
-                    if row is None:
-                        conn.commit()
-                        return None
-                    expires_at = float(row["expires_at"])
-                    if expires_at <= now:
-                        conn.commit()
-                        return None
-                    stored_auth = str(row["auth_scope_id"])
-                    if not _echo_continuity_auth_allows(
-                        stored_auth_scope_id=stored_auth,
-                        requesting_auth_scope_id=requesting_auth_scope_id,
-                    ):
-                        conn.commit()
-                        return None
-                    if self._sliding_expiration:
-                        conn.execute(
-                            """
-                            UPDATE b2bua_mappings
-                            SET last_accessed_at = ?, expires_at = ?
-                            WHERE a_session_id = ?
-                            """,
-                            (
-                                now,
-                                now + self._continuity_ttl_seconds,
-                                normalized_a,
-                            ),
-                        )
-                    else:
-                        conn.execute(
-                            """
-                            UPDATE b2bua_mappings
-                            SET last_accessed_at = ?
-                            WHERE a_session_id = ?
-                            """,
-                            (now, normalized_a),
-                        )
-                    conn.commit()
-                    return B2buaContinuityResolution(
-                        a_session_id=normalized_a,
-                        reused_existing=True,
-                        had_store_error=False,
-                    )
+                conn = self._connections.get()
+                row = conn.execute(
+                    """
+                    SELECT auth_scope_id
+                    FROM b2bua_mappings
+                    WHERE a_session_id = ? AND expires_at > ?
+                    """,
+                    (normalized_a, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if not _echo_continuity_auth_allows(
+                    stored_auth_scope_id=str(row["auth_scope_id"]),
+                    requesting_auth_scope_id=requesting_auth_scope_id,
+                ):
+                    return None
+                # A single statement commits on its own; it matches nothing if
+                # the mapping expired or was swept since the lookup.
+                if not self._touch_mapping(conn, normalized_a, now):
+                    return None
+                return B2buaContinuityResolution(
+                    a_session_id=normalized_a,
+                    reused_existing=True,
+                    had_store_error=False,
+                )
         except Exception as exc:  # - must fail open on store faults
             if logger.isEnabledFor(logging.ERROR):
                 logger.error(
@@ -492,53 +583,9 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         now = self._time_provider()
 
         async with self._lock:
-            with self._connect() as conn:
-                conn.execute("BEGIN IMMEDIATE")
-                self._cleanup_expired_entries(conn, now)
-                row = conn.execute(
-                    """
-                    SELECT last_b_seq
-                    FROM b2bua_mappings
-                    WHERE a_session_id = ?
-                    """,
-                    (normalized_a_session_id,),
-                ).fetchone()
-                if row is None:
-                    raise KeyError(
-                        "A-leg session mapping not found for "
-                        f"a_session_id={normalized_a_session_id}"
-                    )
-
-                next_seq = int(row["last_b_seq"]) + 1
-                if self._sliding_expiration:
-                    conn.execute(
-                        """
-                        UPDATE b2bua_mappings
-                        SET last_b_seq = ?, last_accessed_at = ?, expires_at = ?
-                        WHERE a_session_id = ?
-                        """,
-                        (
-                            next_seq,
-                            now,
-                            now + self._continuity_ttl_seconds,
-                            normalized_a_session_id,
-                        ),
-                    )
-                else:
-                    conn.execute(
-                        """
-                        UPDATE b2bua_mappings
-                        SET last_b_seq = ?, last_accessed_at = ?
-                        WHERE a_session_id = ?
-                        """,
-                        (
-                            next_seq,
-                            now,
-                            normalized_a_session_id,
-                        ),
-                    )
-                conn.commit()
-                return next_seq
+            return self._increment_b_seq(
+                self._connections.get(), normalized_a_session_id, now
+            )
 
     async def record_attempt(
         self,
@@ -564,72 +611,57 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
 
         now = self._time_provider()
         async with self._lock:
-            with self._connect() as conn:
-                conn.execute("BEGIN IMMEDIATE")
-                self._cleanup_expired_entries(conn, now)
-                mapping_row = conn.execute(
-                    """
-                    SELECT 1
-                    FROM b2bua_mappings
-                    WHERE a_session_id = ?
-                    """,
-                    (normalized_a_session_id,),
-                ).fetchone()
-                if mapping_row is None:
+            with self._connections.transaction() as conn:
+                if not self._touch_mapping(conn, normalized_a_session_id, now):
                     raise KeyError(
                         "A-leg session mapping not found for "
                         f"a_session_id={normalized_a_session_id}"
                     )
-
-                conn.execute(
-                    """
-                    INSERT INTO b2bua_attempts (
-                        b_session_id,
-                        a_session_id,
-                        seq,
-                        backend_type,
-                        effective_model,
-                        reason,
-                        created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        normalized_b_session_id,
-                        normalized_a_session_id,
-                        seq,
-                        backend_type,
-                        effective_model,
-                        reason,
-                        now,
+                self._insert_attempt(
+                    conn,
+                    B2buaAttemptRecord(
+                        b_session_id=normalized_b_session_id,
+                        a_session_id=normalized_a_session_id,
+                        seq=seq,
+                        backend_type=backend_type,
+                        effective_model=effective_model,
+                        reason=reason,
                     ),
+                    now,
                 )
 
-                if self._sliding_expiration:
-                    conn.execute(
-                        """
-                        UPDATE b2bua_mappings
-                        SET last_accessed_at = ?, expires_at = ?
-                        WHERE a_session_id = ?
-                        """,
-                        (
-                            now,
-                            now + self._continuity_ttl_seconds,
-                            normalized_a_session_id,
-                        ),
-                    )
-                else:
-                    conn.execute(
-                        """
-                        UPDATE b2bua_mappings
-                        SET last_accessed_at = ?
-                        WHERE a_session_id = ?
-                        """,
-                        (
-                            now,
-                            normalized_a_session_id,
-                        ),
-                    )
-                conn.commit()
+    async def allocate_attempt(
+        self,
+        *,
+        a_session_id: str,
+        create_b_session_id: Callable[[int], str],
+        backend_type: str | None,
+        effective_model: str | None,
+        reason: str | None,
+    ) -> B2buaAttemptRecord:
+        """Allocate the next B-leg sequence and record its attempt in one transaction."""
+        normalized_a_session_id = _normalize_required_identifier(
+            a_session_id,
+            "a_session_id",
+        )
+        now = self._time_provider()
+
+        async with self._lock:
+            with self._connections.transaction() as conn:
+                seq = self._increment_b_seq(conn, normalized_a_session_id, now)
+                record = B2buaAttemptRecord(
+                    b_session_id=_normalize_required_identifier(
+                        create_b_session_id(seq),
+                        "b_session_id",
+                    ),
+                    a_session_id=normalized_a_session_id,
+                    seq=seq,
+                    backend_type=backend_type,
+                    effective_model=effective_model,
+                    reason=reason,
+                )
+                self._insert_attempt(conn, record, now)
+                return record
 
     async def get_attempt_records(self, a_session_id: str) -> list[B2buaAttemptRecord]:
         """Load attempt records for one A-leg ordered by sequence."""
@@ -639,30 +671,91 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         )
         now = self._time_provider()
         async with self._lock:
-            with self._connect() as conn:
-                conn.execute("BEGIN IMMEDIATE")
-                self._cleanup_expired_entries(conn, now)
-                rows = conn.execute(
+            rows = (
+                self._connections.get()
+                .execute(
                     """
                     SELECT b_session_id, a_session_id, seq, backend_type, effective_model, reason
                     FROM b2bua_attempts
                     WHERE a_session_id = ?
+                      AND EXISTS (
+                        SELECT 1 FROM b2bua_mappings
+                        WHERE a_session_id = ? AND expires_at > ?
+                      )
                     ORDER BY seq ASC, created_at ASC
                     """,
-                    (normalized_a_session_id,),
-                ).fetchall()
-                conn.commit()
-                return [
-                    B2buaAttemptRecord(
-                        b_session_id=str(row["b_session_id"]),
-                        a_session_id=str(row["a_session_id"]),
-                        seq=int(row["seq"]),
-                        backend_type=row["backend_type"],
-                        effective_model=row["effective_model"],
-                        reason=row["reason"],
+                    (normalized_a_session_id, normalized_a_session_id, now),
+                )
+                .fetchall()
+            )
+            return [
+                B2buaAttemptRecord(
+                    b_session_id=str(row["b_session_id"]),
+                    a_session_id=str(row["a_session_id"]),
+                    seq=int(row["seq"]),
+                    backend_type=row["backend_type"],
+                    effective_model=row["effective_model"],
+                    reason=row["reason"],
+                )
+                for row in rows
+            ]
+
+    def sweep(self) -> int:
+        """Delete expired mappings, then evict least recently used ones over capacity.
+
+        Runs in batches of short transactions so request-path writers are not
+        blocked for long. Returns the number of mappings removed (their
+        attempts are removed by cascade).
+        """
+        now = self._time_provider()
+        removed = 0
+        while True:
+            with self._connections.transaction() as conn:
+                deleted = conn.execute(
+                    """
+                    DELETE FROM b2bua_mappings
+                    WHERE rowid IN (
+                        SELECT rowid FROM b2bua_mappings
+                        WHERE expires_at <= ?
+                        LIMIT ?
+                    )
+                    """,
+                    (now, _SWEEP_BATCH_SIZE),
+                ).rowcount
+            removed += deleted
+            if deleted < _SWEEP_BATCH_SIZE:
+                break
+
+        while True:
+            with self._connections.transaction() as conn:
+                count_row = conn.execute(
+                    "SELECT COUNT(*) AS total FROM b2bua_mappings"
+                ).fetchone()
+                total_entries = int(count_row["total"]) if count_row is not None else 0
+                overflow = min(total_entries - self._max_entries, _SWEEP_BATCH_SIZE)
+                if overflow <= 0:
+                    break
+                removed += conn.execute(
+                    """
+                    DELETE FROM b2bua_mappings
+                    WHERE rowid IN (
+                        SELECT rowid FROM b2bua_mappings
+                        ORDER BY last_accessed_at ASC
+                        LIMIT ?
                     )
-                    for row in rows
-                ]
+                    """,
+                    (overflow,),
+                ).rowcount
+        return removed
+
+    def dispose(self) -> None:
+        """Stop the sweeper and close all pooled connections."""
+        self._sweeper_stop.set()
+        sweeper = self._sweeper
+        self._sweeper = None
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join(timeout=_SQLITE_BUSY_TIMEOUT_SECONDS)
+        self._connections.close()
 
     async def _resolve_or_create_core(
         self,
@@ -681,12 +774,10 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
         now = self._time_provider()
 
         async with self._lock:
-            with self._connect() as conn:
-                conn.execute("BEGIN IMMEDIATE")
-                self._cleanup_expired_entries(conn, now)
+            with self._connections.transaction() as conn:
                 existing_row = conn.execute(
                     """
-                    SELECT a_session_id
+                    SELECT a_session_id, expires_at
                     FROM b2bua_mappings
                     WHERE auth_scope_id = ? AND client_session_id = ?
                     """,
@@ -694,38 +785,20 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
                 ).fetchone()
                 if existing_row is not None:
                     a_session_id = str(existing_row["a_session_id"])
-                    if self._sliding_expiration:
-                        conn.execute(
-                            """
-                            UPDATE b2bua_mappings
-                            SET last_accessed_at = ?, expires_at = ?
-                            WHERE auth_scope_id = ? AND client_session_id = ?
-                            """,
-                            (
-                                now,
-                                now + self._continuity_ttl_seconds,
-                                normalized_auth_scope,
-                                normalized_client_session_id,
-                            ),
-                        )
-                    else:
-                        conn.execute(
-                            """
-                            UPDATE b2bua_mappings
-                            SET last_accessed_at = ?
-                            WHERE auth_scope_id = ? AND client_session_id = ?
-                            """,
-                            (
-                                now,
-                                normalized_auth_scope,
-                                normalized_client_session_id,
-                            ),
+                    if float(existing_row["expires_at"]) > now:
+                        self._touch_mapping(conn, a_session_id, now)
+                        return B2buaContinuityResolution(
+                            a_session_id=a_session_id,
+                            reused_existing=True,
+                            had_store_error=False,
                         )
-                    conn.commit()
-                    return B2buaContinuityResolution(
-                        a_session_id=a_session_id,
-                        reused_existing=True,
-                        had_store_error=False,
+                    # Expired but not swept yet: replace it (attempts cascade).
+                    conn.execute(
+                        """
+                        DELETE FROM b2bua_mappings
+                        WHERE auth_scope_id = ? AND client_session_id = ?
+                        """,
+                        (normalized_auth_scope, normalized_client_session_id),
                     )
 
                 a_session_id = create_a_session_id()
@@ -750,20 +823,93 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
                         now + self._continuity_ttl_seconds,
                     ),
                 )
-                self._evict_if_needed(conn)
-                conn.commit()
                 return B2buaContinuityResolution(
                     a_session_id=a_session_id,
                     reused_existing=False,
                     had_store_error=False,
                 )
 
-    def _initialize_database(self) -> None:
-        with self._connect() as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA foreign_keys=ON")
-            conn.execute(
+    def _touch_mapping(
+        self, conn: sqlite3.Connection, a_session_id: str, now: float
+    ) -> bool:
+        """Refresh an active mapping's access time (and expiry when sliding)."""
+        if self._sliding_expiration:
+            cursor = conn.execute(
+                """
+                UPDATE b2bua_mappings
+                SET last_accessed_at = ?, expires_at = ?
+                WHERE a_session_id = ? AND expires_at > ?
+                """,
+                (now, now + self._continuity_ttl_seconds, a_session_id, now),
+            )
+        else:
+            cursor = conn.execute(
                 """
+                UPDATE b2bua_mappings
+                SET last_accessed_at = ?
+                WHERE a_session_id = ? AND expires_at > ?
+                """,
+                (now, a_session_id, now),
+            )
+        return cursor.rowcount > 0
+
+    def _increment_b_seq(
+        self, conn: sqlite3.Connection, a_session_id: str, now: float
+    ) -> int:
+        """Bump and return ``last_b_seq`` of an active mapping in one statement."""
+        expires_at_sql = "?" if self._sliding_expiration else "expires_at"
+        params: tuple[object, ...] = (
+            (now, now + self._continuity_ttl_seconds, a_session_id, now)
+            if self._sliding_expiration
+            else (now, a_session_id, now)
+        )
+        row = conn.execute(
+            f"""
+            UPDATE b2bua_mappings
+            SET last_b_seq = last_b_seq + 1,
+                last_accessed_at = ?,
+                expires_at = {expires_at_sql}
+            WHERE a_session_id = ? AND expires_at > ?
+            RETURNING last_b_seq
+            """,
+            params,
+        ).fetchone()
+        if row is None:
+            raise KeyError(
+                f"A-leg session mapping not found for a_session_id={a_session_id}"
+            )
+        return int(row["last_b_seq"])
+
+    @staticmethod
+    def _insert_attempt(
+        conn: sqlite3.Connection, record: B2buaAttemptRecord, now: float
+    ) -> None:
+        conn.execute(
+            """
+            INSERT INTO b2bua_attempts (
+                b_session_id,
+                a_session_id,
+                seq,
+                backend_type,
+                effective_model,
+                reason,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                record.b_session_id,
+                record.a_session_id,
+                record.seq,
+                record.backend_type,
+                record.effective_model,
+                record.reason,
+                now,
+            ),
+        )
+
+    def _initialize_database(self) -> None:
+        with self._connections.transaction() as conn:
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS b2bua_mappings (
                     auth_scope_id TEXT NOT NULL,
                     client_session_id TEXT NOT NULL,
@@ -774,10 +920,8 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
                     expires_at REAL NOT NULL,
                     PRIMARY KEY (auth_scope_id, client_session_id)
                 )
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS b2bua_attempts (
                     b_session_id TEXT PRIMARY KEY,
                     a_session_id TEXT NOT NULL,
@@ -790,78 +934,19 @@ class PersistentB2buaMappingStore(IB2buaMappingStore):
                         REFERENCES b2bua_mappings(a_session_id)
                         ON DELETE CASCADE
                 )
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_b2bua_mappings_expires_at
                 ON b2bua_mappings(expires_at)
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_b2bua_mappings_last_accessed
                 ON b2bua_mappings(last_accessed_at)
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_b2bua_attempts_a_session
                 ON b2bua_attempts(a_session_id)
-                """
-            )
-            conn.commit()
-
-    def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(
-            str(self._database_path),
-            timeout=_SQLITE_BUSY_TIMEOUT_SECONDS,
-            isolation_level=None,
-            check_same_thread=False,
-        )
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA foreign_keys=ON")
-        return connection
-
-    def _cleanup_expired_entries(self, conn: sqlite3.Connection, now: float) -> None:
-        conn.execute(
-            """
-            DELETE FROM b2bua_mappings
-            WHERE expires_at <= ?
-            """,
-            (now,),
-        )
-
-    def _evict_if_needed(self, conn: sqlite3.Connection) -> None:
-        count_row = conn.execute(
-            "SELECT COUNT(*) AS total FROM b2bua_mappings"
-        ).fetchone()
-        total_entries = int(count_row["total"]) if count_row is not None else 0
-        overflow = total_entries - self._max_entries
-        if overflow <= 0:
-            return
-
-        rows_to_evict = conn.execute(
-            """
-            SELECT auth_scope_id, client_session_id
-            FROM b2bua_mappings
-            ORDER BY last_accessed_at ASC
-            LIMIT ?
-            """,
-            (overflow,),
-        ).fetchall()
-
-        for row in rows_to_evict:
-            conn.execute(
-                """
-                DELETE FROM b2bua_mappings
-                WHERE auth_scope_id = ? AND client_session_id = ?
-                """,
-                (
-                    str(row["auth_scope_id"]),
-                    str(row["client_session_id"]),
-                ),
-            )
+                """)
 
 
 __all__ = [
@@ -39,6 +39,10 @@ from src.core.interfaces.wire_capture_interface import IWireCapture
 from src.core.interfaces.wire_capture_recorder_interface import (
     IWireCaptureRecorder,
 )
+from src.core.wire_capture.capture_index import (
+    CaptureIndexRecord,
+    CaptureIndexWriter,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -161,6 +165,8 @@ class CborWireCaptureService(IWireCapture, IWireCaptureRecorder):
         # File handle for current session
         self._file_path: Path | None = None
         self._header_written = False
+        # Sidecar offset index kept in step with the capture file
+        self._index_writer: CaptureIndexWriter | None = None
 
         # Background flush task
         self._flush_task: asyncio.Task[None] | None = None
@@ -231,6 +237,7 @@ class CborWireCaptureService(IWireCapture, IWireCaptureRecorder):
 
             # Set up file path for this session
             self._file_path = self._capture_dir / f"{self._session_id}.cbor"
+            self._index_writer = CaptureIndexWriter(self._file_path)
 
             # Write header (failure leaves capture disabled)
             if not self._write_header():
@@ -333,8 +340,11 @@ class CborWireCaptureService(IWireCapture, IWireCaptureRecorder):
         try:
             # Manual close in finally with OSError suppressed (avoids chained exc on ENOSPC).
             f = open(self._file_path, "wb")  # noqa: SIM115
-            cbor2.dump(header.to_dict(), f)
+            header_bytes = cbor2.dumps(header.to_dict())
+            f.write(header_bytes)
             self._header_written = True
+            if self._index_writer is not None:
+                self._index_writer.reset(len(header_bytes))
             return True
         except OSError as e:
             self._handle_capture_os_error(e, context="header write")
@@ -1398,11 +1408,24 @@ class CborWireCaptureService(IWireCapture, IWireCaptureRecorder):
             return
 
         f: Any = None
+        index_records: list[CaptureIndexRecord] = []
         with self._write_lock:
             try:
                 f = open(self._file_path, "ab")  # noqa: SIM115
+                offset = f.tell()
                 for entry in entries:
-                    cbor2.dump(entry.to_dict(), f)
+                    entry_dict = entry.to_dict()
+                    encoded = cbor2.dumps(entry_dict)
+                    f.write(encoded)
+                    index_records.append(
+                        CaptureIndexRecord.from_entry(
+                            entry_dict,
+                            offset,
+                            len(encoded),
+                            data_size=len(entry.data),
+                        )
+                    )
+                    offset += len(encoded)
             except OSError as e:
                 self._handle_capture_os_error(e, context="append")
             except (ValueError, TypeError) as e:
@@ -1415,6 +1438,10 @@ class CborWireCaptureService(IWireCapture, IWireCaptureRecorder):
                 if f is not None:
                     with contextlib.suppress(OSError):
                         f.close()
+                # Only index entries that were fully handed to the file; readers
+                # scan any un-indexed tail themselves.
+                if self._index_writer is not None and index_records:
+                    self._index_writer.append(index_records)
 
     async def _background_flush_loop(self) -> None:
         """Background task to periodically flush buffer."""
@@ -10,8 +10,9 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from collections import Counter
-from collections.abc import Iterable
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 
 from src.core.domain.chat import ChatMessage
@@ -22,6 +23,13 @@ logger = logging.getLogger(__name__)
 # Module-level constant avoids recompiling on every service instantiation.
 _TOKEN_PATTERN = re.compile(r"[a-z0-9]{3,}")
 
+# Maximum number of per-conversation incremental states kept (LRU-bounded).
+_DEFAULT_MAX_INCREMENTAL_STATES = 4096
+
+# (role, content kind, payload length, payload hash) - cheap in-process identity
+# used to verify that a cached conversation prefix was resent unchanged.
+_MessageIdentity = tuple[str, str, int, int]
+
 
 @dataclass
 class ConversationFingerprint:
@@ -44,19 +52,44 @@ class ConversationFingerprintBundle:
     message_count: int = 0
 
 
+@dataclass
+class _IncrementalFingerprintState:
+    """Cached per-message digests and running aggregates for one conversation."""
+
+    identities: list[_MessageIdentity] = field(default_factory=list)
+    roles: list[str] = field(default_factory=list)
+    signatures: list[str] = field(default_factory=list)
+    token_counts: Counter[str] = field(default_factory=Counter)
+    rolling: set[str] = field(default_factory=set)
+    # window size -> number of windows of that size already hashed
+    windows_done: dict[int, int] = field(default_factory=dict)
+    last_user_hash: str | None = None
+
+
 class ConversationFingerprintService:
     """Service for computing stable fingerprints from message sequences."""
 
-    def __init__(self, fingerprint_message_count: int = 5) -> None:
+    def __init__(
+        self,
+        fingerprint_message_count: int = 5,
+        max_incremental_states: int = _DEFAULT_MAX_INCREMENTAL_STATES,
+    ) -> None:
         """Initialize the fingerprint service.
 
         Args:
             fingerprint_message_count: Number of recent messages to include in fingerprint
+            max_incremental_states: Maximum number of conversations whose
+                per-message digests are cached for incremental bundles
         """
         self._fingerprint_message_count = fingerprint_message_count
         # Use module-level pre-compiled pattern (avoids recompiling on each instantiation)
         self._token_pattern = _TOKEN_PATTERN
         self._topic_token_limit = 128
+        self._max_incremental_states = max(1, max_incremental_states)
+        self._incremental_states: OrderedDict[
+            tuple[str, int], _IncrementalFingerprintState
+        ] = OrderedDict()
+        self._incremental_lock = threading.Lock()
 
     def compute_fingerprint(
         self, messages: list[ChatMessage], count: int | None = None
@@ -81,17 +114,12 @@ class ConversationFingerprintService:
             messages[-num_messages:] if len(messages) > num_messages else messages
         )
 
-        # Build fingerprint string
-        parts = []
-        for idx, msg in enumerate(relevant_messages):
-            role = msg.role
-            content = self._extract_content_signature(msg)
-            # Include position to maintain order sensitivity
-            parts.append(f"{idx}:{role}:{content}")
-
-        fingerprint_str = "|".join(parts)
-        hash_obj = hashlib.sha256(fingerprint_str.encode("utf-8"))
-        fingerprint_hex = hash_obj.hexdigest()[:32]
+        fingerprint_hex = self._hash_signatures(
+            [msg.role for msg in relevant_messages],
+            [self._extract_content_signature(msg) for msg in relevant_messages],
+            0,
+            len(relevant_messages),
+        )
 
         return ConversationFingerprint(
             fingerprint=fingerprint_hex,
@@ -100,9 +128,18 @@ class ConversationFingerprintService:
         )
 
     def compute_fingerprint_bundle(
-        self, messages: list[ChatMessage]
+        self, messages: list[ChatMessage], session_key: str | None = None
     ) -> ConversationFingerprintBundle:
-        """Compute a bundle of fingerprints and semantic signals."""
+        """Compute a bundle of fingerprints and semantic signals.
+
+        When ``session_key`` is given, per-message digests are cached for that
+        conversation and only the appended suffix is processed on later turns.
+        The result is identical to a full computation; an edited or truncated
+        history simply falls back to rebuilding the cached state.
+        """
+        if session_key is not None and messages:
+            return self._compute_bundle_incremental(messages, session_key)
+
         primary = self.compute_fingerprint(messages)
         rolling = self._collect_rolling_fingerprints(messages)
         topic_tokens = self._collect_topic_tokens(messages)
@@ -197,6 +234,18 @@ class ConversationFingerprintService:
         digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
         return f"{len(text)}:{digest}"
 
+    @staticmethod
+    def _hash_signatures(
+        roles: Sequence[str], signatures: Sequence[str], start: int, count: int
+    ) -> str:
+        """Hash ``count`` message signatures starting at ``start``."""
+        # Include position to maintain order sensitivity
+        fingerprint_str = "|".join(
+            f"{idx}:{roles[start + idx]}:{signatures[start + idx]}"
+            for idx in range(count)
+        )
+        return hashlib.sha256(fingerprint_str.encode("utf-8")).hexdigest()[:32]
+
     def is_continuation(
         self,
         previous_messages: list[ChatMessage],
@@ -298,12 +347,125 @@ class ConversationFingerprintService:
             if not text:
                 continue
 
-            normalized = " ".join(text.split())
-            hash_obj = hashlib.sha256(normalized.encode("utf-8"))
-            return hash_obj.hexdigest()[:32]
+            return self._hash_user_text(text)
 
         return None
 
+    @staticmethod
+    def _hash_user_text(text: str) -> str:
+        normalized = " ".join(text.split())
+        hash_obj = hashlib.sha256(normalized.encode("utf-8"))
+        return hash_obj.hexdigest()[:32]
+
+    def _compute_bundle_incremental(
+        self, messages: list[ChatMessage], session_key: str
+    ) -> ConversationFingerprintBundle:
+        """Compute a bundle reusing cached digests for an unchanged prefix."""
+        identities = [self._message_identity(message) for message in messages]
+        # Distinguish concurrent conversations sharing one key (e.g. a client key).
+        key = (session_key, hash(tuple(identities[:2])))
+
+        with self._incremental_lock:
+            state = self._incremental_states.get(key)
+            if state is not None:
+                self._incremental_states.move_to_end(key)
+                cached = len(state.identities)
+                if cached > len(identities) or identities[:cached] != state.identities:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "Conversation history changed for %s; rebuilding "
+                            "fingerprint state",
+                            session_key,
+                        )
+                    state = None
+            if state is None:
+                state = _IncrementalFingerprintState()
+                self._incremental_states[key] = state
+                while len(self._incremental_states) > self._max_incremental_states:
+                    self._incremental_states.popitem(last=False)
+
+            self._extend_incremental_state(state, messages, identities)
+            return self._bundle_from_state(state)
+
+    def _extend_incremental_state(
+        self,
+        state: _IncrementalFingerprintState,
+        messages: list[ChatMessage],
+        identities: list[_MessageIdentity],
+    ) -> None:
+        """Fold messages beyond the cached prefix into ``state``."""
+        for index in range(len(state.identities), len(messages)):
+            message = messages[index]
+            state.identities.append(identities[index])
+            state.roles.append(message.role)
+            state.signatures.append(self._extract_content_signature(message))
+
+            text = self._extract_full_text(message)
+            if not text:
+                continue
+            state.token_counts.update(self._token_pattern.findall(text.lower()))
+            if message.role == "user":
+                state.last_user_hash = self._hash_user_text(text)
+
+        total = len(state.signatures)
+        if total < 2:
+            return
+        # Same window sizes as _collect_rolling_fingerprints; only windows that
+        # were not hashed on earlier turns are computed.
+        for window_size in range(2, min(total, self._fingerprint_message_count + 3)):
+            window_count = total - window_size + 1
+            for start in range(state.windows_done.get(window_size, 0), window_count):
+                state.rolling.add(
+                    self._hash_signatures(
+                        state.roles, state.signatures, start, window_size
+                    )
+                )
+            state.windows_done[window_size] = window_count
+
+    def _bundle_from_state(
+        self, state: _IncrementalFingerprintState
+    ) -> ConversationFingerprintBundle:
+        total = len(state.signatures)
+        relevant = min(total, self._fingerprint_message_count)
+        primary = ConversationFingerprint(
+            fingerprint=self._hash_signatures(
+                state.roles, state.signatures, total - relevant, relevant
+            ),
+            message_count=relevant,
+            last_role=state.roles[-1],
+        )
+
+        topic_tokens = frozenset(
+            token
+            for token, _ in state.token_counts.most_common(self._topic_token_limit)
+        )
+
+        return ConversationFingerprintBundle(
+            primary=primary,
+            rolling_fingerprints=frozenset(state.rolling),
+            topic_tokens=topic_tokens,
+            topic_hash=self._hash_tokens(topic_tokens) if topic_tokens else None,
+            last_user_hash=state.last_user_hash,
+            message_count=total,
+        )
+
+    def _message_identity(self, message: ChatMessage) -> _MessageIdentity:
+        """Cheap identity of everything that feeds the fingerprint of a message."""
+        content = message.content
+        if content is None:
+            tool_names = tuple(
+                tc.function.name
+                for tc in (message.tool_calls or [])
+                if tc.function.name
+            )
+            return (message.role, "tool_calls", len(tool_names), hash(tool_names))
+        if isinstance(content, str):
+            return (message.role, "text", len(content), hash(content))
+
+        text = self._extract_full_text(message)
+        kind = "parts" if isinstance(content, list) else "other"
+        return (message.role, kind, len(text), hash(text))
+
     def _extract_full_text(self, message: ChatMessage) -> str:
         """Extract full text content from a chat message."""
         content = message.content
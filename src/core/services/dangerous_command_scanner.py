@@ -0,0 +1,206 @@
+"""
+Multi-pattern scanning engine for dangerous command rules.
+
+Each rule's regex is parsed once for literal substrings that every match must
+contain (for ``git\\s+push\\s+--force`` these are ``git``, ``push`` and
+``--force``); the longest becomes the rule's anchor. All anchors go into one
+Aho-Corasick automaton, so a scan walks the command once and only confirms
+the rules whose anchor occurred with their regex. Rules without a usable
+anchor (e.g. a top-level alternation) are always confirmed.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from src.core.domain.configuration.dangerous_command_config import (
+    DangerousCommandRule,
+)
+
+try:
+    from re import _parser as _sre_parse  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# Anchors shorter than this match too often to be a useful prefilter.
+_MIN_ANCHOR_LENGTH = 2
+
+# Separates candidate variants so no anchor can straddle two of them.
+_CANDIDATE_SEPARATOR = "\x00"
+
+# Characters ``re.IGNORECASE`` matches to an ASCII letter that casefolding
+# alone does not fold to it (dotless i, dotted capital I, long s, Kelvin sign).
+_IGNORECASE_FOLDS = str.maketrans(
+    {"\u0131": "i", "\u0130": "i", "\u017f": "s", "\u212a": "k"}
+)
+
+_REPEAT_OPS = tuple(
+    op
+    for op in (
+        getattr(_sre_parse, "MAX_REPEAT", None),
+        getattr(_sre_parse, "MIN_REPEAT", None),
+        getattr(_sre_parse, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+)
+
+
+def _collect_required_literals(items: Any, out: list[str]) -> None:
+    """Append literal runs that must appear in every match of ``items``."""
+    run: list[str] = []
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            out.append("".join(run))
+            run = []
+        if op is _sre_parse.SUBPATTERN:
+            _collect_required_literals(av[-1], out)
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            _collect_required_literals(av[2], out)
+        elif op is _sre_parse.ASSERT:
+            # Positive lookaround: its content must be present too.
+            _collect_required_literals(av[1], out)
+    if run:
+        out.append("".join(run))
+
+
+def _fold(text: str) -> str:
+    """Fold ``text`` so that ``re.IGNORECASE`` equivalents compare equal."""
+    return text.translate(_IGNORECASE_FOLDS).casefold()
+
+
+def required_anchor(rule: DangerousCommandRule) -> str | None:
+    """Return the longest literal every match of ``rule`` contains, folded.
+
+    Folding both anchors and scanned text with :func:`_fold` keeps the prefilter a necessary
+    condition for case-insensitive rules; it is merely less selective for
+    case-sensitive ones.
+    """
+    try:
+        parsed = _sre_parse.parse(rule.pattern.pattern, rule.pattern.flags)
+    except Exception:  # pragma: no cover - compiled patterns always parse
+        return None
+    literals: list[str] = []
+    _collect_required_literals(parsed, literals)
+    folded = [_fold(literal) for literal in literals]
+    folded = [literal for literal in folded if len(literal) >= _MIN_ANCHOR_LENGTH]
+    if not folded:
+        return None
+    return max(folded, key=len)
+
+
+class _AhoCorasick:
+    """Aho-Corasick automaton reporting which keywords occur in a text."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[int, ...]] = [()]
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._out.append(())
+                state = next_state
+            self._out[state] = (*self._out[state], index)
+
+        self._fail = [0] * len(self._goto)
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target
+                if self._out[target]:
+                    self._out[next_state] = (*self._out[next_state], *self._out[target])
+
+    def search(self, text: str) -> set[int]:
+        """Return the indices of all keywords occurring in ``text``."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class DangerousCommandScanner:
+    """Precompiled prefilter plus regex confirmation over an ordered rule list.
+
+    Matches are reported in rule order, as with a linear scan of the rules.
+    """
+
+    def __init__(self, rules: Iterable[DangerousCommandRule]) -> None:
+        self._rules: tuple[DangerousCommandRule, ...] = tuple(rules)
+        anchors: list[str] = []
+        anchor_index: dict[str, int] = {}
+        rules_by_anchor: list[list[int]] = []
+        unanchored: list[int] = []
+        for position, rule in enumerate(self._rules):
+            anchor = required_anchor(rule)
+            if anchor is None:
+                unanchored.append(position)
+                continue
+            index = anchor_index.get(anchor)
+            if index is None:
+                index = anchor_index[anchor] = len(anchors)
+                anchors.append(anchor)
+                rules_by_anchor.append([])
+            rules_by_anchor[index].append(position)
+
+        self._automaton = _AhoCorasick(anchors)
+        self._rules_by_anchor = tuple(tuple(group) for group in rules_by_anchor)
+        self._unanchored = tuple(unanchored)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compiled dangerous command scanner: %d rules, %d anchors, "
+                "%d unanchored",
+                len(self._rules),
+                len(anchors),
+                len(unanchored),
+            )
+
+    @property
+    def rules(self) -> tuple[DangerousCommandRule, ...]:
+        return self._rules
+
+    def _candidate_rules(self, texts: Sequence[str]) -> list[int]:
+        haystack = _fold(_CANDIDATE_SEPARATOR.join(texts))
+        positions = set(self._unanchored)
+        for index in self._automaton.search(haystack):
+            positions.update(self._rules_by_anchor[index])
+        return sorted(positions)
+
+    def first_match(self, texts: Sequence[str]) -> DangerousCommandRule | None:
+        """Return the first rule (in rule order) matching any of ``texts``."""
+        if not self._rules or not texts:
+            return None
+        for position in self._candidate_rules(texts):
+            rule = self._rules[position]
+            for text in texts:
+                if rule.pattern.search(text):
+                    return rule
+        return None
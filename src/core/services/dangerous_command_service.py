@@ -1,6 +1,8 @@
 import json
 import logging
 import re
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import Any
 
 from pydantic import BaseModel
@@ -9,17 +11,22 @@ from src.core.domain.chat import ToolCall
 from src.core.domain.configuration.dangerous_command_config import (
     DangerousCommandConfig,
     DangerousCommandRule,
-    is_dangerous_command,
 )
 from src.core.domain.security.command_normalization import (
     normalize_command_for_security_scan,
 )
+from src.core.services.dangerous_command_scanner import DangerousCommandScanner
 
 _SUBSHELL_GIT_PATTERN = re.compile(r"\$\((?:which|command\s+-v)\s+git\)", re.IGNORECASE)
 _ENV_PREFIX_PATTERN = re.compile(r"\b[A-Z_][A-Z0-9_]*=.*?(?=\s+git\b)", re.IGNORECASE)
 
 logger = logging.getLogger(__name__)
 
+# Verdicts are memoized per command for commands up to this length.
+_VERDICT_CACHE_MAX_COMMAND_LENGTH = 8192
+_VERDICT_CACHE_SIZE = 2048
+_NOT_CACHED = object()
+
 
 class DangerousCommandMatch(BaseModel):
     """Represents a matched dangerous command rule."""
@@ -39,6 +46,11 @@ class DangerousCommandService:
         }
         # Optional command extraction service for safe dev tool checks
         self._command_service = command_service
+        # All configured rules precompiled into one prefiltered scanner
+        self._scanner = DangerousCommandScanner(self.config.rules)
+        # LRU memo of command -> matched rule (None when safe). Retries and
+        # the can_handle/handle pair scan the same command repeatedly.
+        self._verdicts: OrderedDict[str, DangerousCommandRule | None] = OrderedDict()
 
     def scan_tool_call(self, tool_call: ToolCall) -> DangerousCommandMatch | None:
         """
@@ -185,11 +197,8 @@ class DangerousCommandService:
 
         return " ".join(["git"] + tokens[idx:]).strip()
 
-    def scan(self, tool_name: str, arguments: Any) -> DangerousCommandMatch | None:
-        """Scan tool_name and arguments for dangerous command.
-
-        Returns DangerousCommandMatch object, or None.
-        """
+    def _command_to_check(self, tool_name: str, arguments: Any) -> str | None:
+        """Return the command a tool call would run, or None if out of scope."""
         normalized_tool_name = tool_name.lower() if isinstance(tool_name, str) else ""
         if normalized_tool_name not in self._normalized_tool_names:
             return None
@@ -204,65 +213,88 @@ class DangerousCommandService:
             and hasattr(self._command_service, "is_safe_dev_tool_command")
             and self._command_service.is_safe_dev_tool_command(command_to_check)
         ):
-            # Safe dev tool - no need to log at warning level
             return None
+        return command_to_check
 
-        original_command = command_to_check
+    def _match_command(self, command: str) -> DangerousCommandRule | None:
+        """Return the first rule matching ``command``, memoized per command."""
         # Truncate for performance before any processing
-        if len(command_to_check) > self.config.max_command_length:
-            command_to_check = command_to_check[: self.config.max_command_length]
-
-        # Fast pre-check on the (potentially truncated) command
+        if len(command) > self.config.max_command_length:
+            command = command[: self.config.max_command_length]
+
+        cacheable = len(command) <= _VERDICT_CACHE_MAX_COMMAND_LENGTH
+        if cacheable:
+            cached = self._verdicts.get(command, _NOT_CACHED)
+            if cached is not _NOT_CACHED:
+                self._verdicts.move_to_end(command, last=True)
+                return cached  # type: ignore[return-value]
+
+        rule = self._match_uncached(command)
+
+        if cacheable:
+            self._verdicts[command] = rule
+            if len(self._verdicts) > _VERDICT_CACHE_SIZE:
+                self._verdicts.popitem(last=False)
+        return rule
+
+    def _match_uncached(self, command_to_check: str) -> DangerousCommandRule | None:
+        # Fast pre-check on the normalized command, and again after stripping
+        # leading git options to catch forms like "git --work-tree=. checkout -- ."
         normalized_for_detection = self._normalize_for_detection(command_to_check)
-
-        if not is_dangerous_command(normalized_for_detection):
-            # Try again after stripping leading git options to catch forms like
-            # "git --work-tree=. checkout -- ."
-            stripped = self._strip_git_leading_options(normalized_for_detection)
-            if stripped == normalized_for_detection:
-                return None
-            if not is_dangerous_command(stripped):
-                return None
+        precheck = [normalized_for_detection]
+        stripped = self._strip_git_leading_options(normalized_for_detection)
+        if stripped != normalized_for_detection:
+            precheck.append(stripped)
+        if self._scanner.first_match(precheck) is None:
+            return None
 
         # If there's a potential match, generate candidates to find the specific rule
         candidates = self._generate_command_candidates(normalized_for_detection)
         if command_to_check not in candidates:
             candidates.append(command_to_check)
+        return self._scanner.first_match(candidates)
 
-        for rule in self.config.rules:
-            for candidate in candidates:
-                if rule.pattern.search(candidate):
-                    return DangerousCommandMatch(rule=rule, command=original_command)
-        return None
-
-    def might_be_dangerous(self, tool_name: str, arguments: Any) -> bool:
-        """Fast pre-check for whether arguments contain a dangerous command.
+    def scan(self, tool_name: str, arguments: Any) -> DangerousCommandMatch | None:
+        """Scan tool_name and arguments for dangerous command.
 
-        This method is optimized for low overhead (used by can_handle) and avoids
-        iterating all rules. It relies on the combined pattern to indicate that
-        at least one rule *could* match.
+        Returns DangerousCommandMatch object, or None.
         """
-        normalized_tool_name = tool_name.lower() if isinstance(tool_name, str) else ""
-        if normalized_tool_name not in self._normalized_tool_names:
-            return False
+        command_to_check = self._command_to_check(tool_name, arguments)
+        if command_to_check is None:
+            return None
 
-        command_to_check = self._extract_command_string(arguments)
-        if not command_to_check:
-            return False
+        rule = self._match_command(command_to_check)
+        if rule is None:
+            return None
+        return DangerousCommandMatch(rule=rule, command=command_to_check)
 
-        if (
-            self._command_service
-            and hasattr(self._command_service, "is_safe_dev_tool_command")
-            and self._command_service.is_safe_dev_tool_command(command_to_check)
-        ):
-            return False
+    def scan_many(
+        self, tool_calls: Iterable[ToolCall | tuple[str, Any]]
+    ) -> list[DangerousCommandMatch | None]:
+        """Scan a batch of tool calls, e.g. every call in one model response.
 
-        if len(command_to_check) > self.config.max_command_length:
-            command_to_check = command_to_check[: self.config.max_command_length]
+        Accepts ``ToolCall`` objects or ``(tool_name, arguments)`` pairs and
+        returns one result per input, in order. Identical commands within the
+        batch and across earlier scans are only matched once.
+        """
+        results: list[DangerousCommandMatch | None] = []
+        for tool_call in tool_calls:
+            tool_name: str | None
+            if isinstance(tool_call, tuple):
+                tool_name, arguments = tool_call
+            else:
+                tool_name = tool_call.function.name
+                arguments = tool_call.function.arguments
+            results.append(self.scan(tool_name, arguments) if tool_name else None)
+        return results
 
-        normalized_for_detection = self._normalize_for_detection(command_to_check)
-        if is_dangerous_command(normalized_for_detection):
-            return True
+    def might_be_dangerous(self, tool_name: str, arguments: Any) -> bool:
+        """Fast pre-check for whether arguments contain a dangerous command.
 
-        stripped = self._strip_git_leading_options(normalized_for_detection)
-        return stripped != normalized_for_detection and is_dangerous_command(stripped)
+        Used by ``can_handle``; the verdict is memoized so the following
+        ``scan`` of the same call does not repeat the work.
+        """
+        command_to_check = self._command_to_check(tool_name, arguments)
+        if command_to_check is None:
+            return False
+        return self._match_command(command_to_check) is not None
@@ -5,8 +5,6 @@ from __future__ import annotations
 import json
 import logging
 import re
-import subprocess
-import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -21,6 +19,11 @@ from src.core.domain.configuration.dynamic_compression_config import (
     DynamicCompressionConfig,
 )
 from src.core.domain.dynamic_compression import ToolOutputContext
+from src.core.services.regex_worker_pool import (
+    RegexWorkerError,
+    RegexWorkerPool,
+    get_regex_worker_pool,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,72 +31,6 @@ _ANSI_RE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
 _NESTED_QUANTIFIER_PATTERN_RE = re.compile(
     r"\((?:[^()\\]|\\.)*[+*](?:[^()\\]|\\.)*\)[+*{]"
 )
-_REGEX_EVAL_SUBPROCESS_SNIPPET = (
-    "import json\n"
-    "import re\n"
-    "import sys\n"
-    "payload = json.loads(sys.stdin.read())\n"
-    "try:\n"
-    "    compiled = re.compile(payload['pattern'], payload['flags'])\n"
-    "    matched = compiled.search(payload['text']) is not None\n"
-    "except Exception:\n"
-    "    matched = False\n"
-    "sys.stdout.write('1' if matched else '0')\n"
-)
-_REGEX_REPLACE_STAGE_SUBPROCESS_SNIPPET = (
-    "import json\n"
-    "import re\n"
-    "import sys\n"
-    "payload = json.loads(sys.stdin.read())\n"
-    "lines = payload.get('lines')\n"
-    "rules = payload.get('rules')\n"
-    "response = {'ok': False, 'lines': []}\n"
-    "if isinstance(lines, list) and isinstance(rules, list):\n"
-    "    try:\n"
-    "        compiled = [\n"
-    "            (\n"
-    "                re.compile(str(item.get('pattern', '')), int(item.get('flags', 0))),\n"
-    "                str(item.get('replacement', '')),\n"
-    "            )\n"
-    "            for item in rules\n"
-    "        ]\n"
-    "        transformed = []\n"
-    "        for raw_line in lines:\n"
-    "            current = str(raw_line)\n"
-    "            for pattern, replacement in compiled:\n"
-    "                current = pattern.sub(replacement, current)\n"
-    "            transformed.append(current)\n"
-    "        response = {'ok': True, 'lines': transformed}\n"
-    "    except Exception:\n"
-    "        response = {'ok': False, 'lines': []}\n"
-    "sys.stdout.write(json.dumps(response))\n"
-)
-_REGEX_FILTER_STAGE_SUBPROCESS_SNIPPET = (
-    "import json\n"
-    "import re\n"
-    "import sys\n"
-    "payload = json.loads(sys.stdin.read())\n"
-    "lines = payload.get('lines')\n"
-    "patterns = payload.get('patterns')\n"
-    "keep_matches = bool(payload.get('keep_matches', False))\n"
-    "response = {'ok': False, 'lines': []}\n"
-    "if isinstance(lines, list) and isinstance(patterns, list):\n"
-    "    try:\n"
-    "        compiled = [\n"
-    "            re.compile(str(item.get('pattern', '')), int(item.get('flags', 0)))\n"
-    "            for item in patterns\n"
-    "        ]\n"
-    "        transformed = []\n"
-    "        for raw_line in lines:\n"
-    "            line = str(raw_line)\n"
-    "            matched = any(pattern.search(line) is not None for pattern in compiled)\n"
-    "            if (keep_matches and matched) or ((not keep_matches) and (not matched)):\n"
-    "                transformed.append(line)\n"
-    "        response = {'ok': True, 'lines': transformed}\n"
-    "    except Exception:\n"
-    "        response = {'ok': False, 'lines': []}\n"
-    "sys.stdout.write(json.dumps(response))\n"
-)
 _DEFAULT_PRIORITY = 1000
 _SUPPORTED_DECLARATIVE_RULE_KEYS = frozenset(
     {
@@ -169,14 +106,14 @@ class DeclarativeRulePipelineError(RuntimeError):
 
 
 @dataclass(frozen=True)
-class _RegexTimeoutResult:
-    matched: bool
+class _RegexFirstMatchResult:
+    index: int | None
     timed_out: bool
 
 
 @dataclass(frozen=True)
 class _RegexWorkerExecutionResult:
-    stdout: str
+    results: tuple[Any, ...]
     timed_out: bool
 
 
@@ -187,10 +124,22 @@ class _RegexLinesTimeoutResult:
 
 
 class DeclarativeFilterPipeline:
-    """Deterministic 8-stage declarative text filter pipeline."""
+    """Deterministic 8-stage declarative text filter pipeline.
 
-    def __init__(self, *, regex_timeout_ms: int = 25) -> None:
+    Patterns prone to catastrophic backtracking are evaluated in a pooled
+    worker process under ``regex_timeout_ms``; all such patterns of a stage
+    go to the worker in one round trip.
+    """
+
+    def __init__(
+        self,
+        *,
+        regex_timeout_ms: int = 25,
+        worker_pool: RegexWorkerPool | None = None,
+    ) -> None:
         self._regex_timeout_ms = max(1, int(regex_timeout_ms))
+        # Resolve the shared pool now so its workers start before any request
+        self._worker_pool = worker_pool or get_regex_worker_pool()
 
     def apply(self, *, rule: CompiledDeclarativeRule, content: str) -> str:
         lines = content.splitlines()
@@ -215,23 +164,15 @@ class DeclarativeFilterPipeline:
         # 3. match_output (short-circuit full output)
         if rule.match_output:
             blob = "\n".join(lines)
-            for match_rule in rule.match_output:
-                matched_result = self._search_with_timeout(match_rule.pattern, blob)
-                if matched_result.timed_out:
-                    raise DeclarativeRulePipelineError(
-                        f"Regex timeout in rule '{rule.name}' match_output stage."
-                    )
-                if not matched_result.matched:
-                    continue
-                if match_rule.unless is not None:
-                    unless_result = self._search_with_timeout(match_rule.unless, blob)
-                    if unless_result.timed_out:
-                        raise DeclarativeRulePipelineError(
-                            f"Regex timeout in rule '{rule.name}' match_output unless stage."
-                        )
-                    if unless_result.matched:
-                        continue
-                return match_rule.message
+            matched_result = self._first_match_output_with_timeout(
+                rule.match_output, blob
+            )
+            if matched_result.timed_out:
+                raise DeclarativeRulePipelineError(
+                    f"Regex timeout in rule '{rule.name}' match_output stage."
+                )
+            if matched_result.index is not None:
+                return rule.match_output[matched_result.index].message
 
         # 4. strip/keep lines (mutually exclusive by validation)
         if rule.strip_lines:
@@ -321,29 +262,59 @@ class DeclarativeFilterPipeline:
             return value[:max_chars]
         return f"{value[: max_chars - 3]}..."
 
-    def _search_with_timeout(
+    def _first_match_output_with_timeout(
         self,
-        pattern: re.Pattern[str],
+        match_rules: tuple[_CompiledMatchOutputRule, ...],
         text: str,
-    ) -> _RegexTimeoutResult:
-        if not self._pattern_requires_timeout_worker(pattern):
-            return _RegexTimeoutResult(
-                matched=pattern.search(text) is not None,
-                timed_out=False,
+    ) -> _RegexFirstMatchResult:
+        if not any(
+            self._pattern_requires_timeout_worker(rule.pattern)
+            or (
+                rule.unless is not None
+                and self._pattern_requires_timeout_worker(rule.unless)
             )
+            for rule in match_rules
+        ):
+            for index, match_rule in enumerate(match_rules):
+                if match_rule.pattern.search(text) is None:
+                    continue
+                if match_rule.unless is not None and match_rule.unless.search(text):
+                    continue
+                return _RegexFirstMatchResult(index=index, timed_out=False)
+            return _RegexFirstMatchResult(index=None, timed_out=False)
+
         worker_result = self._execute_regex_worker(
-            snippet=_REGEX_EVAL_SUBPROCESS_SNIPPET,
-            payload={
-                "pattern": pattern.pattern,
-                "flags": int(pattern.flags),
-                "text": text,
-            },
+            ops=[
+                {
+                    "op": "first_match",
+                    "text": text,
+                    "rules": [
+                        {
+                            "pattern": match_rule.pattern.pattern,
+                            "flags": int(match_rule.pattern.flags),
+                            "unless": (
+                                match_rule.unless.pattern
+                                if match_rule.unless is not None
+                                else None
+                            ),
+                            "unless_flags": (
+                                int(match_rule.unless.flags)
+                                if match_rule.unless is not None
+                                else 0
+                            ),
+                        }
+                        for match_rule in match_rules
+                    ],
+                }
+            ]
         )
         if worker_result.timed_out:
-            return _RegexTimeoutResult(matched=False, timed_out=True)
-        return _RegexTimeoutResult(
-            matched=worker_result.stdout.strip() == "1",
-            timed_out=False,
+            return _RegexFirstMatchResult(index=None, timed_out=True)
+        index = worker_result.results[0]
+        if not isinstance(index, int) or not -1 <= index < len(match_rules):
+            return _RegexFirstMatchResult(index=None, timed_out=True)
+        return _RegexFirstMatchResult(
+            index=index if index >= 0 else None, timed_out=False
         )
 
     def _replace_lines_with_timeout(
@@ -368,25 +339,22 @@ class DeclarativeFilterPipeline:
             return _RegexLinesTimeoutResult(lines=tuple(replaced), timed_out=False)
 
         worker_result = self._execute_regex_worker(
-            snippet=_REGEX_REPLACE_STAGE_SUBPROCESS_SNIPPET,
-            payload={
-                "rules": [
-                    {
-                        "pattern": replace_rule.pattern.pattern,
-                        "flags": int(replace_rule.pattern.flags),
-                        "replacement": replace_rule.replacement,
-                    }
-                    for replace_rule in replace_rules
-                ],
-                "lines": lines,
-            },
+            ops=[
+                {
+                    "op": "replace",
+                    "rules": [
+                        {
+                            "pattern": replace_rule.pattern.pattern,
+                            "flags": int(replace_rule.pattern.flags),
+                            "replacement": replace_rule.replacement,
+                        }
+                        for replace_rule in replace_rules
+                    ],
+                    "lines": lines,
+                }
+            ]
         )
-        if worker_result.timed_out:
-            return _RegexLinesTimeoutResult(lines=tuple(lines), timed_out=True)
-        parsed_lines = self._parse_lines_worker_output(worker_result.stdout)
-        if parsed_lines is None:
-            return _RegexLinesTimeoutResult(lines=tuple(lines), timed_out=True)
-        return _RegexLinesTimeoutResult(lines=tuple(parsed_lines), timed_out=False)
+        return self._lines_result(worker_result, lines)
 
     def _filter_lines_with_timeout(
         self,
@@ -406,77 +374,49 @@ class DeclarativeFilterPipeline:
             return _RegexLinesTimeoutResult(lines=tuple(transformed), timed_out=False)
 
         worker_result = self._execute_regex_worker(
-            snippet=_REGEX_FILTER_STAGE_SUBPROCESS_SNIPPET,
-            payload={
-                "patterns": [
-                    {"pattern": pattern.pattern, "flags": int(pattern.flags)}
-                    for pattern in patterns
-                ],
-                "lines": lines,
-                "keep_matches": keep_matches,
-            },
+            ops=[
+                {
+                    "op": "filter",
+                    "patterns": [
+                        {"pattern": pattern.pattern, "flags": int(pattern.flags)}
+                        for pattern in patterns
+                    ],
+                    "lines": lines,
+                    "keep_matches": keep_matches,
+                }
+            ]
         )
+        return self._lines_result(worker_result, lines)
+
+    @staticmethod
+    def _lines_result(
+        worker_result: _RegexWorkerExecutionResult,
+        original_lines: list[str],
+    ) -> _RegexLinesTimeoutResult:
         if worker_result.timed_out:
-            return _RegexLinesTimeoutResult(lines=tuple(lines), timed_out=True)
-        parsed_lines = self._parse_lines_worker_output(worker_result.stdout)
-        if parsed_lines is None:
-            return _RegexLinesTimeoutResult(lines=tuple(lines), timed_out=True)
-        return _RegexLinesTimeoutResult(lines=tuple(parsed_lines), timed_out=False)
+            return _RegexLinesTimeoutResult(lines=tuple(original_lines), timed_out=True)
+        lines = worker_result.results[0]
+        if not isinstance(lines, list):
+            return _RegexLinesTimeoutResult(lines=tuple(original_lines), timed_out=True)
+        return _RegexLinesTimeoutResult(
+            lines=tuple(str(line) for line in lines), timed_out=False
+        )
 
     def _execute_regex_worker(
         self,
         *,
-        snippet: str,
-        payload: dict[str, Any],
+        ops: list[dict[str, Any]],
     ) -> _RegexWorkerExecutionResult:
-        timeout_seconds = self._regex_timeout_ms / 1000.0
-        worker: subprocess.Popen[str] | None = None
         try:
-            worker = subprocess.Popen(
-                [sys.executable, "-c", snippet],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                text=True,
-            )
-            stdout_data, _ = worker.communicate(
-                json.dumps(payload),
-                timeout=timeout_seconds,
-            )
-            if worker.returncode not in (0, None):
-                return _RegexWorkerExecutionResult(stdout="", timed_out=True)
-            return _RegexWorkerExecutionResult(
-                stdout=stdout_data,
-                timed_out=False,
-            )
-        except subprocess.TimeoutExpired:
-            if worker is not None:
-                worker.kill()
-                worker.communicate(timeout=0.05)
-            return _RegexWorkerExecutionResult(stdout="", timed_out=True)
-        except Exception:
-            logger.debug(
-                "Declarative regex timeout evaluator failed; failing open",
-                exc_info=True,
-            )
-            return _RegexWorkerExecutionResult(stdout="", timed_out=True)
-        finally:
-            if worker is not None and worker.poll() is None:
-                worker.kill()
-                worker.communicate(timeout=0.05)
-
-    @staticmethod
-    def _parse_lines_worker_output(stdout_data: str) -> list[str] | None:
-        try:
-            payload = json.loads(stdout_data)
-        except (TypeError, json.JSONDecodeError):
-            return None
-        if not isinstance(payload, dict) or payload.get("ok") is not True:
-            return None
-        lines = payload.get("lines")
-        if not isinstance(lines, list):
-            return None
-        return [str(line) for line in lines]
+            results = self._worker_pool.run(ops, self._regex_timeout_ms / 1000.0)
+        except RegexWorkerError:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Declarative regex worker timed out or failed; failing open",
+                    exc_info=True,
+                )
+            return _RegexWorkerExecutionResult(results=(), timed_out=True)
+        return _RegexWorkerExecutionResult(results=tuple(results), timed_out=False)
 
     @staticmethod
     def _pattern_requires_timeout_worker(pattern: re.Pattern[str]) -> bool:
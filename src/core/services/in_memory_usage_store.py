@@ -2,21 +2,115 @@
 
 This module provides the InMemoryUsageStore class which maintains usage records
 in memory with thread-safe access and periodic persistence to disk.
+
+Persistence is an append-only record log: each flush appends the records
+changed since the previous flush as JSON lines to the current segment file in
+``<persistence file>.segments/``, rotating to a new segment once it grows past
+``segment_max_bytes``. After ``max_segments`` sealed segments the log is
+compacted into a snapshot at the persistence path, which records the last
+segment it covers. Loading reads the snapshot and replays newer segments, the
+last write of a record id winning. Serialization and file I/O happen outside
+the store lock, so request threads are never blocked by a flush.
 """
 
 from __future__ import annotations
 
+import bisect
 import json
 import logging
 import threading
+from collections.abc import Collection, Iterable
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from src.core.domain.statistics_filter import StatisticsFilter
 from src.core.domain.usage_record import UsageRecord
 
 logger = logging.getLogger(__name__)
 
+_SNAPSHOT_VERSION = 2
+_SEGMENT_SUFFIX = ".jsonl"
+
+# Narrowed candidate sets larger than this share of the store are not worth
+# sorting back into insertion order; a plain scan is used instead.
+_INDEX_SELECTIVITY_THRESHOLD = 0.5
+
+
+class _TimestampIndex:
+    """Record ids sorted by timestamp, for range lookups.
+
+    Naive and timezone-aware timestamps cannot be compared with each other, so
+    they are kept in separate sorted lists.
+    """
+
+    __slots__ = ("_naive", "_aware")
+
+    def __init__(self) -> None:
+        self._naive: tuple[list[datetime], list[str]] = ([], [])
+        self._aware: tuple[list[datetime], list[str]] = ([], [])
+
+    def _lists(self, timestamp: datetime) -> tuple[list[datetime], list[str]]:
+        return self._naive if timestamp.tzinfo is None else self._aware
+
+    def add(self, timestamp: datetime, record_id: str) -> None:
+        keys, ids = self._lists(timestamp)
+        position = bisect.bisect_right(keys, timestamp)
+        keys.insert(position, timestamp)
+        ids.insert(position, record_id)
+
+    def remove(self, timestamp: datetime, record_id: str) -> None:
+        keys, ids = self._lists(timestamp)
+        position = bisect.bisect_left(keys, timestamp)
+        while position < len(keys) and keys[position] == timestamp:
+            if ids[position] == record_id:
+                del keys[position]
+                del ids[position]
+                return
+            position += 1
+
+    def clear(self) -> None:
+        for keys, ids in (self._naive, self._aware):
+            keys.clear()
+            ids.clear()
+
+    def range(self, start: datetime | None, end: datetime | None) -> list[str] | None:
+        """Return ids with ``start <= timestamp <= end``, or None if unbounded.
+
+        Ids in the list of the other timezone kind are always included: the
+        filter has to reject them itself, exactly as a full scan would.
+        """
+        bound = start if start is not None else end
+        if bound is None:
+            return None
+        if (
+            start is not None
+            and end is not None
+            and (start.tzinfo is None) != (end.tzinfo is None)
+        ):
+            return None
+        matching = self._lists(bound)
+        other = self._aware if matching is self._naive else self._naive
+        keys, ids = matching
+        low = 0 if start is None else bisect.bisect_left(keys, start)
+        high = len(keys) if end is None else bisect.bisect_right(keys, end)
+        return ids[low:high] + other[1]
+
+
+def _index_add(index: dict[str, dict[str, None]], key: str, record_id: str) -> None:
+    bucket = index.get(key)
+    if bucket is None:
+        bucket = index[key] = {}
+    bucket[record_id] = None
+
+
+def _index_remove(index: dict[str, dict[str, None]], key: str, record_id: str) -> None:
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(record_id, None)
+        if not bucket:
+            del index[key]
+
 
 class InMemoryUsageStore:
     """Thread-safe in-memory storage with periodic disk persistence.
@@ -33,6 +127,8 @@ class InMemoryUsageStore:
         _flush_thread: Background thread for periodic persistence
         _shutdown_event: Event to signal shutdown to background thread
         _max_records: Maximum number of records to keep in memory
+        _pending: Records added or updated since the last flush
+        _flush_lock: Serializes flushes and guards the segment log state
     """
 
     def __init__(
@@ -40,6 +136,8 @@ class InMemoryUsageStore:
         persistence_path: Path,
         flush_interval_seconds: float = 30.0,
         max_records_in_memory: int = 100000,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        max_segments: int = 8,
     ):
         """Initialize the in-memory usage store.
 
@@ -47,6 +145,8 @@ class InMemoryUsageStore:
             persistence_path: Path to the persistence file
             flush_interval_seconds: Interval between automatic flushes
             max_records_in_memory: Maximum records to keep in memory
+            segment_max_bytes: Size at which the current log segment is sealed
+            max_segments: Sealed segments kept before compacting into a snapshot
         """
         self._lock = threading.RLock()
         self._records: dict[str, UsageRecord] = {}
@@ -57,9 +157,62 @@ class InMemoryUsageStore:
         self._shutdown_event = threading.Event()
         self._max_records = max_records_in_memory
 
+        # Secondary indexes, maintained alongside _records
+        self._sequence: dict[str, int] = {}
+        self._next_sequence = 0
+        self._by_timestamp = _TimestampIndex()
+        self._by_backend: dict[str, dict[str, None]] = {}
+        self._by_model: dict[str, dict[str, None]] = {}
+        self._by_session: dict[str, dict[str, None]] = {}
+
+        # Append-only log state
+        self._pending: dict[str, UsageRecord] = {}
+        self._compaction_requested = False
+        self._flush_lock = threading.Lock()
+        self._segment_dir = persistence_path.with_name(
+            persistence_path.name + ".segments"
+        )
+        self._segment_max_bytes = segment_max_bytes
+        self._max_segments = max_segments
+        self._segment_index = 1
+        self._segment_bytes = 0
+        self._sealed_segments = 0
+        # Segments may only be appended once the snapshot on disk is known to
+        # describe this store; until then the first flush writes a snapshot.
+        self._log_loaded = False
+
         # Ensure parent directory exists
         self._persistence_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def _index_record(self, record: UsageRecord) -> None:
+        self._by_timestamp.add(record.timestamp, record.id)
+        _index_add(self._by_backend, record.backend_type, record.id)
+        _index_add(self._by_model, record.model, record.id)
+        _index_add(self._by_session, record.session_id, record.id)
+
+    def _unindex_record(self, record: UsageRecord) -> None:
+        self._by_timestamp.remove(record.timestamp, record.id)
+        _index_remove(self._by_backend, record.backend_type, record.id)
+        _index_remove(self._by_model, record.model, record.id)
+        _index_remove(self._by_session, record.session_id, record.id)
+
+    def _insert(self, record: UsageRecord) -> None:
+        """Insert or replace a record and keep the indexes in sync."""
+        previous = self._records.get(record.id)
+        if previous is not None:
+            self._unindex_record(previous)
+        else:
+            self._sequence[record.id] = self._next_sequence
+            self._next_sequence += 1
+        self._records[record.id] = record
+        self._index_record(record)
+
+    def _evict_oldest(self) -> None:
+        oldest_id = next(iter(self._records))
+        self._unindex_record(self._records.pop(oldest_id))
+        del self._sequence[oldest_id]
+        self._pending.pop(oldest_id, None)
+
     def add_record(self, record: UsageRecord) -> None:
         """Add a usage record to the store (thread-safe).
 
@@ -70,26 +223,67 @@ class InMemoryUsageStore:
             # Enforce max records limit (FIFO eviction)
             while len(self._records) >= self._max_records and self._records:
                 # Remove oldest inserted item
-                oldest_id = next(iter(self._records))
-                del self._records[oldest_id]
+                self._evict_oldest()
 
             if len(self._records) < self._max_records:
-                self._records[record.id] = record
+                self._insert(record)
+                self._pending[record.id] = record
                 self._dirty = True
 
-    def get_records(self, filters: StatisticsFilter | None = None) -> list[UsageRecord]:
+    def _candidate_ids(
+        self, filters: StatisticsFilter | None, session_id: str | None
+    ) -> Collection[str] | None:
+        """Return the smallest indexed superset of matching ids, or None."""
+        candidates: list[Collection[str]] = []
+        if session_id is not None:
+            candidates.append(self._by_session.get(session_id, {}))
+        if filters is not None:
+            if filters.backend_type is not None:
+                candidates.append(self._by_backend.get(filters.backend_type, {}))
+            if filters.model is not None:
+                candidates.append(self._by_model.get(filters.model, {}))
+            in_range = self._by_timestamp.range(filters.start_date, filters.end_date)
+            if in_range is not None:
+                candidates.append(in_range)
+        if not candidates:
+            return None
+        smallest = min(candidates, key=len)
+        if len(smallest) > len(self._records) * _INDEX_SELECTIVITY_THRESHOLD:
+            return None
+        return smallest
+
+    def get_records(
+        self,
+        filters: StatisticsFilter | None = None,
+        session_id: str | None = None,
+    ) -> list[UsageRecord]:
         """Get usage records matching the filter (thread-safe).
 
+        Backend, model, session and date range criteria are answered from
+        secondary indexes, so only the matching slice of the store is scanned.
+
         Args:
             filters: Optional filter to apply. If None, returns all records.
+            session_id: Optional session identifier to restrict records to
 
         Returns:
-            List of usage records matching the filter
+            List of usage records matching the filter, in insertion order
         """
         with self._lock:
+            candidate_ids = self._candidate_ids(filters, session_id)
+            if candidate_ids is None:
+                records: Iterable[UsageRecord] = self._records.values()
+            else:
+                sequence = self._sequence
+                records = [
+                    self._records[record_id]
+                    for record_id in sorted(candidate_ids, key=sequence.__getitem__)
+                ]
+            if session_id is not None:
+                records = [r for r in records if r.session_id == session_id]
             if filters is None:
-                return list(self._records.values())
-            return [r for r in self._records.values() if filters.matches(r)]
+                return list(records)
+            return [r for r in records if filters.matches(r)]
 
     def update_record(self, record: UsageRecord) -> None:
         """Update an existing usage record (thread-safe).
@@ -103,7 +297,8 @@ class InMemoryUsageStore:
         with self._lock:
             if record.id not in self._records:
                 raise KeyError(f"Record with id {record.id} not found")
-            self._records[record.id] = record
+            self._insert(record)
+            self._pending[record.id] = record
             self._dirty = True
 
     def get_record_by_id(self, record_id: str) -> UsageRecord | None:
@@ -170,99 +365,219 @@ class InMemoryUsageStore:
             except Exception as e:
                 logger.error(f"Error during periodic flush: {e}", exc_info=True)
 
-    def flush_to_disk(self) -> None:
-        """Persist current state to disk if dirty (thread-safe).
-
-        This method serializes all records to JSON and writes them to the
-        persistence file. The dirty flag is cleared after successful write.
-        """
-        with self._lock:
-            if not self._dirty:
-                logger.debug("Store is clean, skipping flush")
-                return
+    def _segment_path(self, index: int) -> Path:
+        return self._segment_dir / f"{index:08d}{_SEGMENT_SUFFIX}"
 
+    def _existing_segments(self) -> list[tuple[int, Path]]:
+        """Return the segment files on disk, ordered by index."""
+        if not self._segment_dir.is_dir():
+            return []
+        segments: list[tuple[int, Path]] = []
+        for path in self._segment_dir.glob(f"*{_SEGMENT_SUFFIX}"):
             try:
-                # Serialize records
-                records_data = [record.to_dict() for record in self._records.values()]
-
-                # Create persistence structure
-                persistence_data = {
-                    "version": 1,
-                    "last_flush": datetime.now().isoformat(),
-                    "record_count": len(records_data),
-                    "records": records_data,
-                }
-
-                # Write to temporary file first
-                temp_path = self._persistence_path.with_suffix(".tmp")
-                with open(temp_path, "w", encoding="utf-8") as f:
-                    json.dump(persistence_data, f, indent=2)
-
-                # Atomic rename
-                temp_path.replace(self._persistence_path)
-
-                # Clear dirty flag
+                segments.append((int(path.stem), path))
+            except ValueError:
+                continue
+        segments.sort()
+        return segments
+
+    def flush_to_disk(self) -> None:
+        """Persist changes since the last flush to disk if dirty (thread-safe).
+
+        Changed records are taken from the store under the lock; serializing
+        and writing them happens after it is released. Usually this appends
+        them to the current log segment. When the log holds too many sealed
+        segments, the store was cleared, or no snapshot has been written or
+        loaded yet, the full store is written as a new snapshot instead and
+        the segments it covers are deleted. The dirty flag is cleared when the
+        changes are taken and restored if writing them fails.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    logger.debug("Store is clean, skipping flush")
+                    return
+
+                pending = self._pending
+                self._pending = {}
                 self._dirty = False
-                logger.info(
-                    f"Flushed {len(records_data)} records to {self._persistence_path}"
-                )
+                snapshot: list[UsageRecord] | None = None
+                if (
+                    self._compaction_requested
+                    or not self._log_loaded
+                    or self._sealed_segments >= self._max_segments
+                ):
+                    snapshot = list(self._records.values())
+                    self._compaction_requested = False
 
+            try:
+                if snapshot is not None:
+                    self._write_snapshot(snapshot)
+                else:
+                    self._append_to_log(pending.values())
             except Exception as e:
+                with self._lock:
+                    # Keep newer changes made while the flush was running
+                    pending.update(self._pending)
+                    self._pending = pending
+                    self._dirty = True
+                    if snapshot is not None:
+                        self._compaction_requested = True
                 logger.error(f"Failed to flush to disk: {e}", exc_info=True)
                 raise
 
+    def _write_snapshot(self, records: list[UsageRecord]) -> None:
+        """Write ``records`` as a snapshot covering all current segments."""
+        covered = self._segment_index
+        persistence_data = {
+            "version": _SNAPSHOT_VERSION,
+            "last_flush": datetime.now().isoformat(),
+            "record_count": len(records),
+            "segment": covered,
+            "records": [record.to_dict() for record in records],
+        }
+
+        # Write to temporary file first
+        temp_path = self._persistence_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(persistence_data, f, separators=(",", ":"))
+
+        # Atomic rename
+        temp_path.replace(self._persistence_path)
+
+        for index, path in self._existing_segments():
+            if index <= covered:
+                path.unlink(missing_ok=True)
+        self._segment_index = covered + 1
+        self._segment_bytes = 0
+        self._sealed_segments = 0
+        self._log_loaded = True
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Wrote snapshot of %d records to %s",
+                len(records),
+                self._persistence_path,
+            )
+
+    def _append_to_log(self, records: Iterable[UsageRecord]) -> None:
+        """Append ``records`` as JSON lines to the current log segment."""
+        payload = "".join(
+            json.dumps(record.to_dict(), separators=(",", ":")) + "\n"
+            for record in records
+        ).encode("utf-8")
+        if not payload:
+            return
+
+        self._segment_dir.mkdir(parents=True, exist_ok=True)
+        segment_path = self._segment_path(self._segment_index)
+        with open(segment_path, "ab") as f:
+            f.write(payload)
+        self._segment_bytes += len(payload)
+        if self._segment_bytes >= self._segment_max_bytes:
+            self._segment_index += 1
+            self._segment_bytes = 0
+            self._sealed_segments += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Appended %d bytes of usage records to %s",
+                len(payload),
+                segment_path,
+            )
+
+    def _read_snapshot(self) -> tuple[list[dict[str, Any]], int]:
+        """Return the snapshot's records and the last segment it covers."""
+        with open(self._persistence_path, encoding="utf-8") as f:
+            persistence_data = json.load(f)
+
+        # Validate version; version 1 files are plain snapshots without a log
+        version = persistence_data.get("version", 1)
+        if version not in (1, _SNAPSHOT_VERSION):
+            logger.warning(f"Unknown persistence version {version}, attempting to load")
+
+        return persistence_data.get("records", []), int(
+            persistence_data.get("segment", 0)
+        )
+
+    def _read_segment(self, path: Path) -> list[dict[str, Any]]:
+        records_data: list[dict[str, Any]] = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records_data.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash mid-append can leave a partial last line
+                    logger.warning(
+                        "Skipping unreadable line %d in usage log segment %s",
+                        line_number,
+                        path,
+                    )
+        return records_data
+
     def load_from_disk(self) -> None:
         """Load persisted state from disk (thread-safe).
 
-        This method reads the persistence file and loads all records into memory.
-        If the file doesn't exist or is invalid, the store remains empty.
+        This method reads the snapshot file and replays the log segments
+        written after it. If neither exists, the store remains empty.
         """
-        with self._lock:
-            if not self._persistence_path.exists():
+        with self._flush_lock, self._lock:
+            segments = self._existing_segments()
+            has_snapshot = self._persistence_path.exists()
+            if not has_snapshot and not segments:
                 logger.info(
                     f"No persistence file found at {self._persistence_path}, "
                     "starting with empty store"
                 )
+                self._log_loaded = True
                 return
 
             try:
-                with open(self._persistence_path, encoding="utf-8") as f:
-                    persistence_data = json.load(f)
-
-                # Validate version
-                version = persistence_data.get("version", 1)
-                if version != 1:
-                    logger.warning(
-                        f"Unknown persistence version {version}, attempting to load"
-                    )
-
-                # Load records
-                records_data = persistence_data.get("records", [])
-
-                # Respect memory limit by taking only the most recent records
-                if len(records_data) > self._max_records:
-                    logger.info(
-                        f"Truncating loaded records from {len(records_data)} to {self._max_records} limit"
-                    )
-                    records_data = records_data[-self._max_records :]
-
-                loaded_count = 0
-
+                records_data: list[dict[str, Any]] = []
+                covered = 0
+                if has_snapshot:
+                    records_data, covered = self._read_snapshot()
+                segments = [(i, path) for i, path in segments if i > covered]
+                for _, path in segments:
+                    records_data.extend(self._read_segment(path))
+
+                # Replay in write order; a later line for an id replaces the
+                # earlier one but keeps its position.
+                loaded: dict[str, UsageRecord] = {}
                 for record_data in records_data:
                     try:
                         record = UsageRecord.from_dict(record_data)
-                        self._records[record.id] = record
-                        loaded_count += 1
+                        loaded[record.id] = record
                     except Exception as e:
                         logger.error(
                             f"Failed to load record {record_data.get('id')}: {e}",
                             exc_info=True,
                         )
 
+                # Respect memory limit by taking only the most recent records
+                loaded_records = list(loaded.values())
+                if len(loaded_records) > self._max_records:
+                    logger.info(
+                        f"Truncating loaded records from {len(loaded_records)} to {self._max_records} limit"
+                    )
+                    loaded_records = loaded_records[-self._max_records :]
+
+                for record in loaded_records:
+                    self._insert(record)
+                while len(self._records) > self._max_records:
+                    self._evict_oldest()
+
+                # Continue in a fresh segment after the newest one on disk
+                last_segment = segments[-1][0] if segments else covered
+                self._segment_index = last_segment + 1
+                self._segment_bytes = 0
+                self._sealed_segments = len(segments)
+                self._log_loaded = True
+
                 # Don't mark as dirty after loading
                 self._dirty = False
                 logger.info(
-                    f"Loaded {loaded_count} records from {self._persistence_path}"
+                    f"Loaded {len(loaded_records)} records from {self._persistence_path}"
                 )
 
             except json.JSONDecodeError as e:
@@ -275,10 +590,18 @@ class InMemoryUsageStore:
     def clear(self) -> None:
         """Clear all records from the store (thread-safe).
 
-        This method removes all records and marks the store as dirty.
+        This method removes all records and marks the store as dirty. The next
+        flush replaces the persisted log with an empty snapshot.
         """
         with self._lock:
             self._records.clear()
+            self._sequence.clear()
+            self._by_timestamp.clear()
+            self._by_backend.clear()
+            self._by_model.clear()
+            self._by_session.clear()
+            self._pending.clear()
+            self._compaction_requested = True
             self._dirty = True
 
     def get_record_count(self) -> int:
@@ -143,7 +143,9 @@ class IntelligentSessionResolver(ISessionResolver):
             return session_id
 
         # 5. Compute conversation fingerprint
-        fp_bundle = self._fingerprint_service.compute_fingerprint_bundle(messages)
+        fp_bundle = self._fingerprint_service.compute_fingerprint_bundle(
+            messages, session_key=f"client:{client_key}"
+        )
         conversation_fp = fp_bundle.primary.fingerprint
 
         if logger.isEnabledFor(logging.DEBUG):
@@ -1,12 +1,31 @@
+"""Process-wide counters, gauges and latency timers.
+
+Metrics are accumulated in per-thread shards: each thread owns a shard it
+alone writes to, so ``inc`` and ``record_duration`` never take a lock (all
+asyncio tasks of an event loop share that loop thread's shard). Reads merge
+all shards under the registry lock; shards of threads that have exited are
+folded into a retired shard whenever a shard is registered or metrics are
+read, so the shard list tracks live threads only.
+
+Gauges hold the last value set from any thread, so they live in one map
+under the registry lock instead of in the shards.
+
+Timers keep a log-linear (HDR-style) histogram with 16 sub-buckets per power
+of two, which bounds quantile error to about 3% relative without storing
+samples.
+"""
+
 from __future__ import annotations
 
 import logging
+import math
+import re
 import threading
 import time
 from collections import OrderedDict
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
-from dataclasses import dataclass
+from typing import Any
 
 from src.core.domain.metrics import TimerStats
 
@@ -15,21 +34,162 @@ logger = logging.getLogger(__name__)
 # Maximum number of metrics to track to prevent unbounded memory growth
 _MAX_METRICS = 10000
 
-_lock = threading.RLock()
-_counters: OrderedDict[str, int] = OrderedDict()
+# Histogram resolution: 2**_SUB_BUCKET_BITS buckets per power of two
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+# Bucket for zero, negative and non-finite durations
+_ZERO_BUCKET = -(2**31)
+
+_PROMETHEUS_QUANTILES = (0.5, 0.9, 0.99)
+_PROMETHEUS_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _bucket_index(value: float) -> int:
+    if not value > 0 or math.isinf(value):
+        return _ZERO_BUCKET
+    mantissa, exponent = math.frexp(value)
+    return exponent * _SUB_BUCKETS + int((mantissa * 2.0 - 1.0) * _SUB_BUCKETS)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index == _ZERO_BUCKET:
+        return 0.0
+    exponent, sub_bucket = divmod(index, _SUB_BUCKETS)
+    return math.ldexp(1.0 + (sub_bucket + 0.5) / _SUB_BUCKETS, exponent - 1)
+
+
+class _Histogram:
+    """Duration histogram with exact count, total, min and max."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.buckets: dict[int, int] = {}
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        index = _bucket_index(value)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+
+    def merge(self, other: _Histogram) -> None:
+        # Copy first: the owning thread may be recording into ``other``.
+        other_buckets = other.buckets.copy()
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, count in other_buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q``-quantile, clamped to the observed range."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(_bucket_midpoint(index), self.min), self.max)
+        return self.max
+
+    def to_stats(self) -> TimerStats:
+        if self.count == 0:
+            return TimerStats(count=0, total=0.0, average=0.0, min=0.0, max=0.0)
+        return TimerStats(
+            count=self.count,
+            total=self.total,
+            average=self.total / self.count,
+            min=self.min,
+            max=self.max,
+            p50=self.quantile(0.5),
+            p90=self.quantile(0.9),
+            p99=self.quantile(0.99),
+        )
 
 
-@dataclass
-class TimerData:
-    """Internal storage for timer metrics."""
+class _Shard:
+    """Metrics written by a single thread."""
 
-    count: int = 0
-    total: float = 0.0
-    min: float = float("inf")
-    max: float = float("-inf")
+    __slots__ = ("thread", "counters", "timers")
 
+    def __init__(self, thread: threading.Thread | None) -> None:
+        self.thread = thread
+        self.counters: OrderedDict[str, int] = OrderedDict()
+        self.timers: OrderedDict[str, _Histogram] = OrderedDict()
 
-_timers: OrderedDict[str, TimerData] = OrderedDict()
+
+_registry_lock = threading.Lock()
+_shards: list[_Shard] = []
+# Accumulated metrics of threads that have exited
+_retired = _Shard(None)
+_gauges: OrderedDict[str, float] = OrderedDict()
+_local = threading.local()
+
+
+def _local_shard() -> _Shard:
+    try:
+        shard: _Shard = _local.shard
+        return shard
+    except AttributeError:
+        pass
+    shard = _Shard(threading.current_thread())
+    with _registry_lock:
+        _fold_dead_shards_locked()
+        _shards.append(shard)
+    _local.shard = shard
+    return shard
+
+
+def _make_room(metrics: OrderedDict[str, Any]) -> None:
+    """Evict the least recently updated metric of a full map (LRU).
+
+    Every update moves a metric to the end, so a hot metric created early is
+    not evicted when many other names appear. Unlike the old global map,
+    reads do not count as use.
+    """
+    if len(metrics) >= _MAX_METRICS:
+        metrics.popitem(last=False)
+
+
+def _fold_dead_shards_locked() -> None:
+    """Merge shards of exited threads into ``_retired``. Requires the lock."""
+    live: list[_Shard] = []
+    for shard in _shards:
+        if shard.thread is not None and shard.thread.is_alive():
+            live.append(shard)
+            continue
+        for name, value in shard.counters.items():
+            if name in _retired.counters:
+                _retired.counters.move_to_end(name)
+            else:
+                _make_room(_retired.counters)
+            _retired.counters[name] = _retired.counters.get(name, 0) + value
+        for name, histogram in shard.timers.items():
+            target = _retired.timers.get(name)
+            if target is None:
+                _make_room(_retired.timers)
+                target = _retired.timers[name] = _Histogram()
+            else:
+                _retired.timers.move_to_end(name)
+            target.merge(histogram)
+    _shards[:] = live
+
+
+def _all_shards_locked() -> Iterable[_Shard]:
+    _fold_dead_shards_locked()
+    return (_retired, *_shards)
 
 
 def inc(name: str, by: int = 1) -> None:
@@ -39,15 +199,14 @@ def inc(name: str, by: int = 1) -> None:
         name: The name of the counter metric
         by: The amount to increment by (default: 1)
     """
-    with _lock:
-        if name in _counters:
-            _counters[name] += by
-            _counters.move_to_end(name)
-        else:
-            if len(_counters) >= _MAX_METRICS:
-                # Evict oldest entry (FIFO behavior with OrderedDict)
-                _counters.popitem(last=False)
-            _counters[name] = by
+    counters = _local_shard().counters
+    value = counters.get(name)
+    if value is None:
+        _make_room(counters)
+        counters[name] = by
+    else:
+        counters[name] = value + by
+        counters.move_to_end(name)
 
 
 def get(name: str) -> int:
@@ -59,11 +218,8 @@ def get(name: str) -> int:
     Returns:
         The current counter value, or 0 if not found
     """
-    with _lock:
-        val = _counters.get(name, 0)
-        if name in _counters:
-            _counters.move_to_end(name)
-        return int(val)
+    with _registry_lock:
+        return sum(shard.counters.get(name, 0) for shard in _all_shards_locked())
 
 
 def snapshot() -> dict[str, int]:
@@ -72,8 +228,12 @@ def snapshot() -> dict[str, int]:
     Returns:
         A dictionary of all counter metrics and their values
     """
-    with _lock:
-        return dict(_counters)
+    totals: dict[str, int] = {}
+    with _registry_lock:
+        for shard in _all_shards_locked():
+            for name, value in shard.counters.copy().items():
+                totals[name] = totals.get(name, 0) + value
+    return totals
 
 
 def record_duration(name: str, duration_seconds: float) -> None:
@@ -83,23 +243,42 @@ def record_duration(name: str, duration_seconds: float) -> None:
         name: The name of the timer metric
         duration_seconds: The duration to record in seconds
     """
-    with _lock:
-        if name in _timers:
-            data = _timers[name]
-            _timers.move_to_end(name)
+    timers = _local_shard().timers
+    histogram = timers.get(name)
+    if histogram is None:
+        _make_room(timers)
+        histogram = timers[name] = _Histogram()
+    else:
+        timers.move_to_end(name)
+    histogram.record(duration_seconds)
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Set a gauge metric to its current value.
+
+    Args:
+        name: The name of the gauge metric
+        value: The current value, e.g. a queue depth
+    """
+    with _registry_lock:
+        if name in _gauges:
+            _gauges.move_to_end(name)
         else:
-            if len(_timers) >= _MAX_METRICS:
-                # Evict oldest entry
-                _timers.popitem(last=False)
-            data = TimerData()
-            _timers[name] = data
+            _make_room(_gauges)
+        _gauges[name] = value
 
-        data.count += 1
-        data.total += duration_seconds
-        if duration_seconds < data.min:
-            data.min = duration_seconds
-        if duration_seconds > data.max:
-            data.max = duration_seconds
+
+def get_gauge(name: str) -> float:
+    """Get the last value set for a gauge metric.
+
+    Args:
+        name: The name of the gauge metric
+
+    Returns:
+        The gauge value, or 0.0 if it was never set
+    """
+    with _registry_lock:
+        return _gauges.get(name, 0.0)
 
 
 @contextmanager
@@ -122,6 +301,18 @@ def timer(name: str) -> Generator[None, None, None]:
         record_duration(name, duration)
 
 
+def _merged_histograms() -> dict[str, _Histogram]:
+    merged: dict[str, _Histogram] = {}
+    with _registry_lock:
+        for shard in _all_shards_locked():
+            for name, histogram in shard.timers.copy().items():
+                target = merged.get(name)
+                if target is None:
+                    target = merged[name] = _Histogram()
+                target.merge(histogram)
+    return merged
+
+
 def get_timer_stats(name: str) -> TimerStats:
     """Get statistics for a timer metric.
 
@@ -129,36 +320,15 @@ def get_timer_stats(name: str) -> TimerStats:
         name: The name of the timer metric
 
     Returns:
-        TimerStats containing count, total, average, min, and max durations
+        TimerStats containing count, total, average, min, max and p50/p90/p99
     """
-    with _lock:
-        if name not in _timers:
-            return TimerStats(
-                count=0,
-                total=0.0,
-                average=0.0,
-                min=0.0,
-                max=0.0,
-            )
-
-        data = _timers[name]
-        # Handle case where count is 0 (shouldn't happen if in dict, but for safety)
-        if data.count == 0:
-            return TimerStats(
-                count=0,
-                total=0.0,
-                average=0.0,
-                min=0.0,
-                max=0.0,
-            )
-
-        return TimerStats(
-            count=data.count,
-            total=data.total,
-            average=data.total / data.count,
-            min=data.min,
-            max=data.max,
-        )
+    merged = _Histogram()
+    with _registry_lock:
+        for shard in _all_shards_locked():
+            histogram = shard.timers.get(name)
+            if histogram is not None:
+                merged.merge(histogram)
+    return merged.to_stats()
 
 
 def get_all_timer_stats() -> dict[str, TimerStats]:
@@ -167,8 +337,77 @@ def get_all_timer_stats() -> dict[str, TimerStats]:
     Returns:
         A dictionary mapping timer names to their statistics
     """
-    with _lock:
-        return {name: get_timer_stats(name) for name in _timers}
+    return {name: hist.to_stats() for name, hist in _merged_histograms().items()}
+
+
+def reset() -> None:
+    """Discard all counters, gauges and timers."""
+    with _registry_lock:
+        _gauges.clear()
+        for shard in (_retired, *_shards):
+            # Swap rather than clear: owners hold no iterator over the new maps.
+            shard.counters = OrderedDict()
+            shard.timers = OrderedDict()
+
+
+def _prometheus_name(name: str, suffix: str) -> str:
+    sanitized = _PROMETHEUS_NAME_INVALID.sub("_", name)
+    if sanitized[:1].isdigit():
+        sanitized = f"_{sanitized}"
+    return f"llm_proxy_{sanitized}{suffix}"
+
+
+def _prometheus_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format (0.0.4).
+
+    Counters are exported as ``<name>_total`` counters, gauges as ``<name>``
+    gauges and timers as ``<name>_seconds`` summaries with p50/p90/p99 quantiles. Names are prefixed
+    with ``llm_proxy_``; characters Prometheus does not allow become ``_``,
+    and metrics whose names collide after that are merged.
+    """
+    counters: dict[str, int] = {}
+    for name, value in snapshot().items():
+        metric = _prometheus_name(name, "_total")
+        counters[metric] = counters.get(metric, 0) + value
+
+    with _registry_lock:
+        gauges = {_prometheus_name(name, ""): value for name, value in _gauges.items()}
+
+    summaries: dict[str, _Histogram] = {}
+    for name, histogram in _merged_histograms().items():
+        metric = _prometheus_name(name, "_seconds")
+        target = summaries.get(metric)
+        if target is None:
+            summaries[metric] = histogram
+        else:
+            target.merge(histogram)
+
+    lines: list[str] = []
+    for metric in sorted(counters):
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {counters[metric]}")
+    for metric in sorted(gauges):
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {_prometheus_value(gauges[metric])}")
+    for metric in sorted(summaries):
+        histogram = summaries[metric]
+        lines.append(f"# TYPE {metric} summary")
+        for q in _PROMETHEUS_QUANTILES:
+            lines.append(
+                f'{metric}{{quantile="{q}"}} '
+                f"{_prometheus_value(histogram.quantile(q))}"
+            )
+        lines.append(f"{metric}_sum {_prometheus_value(histogram.total)}")
+        lines.append(f"{metric}_count {histogram.count}")
+    return "\n".join(lines) + "\n" if lines else ""
 
 
 def log_performance_stats() -> None:
@@ -197,6 +436,7 @@ def log_performance_stats() -> None:
             f"Tool call processing timing: "
             f"count={processing_stats.count}, "
             f"avg={processing_stats.average*1000:.2f}ms, "
+            f"p99={processing_stats.p99*1000:.2f}ms, "
             f"min={processing_stats.min*1000:.2f}ms, "
             f"max={processing_stats.max*1000:.2f}ms"
         )
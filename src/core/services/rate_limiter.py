@@ -7,8 +7,13 @@ Implements the IRateLimiter interface for controlling API request rates.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import inspect
 import logging
+import math
 import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -17,6 +22,18 @@ from src.core.interfaces.rate_limiter_interface import IRateLimiter, RateLimitIn
 
 logger = logging.getLogger(__name__)
 
+# Values accepted by ``create_rate_limiter`` for ``rate_limiter_engine``.
+RATE_LIMITER_ENGINE_EXACT = "exact"
+RATE_LIMITER_ENGINE_SLIDING_WINDOW = "sliding_window"
+
+# Settings ``create_rate_limiter`` reads from configuration objects.
+_RATE_LIMITER_CONFIG_KEYS = (
+    "default_rate_limit",
+    "default_rate_window",
+    "rate_limiter_engine",
+    "rate_limits",
+)
+
 
 @dataclass(frozen=True)
 class RateLimit:
@@ -402,6 +419,357 @@ class InMemoryRateLimiter(IRateLimiter):
             )
 
 
+@dataclass(slots=True)
+class _WindowCounter:
+    """Fixed-size sliding-window state for one key."""
+
+    window_start: float
+    time_window: int
+    current: int = 0
+    previous: int = 0
+
+
+class SlidingWindowRateLimiter(IRateLimiter):
+    """In-memory rate limiter using sliding-window counters.
+
+    Each key keeps the counts of the current and previous fixed windows and
+    estimates usage as ``previous * (1 - elapsed / window) + current``. Checks
+    and records are O(1) in time and memory per key regardless of the limit,
+    at the cost of approximating the exact timestamp log kept by
+    ``InMemoryRateLimiter``. Idle keys, expired cooldowns and stale custom
+    limits are dropped by a background sweeper instead of on the request path.
+    """
+
+    def __init__(
+        self,
+        default_limit: int = 60,
+        default_time_window: int = 60,
+        sweep_interval_seconds: float = 60.0,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            default_limit: Default operations per time window
+            default_time_window: Default time window in seconds
+            sweep_interval_seconds: Interval between background expiry sweeps
+        """
+        self._counters: OrderedDict[str, _WindowCounter] = OrderedDict()
+        self._limits: dict[str, RateLimit] = {}
+        self._limits_last_access: dict[str, float] = {}
+        self._cooldowns: dict[str, float] = {}
+
+        self._default_limit = default_limit
+        self._default_time_window = default_time_window
+        # Least recently used counters are evicted beyond this many keys
+        self._max_usage_entries = 10000
+        self._max_limits = 10000
+        self._limits_ttl_seconds = 24 * 3600
+        self._sweep_interval_seconds = sweep_interval_seconds
+        self._sweeper_task: asyncio.Task[None] | None = None
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Initialized SlidingWindowRateLimiter with defaults: %s/%ss",
+                default_limit,
+                default_time_window,
+            )
+
+    async def check_limit(self, key: str) -> RateLimitInfo:
+        """Check if the given key is rate limited.
+
+        Args:
+            key: The key to check
+
+        Returns:
+            RateLimitInfo with rate limit status
+        """
+        now = time.time()
+        self._ensure_sweeper()
+
+        rate_limit = self._get_limits(key)
+        limit = rate_limit.limit
+        time_window = rate_limit.time_window
+
+        used = 0.0
+        reset_at = None
+        counter = self._counters.get(key)
+        if counter is not None:
+            self._counters.move_to_end(key)
+            self._roll(counter, now, time_window)
+            used = self._estimate(counter, now)
+
+        is_limited = used >= limit
+        remaining = max(0, limit - int(used))
+        if is_limited and counter is not None:
+            reset_at = self._reset_time(counter, limit)
+
+        cooldown_until = self._cooldowns.get(key)
+        if cooldown_until is not None:
+            if now >= cooldown_until:
+                self._cooldowns.pop(key, None)
+            else:
+                is_limited = True
+                remaining = 0
+                reset_at = cooldown_until
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Rate limit check: %s - %.2f/%s used, limited: %s",
+                key,
+                used,
+                limit,
+                is_limited,
+            )
+
+        return RateLimitInfo(
+            is_limited=is_limited,
+            remaining=remaining,
+            reset_at=reset_at,
+            limit=limit,
+            time_window=time_window,
+        )
+
+    async def record_usage(self, key: str, cost: int = 1) -> None:
+        """Record usage for the given key.
+
+        Args:
+            key: The key to record usage for
+            cost: The cost of the operation
+        """
+        now = time.time()
+        self._ensure_sweeper()
+
+        time_window = self._get_limits(key).time_window
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = _WindowCounter(
+                window_start=self._window_start(now, time_window),
+                time_window=time_window,
+            )
+            self._counters[key] = counter
+            while len(self._counters) > self._max_usage_entries:
+                evicted_key, _ = self._counters.popitem(last=False)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Evicted oldest usage entry for key %s "
+                        "(max_usage_entries=%d reached)",
+                        evicted_key,
+                        self._max_usage_entries,
+                    )
+        else:
+            self._counters.move_to_end(key)
+            self._roll(counter, now, time_window)
+
+        counter.current += max(0, cost)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Recorded usage for %s: cost=%s", key, cost)
+
+    async def reset(self, key: str) -> None:
+        """Reset rate limit counters for the given key.
+
+        Args:
+            key: The key to reset
+        """
+        if self._counters.pop(key, None) is not None and logger.isEnabledFor(
+            logging.DEBUG
+        ):
+            logger.debug("Reset rate limit counters for %s", key)
+        self._cooldowns.pop(key, None)
+
+    async def set_limit(self, key: str, limit: int, time_window: int) -> None:
+        """Set a custom rate limit for the given key.
+
+        Args:
+            key: The key to set limits for
+            limit: The maximum number of operations
+            time_window: The time window in seconds
+        """
+        now = time.time()
+
+        if len(self._limits) >= self._max_limits and key not in self._limits:
+            oldest_key = min(self._limits_last_access.items(), key=lambda x: x[1])[0]
+            self._limits.pop(oldest_key, None)
+            self._limits_last_access.pop(oldest_key, None)
+
+        self._limits[key] = RateLimit(limit=limit, time_window=time_window)
+        self._limits_last_access[key] = now
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Set custom rate limit for %s: %s/%ss", key, limit, time_window
+            )
+
+    async def apply_cooldown(self, key: str, cooldown_seconds: int) -> None:
+        """Force a temporary cooldown for the key."""
+        if cooldown_seconds <= 0:
+            return
+
+        new_expiry = time.time() + cooldown_seconds
+        current_expiry = self._cooldowns.get(key)
+        if current_expiry is None or new_expiry > current_expiry:
+            self._cooldowns[key] = new_expiry
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Applied cooldown for %s until %s",
+                    key,
+                    datetime.fromtimestamp(new_expiry).isoformat(),
+                )
+
+    async def close(self) -> None:
+        """Stop the background expiry sweeper."""
+        task = self._sweeper_task
+        self._sweeper_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def dispose(self) -> None:
+        """Stop the sweeper when the DI container shuts down."""
+        await self.close()
+
+    def sweep(self, now: float | None = None) -> int:
+        """Drop idle counters, expired cooldowns and stale custom limits.
+
+        Runs periodically on the background sweeper; exposed for tests and
+        callers without a running event loop.
+
+        Returns:
+            The number of entries removed
+        """
+        if now is None:
+            now = time.time()
+        removed = 0
+
+        # A counter whose previous window has also elapsed estimates to zero.
+        idle_keys = [
+            key
+            for key, counter in self._counters.items()
+            if now - counter.window_start >= 2 * counter.time_window
+        ]
+        for key in idle_keys:
+            del self._counters[key]
+        removed += len(idle_keys)
+
+        expired_cooldowns = [
+            key for key, expiry in self._cooldowns.items() if now >= expiry
+        ]
+        for key in expired_cooldowns:
+            del self._cooldowns[key]
+        removed += len(expired_cooldowns)
+
+        cutoff = now - self._limits_ttl_seconds
+        stale_limits = [
+            key
+            for key, last_access in self._limits_last_access.items()
+            if last_access < cutoff
+        ]
+        for key in stale_limits:
+            self._limits.pop(key, None)
+            self._limits_last_access.pop(key, None)
+        removed += len(stale_limits)
+
+        if removed and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Rate limiter sweep removed %d entries (idle=%d, cooldowns=%d, "
+                "limits=%d)",
+                removed,
+                len(idle_keys),
+                len(expired_cooldowns),
+                len(stale_limits),
+            )
+        return removed
+
+    def _get_limits(self, key: str) -> RateLimit:
+        """Get the limits for a key (or default if not set)."""
+        rate_limit = self._limits.get(key)
+        if rate_limit is None:
+            return RateLimit(
+                limit=self._default_limit, time_window=self._default_time_window
+            )
+        self._limits_last_access[key] = time.time()
+        return rate_limit
+
+    @staticmethod
+    def _window_start(now: float, time_window: int) -> float:
+        return now - (now % time_window) if time_window > 0 else now
+
+    def _roll(self, counter: _WindowCounter, now: float, time_window: int) -> None:
+        """Advance ``counter`` to the fixed window containing ``now``."""
+        if time_window != counter.time_window:
+            # The limit changed; carry the current estimate into the new window.
+            carried = self._estimate(counter, now)
+            counter.time_window = time_window
+            counter.window_start = self._window_start(now, time_window)
+            counter.current = math.ceil(carried)
+            counter.previous = 0
+            return
+        start = self._window_start(now, time_window)
+        if start <= counter.window_start:
+            return
+        if start - counter.window_start < 2 * time_window:
+            counter.previous = counter.current
+        else:
+            counter.previous = 0
+        counter.current = 0
+        counter.window_start = start
+
+    @staticmethod
+    def _estimate(counter: _WindowCounter, now: float) -> float:
+        if counter.time_window <= 0:
+            return float(counter.current)
+        elapsed = (now - counter.window_start) / counter.time_window
+        weight = max(0.0, 1.0 - elapsed)
+        return counter.previous * weight + counter.current
+
+    @staticmethod
+    def _reset_time(counter: _WindowCounter, limit: int) -> float | None:
+        """Return when the estimate next drops below ``limit``."""
+        window = counter.time_window
+        if limit <= 0 or window <= 0:
+            return None
+        if counter.current >= limit:
+            # Only once the current count becomes the decaying previous window
+            next_start = counter.window_start + window
+            return next_start + window * (1.0 - limit / counter.current)
+        return counter.window_start + window * (
+            1.0 - (limit - counter.current) / counter.previous
+        )
+
+    def _ensure_sweeper(self) -> None:
+        task = self._sweeper_task
+        if task is not None and not task.done():
+            return
+        if self._sweep_interval_seconds <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # The loop only holds a weak reference so an abandoned limiter can be
+        # collected; the task then exits on its next wake-up.
+        self._sweeper_task = loop.create_task(
+            _sweep_periodically(weakref.ref(self), self._sweep_interval_seconds),
+            name="rate-limiter-sweeper",
+        )
+
+
+async def _sweep_periodically(
+    limiter_ref: weakref.ReferenceType[SlidingWindowRateLimiter], interval: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        limiter = limiter_ref()
+        if limiter is None:
+            return
+        try:
+            limiter.sweep()
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Rate limiter sweep failed")
+        del limiter
+
+
 class ConfigurableRateLimiter(IRateLimiter):
     """Rate limiter that loads configuration from app config.
 
@@ -468,6 +836,15 @@ class ConfigurableRateLimiter(IRateLimiter):
         await self._ensure_config_applied()
         await self._limiter.apply_cooldown(key, cooldown_seconds)
 
+    async def dispose(self) -> None:
+        """Dispose the base limiter, e.g. stop its background sweeper."""
+        dispose = getattr(self._limiter, "dispose", None)
+        if dispose is None:
+            return
+        result = dispose()
+        if inspect.isawaitable(result):
+            await result
+
     async def _ensure_config_applied(self) -> None:
         """Apply configuration once before delegating to the base limiter."""
         if self._config_applied:
@@ -559,6 +936,9 @@ RateLimiter = InMemoryRateLimiter
 def create_rate_limiter(config: Any) -> IRateLimiter:
     """Create a rate limiter based on configuration.
 
+    ``rate_limiter_engine`` selects the base limiter: ``"exact"`` (default)
+    keeps a timestamp per operation, ``"sliding_window"`` uses O(1) counters.
+
     Args:
         config: Configuration object (AppConfig or dict)
 
@@ -571,16 +951,33 @@ def create_rate_limiter(config: Any) -> IRateLimiter:
     elif isinstance(config, dict):
         config_dict = config
     else:
-        config_dict = {}
+        config_dict = {
+            key: getattr(config, key)
+            for key in _RATE_LIMITER_CONFIG_KEYS
+            if getattr(config, key, None) is not None
+        }
 
     # Get rate limiter configuration with defaults
     default_limit = config_dict.get("default_rate_limit", 60)
     default_time_window = config_dict.get("default_rate_window", 60)
+    engine = config_dict.get("rate_limiter_engine", RATE_LIMITER_ENGINE_EXACT)
 
     # Create base limiter
-    base_limiter = InMemoryRateLimiter(
-        default_limit=default_limit, default_time_window=default_time_window
-    )
+    base_limiter: IRateLimiter
+    if engine == RATE_LIMITER_ENGINE_SLIDING_WINDOW:
+        base_limiter = SlidingWindowRateLimiter(
+            default_limit=default_limit, default_time_window=default_time_window
+        )
+    else:
+        if engine != RATE_LIMITER_ENGINE_EXACT and logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "Unknown rate_limiter_engine %r; using %r",
+                engine,
+                RATE_LIMITER_ENGINE_EXACT,
+            )
+        base_limiter = InMemoryRateLimiter(
+            default_limit=default_limit, default_time_window=default_time_window
+        )
 
     # Wrap with configurable limiter
     return ConfigurableRateLimiter(base_limiter, config_dict)
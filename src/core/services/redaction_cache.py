@@ -1,12 +1,19 @@
 """
-Redaction cache for tracking processed messages per session.
+Redaction caches: a shared, content-addressed result store plus per-session
+tracking of processed messages.
 
-This module provides a caching mechanism to avoid reprocessing historical
-messages that have already been checked for API key redaction and command
-filtering on previous requests in the same session.
+The result store maps (redactor configuration, text) to the redacted text, so
+identical system prompts and tool outputs sent by many sessions are redacted
+once process-wide. Keys are keyed BLAKE2b digests computed outside any lock;
+entries live in lock-striped LRU segments with a byte budget.
 
-Since conversation history messages are immutable (only new messages are
+Per-session tracking avoids even the lookup for history messages that were
+already processed on previous requests in the same session. Since
+conversation history messages are immutable (only new messages are
 appended), we can safely skip redaction for messages we've already processed.
+Session states are split across lock-striped shards chosen by session id and
+kept in access order, so eviction pops from the front of one shard instead of
+scanning every session.
 """
 
 from __future__ import annotations
@@ -15,7 +22,8 @@ import hashlib
 import logging
 import threading
 import time
-from collections.abc import MutableMapping
+from collections import OrderedDict
+from collections.abc import Callable, MutableMapping
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -33,6 +41,39 @@ _MAX_HASHES_PER_SESSION = 10000
 # Session TTL in seconds (1 hour) - cleanup stale entries
 _SESSION_TTL_SECONDS = 3600
 
+# Number of independently locked session shards
+_SESSION_SHARDS = 16
+
+# Sharding is reduced until every shard can hold at least this many sessions,
+# so small caches keep exact global LRU behaviour.
+_MIN_SESSIONS_PER_SHARD = 64
+
+# Expired sessions dropped per insertion (amortised TTL cleanup)
+_EXPIRE_BATCH = 8
+
+# Byte budget for cached redaction results, split evenly across stripes
+_MAX_RESULT_BYTES = 64 * 1024 * 1024
+
+# Number of independently locked result segments
+_RESULT_STRIPES = 16
+
+# Approximate per-entry overhead (key bytes, dict slot, string header)
+_RESULT_ENTRY_OVERHEAD = 160
+
+_DIGEST_SIZE = 16
+
+
+def content_digest(text: str, namespace: bytes = b"") -> bytes:
+    """Return a 128-bit BLAKE2b digest of ``text`` keyed by ``namespace``.
+
+    ``surrogatepass`` keeps distinct (even malformed) strings distinct.
+    """
+    return hashlib.blake2b(
+        text.encode("utf-8", errors="surrogatepass"),
+        digest_size=_DIGEST_SIZE,
+        key=namespace,
+    ).digest()
+
 
 class RedactionCacheStats(BaseModel):
     """Statistics for a session's redaction cache."""
@@ -41,13 +82,24 @@ class RedactionCacheStats(BaseModel):
     total_processed: int
 
 
+class RedactionResultCacheStats(BaseModel):
+    """Statistics for the shared redaction result store."""
+
+    entries: int
+    bytes_used: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
 @dataclass
 class SessionRedactionState:
     """Tracks redaction state for a single session."""
 
     # Set of content hashes that have been processed
     # We use LRUCache to limit memory usage per session
-    processed_hashes: MutableMapping[str, bool] = field(
+    processed_hashes: MutableMapping[bytes, bool] = field(
         default_factory=lambda: LRUCache(maxsize=_MAX_HASHES_PER_SESSION)
     )
 
@@ -58,40 +110,161 @@ class SessionRedactionState:
     total_processed: int = 0
 
 
+class _ResultStripe:
+    """One lock-protected LRU segment of the result store.
+
+    A ``None`` value records that redaction left the text unchanged, so the
+    common case costs no string memory.
+    """
+
+    __slots__ = ("lock", "entries", "bytes_used", "hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[bytes, str | None] = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class _SessionShard:
+    """One lock-protected slice of per-session state, in access order."""
+
+    __slots__ = ("lock", "states", "max_sessions")
+
+    def __init__(self, max_sessions: int) -> None:
+        self.lock = threading.Lock()
+        self.states: OrderedDict[str, SessionRedactionState] = OrderedDict()
+        self.max_sessions = max_sessions
+
+
+def _entry_cost(result: str | None) -> int:
+    return _RESULT_ENTRY_OVERHEAD + (len(result) if result is not None else 0)
+
+
 class RedactionCache:
     """
-    Cache for tracking which messages have been processed for redaction.
+    Shared redaction result store and per-session processed-message tracking.
 
     Uses content hashing to identify messages. This handles edge cases like:
     - Message content changes (will be reprocessed)
     - Session resets (new hashes, old ones cleaned up)
     - Different message counts (hash-based, not index-based)
+    - Redactor reconfiguration (results are namespaced by configuration)
+
+    Locks are only held for dictionary operations, never while hashing,
+    redacting or awaiting, so the API is safe to call from async handlers and
+    worker threads alike.
     """
 
     def __init__(
         self,
         max_sessions: int = _MAX_SESSIONS,
         session_ttl_seconds: float = _SESSION_TTL_SECONDS,
+        max_result_bytes: int = _MAX_RESULT_BYTES,
+        result_stripes: int = _RESULT_STRIPES,
+        session_shards: int = _SESSION_SHARDS,
     ) -> None:
-        self._states: dict[str, SessionRedactionState] = {}
-        self._max_sessions = max_sessions
+        self._max_sessions = max(1, max_sessions)
         self._session_ttl = session_ttl_seconds
-        self._lock = threading.Lock()
-
-    def _compute_content_hash(self, content: Any) -> str:
-        """Compute a hash of message content for cache lookup.
-
-        Note: MD5 is used here for fast content deduplication, not for security.
-        The usedforsecurity=False flag explicitly marks this non-security usage.
+        shard_count = max(
+            1,
+            min(session_shards, self._max_sessions // _MIN_SESSIONS_PER_SHARD),
+        )
+        per_shard = -(-self._max_sessions // shard_count)
+        self._session_shards = tuple(
+            _SessionShard(per_shard) for _ in range(shard_count)
+        )
+
+        self._stripes = tuple(_ResultStripe() for _ in range(max(1, result_stripes)))
+        self._max_result_bytes = max(0, max_result_bytes)
+        self._stripe_budget = self._max_result_bytes // len(self._stripes)
+
+    # ------------------------------------------------------------------
+    # Shared result store
+    # ------------------------------------------------------------------
+
+    def _stripe_for(self, key: bytes) -> _ResultStripe:
+        return self._stripes[int.from_bytes(key[:4], "little") % len(self._stripes)]
+
+    def redact(
+        self, text: str, redact: Callable[[str], str], *, namespace: bytes = b""
+    ) -> str:
+        """Return ``redact(text)``, reusing a cached result for identical text.
+
+        ``namespace`` must identify the redactor's configuration (for example
+        :attr:`APIKeyRedactor.fingerprint`) so results are never reused across
+        different key sets. Hashing and redaction run outside the stripe lock.
         """
+        if not text or not self._stripe_budget:
+            return redact(text)
+
+        key = content_digest(text, namespace)
+        stripe = self._stripe_for(key)
+        with stripe.lock:
+            if key in stripe.entries:
+                stripe.entries.move_to_end(key)
+                stripe.hits += 1
+                cached = stripe.entries[key]
+                return text if cached is None else cached
+            stripe.misses += 1
+
+        result = redact(text)
+        stored = None if result == text else result
+        cost = _entry_cost(stored)
+        if cost > self._stripe_budget:
+            return result
+
+        with stripe.lock:
+            if key in stripe.entries:
+                # A concurrent miss stored the same result first.
+                stripe.bytes_used -= _entry_cost(stripe.entries.pop(key))
+            stripe.entries[key] = stored
+            stripe.bytes_used += cost
+            while stripe.bytes_used > self._stripe_budget:
+                _, evicted = stripe.entries.popitem(last=False)
+                stripe.bytes_used -= _entry_cost(evicted)
+                stripe.evictions += 1
+        return result
+
+    def clear_results(self) -> None:
+        """Drop all cached redaction results."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes_used = 0
+
+    def get_result_stats(self) -> RedactionResultCacheStats:
+        """Aggregate statistics across all result stripes."""
+        entries = bytes_used = hits = misses = evictions = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                entries += len(stripe.entries)
+                bytes_used += stripe.bytes_used
+                hits += stripe.hits
+                misses += stripe.misses
+                evictions += stripe.evictions
+        return RedactionResultCacheStats(
+            entries=entries,
+            bytes_used=bytes_used,
+            max_bytes=self._max_result_bytes,
+            hits=hits,
+            misses=misses,
+            evictions=evictions,
+        )
+
+    # ------------------------------------------------------------------
+    # Per-session tracking
+    # ------------------------------------------------------------------
+
+    def _compute_content_hash(self, content: Any) -> bytes:
+        """Compute a hash of message content for cache lookup."""
         if content is None:
-            return "none"
+            return b"none"
 
         if isinstance(content, str):
-            # Use first 16 chars of MD5 - enough for deduplication
-            return hashlib.md5(
-                content.encode("utf-8", errors="replace"), usedforsecurity=False
-            ).hexdigest()[:16]
+            return content_digest(content)
 
         # For list content (multimodal), serialize to string first
         if isinstance(content, list):
@@ -105,41 +278,85 @@ class RedactionCache:
                     text = getattr(part, "text", "")
                     if text:
                         parts.append(str(text))
-            combined = "||".join(parts)
-            return hashlib.md5(
-                combined.encode("utf-8", errors="replace"), usedforsecurity=False
-            ).hexdigest()[:16]
+            return content_digest("||".join(parts))
 
         # Fallback: convert to string
-        return hashlib.md5(
-            str(content).encode("utf-8", errors="replace"), usedforsecurity=False
-        ).hexdigest()[:16]
+        return content_digest(str(content))
+
+    def _message_hashes(self, messages: list[Any]) -> list[bytes]:
+        hashes = []
+        for message in messages:
+            if isinstance(message, dict):
+                content = message.get("content")
+            else:
+                content = getattr(message, "content", None)
+            hashes.append(self._compute_content_hash(content))
+        return hashes
+
+    def _shard_for(self, session_id: str) -> _SessionShard:
+        return self._session_shards[hash(session_id) % len(self._session_shards)]
+
+    def _get_or_create_state_locked(
+        self, shard: _SessionShard, session_id: str, now: float
+    ) -> SessionRedactionState:
+        """Return the session's state, creating it if needed. Lock held."""
+        state = shard.states.get(session_id)
+        if state is not None:
+            shard.states.move_to_end(session_id)
+        else:
+            self._evict_locked(shard, now)
+            state = SessionRedactionState(last_access=now)
+            shard.states[session_id] = state
+        state.last_access = now
+        return state
+
+    def _evict_locked(self, shard: _SessionShard, now: float) -> None:
+        """Make room for one new session in ``shard``. Lock held.
+
+        States are in access order, so expired sessions sit at the front and a
+        bounded number of them is dropped per call; if the shard is still full
+        its least recently used session goes.
+        """
+        states = shard.states
+        for _ in range(_EXPIRE_BATCH):
+            if not states:
+                return
+            oldest_state = next(iter(states.values()))
+            if now - oldest_state.last_access <= self._session_ttl:
+                break
+            states.popitem(last=False)
+
+        if len(states) >= shard.max_sessions:
+            oldest_session, _ = states.popitem(last=False)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Evicted oldest redaction cache entry for session %s",
+                    oldest_session,
+                )
 
     def is_processed(self, session_id: str, content: Any) -> bool:
         """Check if a message content has already been processed."""
         content_hash = self._compute_content_hash(content)
+        shard = self._shard_for(session_id)
 
-        with self._lock:
-            state = self._states.get(session_id)
+        with shard.lock:
+            state = shard.states.get(session_id)
             if state is None:
                 return False
 
+            shard.states.move_to_end(session_id)
             state.last_access = time.time()
             return content_hash in state.processed_hashes
 
     def mark_processed(self, session_id: str, content: Any) -> None:
         """Mark a message content as processed."""
         content_hash = self._compute_content_hash(content)
+        shard = self._shard_for(session_id)
+        now = time.time()
 
-        with self._lock:
-            if session_id not in self._states:
-                # Check if we need to evict old entries
-                self._maybe_cleanup_locked()
-                self._states[session_id] = SessionRedactionState()
-
-            state = self._states[session_id]
+        with shard.lock:
+            state = self._get_or_create_state_locked(shard, session_id, now)
             state.processed_hashes[content_hash] = True
-            state.last_access = time.time()
             state.total_processed += 1
 
     def get_unprocessed_indices(
@@ -151,82 +368,62 @@ class RedactionCache:
         This is the main entry point for optimization: instead of processing
         all messages, only process those at the returned indices.
         """
-        unprocessed = []
-
-        with self._lock:
-            state = self._states.get(session_id)
-
-            for idx, message in enumerate(messages):
-                content = None
-                if isinstance(message, dict):
-                    content = message.get("content")
-                else:
-                    content = getattr(message, "content", None)
-
-                content_hash = self._compute_content_hash(content)
-
-                if state is None or content_hash not in state.processed_hashes:
-                    unprocessed.append(idx)
+        hashes = self._message_hashes(messages)
+        shard = self._shard_for(session_id)
 
-        return unprocessed
+        with shard.lock:
+            state = shard.states.get(session_id)
+            if state is None:
+                return list(range(len(hashes)))
+            processed = state.processed_hashes
+            return [
+                idx
+                for idx, content_hash in enumerate(hashes)
+                if content_hash not in processed
+            ]
 
     def mark_batch_processed(self, session_id: str, messages: list[Any]) -> None:
         """Mark multiple messages as processed at once."""
-        with self._lock:
-            if session_id not in self._states:
-                self._maybe_cleanup_locked()
-                self._states[session_id] = SessionRedactionState()
-
-            state = self._states[session_id]
-            for message in messages:
-                content = None
-                if isinstance(message, dict):
-                    content = message.get("content")
-                else:
-                    content = getattr(message, "content", None)
-
-                content_hash = self._compute_content_hash(content)
-                if content_hash not in state.processed_hashes:
-                    state.processed_hashes[content_hash] = True
+        hashes = self._message_hashes(messages)
+        shard = self._shard_for(session_id)
+        now = time.time()
+
+        with shard.lock:
+            state = self._get_or_create_state_locked(shard, session_id, now)
+            processed = state.processed_hashes
+            for content_hash in hashes:
+                if content_hash not in processed:
+                    processed[content_hash] = True
                     state.total_processed += 1
 
-            state.last_access = time.time()
+    def has_session(self, session_id: str) -> bool:
+        """Return whether per-session state is tracked for ``session_id``."""
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            return session_id in shard.states
 
-    def _maybe_cleanup_locked(self) -> None:
-        """Clean up stale sessions if we're at capacity. Must be called with lock held."""
-        if len(self._states) < self._max_sessions:
-            return
-
-        now = time.time()
-        expired_sessions = [
-            sid
-            for sid, state in self._states.items()
-            if now - state.last_access > self._session_ttl
-        ]
-
-        for sid in expired_sessions:
-            del self._states[sid]
-
-        # If still at capacity after TTL cleanup, evict oldest
-        if len(self._states) >= self._max_sessions:
-            oldest_session = min(self._states.items(), key=lambda x: x[1].last_access)[
-                0
-            ]
-            del self._states[oldest_session]
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(
-                    f"Evicted oldest redaction cache entry for session {oldest_session}"
-                )
+    def session_count(self) -> int:
+        """Return the number of tracked sessions across all shards."""
+        total = 0
+        for shard in self._session_shards:
+            with shard.lock:
+                total += len(shard.states)
+        return total
 
     def clear_session(self, session_id: str) -> None:
-        """Clear cached state for a session."""
-        with self._lock:
-            self._states.pop(session_id, None)
+        """Clear cached state for a session.
+
+        Shared redaction results are content-addressed and stay cached.
+        """
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            shard.states.pop(session_id, None)
 
     def get_stats(self, session_id: str) -> RedactionCacheStats:
         """Get statistics for a session's redaction cache."""
-        with self._lock:
-            state = self._states.get(session_id)
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            state = shard.states.get(session_id)
             if state is None:
                 return RedactionCacheStats(cached_hashes=0, total_processed=0)
             return RedactionCacheStats(
@@ -5,7 +5,8 @@ This middleware handles API key redaction to prevent sensitive information
 from being sent to LLM backends.
 
 Optimization: Uses session-level caching to avoid reprocessing historical
-messages that have already been redacted in previous requests.
+messages that have already been redacted in previous requests, and a shared
+content-addressed result cache so text seen by any session is redacted once.
 """
 
 from __future__ import annotations
@@ -18,6 +19,7 @@ from pydantic.types import JsonValue
 from src.core.domain.chat import ChatMessage, ChatRequest, MessageContentPartText
 from src.core.interfaces.request_processor_interface import IRequestMiddleware
 from src.core.services.redaction_cache import (
+    RedactionCache,
     get_global_redaction_cache,
 )
 from src.security import APIKeyRedactor
@@ -70,15 +72,15 @@ class RedactionMiddleware(IRequestMiddleware):
             session_id_value = context.get("session_id")
             session_id = session_id_value if isinstance(session_id_value, str) else None
 
-        # Get the redaction cache for session-level optimization
-        cache = get_global_redaction_cache() if session_id else None
+        # Shared result cache; session-level skipping needs a session id
+        cache = get_global_redaction_cache()
 
         # Create a copy of the request to modify
         processed_request = request.model_copy(deep=True)
 
         # Optimization: Get indices of messages that need processing
         # (skip already-processed messages from previous requests in this session)
-        if cache and session_id:
+        if session_id:
             unprocessed_indices = set(
                 cache.get_unprocessed_indices(session_id, processed_request.messages)
             )
@@ -105,21 +107,21 @@ class RedactionMiddleware(IRequestMiddleware):
                 # Handle string content
                 if isinstance(message.content, str):
                     # Apply API key redaction
-                    message.content = self._api_key_redactor.redact(message.content)
+                    message.content = self._redact_text(cache, message.content)
                 # Handle list of content parts
                 elif isinstance(message.content, list):
                     for part in message.content:
                         if isinstance(part, dict) and "text" in part and part["text"]:
                             # Apply API key redaction
-                            part["text"] = self._api_key_redactor.redact(part["text"])
+                            part["text"] = self._redact_text(cache, part["text"])
                         elif isinstance(part, MessageContentPartText) and part.text:
                             # Apply API key redaction
-                            part.text = self._api_key_redactor.redact(part.text)
+                            part.text = self._redact_text(cache, part.text)
 
             newly_processed_messages.append(message)
 
         # Update cache with newly processed messages
-        if cache and session_id and newly_processed_messages:
+        if session_id and newly_processed_messages:
             cache.mark_batch_processed(session_id, newly_processed_messages)
             if logger.isEnabledFor(logging.DEBUG):
                 stats = cache.get_stats(session_id)
@@ -131,6 +133,10 @@ class RedactionMiddleware(IRequestMiddleware):
 
         return processed_request
 
+    def _redact_text(self, cache: RedactionCache, text: str) -> str:
+        redactor = self._api_key_redactor
+        return cache.redact(text, redactor.redact, namespace=redactor.fingerprint)
+
     def update_api_keys(self, api_keys: Iterable[str]) -> None:
         """Update the API keys to redact.
 
@@ -0,0 +1,366 @@
+"""
+Pool of long-lived worker processes for timeout-guarded regex evaluation.
+
+Python's ``re`` cannot be interrupted, so patterns at risk of catastrophic
+backtracking are evaluated in a separate interpreter that can be killed when
+it exceeds its time budget. Starting an interpreter costs far more than the
+usual budget, so workers are started once, announce readiness, and then serve
+line-delimited JSON requests with a per-worker cache of compiled patterns. A
+worker is killed only when a request times out or the worker misbehaves, and
+its replacement is started on a background thread; the time budget covers
+the request round trip only, never interpreter startup.
+
+Each request carries a batch of operations that are evaluated in order in one
+round trip:
+
+* ``search``: ``{"op": "search", "pattern", "flags", "text"}`` -> ``bool``
+  (an invalid pattern counts as no match)
+* ``first_match``: ``{"op": "first_match", "text", "rules": [{"pattern",
+  "flags", "unless"?, "unless_flags"?}]}`` -> index of the first rule whose
+  pattern matches and whose ``unless`` does not, or ``-1``
+* ``replace``: ``{"op": "replace", "lines", "rules": [{"pattern", "flags",
+  "replacement"}]}`` -> lines with every rule applied in order
+* ``filter``: ``{"op": "filter", "lines", "patterns": [{"pattern", "flags"}],
+  "keep_matches"}`` -> lines kept by the filter
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import subprocess
+import sys
+import threading
+import time
+from contextlib import suppress
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Worker processes kept alive per pool
+_DEFAULT_POOL_SIZE = 2
+
+# Interpreter startup budget; not part of any request's regex budget
+_DEFAULT_STARTUP_TIMEOUT_SECONDS = 10.0
+
+_READY_LINE = "ready"
+
+_WORKER_SNIPPET = """\
+import json
+import re
+import sys
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def _compile(pattern, flags):
+    return re.compile(pattern, flags)
+
+
+def _search(pattern, flags, text):
+    try:
+        return _compile(pattern, flags).search(text) is not None
+    except Exception:
+        return False
+
+
+def _run(op):
+    kind = op["op"]
+    if kind == "search":
+        return _search(op["pattern"], int(op["flags"]), op["text"])
+    if kind == "first_match":
+        text = op["text"]
+        for index, rule in enumerate(op["rules"]):
+            if not _search(rule["pattern"], int(rule["flags"]), text):
+                continue
+            unless = rule.get("unless")
+            if unless is not None and _search(
+                unless, int(rule.get("unless_flags", 0)), text
+            ):
+                continue
+            return index
+        return -1
+    if kind == "replace":
+        compiled = [
+            (_compile(str(r["pattern"]), int(r["flags"])), str(r["replacement"]))
+            for r in op["rules"]
+        ]
+        transformed = []
+        for line in op["lines"]:
+            current = str(line)
+            for pattern, replacement in compiled:
+                current = pattern.sub(replacement, current)
+            transformed.append(current)
+        return transformed
+    if kind == "filter":
+        compiled = [
+            _compile(str(p["pattern"]), int(p["flags"])) for p in op["patterns"]
+        ]
+        keep_matches = bool(op.get("keep_matches", False))
+        return [
+            line
+            for line in map(str, op["lines"])
+            if any(p.search(line) is not None for p in compiled) == keep_matches
+        ]
+    raise ValueError(kind)
+
+
+def _main():
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    write("ready\\n")
+    flush()
+    while True:
+        raw = sys.stdin.readline()
+        if not raw:
+            return
+        try:
+            response = {"ok": True, "results": [_run(op) for op in json.loads(raw)]}
+        except Exception:
+            response = {"ok": False, "results": []}
+        write(json.dumps(response) + "\\n")
+        flush()
+
+
+_main()
+"""
+
+
+class RegexWorkerError(RuntimeError):
+    """Raised when a worker times out, dies or returns an invalid response."""
+
+
+class _RegexWorker:
+    """One worker process plus a reader thread feeding its stdout lines."""
+
+    def __init__(self, startup_timeout_seconds: float) -> None:
+        self._process = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_SNIPPET],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        self._lines: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        threading.Thread(
+            target=self._read_stdout,
+            name="regex-worker-reader",
+            daemon=True,
+        ).start()
+        try:
+            ready = self._lines.get(timeout=startup_timeout_seconds)
+        except queue.Empty:
+            ready = None
+        if ready is None or ready.strip() != _READY_LINE:
+            self.kill()
+            raise RegexWorkerError("Regex worker failed to start")
+
+    def _read_stdout(self) -> None:
+        stdout = self._process.stdout
+        assert stdout is not None
+        with suppress(Exception):
+            for line in stdout:
+                self._lines.put(line)
+        self._lines.put(None)
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def call(self, ops: list[dict[str, Any]], timeout_seconds: float) -> list[Any]:
+        stdin = self._process.stdin
+        assert stdin is not None
+        deadline = time.monotonic() + timeout_seconds
+        try:
+            # ensure_ascii keeps each request on one line whatever the text
+            stdin.write(json.dumps(ops) + "\n")
+            stdin.flush()
+            line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty as exc:
+            raise RegexWorkerError("Regex worker timed out") from exc
+        except (OSError, ValueError) as exc:
+            raise RegexWorkerError("Regex worker pipe closed") from exc
+        if line is None:
+            raise RegexWorkerError("Regex worker exited")
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise RegexWorkerError("Invalid regex worker response") from exc
+        if not isinstance(response, dict) or response.get("ok") is not True:
+            raise RegexWorkerError("Regex worker rejected the request")
+        results = response.get("results")
+        if not isinstance(results, list) or len(results) != len(ops):
+            raise RegexWorkerError("Invalid regex worker response")
+        return results
+
+    def kill(self) -> None:
+        with suppress(Exception):
+            self._process.kill()
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None:
+                with suppress(Exception):
+                    stream.close()
+        with suppress(Exception):
+            self._process.wait(timeout=1.0)
+
+
+class RegexWorkerPool:
+    """Fixed-size pool of pre-started regex worker processes.
+
+    Thread-safe: callers check out an idle worker (starting one if the pool
+    is below its size) and block for one otherwise. Killed workers are
+    replaced in the background so the next request does not pay for
+    interpreter startup.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = _DEFAULT_POOL_SIZE,
+        startup_timeout_seconds: float = _DEFAULT_STARTUP_TIMEOUT_SECONDS,
+    ) -> None:
+        self._size = max(1, size)
+        self._startup_timeout = startup_timeout_seconds
+        self._idle: queue.LifoQueue[_RegexWorker] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+    def _acquire(self) -> _RegexWorker:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RegexWorkerError("Regex worker pool is closed")
+                spawn = self._started < self._size
+                if spawn:
+                    self._started += 1
+            if not spawn:
+                # Poll so a waiter notices capacity freed by a killed worker.
+                with suppress(queue.Empty):
+                    return self._idle.get(timeout=0.05)
+                continue
+            try:
+                return _RegexWorker(self._startup_timeout)
+            except BaseException:
+                with self._lock:
+                    self._started -= 1
+                raise
+
+    def _release(self, worker: _RegexWorker, *, healthy: bool) -> None:
+        if healthy and worker.alive:
+            with self._lock:
+                closed = self._closed
+            if not closed:
+                self._idle.put(worker)
+                return
+        worker.kill()
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._started -= 1
+        if not closed:
+            # The dead worker's slot stays counted until its replacement is up
+            self._start_in_background()
+
+    def _start_in_background(self) -> None:
+        """Start a worker for an already counted slot on a daemon thread."""
+        threading.Thread(
+            target=self._start_worker, name="regex-worker-starter", daemon=True
+        ).start()
+
+    def _start_worker(self) -> None:
+        try:
+            worker = _RegexWorker(self._startup_timeout)
+        except Exception:
+            logger.warning("Could not start regex worker", exc_info=True)
+            with self._lock:
+                self._started -= 1
+            return
+        self._release(worker, healthy=True)
+
+    def run(self, ops: list[dict[str, Any]], timeout_seconds: float) -> list[Any]:
+        """Evaluate ``ops`` in one round trip and return one result per op.
+
+        Raises:
+            RegexWorkerError: The request timed out or the worker failed; the
+                worker involved has been killed.
+        """
+        if not ops:
+            return []
+        try:
+            worker = self._acquire()
+        except RegexWorkerError:
+            raise
+        except Exception as exc:
+            raise RegexWorkerError("Could not start regex worker") from exc
+        healthy = False
+        try:
+            results = worker.call(ops, timeout_seconds)
+            healthy = True
+            return results
+        finally:
+            self._release(worker, healthy=healthy)
+
+    def warm(self, *, wait: bool = True) -> None:
+        """Start all workers now rather than on first use.
+
+        Args:
+            wait: Block until the workers are ready. Otherwise they start on
+                background threads and requests arriving earlier wait for them.
+        """
+        if not wait:
+            with self._lock:
+                missing = 0 if self._closed else self._size - self._started
+                self._started += max(0, missing)
+            for _ in range(missing):
+                self._start_in_background()
+            return
+        workers: list[_RegexWorker] = []
+        try:
+            with self._lock:
+                missing = self._size - self._started
+            for _ in range(max(0, missing)):
+                workers.append(self._acquire())
+        finally:
+            for worker in workers:
+                self._release(worker, healthy=True)
+
+    def close(self) -> None:
+        """Kill all idle workers; busy workers are killed when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.kill()
+            with self._lock:
+                self._started -= 1
+
+
+_shared_pool: RegexWorkerPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_regex_worker_pool() -> RegexWorkerPool:
+    """Return the process-wide regex worker pool, starting its workers."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                pool = RegexWorkerPool()
+                pool.warm(wait=False)
+                atexit.register(pool.close)
+                _shared_pool = pool
+    return _shared_pool
+
+
+__all__ = ["RegexWorkerError", "RegexWorkerPool", "get_regex_worker_pool"]
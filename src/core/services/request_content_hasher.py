@@ -0,0 +1,200 @@
+"""Canonical, incremental hashing of chat request content.
+
+The deduplication key for a request used to be a SHA-256 over a sorted
+``json.dumps`` of every ``model_dump()``-ed message. This module walks the
+same structures directly into a hash object instead, and memoizes the digest
+of plain text messages so that re-sent conversation history costs a dict
+lookup per message rather than a re-serialization.
+
+Cache keys hold the message text, so the cache is bounded by the characters
+it retains as well as by entries, and messages too large to be worth keeping
+(big tool outputs) are hashed directly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Protocol
+
+# Field types a message may contain and still be memoized. Numbers and bools
+# are excluded because ``1 == 1.0 == True`` would alias distinct contents.
+_CACHEABLE_FIELD_TYPES = (str, type(None))
+
+# Characters of message text the digest cache may retain
+_MAX_CACHED_CHARS = 16 * 1024 * 1024
+
+# Larger messages are hashed without memoization
+_MAX_CACHED_MESSAGE_CHARS = 64 * 1024
+
+# Approximate per-entry overhead in characters (key tuple, digest, dict slot)
+_CACHE_ENTRY_OVERHEAD = 256
+
+
+class _Hasher(Protocol):
+    def update(self, data: bytes, /) -> None: ...
+
+
+def update_canonical(hasher: _Hasher, value: Any) -> None:
+    """Feed a canonical encoding of ``value`` into ``hasher``.
+
+    Every value is type-tagged and length-prefixed so that distinct structures
+    cannot collide by concatenation. Mapping keys are visited in sorted order
+    and Pydantic models are treated as mappings of their fields (including
+    extras), mirroring ``json.dumps(model_dump(), sort_keys=True)``.
+    """
+    if value is None:
+        hasher.update(b"N")
+    elif value is True:
+        hasher.update(b"T")
+    elif value is False:
+        hasher.update(b"F")
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8", "surrogatepass")
+        hasher.update(b"s%d:" % len(encoded))
+        hasher.update(encoded)
+    elif isinstance(value, int):
+        hasher.update(b"i%d;" % value)
+    elif isinstance(value, float):
+        hasher.update(b"f" + repr(value).encode("ascii") + b";")
+    elif isinstance(value, dict):
+        _update_mapping(hasher, value)
+    elif isinstance(value, list | tuple):
+        hasher.update(b"l%d:" % len(value))
+        for item in value:
+            update_canonical(hasher, item)
+    elif hasattr(value, "__pydantic_fields_set__"):
+        _update_mapping(hasher, _model_fields(value))
+    else:
+        update_canonical(hasher, str(value))
+
+
+def _update_mapping(hasher: _Hasher, mapping: dict[Any, Any]) -> None:
+    hasher.update(b"d%d:" % len(mapping))
+    for key, item in sorted(mapping.items(), key=lambda pair: str(pair[0])):
+        update_canonical(hasher, str(key))
+        update_canonical(hasher, item)
+
+
+def _model_fields(model: Any) -> dict[str, Any]:
+    fields = dict(model.__dict__)
+    extra = getattr(model, "__pydantic_extra__", None)
+    if extra:
+        fields.update(extra)
+    return fields
+
+
+def _message_cache_key(
+    message: Any, max_chars: int
+) -> tuple[tuple[Any, ...], int] | None:
+    """Return a hashable key and its size for messages made only of strings.
+
+    Plain text messages (the bulk of a long history) qualify; messages with
+    content parts, tool calls or metadata, or with more than ``max_chars``
+    characters of text, are hashed without memoization.
+    """
+    if isinstance(message, dict):
+        fields = message
+        kind = "dict"
+    elif hasattr(message, "__pydantic_fields_set__"):
+        fields = _model_fields(message)
+        kind = type(message).__qualname__
+    else:
+        return None
+    chars = 0
+    for item in fields.values():
+        if not isinstance(item, _CACHEABLE_FIELD_TYPES):
+            return None
+        if item is not None:
+            chars += len(item)
+    if chars > max_chars:
+        return None
+    key = (kind, *sorted(fields.items(), key=lambda pair: str(pair[0])))
+    return key, chars + _CACHE_ENTRY_OVERHEAD
+
+
+class RequestContentHasher:
+    """Computes deduplication hashes with a bounded per-message digest cache.
+
+    The cache is LRU and bounded by both ``max_cached_messages`` entries and
+    ``max_cached_chars`` characters of retained message text.
+
+    Not thread-safe; the deduplication service only calls it from the event
+    loop.
+    """
+
+    def __init__(
+        self,
+        max_cached_messages: int = 4096,
+        max_cached_chars: int = _MAX_CACHED_CHARS,
+    ) -> None:
+        self._max_cached_messages = max_cached_messages
+        self._max_cached_chars = max(0, max_cached_chars)
+        self._max_message_chars = min(
+            _MAX_CACHED_MESSAGE_CHARS,
+            self._max_cached_chars - _CACHE_ENTRY_OVERHEAD,
+        )
+        self._message_digests: OrderedDict[tuple[Any, ...], tuple[bytes, int]] = (
+            OrderedDict()
+        )
+        self._cached_chars = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def cache_hits(self) -> int:
+        return self._hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self._misses
+
+    def message_digest(self, message: Any) -> bytes:
+        """Return the canonical digest of a single message."""
+        entry = (
+            _message_cache_key(message, self._max_message_chars)
+            if self._max_cached_messages > 0 and self._max_message_chars >= 0
+            else None
+        )
+        if entry is not None:
+            key, cost = entry
+            cached = self._message_digests.get(key)
+            if cached is not None:
+                self._message_digests.move_to_end(key)
+                self._hits += 1
+                return cached[0]
+
+        hasher = hashlib.sha256()
+        update_canonical(hasher, message)
+        digest = hasher.digest()
+
+        if entry is not None:
+            self._misses += 1
+            digests = self._message_digests
+            digests[key] = (digest, cost)
+            self._cached_chars += cost
+            while (
+                len(digests) > self._max_cached_messages
+                or self._cached_chars > self._max_cached_chars
+            ):
+                _, (_, evicted_cost) = digests.popitem(last=False)
+                self._cached_chars -= evicted_cost
+        return digest
+
+    def hash_request(self, request: Any, session_id: str) -> str:
+        """Return a 32-character hex hash of the request's dedup-relevant content.
+
+        Covers the session, model, messages and tools.
+        """
+        hasher = hashlib.sha256()
+        update_canonical(hasher, session_id)
+        update_canonical(hasher, request.model)
+        messages = request.messages or []
+        hasher.update(b"m%d:" % len(messages))
+        for message in messages:
+            hasher.update(self.message_digest(message))
+        tools = getattr(request, "tools", None)
+        if tools:
+            hasher.update(b"t")
+            update_canonical(hasher, tools)
+        return hasher.hexdigest()[:32]
@@ -13,17 +13,17 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
 import logging
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.core.domain.chat import ChatRequest
 
 from src.core.interfaces.request_deduplication_interface import DeduplicationStats
+from src.core.services.request_content_hasher import RequestContentHasher
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +97,7 @@ class RequestDeduplicationService:
 
         self._cache: dict[str, TrackedRequest] = {}
         self._lock = asyncio.Lock()
+        self._content_hasher = RequestContentHasher()
 
         self._duplicates_blocked = 0
         self._requests_processed = 0
@@ -124,6 +125,10 @@ class RequestDeduplicationService:
     def _compute_content_hash(self, request: ChatRequest, session_id: str) -> str:
         """Compute deterministic hash of request content.
 
+        Messages and tools are streamed into the hash without an intermediate
+        JSON document; digests of repeated plain text messages are reused
+        across turns.
+
         Args:
             request: The chat request
             session_id: The session identifier
@@ -132,27 +137,7 @@ class RequestDeduplicationService:
             A 32-character hex hash of the request content
         """
         try:
-            messages_data: list[dict[str, Any]] = []
-            if request.messages:
-                for msg in request.messages:
-                    if hasattr(msg, "model_dump"):
-                        messages_data.append(msg.model_dump())
-                    elif isinstance(msg, dict):
-                        messages_data.append(msg)
-                    else:
-                        messages_data.append({"content": str(msg)})
-
-            content: dict[str, Any] = {
-                "session_id": session_id,
-                "model": request.model,
-                "messages": messages_data,
-            }
-
-            if hasattr(request, "tools") and request.tools:
-                content["tools"] = request.tools
-
-            serialized = json.dumps(content, sort_keys=True, default=str)
-            return hashlib.sha256(serialized.encode()).hexdigest()[:32]
+            return self._content_hasher.hash_request(request, session_id)
         except Exception as e:
             logger.warning("Failed to compute content hash: %s", e, exc_info=True)
             return hashlib.sha256(str(time.time()).encode()).hexdigest()[:32]
@@ -257,7 +257,9 @@ class SessionManager(ISessionManager):
             return
 
         # Compute fingerprint from messages
-        fp_bundle = self._fingerprint_service.compute_fingerprint_bundle(messages)
+        fp_bundle = self._fingerprint_service.compute_fingerprint_bundle(
+            messages, session_key=f"session:{session_id}"
+        )
 
         # Update in repository
         await self._session_repository.update_fingerprint(
@@ -0,0 +1,384 @@
+"""
+Shared, tokenizer-aware token counting.
+
+Counts are cached per (encoder, text) under a BLAKE2b digest of the text, so
+chat history that a client re-sends on every turn is only encoded the first
+time it is seen; later requests pay for hashing and a dictionary lookup.
+:meth:`TokenCountingService.count_messages` counts each message separately for
+that reason and adds one separator token between messages, which matches
+counting the newline-joined prompt for tiktoken encodings (they split on
+newlines) up to whitespace merges at message boundaries.
+
+Encoders are chosen per model family: tiktoken encodings by default, falling
+back to a characters-per-token heuristic when tiktoken or its encoding files
+are unavailable. Other tokenizers can be plugged in with
+:meth:`TokenCountingService.register_encoder`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from pydantic import BaseModel
+
+from src.core.interfaces.token_counting_service_interface import (
+    ITokenCountingService,
+    ITokenEncoder,
+)
+from src.core.utils.token_count import _MODEL_TOKENIZER_FAMILIES, extract_prompt_text
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of cached per-text counts
+_MAX_CACHED_COUNTS = 65536
+
+# Uncached characters in one batch above which encoding moves to worker threads
+_PARALLEL_MIN_CHARS = 256 * 1024
+
+_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_DEFAULT_ENCODING = "cl100k_base"
+
+# Bound on the model-name -> encoder resolution cache
+_MAX_RESOLVED_MODELS = 1024
+
+_DIGEST_SIZE = 16
+
+
+def heuristic_token_count(text: str) -> int:
+    """Approximate token count using the 4-characters-per-token heuristic."""
+    return (len(text) + 3) // 4
+
+
+class HeuristicEncoder:
+    """Tokenizer-free estimate: one token per four characters, rounded up."""
+
+    @property
+    def name(self) -> str:
+        return "heuristic"
+
+    def count(self, text: str) -> int:
+        return heuristic_token_count(text)
+
+
+class TiktokenEncoder:
+    """Counts tokens with a tiktoken encoding, loaded on first use.
+
+    Falls back to :func:`heuristic_token_count` if the encoding cannot be
+    loaded (tiktoken missing, or its encoding file cannot be downloaded).
+    """
+
+    def __init__(self, encoding_name: str, encoding: Any | None = None) -> None:
+        self._encoding_name = encoding_name
+        self._encoding = encoding
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"tiktoken:{self._encoding_name}"
+
+    def _load(self) -> Any | None:
+        if self._encoding is not None or self._unavailable:
+            return self._encoding
+        with self._lock:
+            if self._encoding is None and not self._unavailable:
+                try:
+                    import tiktoken  # type: ignore[import-untyped]
+
+                    self._encoding = tiktoken.get_encoding(self._encoding_name)
+                except Exception:
+                    self._unavailable = True
+                    logger.warning(
+                        "tiktoken encoding %s unavailable; estimating tokens heuristically",
+                        self._encoding_name,
+                        exc_info=logger.isEnabledFor(logging.DEBUG),
+                    )
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        encoding = self._load()
+        if encoding is None:
+            return heuristic_token_count(text)
+        # encode_ordinary treats special-token text as plain text instead of raising
+        encode = getattr(encoding, "encode_ordinary", None) or encoding.encode
+        return len(encode(text))
+
+
+class TokenCountCacheStats(BaseModel):
+    """Statistics for the shared token count cache."""
+
+    entries: int
+    hits: int
+    misses: int
+
+
+def _text_key(encoder: ITokenEncoder, text: str) -> tuple[str, bytes]:
+    digest = hashlib.blake2b(
+        text.encode("utf-8", errors="surrogatepass"), digest_size=_DIGEST_SIZE
+    ).digest()
+    return encoder.name, digest
+
+
+def _message_texts(messages: Sequence[Any]) -> list[str]:
+    """Per-message prompt text, formatted as :func:`extract_prompt_text` does."""
+    texts: list[str] = []
+    for message in messages:
+        text = extract_prompt_text([message])
+        if text:
+            texts.append(text)
+    return texts
+
+
+class TokenCountingService(ITokenCountingService):
+    """Process-wide token counter with an LRU of per-text counts."""
+
+    def __init__(
+        self,
+        max_cached_counts: int = _MAX_CACHED_COUNTS,
+        parallel_min_chars: int = _PARALLEL_MIN_CHARS,
+        max_workers: int = _MAX_WORKERS,
+    ) -> None:
+        self._max_cached = max(0, max_cached_counts)
+        self._parallel_min_chars = parallel_min_chars
+        self._max_workers = max(1, max_workers)
+
+        self._lock = threading.Lock()
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        self._custom_encoders: list[tuple[tuple[str, ...], ITokenEncoder]] = []
+        self._tiktoken_encoders: dict[str, TiktokenEncoder] = {}
+        self._resolved: dict[str, ITokenEncoder] = {}
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Encoder selection
+    # ------------------------------------------------------------------
+
+    def register_encoder(
+        self, model_needles: Sequence[str], encoder: ITokenEncoder
+    ) -> None:
+        needles = tuple(n.strip().lower() for n in model_needles)
+        with self._lock:
+            self._custom_encoders.insert(0, (needles, encoder))
+            self._resolved.clear()
+
+    def _tiktoken_encoder(self, encoding_name: str) -> TiktokenEncoder:
+        encoder = self._tiktoken_encoders.get(encoding_name)
+        if encoder is None:
+            encoder = self._tiktoken_encoders.setdefault(
+                encoding_name, TiktokenEncoder(encoding_name)
+            )
+        return encoder
+
+    def encoder_for(self, model: str | None) -> ITokenEncoder:
+        """Return the encoder used for ``model``."""
+        normalized = (model or "").strip().lower()
+        encoder = self._resolved.get(normalized)
+        if encoder is not None:
+            return encoder
+
+        with self._lock:
+            custom = list(self._custom_encoders)
+        for needles, candidate in custom:
+            if any(needle in normalized for needle in needles):
+                encoder = candidate
+                break
+        else:
+            encoding_name = _DEFAULT_ENCODING
+            for needles, family_encoding in _MODEL_TOKENIZER_FAMILIES:
+                if normalized and any(needle in normalized for needle in needles):
+                    encoding_name = family_encoding
+                    break
+            encoder = self._tiktoken_encoder(encoding_name)
+
+        if len(self._resolved) >= _MAX_RESOLVED_MODELS:
+            self._resolved.clear()
+        self._resolved[normalized] = encoder
+        return encoder
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _lookup(self, keys: Sequence[tuple[str, bytes]]) -> list[int | None]:
+        results: list[int | None] = []
+        with self._lock:
+            counts = self._counts
+            for key in keys:
+                value = counts.get(key)
+                if value is not None:
+                    counts.move_to_end(key)
+                    self._hits += 1
+                else:
+                    self._misses += 1
+                results.append(value)
+        return results
+
+    def _store(self, items: Sequence[tuple[tuple[str, bytes], int]]) -> None:
+        if not self._max_cached:
+            return
+        with self._lock:
+            counts = self._counts
+            for key, value in items:
+                counts[key] = value
+                counts.move_to_end(key)
+            while len(counts) > self._max_cached:
+                counts.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached counts."""
+        with self._lock:
+            self._counts.clear()
+
+    def get_stats(self) -> TokenCountCacheStats:
+        """Return cache statistics."""
+        with self._lock:
+            return TokenCountCacheStats(
+                entries=len(self._counts), hits=self._hits, misses=self._misses
+            )
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="token-count",
+                    )
+        return self._executor
+
+    def count(self, text: str, model: str | None = None) -> int:
+        if not text:
+            return 0
+        return self.count_many([text], model)[0]
+
+    def _prepare(
+        self, texts: Sequence[str], model: str | None
+    ) -> tuple[ITokenEncoder, list[tuple[str, bytes]], list[int], list[int]]:
+        """Resolve cached counts; returns encoder, keys, counts and miss indexes."""
+        encoder = self.encoder_for(model)
+        keys = [_text_key(encoder, text) for text in texts]
+        cached = self._lookup(keys)
+        counts = [0] * len(texts)
+        misses: list[int] = []
+        for index, value in enumerate(cached):
+            if value is not None:
+                counts[index] = value
+            elif texts[index]:
+                misses.append(index)
+        return encoder, keys, counts, misses
+
+    def _finish(
+        self,
+        keys: Sequence[tuple[str, bytes]],
+        counts: list[int],
+        misses: Sequence[int],
+        computed: Sequence[int],
+    ) -> list[int]:
+        for index, value in zip(misses, computed, strict=False):
+            counts[index] = value
+        self._store([(keys[i], v) for i, v in zip(misses, computed, strict=False)])
+        return counts
+
+    def _is_large(self, texts: Sequence[str], misses: Sequence[int]) -> bool:
+        return sum(len(texts[i]) for i in misses) >= self._parallel_min_chars
+
+    def count_many(self, texts: Sequence[str], model: str | None = None) -> list[int]:
+        encoder, keys, counts, misses = self._prepare(texts, model)
+        if not misses:
+            return counts
+        missing = [texts[i] for i in misses]
+        if len(misses) > 1 and self._is_large(texts, misses):
+            computed = list(self._get_executor().map(encoder.count, missing))
+        else:
+            computed = [encoder.count(text) for text in missing]
+        return self._finish(keys, counts, misses, computed)
+
+    async def count_many_async(
+        self, texts: Sequence[str], model: str | None = None
+    ) -> list[int]:
+        # Hashing and cache lookups of long prompts are work too; keep the
+        # whole batch off the event loop.
+        return await asyncio.to_thread(self.count_many, texts, model)
+
+    def _joined_total(
+        self, texts: Sequence[str], counts: Sequence[int], model: str | None
+    ) -> int:
+        if len(texts) <= 1:
+            return sum(counts)
+        # Parts are joined by newlines, one token in the supported encodings.
+        return sum(counts) + (len(texts) - 1) * self.count("\n", model)
+
+    def count_joined(self, texts: Sequence[str], model: str | None = None) -> int:
+        texts = [text for text in texts if text]
+        return self._joined_total(texts, self.count_many(texts, model), model)
+
+    def count_messages(self, messages: Sequence[Any], model: str | None = None) -> int:
+        texts = _message_texts(messages)
+        if not texts:
+            return self.count(extract_prompt_text(list(messages)), model)
+        return self.count_joined(texts, model)
+
+    async def count_messages_async(
+        self, messages: Sequence[Any], model: str | None = None
+    ) -> int:
+        return await asyncio.to_thread(self.count_messages, messages, model)
+
+    def dispose(self) -> None:
+        """Shut down the worker threads."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global singleton instance
+_global_service: TokenCountingService | None = None
+_service_lock = threading.Lock()
+
+
+def get_token_counting_service() -> TokenCountingService:
+    """Get the global token counting service instance."""
+    global _global_service
+    if _global_service is None:
+        with _service_lock:
+            if _global_service is None:
+                _global_service = TokenCountingService()
+    return _global_service
+
+
+def reset_token_counting_service() -> None:
+    """Reset the global service (for testing)."""
+    global _global_service
+    with _service_lock:
+        service, _global_service = _global_service, None
+    if service is not None:
+        service.dispose()
+
+
+__all__ = [
+    "HeuristicEncoder",
+    "TiktokenEncoder",
+    "TokenCountCacheStats",
+    "TokenCountingService",
+    "get_token_counting_service",
+    "heuristic_token_count",
+    "reset_token_counting_service",
+]
@@ -61,6 +61,7 @@ from src.core.services.structural_compression_strategies import (
     SensitiveFieldProjectionStrategy,
     XmlMachineSafeguardStrategy,
 )
+from src.core.services.token_counting_service import heuristic_token_count
 from src.core.services.tool_identity_resolver import ToolIdentityResolver
 
 _MESSAGE_YIELD_INTERVAL = 8
@@ -946,9 +947,7 @@ class ToolOutputCompressionService:
     @staticmethod
     def estimate_tokens(text: str) -> int:
         """Approximate token count using the 4-characters heuristic."""
-        if not text:
-            return 0
-        return (len(text) + 3) // 4
+        return heuristic_token_count(text)
 
     async def _run_pipeline_with_escalation(
         self,
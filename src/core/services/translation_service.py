@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from collections.abc import Callable
 from typing import Any, cast
 
@@ -25,16 +26,45 @@ from src.core.domain.translators.registry import (
 from src.core.interfaces.translator_protocol import StreamingTranslatorProtocol
 from src.core.services.translation_service_streaming import (
     dict_to_canonical_stream_chunk,
+    normalize_canonical_stream_chunk,
 )
 
 logger = logging.getLogger(__name__)
 
+# Stream source formats whose domain chunks are CanonicalStreamChunk objects
+_CANONICAL_STREAM_FORMATS = frozenset(
+    {"gemini", "openai", "raw_text", "openai-responses", "responses", "openrouter"}
+)
+
+# Set to re-validate every canonical stream chunk through a dict round trip
+# (debugging aid; costs two pydantic traversals per streamed chunk)
+_VALIDATE_STREAM_CHUNKS_ENV = "LLM_PROXY_VALIDATE_STREAM_CHUNKS"
+
+
+def _validate_stream_chunks_from_env() -> bool:
+    return os.environ.get(_VALIDATE_STREAM_CHUNKS_ENV, "").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
 
 class TranslationService:
     """Central service for translating payloads between API formats."""
 
-    def __init__(self, translator_registry: TranslatorRegistry | None = None) -> None:
+    def __init__(
+        self,
+        translator_registry: TranslatorRegistry | None = None,
+        *,
+        validate_stream_chunks: bool | None = None,
+    ) -> None:
         self._registry = translator_registry or get_global_translator_registry()
+        self._validate_stream_chunks = (
+            _validate_stream_chunks_from_env()
+            if validate_stream_chunks is None
+            else validate_stream_chunks
+        )
         ensure_default_translator_factories_registered(self._registry)
 
         def _to_domain_request(format_name: str) -> Callable[[Any], Any]:
@@ -261,19 +291,15 @@ class TranslationService:
     def to_domain_stream_chunk(
         self, chunk: Any, source_format: str, target_format: str = "domain"
     ) -> Any:
-        """Translate a streaming chunk to the internal format (lazy when possible)."""
+        """Translate a streaming chunk to the internal format (lazy when possible).
+
+        Canonical chunks built by a translator are normalized in place and
+        returned as-is; the dict round trip that re-validates them only runs
+        when stream chunk validation is enabled.
+        """
         if source_format == target_format:
             return chunk
 
-        canonical_formats = {
-            "gemini",
-            "openai",
-            "raw_text",
-            "openai-responses",
-            "responses",
-            "openrouter",
-        }
-
         if logger.isEnabledFor(TRACE_LEVEL):
             chunk_keys = list(chunk.keys()) if isinstance(chunk, dict) else "N/A"
             logger.log(
@@ -296,6 +322,11 @@ class TranslationService:
         )
 
         if isinstance(result, CanonicalStreamChunk):
+            if (
+                source_format in _CANONICAL_STREAM_FORMATS
+                and not self._validate_stream_chunks
+            ):
+                return normalize_canonical_stream_chunk(result)
             result = result.model_dump(exclude_none=True)
         # result is now dict[str, Any] after the above conversion
         choices_val = result.get("choices")
@@ -319,7 +350,7 @@ class TranslationService:
                 result_keys,
             )
 
-        if source_format in canonical_formats:
+        if source_format in _CANONICAL_STREAM_FORMATS:
             return dict_to_canonical_stream_chunk(result)
         return result
 
@@ -87,3 +87,38 @@ def dict_to_canonical_stream_chunk(chunk_dict: dict[str, Any]) -> CanonicalStrea
         usage=chunk_dict.get("usage"),
         system_fingerprint=chunk_dict.get("system_fingerprint"),
     )
+
+
+def normalize_canonical_stream_chunk(
+    chunk: CanonicalStreamChunk,
+) -> CanonicalStreamChunk:
+    """Apply :func:`dict_to_canonical_stream_chunk` normalization in place.
+
+    Equivalent to dumping ``chunk`` and rebuilding it with
+    :func:`dict_to_canonical_stream_chunk`, without the two pydantic
+    traversals. ``chunk`` must be freshly built by a streaming translator
+    because its deltas are modified.
+    """
+    for choice in chunk.choices:
+        delta = choice.delta
+        summary = delta.reasoning_summary
+        if summary and not delta.reasoning_content:
+            normalized = coerce_reasoning_text(summary)
+            if normalized:
+                normalized = strip_empty_html_comment_markers(normalized)
+                if normalized:
+                    delta.reasoning_summary = normalized
+                    delta.reasoning_content = normalized
+                    if delta.reasoning is None:
+                        delta.reasoning = normalized
+                else:
+                    delta.reasoning_summary = None
+
+        if delta.content == "" and (
+            delta.reasoning_content
+            or delta.reasoning
+            or delta.reasoning_summary
+            or delta.tool_calls
+        ):
+            delta.content = None
+    return chunk
@@ -19,11 +19,7 @@ from typing import TYPE_CHECKING, Any
 from src.core.domain.openrouter_usage import (
     OpenRouterUsage,
 )
-from src.core.utils.token_count import (
-    count_tokens,
-    count_tokens_async,
-    extract_prompt_text,
-)
+from src.core.services.token_counting_service import get_token_counting_service
 
 if TYPE_CHECKING:
     from src.core.domain.request_context import (
@@ -56,8 +52,9 @@ class UsageCalculationService:
     ) -> int:
         """Calculate prompt tokens from messages in a background thread."""
         try:
-            prompt_text = extract_prompt_text(messages)
-            return await count_tokens_async(prompt_text, model=model)
+            return await get_token_counting_service().count_messages_async(
+                messages, model=model
+            )
         except (AttributeError, KeyError, TypeError, ValueError) as e:
             if logger.isEnabledFor(logging.WARNING):
                 logger.warning(
@@ -80,8 +77,7 @@ class UsageCalculationService:
             Number of prompt tokens
         """
         try:
-            prompt_text = extract_prompt_text(messages)
-            return count_tokens(prompt_text, model=model)
+            return get_token_counting_service().count_messages(messages, model=model)
         except (AttributeError, KeyError, TypeError, ValueError) as e:
             if logger.isEnabledFor(logging.WARNING):
                 logger.warning(
@@ -99,7 +95,10 @@ class UsageCalculationService:
             text = self._extract_completion_text(content)
             if not text:
                 return 0
-            return await count_tokens_async(text, model=model)
+            (tokens,) = await get_token_counting_service().count_many_async(
+                [text], model=model
+            )
+            return tokens
         except (AttributeError, KeyError, TypeError, ValueError) as e:
             if logger.isEnabledFor(logging.WARNING):
                 logger.warning(
@@ -125,7 +124,7 @@ class UsageCalculationService:
             text = self._extract_completion_text(content)
             if not text:
                 return 0
-            return count_tokens(text, model=model)
+            return get_token_counting_service().count(text, model=model)
         except (AttributeError, KeyError, TypeError, ValueError) as e:
             if logger.isEnabledFor(logging.WARNING):
                 logger.warning(
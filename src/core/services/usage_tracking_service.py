@@ -343,9 +343,11 @@ class UsageTrackingService(IUsageTrackingService):
                     min_ms=min_val or 0.0,
                     max_ms=max_val or 0.0,
                     avg_ms=avg_val or 0.0,
-                    p50_ms=0.0,  # Not calculated by repo yet
-                    p95_ms=0.0,
-                    p99_ms=0.0,
+                    # Percentiles come from the rollup sketches (None when
+                    # the repository had to answer from raw records)
+                    p50_ms=getattr(repo_stats, f"p50_{prefix}", None) or 0.0,
+                    p95_ms=getattr(repo_stats, f"p95_{prefix}", None) or 0.0,
+                    p99_ms=getattr(repo_stats, f"p99_{prefix}", None) or 0.0,
                 )
 
             return AggregatedStats(
@@ -17,6 +17,7 @@ from src.core.domain.usage_summary import UsageSummary
 from src.core.interfaces.response_processor_interface import ProcessedResponse
 from src.core.interfaces.stream_formatting_interface import IStreamFormattingService
 from src.core.interfaces.usage_tracking_wrapper_interface import IUsageTrackingWrapper
+from src.core.services import metrics_service
 
 if TYPE_CHECKING:
     from src.core.interfaces.usage_tracking_interface import IUsageTrackingService
@@ -144,6 +145,14 @@ class UsageTrackingWrapper(IUsageTrackingWrapper):
                 # Record end time after stream completes
                 end_time = time.time()
             finally:
+                if first_token_time is not None:
+                    metrics_service.record_duration(
+                        "stream.ttft", first_token_time - start_time
+                    )
+                if end_time is not None:
+                    metrics_service.record_duration(
+                        "stream.duration", end_time - start_time
+                    )
                 if accumulated_usage:
                     completion_tokens_raw = (
                         accumulated_usage.get("completion_tokens", 0)
@@ -6,6 +6,7 @@ This module provides tools for:
 - Simulating client requests
 - Simulating backend responses with timing replay
 - Full session replay with validation
+- Concurrent load generation with latency reporting
 """
 
 from src.core.simulation.backend_simulator import (
@@ -20,6 +21,17 @@ from src.core.simulation.client_simulator import (
     TimingDeviation,
     ValidationResult,
 )
+from src.core.simulation.load_backend import (
+    CapturedBackendResponses,
+    create_load_backend_app,
+)
+from src.core.simulation.load_generator import (
+    CapturedExchange,
+    LoadGenerator,
+    LoadTestConfig,
+    LoadTestReport,
+    extract_exchanges,
+)
 from src.core.simulation.output_utils import (
     configure_console_encoding,
     console_print,
@@ -37,8 +49,13 @@ __all__ = [
     "BackendSimulator",
     "BackendSimulatorTransport",
     "CaptureReader",
+    "CapturedBackendResponses",
+    "CapturedExchange",
     "ClientSimulator",
     "ContentMismatch",
+    "LoadGenerator",
+    "LoadTestConfig",
+    "LoadTestReport",
     "RequestMatch",
     "SimulationResult",
     "SimulationRunner",
@@ -47,7 +64,9 @@ __all__ = [
     "ValidationResult",
     "configure_console_encoding",
     "console_print",
+    "create_load_backend_app",
     "create_simulation_report",
+    "extract_exchanges",
     "safe_bytes_preview",
     "safe_str",
 ]
@@ -2,15 +2,22 @@
 CBOR capture file reader.
 
 Parses CBOR capture files into replay-ready sequences for simulation.
+
+Captures are opened through the sidecar offset index
+(:mod:`src.core.wire_capture.capture_index`): entries are decoded from a memory
+map only when accessed, and direction/stream/timing queries are answered from
+the index without touching payloads.
 """
 
 from __future__ import annotations
 
 import logging
 from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO
+from typing import overload
 
 import cbor2
 from pydantic import BaseModel
@@ -21,6 +28,10 @@ from src.core.domain.cbor_capture import (
     CaptureFileHeader,
     CaptureSession,
 )
+from src.core.wire_capture.capture_index import (
+    CaptureIndexRecord,
+    IndexedCaptureFile,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +85,74 @@ def _validate_capture_header(header: CaptureFileHeader) -> None:
         )
 
 
+# Decoded events kept per loaded capture; older ones are re-decoded on access.
+_DECODED_EVENT_CACHE_SIZE = 1024
+
+
+class IndexedCaptureEntries(Sequence[CapturedWireEvent]):
+    """Read-only sequence of capture events decoded on demand.
+
+    Backed by an :class:`IndexedCaptureFile`; only the first ``limit`` indexed
+    entries are exposed.
+    """
+
+    def __init__(
+        self,
+        capture: IndexedCaptureFile,
+        limit: int,
+        cache_size: int = _DECODED_EVENT_CACHE_SIZE,
+    ) -> None:
+        self._capture = capture
+        self._records = capture.records[:limit]
+        self._cache: OrderedDict[int, CapturedWireEvent] = OrderedDict()
+        self._cache_size = cache_size
+
+    @property
+    def records(self) -> list[CaptureIndexRecord]:
+        """Index records for the exposed entries, in file order."""
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> CapturedWireEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CapturedWireEvent]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> CapturedWireEvent | list[CapturedWireEvent]:
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("capture entry index out of range")
+        return self._event(index)
+
+    def __iter__(self) -> Iterator[CapturedWireEvent]:
+        for i in range(len(self)):
+            yield self._event(i)
+
+    def close(self) -> None:
+        """Release the underlying memory map."""
+        self._cache.clear()
+        self._capture.close()
+
+    def _event(self, index: int) -> CapturedWireEvent:
+        event = self._cache.get(index)
+        if event is not None:
+            self._cache.move_to_end(index)
+            return event
+        event = CapturedWireEvent.from_dict(self._capture.raw_entry(index))
+        self._cache[index] = event
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return event
+
+
 class CaptureReader:
     """Parse CBOR capture files into replay-ready sequences.
 
@@ -84,6 +163,7 @@ class CaptureReader:
     def __init__(self) -> None:
         """Initialize the capture reader."""
         self._session: CaptureSession | None = None
+        self._entries: IndexedCaptureEntries | None = None
         self._file_path: Path | None = None
 
     def load(self, path: Path | str) -> CaptureSession:
@@ -93,7 +173,7 @@ class CaptureReader:
             path: Path to the capture file
 
         Returns:
-            CaptureSession with header and all entries
+            CaptureSession with header and all entries (decoded lazily)
 
         Raises:
             InvalidCaptureFileError: If the file is invalid or corrupted
@@ -104,64 +184,86 @@ class CaptureReader:
         if not self._file_path.exists():
             raise FileNotFoundError(f"Capture file not found: {self._file_path}")
 
+        # A previously returned session keeps its own capture handle alive, so
+        # it stays readable after another file is loaded.
+        self._entries = None
         try:
-            with open(self._file_path, "rb") as f:
-                self._session = self._read_capture_file(f)
-                return self._session
+            capture = IndexedCaptureFile(
+                self._file_path, max_entries=MAX_CAPTURE_ENTRIES
+            )
         except cbor2.CBORDecodeError as e:
             raise InvalidCaptureFileError(f"CBOR decode error: {e}") from e
         except Exception as e:
             raise InvalidCaptureFileError(f"Failed to read capture file: {e}") from e
 
-    def _read_capture_file(self, f: BinaryIO) -> CaptureSession:
-        """Read and parse a CBOR capture file.
+        try:
+            self._session = self._open_session(capture)
+        except Exception as e:
+            capture.close()
+            raise InvalidCaptureFileError(f"Failed to read capture file: {e}") from e
+        return self._session
+
+    def close(self) -> None:
+        """Release the memory map of the currently loaded capture, if any."""
+        if self._entries is not None:
+            self._entries.close()
+            self._entries = None
+        self._session = None
+
+    def _open_session(self, capture: IndexedCaptureFile) -> CaptureSession:
+        """Validate the header and expose indexed entries as a session.
 
         Args:
-            f: Binary file handle
+            capture: Opened, indexed capture file
 
         Returns:
-            CaptureSession with parsed header and entries
+            CaptureSession with parsed header and lazily decoded entries
         """
-        # Read header
-        header_dict = cbor2.load(f)
-        header = CaptureFileHeader.from_dict(header_dict)
+        header = CaptureFileHeader.from_dict(capture.header)
 
         _validate_capture_header(header)
 
-        # Read entries
-        entries: list[CapturedWireEvent] = []
-        while True:
-            try:
-                # DoS protection: Limit number of entries to prevent memory exhaustion
-                if len(entries) >= MAX_CAPTURE_ENTRIES:
-                    logger.warning(
-                        "Reached maximum capture entries limit (%d), stopping load to prevent DoS",
-                        MAX_CAPTURE_ENTRIES,
-                    )
-                    break
-
-                entry_dict = cbor2.load(f)
-                entry = CapturedWireEvent.from_dict(entry_dict)
-                entries.append(entry)
-            except cbor2.CBORDecodeEOF:
-                break
-            except cbor2.CBORDecodeError as e:
-                # Best-effort loading: captures may contain invalid UTF-8 text items.
-                # Keep the successfully decoded prefix rather than failing the entire file.
-                logger.warning(
-                    "Stopping capture load early due to CBOR decode error after %d entries at file_pos=%d: %s",
-                    len(entries),
-                    f.tell(),
-                    e,
-                    exc_info=True,
-                )
-                break
-
-        logger.debug(
-            f"Loaded capture file: {len(entries)} entries, session_id={header.session_id}"
-        )
+        if capture.decode_error is not None:
+            # Best-effort loading: captures may contain invalid UTF-8 text items.
+            # Keep the successfully decoded prefix rather than failing the entire file.
+            logger.warning(
+                "Stopping capture load early due to CBOR decode error after %d entries at file_pos=%s: %s",
+                len(capture),
+                capture.decode_error_offset,
+                capture.decode_error,
+            )
+
+        # DoS protection: Limit number of entries exposed for replay
+        if capture.truncated:
+            logger.warning(
+                "Reached maximum capture entries limit (%d), stopping load to prevent DoS",
+                MAX_CAPTURE_ENTRIES,
+            )
+
+        self._entries = IndexedCaptureEntries(capture, MAX_CAPTURE_ENTRIES)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Loaded capture file: %d entries, session_id=%s",
+                len(self._entries),
+                header.session_id,
+            )
+
+        return CaptureSession(header=header, entries=self._entries)
+
+    def _indexed_entries(self) -> IndexedCaptureEntries:
+        if self._entries is None:
+            raise RuntimeError("No capture session loaded. Call load() first.")
+        return self._entries
 
-        return CaptureSession(header=header, entries=entries)
+    def _select(self, *directions: CaptureDirection) -> list[CapturedWireEvent]:
+        """Decode only the entries whose indexed direction matches."""
+        entries = self._indexed_entries()
+        return [
+            entries[i]
+            for i, record in enumerate(entries.records)
+            if record.direction in directions
+        ]
 
     def get_session(self) -> CaptureSession:
         """Get the loaded capture session.
@@ -182,8 +284,10 @@ class CaptureReader:
         Returns:
             List of entries with direction CLIENT_TO_PROXY or PROXY_TO_CLIENT
         """
-        session = self.get_session()
-        return session.get_client_entries()
+        return self._select(
+            CaptureDirection.CLIENT_TO_PROXY,
+            CaptureDirection.PROXY_TO_CLIENT,
+        )
 
     def get_backend_sequence(self) -> list[CapturedWireEvent]:
         """Get entries for backend-side traffic (outbound requests and inbound responses).
@@ -191,8 +295,10 @@ class CaptureReader:
         Returns:
             List of entries with direction PROXY_TO_BACKEND or BACKEND_TO_PROXY
         """
-        session = self.get_session()
-        return session.get_backend_entries()
+        return self._select(
+            CaptureDirection.PROXY_TO_BACKEND,
+            CaptureDirection.BACKEND_TO_PROXY,
+        )
 
     def get_inbound_requests(self) -> list[CapturedWireEvent]:
         """Get all inbound request entries from client.
@@ -200,8 +306,7 @@ class CaptureReader:
         Returns:
             List of entries with direction CLIENT_TO_PROXY
         """
-        session = self.get_session()
-        return session.get_inbound_request_entries()
+        return self._select(CaptureDirection.CLIENT_TO_PROXY)
 
     def get_outbound_responses(self) -> list[CapturedWireEvent]:
         """Get all outbound response entries to client.
@@ -209,8 +314,7 @@ class CaptureReader:
         Returns:
             List of entries with direction PROXY_TO_CLIENT
         """
-        session = self.get_session()
-        return session.get_outbound_response_entries()
+        return self._select(CaptureDirection.PROXY_TO_CLIENT)
 
     def get_outbound_requests(self) -> list[CapturedWireEvent]:
         """Get all outbound request entries to backend.
@@ -218,8 +322,7 @@ class CaptureReader:
         Returns:
             List of entries with direction PROXY_TO_BACKEND
         """
-        session = self.get_session()
-        return session.get_outbound_request_entries()
+        return self._select(CaptureDirection.PROXY_TO_BACKEND)
 
     def get_inbound_responses(self) -> list[CapturedWireEvent]:
         """Get all inbound response entries from backend.
@@ -227,8 +330,7 @@ class CaptureReader:
         Returns:
             List of entries with direction BACKEND_TO_PROXY
         """
-        session = self.get_session()
-        return session.get_inbound_response_entries()
+        return self._select(CaptureDirection.BACKEND_TO_PROXY)
 
     def get_timing_deltas(self) -> list[float]:
         """Get time deltas between consecutive entries.
@@ -236,8 +338,11 @@ class CaptureReader:
         Returns:
             List of delta times in seconds between entries
         """
-        session = self.get_session()
-        return session.get_timing_deltas()
+        records = self._indexed_entries().records
+        return [
+            records[i].timestamp - records[i - 1].timestamp
+            for i in range(1, len(records))
+        ]
 
     def get_stream_chunks(
         self, direction: CaptureDirection | None = None
@@ -251,25 +356,25 @@ class CaptureReader:
             List of lists, where each inner list is a complete stream
             (from stream_start to stream_end)
         """
-        session = self.get_session()
-        entries = session.entries
-
-        if direction is not None:
-            entries = [e for e in entries if e.direction == direction]
-
-        streams: list[list[CapturedWireEvent]] = []
-        current_stream: list[CapturedWireEvent] | None = None
-
-        for entry in entries:
-            if entry.metadata.is_stream_start:
-                current_stream = [entry]
+        entries = self._indexed_entries()
+
+        # Group by index records first so only entries inside complete
+        # streams are decoded.
+        stream_indices: list[list[int]] = []
+        current_stream: list[int] | None = None
+
+        for i, record in enumerate(entries.records):
+            if direction is not None and record.direction != direction:
+                continue
+            if record.is_stream_start:
+                current_stream = [i]
             elif current_stream is not None:
-                current_stream.append(entry)
-                if entry.metadata.is_stream_end:
-                    streams.append(current_stream)
+                current_stream.append(i)
+                if record.is_stream_end:
+                    stream_indices.append(current_stream)
                     current_stream = None
 
-        return streams
+        return [[entries[i] for i in stream] for stream in stream_indices]
 
     def get_request_response_pairs(
         self,
@@ -282,24 +387,24 @@ class CaptureReader:
         Returns:
             List of (request_entry, response_entries) tuples
         """
-        session = self.get_session()
-        pairs: list[tuple[CapturedWireEvent, list[CapturedWireEvent]]] = []
+        entries = self._indexed_entries()
+        records = entries.records
+        index_pairs: list[tuple[int, list[int]]] = []
 
-        # Group entries by session_id
-        by_session: dict[str, list[CapturedWireEvent]] = {}
-        for entry in session.entries:
-            sid = entry.metadata.session_id or "unknown"
-            if sid not in by_session:
-                by_session[sid] = []
-            by_session[sid].append(entry)
+        # Group entry positions by session_id (from the index, no decoding)
+        by_session: dict[str, list[int]] = {}
+        for position, record in enumerate(records):
+            sid = record.session_id or "unknown"
+            by_session.setdefault(sid, []).append(position)
 
         # For each session, pair requests with responses
-        for _sid, entries in by_session.items():
+        for positions in by_session.values():
+            session_records = [records[p] for p in positions]
             # Pre-compute response lists for O(log N) lookups instead of O(N^2) scans
             all_responses = [
-                (i, e)
-                for i, e in enumerate(entries)
-                if e.direction
+                (i, r)
+                for i, r in enumerate(session_records)
+                if r.direction
                 in (
                     CaptureDirection.BACKEND_TO_PROXY,
                     CaptureDirection.PROXY_TO_CLIENT,
@@ -308,21 +413,19 @@ class CaptureReader:
             response_indices = [i for i, _ in all_responses]
 
             # Identify stream starts (subset of responses)
-            stream_start_indices = [
-                i for i, e in all_responses if e.metadata.is_stream_start
-            ]
+            stream_start_indices = [i for i, r in all_responses if r.is_stream_start]
 
             requests = [
-                (i, e)
-                for i, e in enumerate(entries)
-                if e.direction
+                i
+                for i, r in enumerate(session_records)
+                if r.direction
                 in (CaptureDirection.CLIENT_TO_PROXY, CaptureDirection.PROXY_TO_BACKEND)
-                and not e.metadata.is_stream_start
-                and not e.metadata.is_stream_end
-                and e.metadata.chunk_index is None
+                and not r.is_stream_start
+                and not r.is_stream_end
+                and r.chunk_index is None
             ]
 
-            for req_idx, req in requests:
+            for req_idx in requests:
                 # Check for any subsequent stream start (mimics original any(...) behavior)
                 ss_pos = bisect_right(stream_start_indices, req_idx)
 
@@ -334,21 +437,26 @@ class CaptureReader:
                     # We start collecting responses from the stream start
                     resp_pos = bisect_right(response_indices, start_idx - 1)
 
-                    stream_responses = []
+                    stream_responses: list[int] = []
                     # Collect all chunks until stream end
                     for i in range(resp_pos, len(all_responses)):
-                        _, r = all_responses[i]
-                        stream_responses.append(r)
-                        if r.metadata.is_stream_end:
+                        r_idx, r = all_responses[i]
+                        stream_responses.append(positions[r_idx])
+                        if r.is_stream_end:
                             break
-                    pairs.append((req, stream_responses))
+                    index_pairs.append((positions[req_idx], stream_responses))
                 else:
                     # No subsequent stream start, just take the next response
                     r_pos = bisect_right(response_indices, req_idx)
                     if r_pos < len(response_indices):
-                        pairs.append((req, [all_responses[r_pos][1]]))
+                        index_pairs.append(
+                            (positions[req_idx], [positions[all_responses[r_pos][0]]])
+                        )
 
-        return pairs
+        return [
+            (entries[req], [entries[r] for r in responses])
+            for req, responses in index_pairs
+        ]
 
     def summarize(self) -> CaptureSummary:
         """Get a summary of the loaded capture.
@@ -357,57 +465,35 @@ class CaptureReader:
             CaptureSummary with capture statistics
         """
         session = self.get_session()
-        entries = session.entries
-
-        direction_counts = CaptureDirectionCounts()
+        records = self._indexed_entries().records
 
+        counts = dict.fromkeys(CaptureDirection, 0)
         stream_count = 0
         total_bytes = 0
 
-        for entry in entries:
-            if entry.direction == CaptureDirection.CLIENT_TO_PROXY:
-                direction_counts = CaptureDirectionCounts(
-                    client_to_proxy=direction_counts.client_to_proxy + 1,
-                    proxy_to_client=direction_counts.proxy_to_client,
-                    proxy_to_backend=direction_counts.proxy_to_backend,
-                    backend_to_proxy=direction_counts.backend_to_proxy,
-                )
-            elif entry.direction == CaptureDirection.PROXY_TO_CLIENT:
-                direction_counts = CaptureDirectionCounts(
-                    client_to_proxy=direction_counts.client_to_proxy,
-                    proxy_to_client=direction_counts.proxy_to_client + 1,
-                    proxy_to_backend=direction_counts.proxy_to_backend,
-                    backend_to_proxy=direction_counts.backend_to_proxy,
-                )
-            elif entry.direction == CaptureDirection.PROXY_TO_BACKEND:
-                direction_counts = CaptureDirectionCounts(
-                    client_to_proxy=direction_counts.client_to_proxy,
-                    proxy_to_client=direction_counts.proxy_to_client,
-                    proxy_to_backend=direction_counts.proxy_to_backend + 1,
-                    backend_to_proxy=direction_counts.backend_to_proxy,
-                )
-            elif entry.direction == CaptureDirection.BACKEND_TO_PROXY:
-                direction_counts = CaptureDirectionCounts(
-                    client_to_proxy=direction_counts.client_to_proxy,
-                    proxy_to_client=direction_counts.proxy_to_client,
-                    proxy_to_backend=direction_counts.proxy_to_backend,
-                    backend_to_proxy=direction_counts.backend_to_proxy + 1,
-                )
-
-            if entry.metadata.is_stream_start:
+        for record in records:
+            if record.direction in counts:
+                counts[CaptureDirection(record.direction)] += 1
+            if record.is_stream_start:
                 stream_count += 1
+            total_bytes += record.data_size
 
-            total_bytes += len(entry.data)
+        direction_counts = CaptureDirectionCounts(
+            client_to_proxy=counts[CaptureDirection.CLIENT_TO_PROXY],
+            proxy_to_client=counts[CaptureDirection.PROXY_TO_CLIENT],
+            proxy_to_backend=counts[CaptureDirection.PROXY_TO_BACKEND],
+            backend_to_proxy=counts[CaptureDirection.BACKEND_TO_PROXY],
+        )
 
-        timing = session.get_timing_deltas()
+        timing = self.get_timing_deltas()
         duration = 0.0
-        if len(entries) >= 2:
-            duration = entries[-1].timestamp - entries[0].timestamp
+        if len(records) >= 2:
+            duration = records[-1].timestamp - records[0].timestamp
 
         return CaptureSummary(
             session_id=session.header.session_id,
             created_at=session.header.created_at,
-            total_entries=len(entries),
+            total_entries=len(records),
             direction_counts=direction_counts,
             stream_count=stream_count,
             total_bytes=total_bytes,
@@ -4,6 +4,7 @@ CLI for capture replay and simulation.
 Usage:
     python -m src.core.simulation.cli replay --capture path/to/capture.cbor [options]
     python -m src.core.simulation.cli inspect --capture path/to/capture.cbor
+    python -m src.core.simulation.cli load --capture-dir captures/ --fan-out 8
 """
 
 from __future__ import annotations
@@ -15,9 +16,19 @@ import logging
 import sys
 from pathlib import Path
 
+from src.core.domain.cbor_capture import CaptureSession
 from src.core.simulation.capture_reader import (
     CaptureReader,
 )
+from src.core.simulation.load_backend import (
+    CapturedBackendResponses,
+    create_load_backend_app,
+)
+from src.core.simulation.load_generator import (
+    LoadGenerator,
+    LoadTestConfig,
+    LoadTestReport,
+)
 from src.core.simulation.output_utils import (
     configure_console_encoding,
     console_print,
@@ -209,6 +220,105 @@ def cmd_list(args: argparse.Namespace) -> int:
     return 0
 
 
+async def _run_load_test(
+    args: argparse.Namespace, captures: dict[str, CaptureSession]
+) -> LoadTestReport:
+    """Run the load generator, serving the backend stand-in if requested."""
+    headers = {"Authorization": f"Bearer {args.api_key}"} if args.api_key else {}
+    generator = LoadGenerator(
+        LoadTestConfig(
+            proxy_base_url=args.proxy_url,
+            fan_out=args.fan_out,
+            concurrency=args.concurrency,
+            time_compression=args.time_compression,
+            iterations=args.iterations,
+            ramp_up_seconds=args.ramp_up,
+            headers=headers,
+        )
+    )
+    if args.backend_port is None:
+        return await generator.run(captures)
+
+    import uvicorn
+
+    app = create_load_backend_app(
+        CapturedBackendResponses(captures.values()),
+        time_compression=args.time_compression,
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=args.backend_host,
+            port=args.backend_port,
+            log_level="warning",
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if server_task.done():
+                server_task.result()
+                raise RuntimeError("Backend stand-in exited during startup")
+            await asyncio.sleep(0.05)
+        return await generator.run(captures)
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+def cmd_load(args: argparse.Namespace) -> int:
+    """Replay captures concurrently against a proxy and report latency.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    paths = [Path(p) for p in args.capture or []]
+    if args.capture_dir:
+        paths.extend(sorted(Path(args.capture_dir).glob("*.cbor")))
+    if not paths:
+        console_print("Error: No capture files given", file=sys.stderr)
+        return 1
+
+    reader = CaptureReader()
+    captures: dict[str, CaptureSession] = {}
+    for path in paths:
+        try:
+            captures[path.name] = reader.load(path)
+        except Exception as e:
+            console_print(f"Error: Cannot load {path}: {e}", file=sys.stderr)
+            return 1
+
+    console_print(f"Load testing {args.proxy_url} with {len(captures)} capture(s)")
+    if args.backend_port is not None:
+        console_print(
+            f"Backend stand-in: http://{args.backend_host}:{args.backend_port}"
+        )
+    console_print()
+
+    try:
+        report = asyncio.run(_run_load_test(args, captures))
+    except Exception as e:
+        console_print(f"Error during load test: {e}", file=sys.stderr)
+        return 1
+
+    console_print(report.summary)
+    console_print()
+
+    if args.report:
+        report_path = Path(args.report)
+        with open(report_path, "w", encoding="utf-8") as f:
+            if args.json:
+                json.dump(report.to_dict(), f, indent=2)
+            else:
+                f.write(report.summary)
+        console_print(f"Report written to: {report_path}")
+
+    return 0 if report.samples and report.error_count == 0 else 1
+
+
 def main() -> int:
     """Main entry point for the CLI."""
     # Configure console encoding for Windows compatibility
@@ -283,6 +393,71 @@ def main() -> int:
     )
     list_parser.set_defaults(func=cmd_list)
 
+    # Load command
+    load_parser = subparsers.add_parser(
+        "load", help="Replay captures concurrently and report latency"
+    )
+    load_parser.add_argument(
+        "--capture", "-c", action="append", help="CBOR capture file (repeatable)"
+    )
+    load_parser.add_argument(
+        "--capture-dir", "-d", help="Replay every *.cbor file in a directory"
+    )
+    load_parser.add_argument(
+        "--proxy-url",
+        "-p",
+        default="http://localhost:8000",
+        help="Proxy URL (default: http://localhost:8000)",
+    )
+    load_parser.add_argument(
+        "--fan-out",
+        "-n",
+        type=int,
+        default=1,
+        help="Concurrent virtual clients per capture (default: 1)",
+    )
+    load_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=64,
+        help="Maximum requests in flight (default: 64)",
+    )
+    load_parser.add_argument(
+        "--time-compression",
+        "-s",
+        type=float,
+        default=1.0,
+        help="Divide captured delays by this factor; 0 disables delays (default: 1.0)",
+    )
+    load_parser.add_argument(
+        "--iterations",
+        type=int,
+        default=1,
+        help="Replays per virtual client (default: 1)",
+    )
+    load_parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=0.0,
+        help="Seconds over which virtual clients start (default: 0)",
+    )
+    load_parser.add_argument(
+        "--backend-port",
+        type=int,
+        help="Serve captured backend responses on this port during the run",
+    )
+    load_parser.add_argument(
+        "--backend-host",
+        default="127.0.0.1",
+        help="Backend stand-in bind address (default: 127.0.0.1)",
+    )
+    load_parser.add_argument("--api-key", help="Bearer token for the proxy")
+    load_parser.add_argument("--report", "-r", help="Write report to file")
+    load_parser.add_argument(
+        "--json", "-j", action="store_true", help="Output report in JSON format"
+    )
+    load_parser.set_defaults(func=cmd_load)
+
     args = parser.parse_args()
 
     if args.verbose:
@@ -0,0 +1,130 @@
+"""
+Backend stand-in for capture-driven load tests.
+
+Serves the captured backend responses of a set of captures over HTTP so a
+proxy under load can use it as its upstream. Unlike :class:`BackendSimulator`,
+which replays one session in order, the stand-in serves any number of
+concurrent requests: a request whose body matches a captured backend request
+gets that response, anything else is served the next captured response in
+round-robin order. Responses keep their captured time to first byte and
+inter-chunk gaps, divided by ``time_compression``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+from collections.abc import AsyncIterator, Iterable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.core.domain.cbor_capture import CaptureSession
+from src.core.simulation.load_generator import CapturedExchange, extract_exchanges
+from src.core.simulation.timing_controller import TimingController
+
+logger = logging.getLogger(__name__)
+
+
+def _body_key(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class CapturedBackendResponses:
+    """Captured backend responses indexed for concurrent lookup."""
+
+    def __init__(self, sessions: Iterable[CaptureSession]) -> None:
+        self._exchanges: list[CapturedExchange] = [
+            exchange
+            for session in sessions
+            for exchange in extract_exchanges(session)
+            if exchange.backend_request is not None and exchange.backend_chunks
+        ]
+        self._by_body: dict[bytes, CapturedExchange] = {}
+        for exchange in self._exchanges:
+            assert exchange.backend_request is not None
+            self._by_body.setdefault(_body_key(exchange.backend_request.data), exchange)
+        self._round_robin = itertools.cycle(self._exchanges)
+        self.exact_matches = 0
+        self.fallback_matches = 0
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    def match(self, body: bytes) -> CapturedExchange | None:
+        """Return the exchange captured for ``body``, else the next in rotation."""
+        exchange = self._by_body.get(_body_key(body))
+        if exchange is not None:
+            self.exact_matches += 1
+            return exchange
+        if not self._exchanges:
+            return None
+        self.fallback_matches += 1
+        return next(self._round_robin)
+
+
+def _is_streaming(exchange: CapturedExchange) -> bool:
+    return any(e.is_stream_start for e in exchange.backend_responses) or (
+        len(exchange.backend_chunks) > 1
+    )
+
+
+def _status_code(exchange: CapturedExchange) -> int:
+    for entry in exchange.backend_responses:
+        status = entry.http_status_code or entry.status_code
+        if status:
+            return status
+    return 200
+
+
+async def _replay_chunks(
+    exchange: CapturedExchange, time_compression: float
+) -> AsyncIterator[bytes]:
+    timing: TimingController | None = None
+    if time_compression > 0 and exchange.backend_request is not None:
+        timing = TimingController(speed_multiplier=time_compression)
+        timing.start(exchange.backend_request.timestamp)
+    for entry in exchange.backend_chunks:
+        if timing is not None:
+            await timing.wait_for_entry(entry.timestamp)
+        yield entry.data
+
+
+def create_load_backend_app(
+    responses: CapturedBackendResponses, time_compression: float = 1.0
+) -> FastAPI:
+    """Build an ASGI app that answers every request with a captured response.
+
+    Args:
+        responses: Captured backend responses to serve
+        time_compression: Divides captured delays; ``0`` replays without delays
+    """
+    app = FastAPI(title="llm-proxy load test backend")
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def _serve(request: Request, path: str) -> Response:
+        exchange = responses.match(await request.body())
+        if exchange is None:
+            return JSONResponse(
+                {"error": "No captured backend responses"}, status_code=404
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Serving captured response seq=%s for /%s",
+                exchange.request.sequence,
+                path,
+            )
+        media_type = (
+            "text/event-stream" if _is_streaming(exchange) else "application/json"
+        )
+        return StreamingResponse(
+            _replay_chunks(exchange, time_compression),
+            status_code=_status_code(exchange),
+            media_type=media_type,
+        )
+
+    return app
+
+
+__all__ = ["CapturedBackendResponses", "create_load_backend_app"]
@@ -0,0 +1,528 @@
+"""
+Capture-driven load generator for latency regression testing.
+
+Replays the client requests of one or more captures against a running proxy
+with many concurrent virtual clients. Each capture is replayed by ``fan_out``
+virtual clients at its recorded inter-request timing divided by
+``time_compression``. Every request is timed on the wire (time to first
+byte, inter-chunk gaps, total duration) and the samples are aggregated into
+a :class:`LoadTestReport`.
+
+When the proxy's backend is the :mod:`load_backend` stand-in serving the
+same captures, the captured backend timing is the baseline, so the report
+can also show the latency the proxy adds on top of the backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import numpy as np
+
+from src.core.domain.cbor_capture import (
+    CaptureDirection,
+    CapturedWireEvent,
+    CaptureSession,
+)
+from src.core.simulation.timing_controller import TimingController
+
+logger = logging.getLogger(__name__)
+
+_PERCENTILES = (50.0, 90.0, 99.0)
+_DEFAULT_ENDPOINT = "/v1/chat/completions"
+_METRICS_PATH = "/v1/diagnostics/metrics"
+_PROMETHEUS_SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{[^}]*\})? (\S+)$")
+
+
+def _is_message(entry: CapturedWireEvent) -> bool:
+    """True for whole request/response entries (not stream markers or chunks)."""
+    return (
+        not entry.is_stream_start
+        and not entry.is_stream_end
+        and entry.chunk_index is None
+    )
+
+
+@dataclass(frozen=True)
+class CapturedExchange:
+    """One client request of a capture and the backend leg that served it."""
+
+    request: CapturedWireEvent
+    backend_request: CapturedWireEvent | None = None
+    backend_responses: tuple[CapturedWireEvent, ...] = ()
+
+    @property
+    def backend_chunks(self) -> tuple[CapturedWireEvent, ...]:
+        """Backend response entries that carry payload bytes."""
+        return tuple(e for e in self.backend_responses if e.data)
+
+    @property
+    def backend_ttft(self) -> float | None:
+        """Captured backend time to first byte, in seconds."""
+        chunks = self.backend_chunks
+        if self.backend_request is None or not chunks:
+            return None
+        return max(0.0, chunks[0].timestamp - self.backend_request.timestamp)
+
+    @property
+    def backend_duration(self) -> float | None:
+        """Captured backend time to last byte, in seconds."""
+        chunks = self.backend_chunks
+        if self.backend_request is None or not chunks:
+            return None
+        return max(0.0, chunks[-1].timestamp - self.backend_request.timestamp)
+
+
+def extract_exchanges(session: CaptureSession) -> list[CapturedExchange]:
+    """Pair each client request of a capture with its (last) backend attempt."""
+    exchanges: list[CapturedExchange] = []
+    request: CapturedWireEvent | None = None
+    backend_request: CapturedWireEvent | None = None
+    responses: list[CapturedWireEvent] = []
+
+    def _flush() -> None:
+        if request is not None:
+            exchanges.append(
+                CapturedExchange(request, backend_request, tuple(responses))
+            )
+
+    for entry in session.entries:
+        if entry.direction == CaptureDirection.CLIENT_TO_PROXY and _is_message(entry):
+            _flush()
+            request, backend_request, responses = entry, None, []
+        elif entry.direction == CaptureDirection.PROXY_TO_BACKEND:
+            if request is not None and _is_message(entry):
+                # A retry supersedes the previous attempt.
+                backend_request, responses = entry, []
+        elif entry.direction == CaptureDirection.BACKEND_TO_PROXY:
+            if backend_request is not None:
+                responses.append(entry)
+    _flush()
+    return [e for e in exchanges if e.request.data]
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    """Load test parameters."""
+
+    proxy_base_url: str = "http://localhost:8000"
+    fan_out: int = 1
+    """Concurrent virtual clients replaying each capture."""
+    concurrency: int = 64
+    """Maximum requests in flight across all virtual clients."""
+    time_compression: float = 1.0
+    """Divides recorded request spacing; ``0`` sends back to back."""
+    iterations: int = 1
+    """Times each virtual client replays its capture."""
+    ramp_up_seconds: float = 0.0
+    """Spread virtual client start times evenly over this period."""
+    endpoint: str = _DEFAULT_ENDPOINT
+    """Fallback endpoint for requests whose capture lacks a URL."""
+    headers: dict[str, str] = field(default_factory=dict)
+    request_timeout: float = 300.0
+    scrape_proxy_metrics: bool = True
+    """Diff the proxy's Prometheus timers before and after the run."""
+
+
+@dataclass
+class RequestSample:
+    """Wire timing of one replayed request."""
+
+    capture: str
+    status_code: int
+    ttft: float | None
+    duration: float
+    chunk_gaps: list[float]
+    chunks: int
+    bytes_received: int
+    expected_backend_ttft: float | None = None
+    expected_backend_duration: float | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 400
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """Time a proxy stage spent during the run, from its exported timer."""
+
+    count: int
+    total_seconds: float
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+def _percentiles(values: Sequence[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    array = np.asarray(values, dtype=np.float64)
+    p50, p90, p99 = np.percentile(array, _PERCENTILES)
+    return {
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(array.max()),
+    }
+
+
+def _format_percentiles(values: Sequence[float], unit: float = 1000.0) -> str:
+    stats = _percentiles(values)
+    if stats is None:
+        return "n/a"
+    return " ".join(f"{name}={value * unit:.1f}ms" for name, value in stats.items())
+
+
+@dataclass
+class LoadTestReport:
+    """Aggregated results of a load test run."""
+
+    config: LoadTestConfig
+    captures: list[str]
+    wall_seconds: float
+    samples: list[RequestSample]
+    stage_timings: dict[str, StageTiming] = field(default_factory=dict)
+
+    @property
+    def successful(self) -> list[RequestSample]:
+        return [s for s in self.samples if s.ok]
+
+    @property
+    def error_count(self) -> int:
+        return len(self.samples) - len(self.successful)
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.samples) / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        received = sum(s.bytes_received for s in self.samples)
+        return received / self.wall_seconds if self.wall_seconds else 0.0
+
+    def _latencies(self) -> dict[str, list[float]]:
+        ok = self.successful
+        return {
+            "ttft": [s.ttft for s in ok if s.ttft is not None],
+            "duration": [s.duration for s in ok],
+            "chunk_gap": [gap for s in ok for gap in s.chunk_gaps],
+            # Latency added on top of the captured backend timing.
+            "ttft_overhead": [
+                s.ttft - s.expected_backend_ttft
+                for s in ok
+                if s.ttft is not None and s.expected_backend_ttft is not None
+            ],
+            "duration_overhead": [
+                s.duration - s.expected_backend_duration
+                for s in ok
+                if s.expected_backend_duration is not None
+            ],
+        }
+
+    @property
+    def summary(self) -> str:
+        """Get a human-readable summary."""
+        latencies = self._latencies()
+        lines = [
+            "=" * 60,
+            "LOAD TEST REPORT",
+            "=" * 60,
+            f"  Captures: {len(self.captures)}",
+            f"  Fan-out: {self.config.fan_out}, concurrency: {self.config.concurrency}, "
+            f"compression: {self.config.time_compression}x, "
+            f"iterations: {self.config.iterations}",
+            f"  Requests: {len(self.samples)} ({self.error_count} failed) "
+            f"in {self.wall_seconds:.2f}s",
+            f"  Throughput: {self.requests_per_second:.1f} req/s, "
+            f"{self.bytes_per_second / 1024:.1f} KiB/s",
+            "",
+            "Latency:",
+            f"  TTFT:      {_format_percentiles(latencies['ttft'])}",
+            f"  Duration:  {_format_percentiles(latencies['duration'])}",
+            f"  Chunk gap: {_format_percentiles(latencies['chunk_gap'])}",
+            "",
+            "Proxy overhead (vs captured backend timing):",
+            f"  TTFT:      {_format_percentiles(latencies['ttft_overhead'])}",
+            f"  Duration:  {_format_percentiles(latencies['duration_overhead'])}",
+        ]
+        if self.stage_timings:
+            lines.extend(["", "Proxy stage timers (mean per operation):"])
+            for name, stage in sorted(self.stage_timings.items()):
+                lines.append(
+                    f"  {name}: {stage.mean_seconds * 1000:.2f}ms x {stage.count}"
+                )
+        errors = [s.error or f"HTTP {s.status_code}" for s in self.samples if not s.ok]
+        if errors:
+            lines.extend(["", "Errors (first 5):"])
+            lines.extend(f"  - {error}" for error in errors[:5])
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "captures": self.captures,
+            "config": {
+                "proxy_base_url": self.config.proxy_base_url,
+                "fan_out": self.config.fan_out,
+                "concurrency": self.config.concurrency,
+                "time_compression": self.config.time_compression,
+                "iterations": self.config.iterations,
+                "ramp_up_seconds": self.config.ramp_up_seconds,
+            },
+            "wall_seconds": self.wall_seconds,
+            "requests": len(self.samples),
+            "errors": self.error_count,
+            "requests_per_second": self.requests_per_second,
+            "bytes_per_second": self.bytes_per_second,
+            "latency_seconds": {
+                name: _percentiles(values) for name, values in self._latencies().items()
+            },
+            "proxy_stages": {
+                name: {
+                    "count": stage.count,
+                    "total_seconds": stage.total_seconds,
+                    "mean_seconds": stage.mean_seconds,
+                }
+                for name, stage in sorted(self.stage_timings.items())
+            },
+        }
+
+
+def parse_prometheus_timers(text: str) -> dict[str, StageTiming]:
+    """Extract ``*_seconds`` summary totals from Prometheus text exposition."""
+    sums: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    for line in text.splitlines():
+        match = _PROMETHEUS_SAMPLE.match(line)
+        if match is None:
+            continue
+        name, value = match.groups()
+        if name.endswith("_seconds_sum"):
+            sums[name[: -len("_sum")]] = float(value)
+        elif name.endswith("_seconds_count"):
+            counts[name[: -len("_count")]] = int(float(value))
+    return {
+        name: StageTiming(count=counts[name], total_seconds=sums[name])
+        for name in sums.keys() & counts.keys()
+    }
+
+
+def diff_stage_timings(
+    before: dict[str, StageTiming], after: dict[str, StageTiming]
+) -> dict[str, StageTiming]:
+    """Per-stage activity between two timer snapshots."""
+    result: dict[str, StageTiming] = {}
+    for name, end in after.items():
+        start = before.get(name, StageTiming(0, 0.0))
+        count = end.count - start.count
+        if count > 0:
+            result[name] = StageTiming(count, end.total_seconds - start.total_seconds)
+    return result
+
+
+class LoadGenerator:
+    """Replays captures concurrently against a proxy and aggregates latency."""
+
+    def __init__(
+        self,
+        config: LoadTestConfig,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize the load generator.
+
+        Args:
+            config: Load test parameters
+            transport: Optional httpx transport (e.g. an ASGI app in tests)
+        """
+        if config.fan_out < 1 or config.concurrency < 1 or config.iterations < 1:
+            raise ValueError("fan_out, concurrency and iterations must be >= 1")
+        if config.time_compression < 0:
+            raise ValueError("time_compression must be >= 0")
+        self._config = config
+        self._transport = transport
+        self._base_url = config.proxy_base_url.rstrip("/")
+
+    async def run(self, captures: dict[str, CaptureSession]) -> LoadTestReport:
+        """Replay ``captures`` (name -> session) and return the aggregated report."""
+        config = self._config
+        workloads = {
+            name: exchanges
+            for name, session in captures.items()
+            if (exchanges := extract_exchanges(session))
+        }
+        samples: list[RequestSample] = []
+        semaphore = asyncio.Semaphore(config.concurrency)
+        limits = httpx.Limits(
+            max_connections=config.concurrency,
+            max_keepalive_connections=config.concurrency,
+        )
+
+        async with httpx.AsyncClient(
+            transport=self._transport,
+            timeout=config.request_timeout,
+            limits=limits,
+        ) as client:
+            stages_before = await self._scrape_stage_timings(client)
+            clients = [
+                (name, exchanges, index)
+                for name, exchanges in workloads.items()
+                for index in range(config.fan_out)
+            ]
+            stagger = config.ramp_up_seconds / len(clients) if clients else 0.0
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    self._run_virtual_client(
+                        client,
+                        semaphore,
+                        samples,
+                        name,
+                        exchanges,
+                        index,
+                        start_delay=position * stagger,
+                    )
+                    for position, (name, exchanges, index) in enumerate(clients)
+                )
+            )
+            wall_seconds = time.perf_counter() - start
+            stages_after = await self._scrape_stage_timings(client)
+
+        return LoadTestReport(
+            config=config,
+            captures=list(workloads),
+            wall_seconds=wall_seconds,
+            samples=samples,
+            stage_timings=(
+                diff_stage_timings(stages_before, stages_after)
+                if stages_before is not None and stages_after is not None
+                else {}
+            ),
+        )
+
+    async def _run_virtual_client(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        samples: list[RequestSample],
+        capture: str,
+        exchanges: list[CapturedExchange],
+        index: int,
+        *,
+        start_delay: float,
+    ) -> None:
+        if start_delay > 0:
+            await asyncio.sleep(start_delay)
+        compression = self._config.time_compression
+        for _ in range(self._config.iterations):
+            timing: TimingController | None = None
+            if compression > 0:
+                timing = TimingController(speed_multiplier=compression)
+                timing.start(exchanges[0].request.timestamp)
+            for exchange in exchanges:
+                if timing is not None:
+                    await timing.wait_for_entry(exchange.request.timestamp)
+                async with semaphore:
+                    samples.append(await self._send(client, capture, exchange, index))
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        capture: str,
+        exchange: CapturedExchange,
+        client_index: int,
+    ) -> RequestSample:
+        request = exchange.request
+        path = urlsplit(request.url).path if request.url else ""
+        url = f"{self._base_url}{path or self._config.endpoint}"
+        headers = {"Content-Type": "application/json", **self._config.headers}
+        if request.session_id:
+            # Keep virtual clients in separate proxy sessions.
+            headers["X-Session-ID"] = f"{request.session_id}-load-{client_index}"
+
+        expected_scale = self._config.time_compression or None
+        sample = RequestSample(
+            capture=capture,
+            status_code=0,
+            ttft=None,
+            duration=0.0,
+            chunk_gaps=[],
+            chunks=0,
+            bytes_received=0,
+            expected_backend_ttft=(
+                exchange.backend_ttft / expected_scale
+                if expected_scale and exchange.backend_ttft is not None
+                else None
+            ),
+            expected_backend_duration=(
+                exchange.backend_duration / expected_scale
+                if expected_scale and exchange.backend_duration is not None
+                else None
+            ),
+        )
+
+        start = time.perf_counter()
+        last: float | None = None
+        try:
+            async with client.stream(
+                request.http_method or "POST",
+                url,
+                content=request.data,
+                headers=headers,
+            ) as response:
+                sample.status_code = response.status_code
+                async for chunk in response.aiter_raw():
+                    if not chunk:
+                        continue
+                    now = time.perf_counter()
+                    if last is None:
+                        sample.ttft = now - start
+                    else:
+                        sample.chunk_gaps.append(now - last)
+                    last = now
+                    sample.chunks += 1
+                    sample.bytes_received += len(chunk)
+        except httpx.HTTPError as exc:
+            sample.error = f"{type(exc).__name__}: {exc}"
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Load test request to %s failed", url, exc_info=True)
+        sample.duration = time.perf_counter() - start
+        return sample
+
+    async def _scrape_stage_timings(
+        self, client: httpx.AsyncClient
+    ) -> dict[str, StageTiming] | None:
+        if not self._config.scrape_proxy_metrics:
+            return None
+        try:
+            response = await client.get(f"{self._base_url}{_METRICS_PATH}")
+        except httpx.HTTPError:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Proxy metrics endpoint unavailable", exc_info=True)
+            return None
+        if response.status_code != 200:
+            return None
+        return parse_prometheus_timers(response.text)
+
+
+__all__ = [
+    "CapturedExchange",
+    "LoadGenerator",
+    "LoadTestConfig",
+    "LoadTestReport",
+    "RequestSample",
+    "StageTiming",
+    "diff_stage_timings",
+    "extract_exchanges",
+    "parse_prometheus_timers",
+]
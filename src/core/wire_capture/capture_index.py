@@ -0,0 +1,553 @@
+"""Sidecar offset index and lazy, mmap-backed access to CBOR wire captures.
+
+A capture file is a CBOR header followed by a stream of CBOR entry maps. The
+sidecar index (``<capture>.idx``) is itself a CBOR stream: an index header
+followed by one compact row per entry holding the entry's byte offset/length
+and the fields needed for filtering (timestamp, direction, sessions, backend,
+stream markers). ``CborWireCaptureService`` appends rows as it writes entries;
+readers build or extend the index on first open.
+
+Readers map the capture file with ``mmap`` (plain positioned reads on Windows,
+where a live mapping would stop the proxy from truncating the capture) and
+decode an entry only when it is accessed; zlib payloads are only decompressed
+when ``data`` is read. Direction, session, backend and time filters run against
+the index rows alone.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import mmap
+import sys
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Final
+
+import cbor2
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC: Final[str] = "LLMPROXY-CAPTURE-INDEX-V1"
+INDEX_VERSION: Final[int] = 1
+INDEX_SUFFIX: Final[str] = ".idx"
+
+FLAG_STREAM_START: Final[int] = 1
+FLAG_STREAM_END: Final[int] = 2
+FLAG_COMPRESSED: Final[int] = 4
+
+# Entry keys answered from the index without decoding the entry.
+_INDEXED_KEYS: Final[frozenset[str]] = frozenset({"ts", "dir", "seq"})
+_DEFAULT_DECODE_CACHE_SIZE: Final[int] = 4096
+# Payloads are inflated in bounded chunks (and only counted) while indexing.
+_INFLATE_CHUNK_SIZE: Final[int] = 1 << 20
+# Windows refuses to truncate or replace a file while a mapping of it is open.
+_USE_MMAP: Final[bool] = sys.platform != "win32"
+
+
+class CaptureIndexError(Exception):
+    """Raised when a capture file cannot be opened for indexed access."""
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureIndexRecord:
+    """Location and filterable fields of one capture entry."""
+
+    offset: int
+    length: int
+    timestamp: float
+    direction: int
+    sequence: int
+    session_id: str | None = None
+    a_session_id: str | None = None
+    b_session_id: str | None = None
+    backend: str | None = None
+    chunk_index: int | None = None
+    flags: int = 0
+    data_size: int = 0
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    @property
+    def is_stream_start(self) -> bool:
+        return bool(self.flags & FLAG_STREAM_START)
+
+    @property
+    def is_stream_end(self) -> bool:
+        return bool(self.flags & FLAG_STREAM_END)
+
+    @property
+    def is_compressed(self) -> bool:
+        return bool(self.flags & FLAG_COMPRESSED)
+
+    @property
+    def effective_session_id(self) -> str | None:
+        """A-leg session id with fallback to the legacy ``sid`` field."""
+        return self.a_session_id or self.session_id
+
+    def to_row(self) -> list[Any]:
+        return [
+            self.offset,
+            self.length,
+            self.timestamp,
+            self.direction,
+            self.sequence,
+            self.session_id,
+            self.a_session_id,
+            self.b_session_id,
+            self.backend,
+            self.chunk_index,
+            self.flags,
+            self.data_size,
+        ]
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> CaptureIndexRecord:
+        return cls(*row)
+
+    @classmethod
+    def from_entry(
+        cls,
+        entry: Mapping[str, Any],
+        offset: int,
+        length: int,
+        *,
+        data_size: int | None = None,
+    ) -> CaptureIndexRecord:
+        """Build a record from a raw (still compressed) CBOR entry map."""
+        meta = entry.get("meta") or {}
+        compressed = entry.get("enc") == "zlib"
+        flags = 0
+        if meta.get("ss"):
+            flags |= FLAG_STREAM_START
+        if meta.get("se"):
+            flags |= FLAG_STREAM_END
+        if compressed:
+            flags |= FLAG_COMPRESSED
+        if data_size is None:
+            data = entry.get("data") or b""
+            data_size = _inflated_size(data) if compressed else len(data)
+        return cls(
+            offset=offset,
+            length=length,
+            timestamp=float(entry.get("ts", 0.0)),
+            direction=int(entry.get("dir", 0)),
+            sequence=int(entry.get("seq", 0)),
+            session_id=_str_or_none(meta.get("sid")),
+            a_session_id=_str_or_none(meta.get("asid")),
+            b_session_id=_str_or_none(meta.get("bsid")),
+            backend=_str_or_none(meta.get("be")),
+            chunk_index=meta.get("ci"),
+            flags=flags,
+            data_size=data_size,
+        )
+
+
+def _inflated_size(data: bytes) -> int:
+    """Return the decompressed size of zlib ``data`` without buffering it."""
+    decompressor = zlib.decompressobj()
+    size = 0
+    pending = data
+    while True:
+        chunk = decompressor.decompress(pending, _INFLATE_CHUNK_SIZE)
+        size += len(chunk)
+        pending = decompressor.unconsumed_tail
+        if decompressor.eof or (not pending and len(chunk) < _INFLATE_CHUNK_SIZE):
+            return size
+
+
+def _str_or_none(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+def index_path_for(capture_path: Path | str) -> Path:
+    """Return the sidecar index path for ``capture_path``."""
+    path = Path(capture_path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _encode_index_header(data_start: int) -> bytes:
+    return cbor2.dumps(
+        {"magic": INDEX_MAGIC, "version": INDEX_VERSION, "data_start": data_start}
+    )
+
+
+def _encode_rows(records: Iterable[CaptureIndexRecord]) -> bytes:
+    return b"".join(cbor2.dumps(record.to_row()) for record in records)
+
+
+class CaptureIndexWriter:
+    """Append-only writer for a capture's sidecar index.
+
+    Index writes are best-effort: on the first I/O error the writer disables
+    itself and readers fall back to scanning the un-indexed tail.
+    """
+
+    def __init__(self, capture_path: Path | str) -> None:
+        self._path = index_path_for(capture_path)
+        self._enabled = True
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def reset(self, data_start: int) -> None:
+        """Start a fresh index for a capture whose entries begin at ``data_start``."""
+        self._enabled = True
+        self._write(_encode_index_header(data_start), mode="wb")
+
+    def append(self, records: Sequence[CaptureIndexRecord]) -> None:
+        if records:
+            self._write(_encode_rows(records), mode="ab")
+
+    def _write(self, payload: bytes, *, mode: str) -> None:
+        if not self._enabled:
+            return
+        try:
+            with open(self._path, mode) as f:
+                f.write(payload)
+        except OSError as e:
+            self._enabled = False
+            logger.warning(
+                "Disabling capture index %s after write failure: %s", self._path, e
+            )
+
+
+class IndexedCaptureFile:
+    """Random-access view of a CBOR capture file.
+
+    Opening the file decodes only the capture header and the sidecar index
+    (building or extending it when missing or stale). Entries are decoded from
+    the memory map on demand, with a bounded LRU of decoded entries.
+
+    With ``max_entries`` set, only the first ``max_entries`` entries are
+    indexed and the scan of un-indexed entries stops at that limit.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        persist_index: bool = True,
+        decode_cache_size: int = _DEFAULT_DECODE_CACHE_SIZE,
+        max_entries: int | None = None,
+    ) -> None:
+        self._path = Path(path)
+        self._max_entries = max_entries
+        self._persist_index = persist_index
+        self._decode_cache_size = max(0, decode_cache_size)
+        self._decoded: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        #: Decode error that stopped indexing early (entries before it are usable).
+        self.decode_error: Exception | None = None
+        #: Byte offset of the item that failed to decode, if any.
+        self.decode_error_offset: int | None = None
+        #: Whether entries beyond ``max_entries`` were left out.
+        self.truncated = False
+
+        self._file: BinaryIO = open(self._path, "rb")  # noqa: SIM115
+        try:
+            self.header, self._data_start = self._read_header()
+            self._size = self._data_start
+            self._mmap: mmap.mmap | None = None
+            self._remap()
+            self.records: list[CaptureIndexRecord] = self._load_index()
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __enter__(self) -> IndexedCaptureFile:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._decoded.clear()
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()  # type: ignore[union-attr]
+            self._mmap = None
+        self._file.close()
+
+    def raw_entry(self, index: int) -> dict[str, Any]:
+        """Return the decoded entry map; ``data`` may still be compressed."""
+        cached = self._decoded.get(index)
+        if cached is not None:
+            self._decoded.move_to_end(index)
+            return cached
+        record = self.records[index]
+        decoded: dict[str, Any] = cbor2.loads(self._slice(record.offset, record.end))
+        if self._decode_cache_size:
+            self._decoded[index] = decoded
+            if len(self._decoded) > self._decode_cache_size:
+                self._decoded.popitem(last=False)
+        return decoded
+
+    def payload(self, index: int) -> bytes:
+        """Return the entry's payload bytes, decompressing on first access."""
+        decoded = self.raw_entry(index)
+        if decoded.get("enc") == "zlib":
+            decoded["data"] = zlib.decompress(decoded["data"])
+            del decoded["enc"]
+        data = decoded.get("data", b"")
+        return data if isinstance(data, bytes) else bytes(data)
+
+    def entry(self, index: int) -> LazyCaptureEntry:
+        return LazyCaptureEntry(self, index)
+
+    def entries(self) -> list[LazyCaptureEntry]:
+        return [LazyCaptureEntry(self, i) for i in range(len(self.records))]
+
+    def select(
+        self,
+        *,
+        directions: Iterable[int] | None = None,
+        session_id: str | None = None,
+        backend: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> list[int]:
+        """Return indices of entries matching all filters, using the index only."""
+        wanted = frozenset(int(d) for d in directions) if directions else None
+        result: list[int] = []
+        for i, record in enumerate(self.records):
+            if wanted is not None and record.direction not in wanted:
+                continue
+            if session_id is not None and record.effective_session_id != session_id:
+                continue
+            if backend is not None and record.backend != backend:
+                continue
+            if start_time is not None and record.timestamp < start_time:
+                continue
+            if end_time is not None and record.timestamp > end_time:
+                continue
+            result.append(i)
+        return result
+
+    def _slice(self, start: int, end: int) -> bytes:
+        if end > self._size:
+            self._remap()
+        if self._mmap is not None:
+            return self._mmap[start:end]
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def _remap(self) -> None:
+        """(Re)map the file so appended bytes become visible."""
+        size = self._file.seek(0, io.SEEK_END)
+        if self._mmap is not None and size == self._size:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._size = size
+        if size and _USE_MMAP:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read_header(self) -> tuple[dict[str, Any], int]:
+        self._file.seek(0)
+        header = cbor2.load(self._file)
+        if not isinstance(header, dict):
+            raise CaptureIndexError(
+                f"Unsupported capture file header type: {type(header).__name__}"
+            )
+        return header, self._file.tell()
+
+    def _load_index(self) -> list[CaptureIndexRecord]:
+        index_path = index_path_for(self._path)
+        records, rewrite = self._read_sidecar(index_path)
+        if records and not self._records_match_capture(records):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Capture index %s is stale; rebuilding", index_path)
+            records, rewrite = [], True
+
+        limit = self._max_entries
+        if limit is not None and len(records) >= limit:
+            self.truncated = len(records) > limit or records[-1].end < self._size
+            del records[limit:]
+            new_records: list[CaptureIndexRecord] = []
+        else:
+            scan_from = records[-1].end if records else self._data_start
+            remaining = None if limit is None else limit - len(records)
+            new_records = self._scan(scan_from, remaining)
+            records.extend(new_records)
+
+        if self._persist_index and (rewrite or new_records):
+            self._persist(index_path, records, new_records, rewrite=rewrite)
+        return records
+
+    def _read_sidecar(self, index_path: Path) -> tuple[list[CaptureIndexRecord], bool]:
+        """Return (records, needs_rewrite) from the sidecar index, if usable."""
+        try:
+            raw = index_path.read_bytes()
+        except FileNotFoundError:
+            return [], True
+        except OSError as e:
+            logger.debug("Cannot read capture index %s: %s", index_path, e)
+            return [], True
+
+        stream = io.BytesIO(raw)
+        decoder = cbor2.CBORDecoder(stream)
+        try:
+            header = decoder.decode()
+        except (cbor2.CBORDecodeError, EOFError):
+            return [], True
+        if (
+            not isinstance(header, dict)
+            or header.get("magic") != INDEX_MAGIC
+            or header.get("version") != INDEX_VERSION
+            or header.get("data_start") != self._data_start
+        ):
+            return [], True
+
+        records: list[CaptureIndexRecord] = []
+        expected_offset = self._data_start
+        while stream.tell() < len(raw):
+            try:
+                record = CaptureIndexRecord.from_row(decoder.decode())
+            except (cbor2.CBORDecodeError, EOFError, TypeError, ValueError):
+                # Torn trailing row (crash mid-append): keep the valid prefix.
+                return records, True
+            if record.offset != expected_offset or record.length <= 0:
+                return [], True
+            records.append(record)
+            expected_offset = record.end
+        return records, False
+
+    def _records_match_capture(self, records: list[CaptureIndexRecord]) -> bool:
+        """Spot-check that the index still describes this capture file."""
+        last = records[-1]
+        if last.end > self._size:
+            return False
+        try:
+            entry = cbor2.loads(self._slice(last.offset, last.end))
+        except (cbor2.CBORDecodeError, EOFError):
+            return False
+        return (
+            isinstance(entry, dict)
+            and entry.get("seq") == last.sequence
+            and entry.get("dir") == last.direction
+            and entry.get("ts") == last.timestamp
+        )
+
+    def _scan(self, offset: int, limit: int | None) -> list[CaptureIndexRecord]:
+        """Index up to ``limit`` entries from ``offset`` on."""
+        records: list[CaptureIndexRecord] = []
+        self._file.seek(offset)
+        decoder = cbor2.CBORDecoder(self._file)
+        while True:
+            start = self._file.tell()
+            if limit is not None and len(records) >= limit:
+                self.truncated = start < self._file.seek(0, io.SEEK_END)
+                break
+            try:
+                entry = decoder.decode()
+            except (cbor2.CBORDecodeEOF, EOFError):
+                break
+            except cbor2.CBORDecodeError as e:
+                self.decode_error = e
+                self.decode_error_offset = start
+                break
+            if not isinstance(entry, dict):
+                self.decode_error = CaptureIndexError(
+                    f"Unexpected {type(entry).__name__} item in capture stream"
+                )
+                self.decode_error_offset = start
+                break
+            end = self._file.tell()
+            records.append(CaptureIndexRecord.from_entry(entry, start, end - start))
+        self._remap()
+        return records
+
+    def _persist(
+        self,
+        index_path: Path,
+        records: list[CaptureIndexRecord],
+        new_records: list[CaptureIndexRecord],
+        *,
+        rewrite: bool,
+    ) -> None:
+        try:
+            if rewrite:
+                index_path.write_bytes(
+                    _encode_index_header(self._data_start) + _encode_rows(records)
+                )
+            else:
+                with open(index_path, "ab") as f:
+                    f.write(_encode_rows(new_records))
+        except OSError as e:
+            logger.debug("Cannot persist capture index %s: %s", index_path, e)
+
+
+class LazyCaptureEntry(Mapping[str, Any]):
+    """Read-only mapping view of one capture entry.
+
+    ``ts``/``dir``/``seq`` come from the index; other keys decode the entry on
+    first access and ``data`` is decompressed only when read. The mapping never
+    exposes the ``enc`` marker, matching eagerly loaded entries.
+    """
+
+    __slots__ = ("_capture", "_index")
+
+    def __init__(self, capture: IndexedCaptureFile, index: int) -> None:
+        self._capture = capture
+        self._index = index
+
+    @property
+    def index_record(self) -> CaptureIndexRecord:
+        return self._capture.records[self._index]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _INDEXED_KEYS:
+            record = self.index_record
+            if key == "ts":
+                return record.timestamp
+            if key == "dir":
+                return record.direction
+            return record.sequence
+        if key == "data":
+            return self._capture.payload(self._index)
+        if key == "enc":
+            raise KeyError(key)
+        return self._capture.raw_entry(self._index)[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._capture.raw_entry(self._index) if key != "enc")
+
+    def __len__(self) -> int:
+        decoded = self._capture.raw_entry(self._index)
+        return len(decoded) - (1 if "enc" in decoded else 0)
+
+    def __repr__(self) -> str:
+        record = self.index_record
+        return (
+            f"LazyCaptureEntry(index={self._index}, seq={record.sequence}, "
+            f"dir={record.direction}, ts={record.timestamp})"
+        )
+
+
+__all__ = [
+    "FLAG_COMPRESSED",
+    "FLAG_STREAM_END",
+    "FLAG_STREAM_START",
+    "INDEX_MAGIC",
+    "INDEX_SUFFIX",
+    "INDEX_VERSION",
+    "CaptureIndexError",
+    "CaptureIndexRecord",
+    "CaptureIndexWriter",
+    "IndexedCaptureFile",
+    "LazyCaptureEntry",
+    "index_path_for",
+]
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+from src.core.wire_capture.inspection.analysis_latency import (
+    compute_backend_hop_latencies,
+    print_latency_summary,
+)
 from src.core.wire_capture.inspection.analysis_pairs import (
     analyze_request_response_pairs,
 )
 from src.core.wire_capture.inspection.analysis_streaming import analyze_streaming
 from src.core.wire_capture.inspection.analysis_track import track_request
 from src.core.wire_capture.inspection.app import main, run, run_inspection
+from src.core.wire_capture.inspection.columnar import (
+    CaptureColumns,
+    build_capture_columns,
+    convert_capture_to_columnar,
+    load_columnar_capture,
+)
 from src.core.wire_capture.inspection.export_json import export_to_json
 from src.core.wire_capture.inspection.filters import (
     filter_entries_by_backend,
@@ -32,9 +42,13 @@ from src.core.wire_capture.inspection.render_console import (
 from src.core.wire_capture.inspection.types import InspectCliConfig
 
 __all__ = [
+    "CaptureColumns",
     "InspectCliConfig",
     "analyze_request_response_pairs",
     "analyze_streaming",
+    "build_capture_columns",
+    "compute_backend_hop_latencies",
+    "convert_capture_to_columnar",
     "detect_issues",
     "filter_entries_by_backend",
     "filter_entries_by_time",
@@ -42,6 +56,7 @@ __all__ = [
     "get_unique_backends",
     "export_to_json",
     "load_capture_file",
+    "load_columnar_capture",
     "main",
     "normalize_metadata",
     "parse_all_sse_events",
@@ -49,6 +64,7 @@ __all__ = [
     "parse_sse_chunk",
     "parse_time_arg",
     "print_entries",
+    "print_latency_summary",
     "print_summary",
     "print_timeline",
     "run",
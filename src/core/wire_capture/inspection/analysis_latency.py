@@ -0,0 +1,263 @@
+"""Vectorized backend latency analysis over columnar captures.
+
+Every P->B entry opens a backend hop. B->P entries are attributed to the most
+recent earlier P->B with the same correlation key: the request id when
+present, else the B-leg session id. Entries carrying neither are attributed in
+capture order, and a C->P entry closes the open uncorrelated hop, matching the
+entry-by-entry analyses. All steps are NumPy array operations, so the cost
+is dominated by a single sort of the backend entries.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import TextIO
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core.wire_capture.capture_index import FLAG_STREAM_END
+from src.core.wire_capture.inspection.columnar import NO_CODE, CaptureColumns
+from src.core.wire_capture.inspection.text_output import writeln
+
+_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+@dataclass(frozen=True, slots=True)
+class BackendHopLatencies:
+    """Per-hop latency columns, one row per P->B entry (in capture order)."""
+
+    request_index: npt.NDArray[np.int64]
+    backend: npt.NDArray[np.int32]
+    ttft: npt.NDArray[np.float64]
+    duration: npt.NDArray[np.float64]
+    chunk_count: npt.NDArray[np.int64]
+    total_bytes: npt.NDArray[np.int64]
+    #: Gaps between consecutive payload chunks of the same hop, and their hop row.
+    gaps: npt.NDArray[np.float64]
+    gap_hop: npt.NDArray[np.int64]
+
+    def __len__(self) -> int:
+        return int(self.request_index.shape[0])
+
+
+def _correlation_keys(columns: CaptureColumns) -> npt.NDArray[np.int64]:
+    """Request-id code, else B-leg session code offset past the rid codes."""
+    rid = columns.request_id.astype(np.int64)
+    bsid = columns.b_session.astype(np.int64)
+    rid_count = len(columns.strings["request_id"])
+    return np.where(
+        rid != NO_CODE,
+        rid,
+        np.where(bsid != NO_CODE, bsid + rid_count, NO_CODE),
+    )
+
+
+def compute_backend_hop_latencies(
+    columns: CaptureColumns,
+    *,
+    start_time: float | None = None,
+    end_time: float | None = None,
+) -> BackendHopLatencies:
+    """Correlate backend responses to requests and compute per-hop latencies.
+
+    ``start_time``/``end_time`` restrict the hops by request timestamp.
+    """
+    direction = columns.direction
+    ts = columns.ts
+    keys = _correlation_keys(columns)
+
+    # C->P entries close the open uncorrelated hop; they never bound keyed hops.
+    is_boundary = direction == 0
+    rows = np.flatnonzero((direction == 2) | (direction == 3) | is_boundary)
+    row_keys = np.where(is_boundary[rows], NO_CODE, keys[rows])
+    order = np.lexsort((rows, row_keys))
+    rows = rows[order]
+    row_keys = row_keys[order]
+
+    row_dir = direction[rows]
+    opens = row_dir != 3
+    # Hop ordinal of every row: the number of openers (requests/boundaries) so
+    # far. Rows are grouped by key, so a hop never spans two keys.
+    hop = np.cumsum(opens) - 1
+    segment_start = np.ones(rows.shape[0], dtype=bool)
+    segment_start[1:] = row_keys[1:] != row_keys[:-1]
+    segment_id = np.cumsum(segment_start) - 1
+    last_hop_before_segment = (hop - opens)[segment_start]
+    # Responses seen before the first opener of their key have no request.
+    attributed = hop > last_hop_before_segment[segment_id]
+
+    opener_rows = rows[opens]
+    opener_is_request = row_dir[opens] == 2
+    hop_count = int(opener_rows.shape[0])
+
+    response_mask = ~opens & attributed
+    response_rows = rows[response_mask]
+    response_hop = hop[response_mask]
+    if response_rows.shape[0]:
+        keep = opener_is_request[response_hop]
+        response_rows = response_rows[keep]
+        response_hop = response_hop[keep]
+
+    request_ts = ts[opener_rows]
+    has_data = columns.data_size[response_rows] > 0
+    payload_rows = response_rows[has_data]
+    payload_hop = response_hop[has_data]
+
+    chunk_count = np.bincount(payload_hop, minlength=hop_count).astype(np.int64)
+    total_bytes = np.bincount(
+        payload_hop, weights=columns.data_size[payload_rows], minlength=hop_count
+    ).astype(np.int64)
+
+    first_payload_ts = _first_per_group(payload_hop, ts[payload_rows], hop_count)
+    last_payload_ts = _last_per_group(payload_hop, ts[payload_rows], hop_count)
+    first_response_ts = _first_per_group(response_hop, ts[response_rows], hop_count)
+    last_response_ts = _last_per_group(response_hop, ts[response_rows], hop_count)
+
+    # TTFT: explicit ttfb metadata, else first payload, else first response.
+    ttfb = columns.ttfb_ms[response_rows]
+    has_ttfb = ~np.isnan(ttfb)
+    ttfb_first = _first_per_group(response_hop[has_ttfb], ttfb[has_ttfb], hop_count)
+    ttft = np.where(
+        np.isnan(ttfb_first),
+        np.where(np.isnan(first_payload_ts), first_response_ts, first_payload_ts)
+        - request_ts,
+        ttfb_first / 1000.0,
+    )
+
+    # Duration: last stream-end marker (sdur, lat, or its timestamp), else the
+    # last payload, else the last response.
+    stream_end = (columns.flags[response_rows] & FLAG_STREAM_END) != 0
+    end_rows = response_rows[stream_end]
+    end_hop = response_hop[stream_end]
+    end_seconds = np.where(
+        ~np.isnan(columns.sdur_ms[end_rows]),
+        columns.sdur_ms[end_rows] / 1000.0,
+        np.where(
+            ~np.isnan(columns.lat_ms[end_rows]),
+            columns.lat_ms[end_rows] / 1000.0,
+            ts[end_rows] - request_ts[end_hop],
+        ),
+    )
+    marker_duration = _last_per_group(end_hop, end_seconds, hop_count)
+    fallback_ts = np.where(np.isnan(last_payload_ts), last_response_ts, last_payload_ts)
+    duration = np.where(
+        np.isnan(marker_duration), fallback_ts - request_ts, marker_duration
+    )
+
+    same_hop = payload_hop[1:] == payload_hop[:-1]
+    gaps = np.diff(ts[payload_rows])[same_hop]
+    gap_hop = payload_hop[1:][same_hop]
+
+    # Keep request hops only, in capture order, within the time window.
+    hop_keep = opener_is_request.copy()
+    if start_time is not None:
+        hop_keep &= request_ts >= start_time
+    if end_time is not None:
+        hop_keep &= request_ts <= end_time
+    hop_order = np.flatnonzero(hop_keep)
+    hop_order = hop_order[np.argsort(opener_rows[hop_order], kind="stable")]
+    renumber = np.full(hop_count, -1, dtype=np.int64)
+    renumber[hop_order] = np.arange(hop_order.shape[0])
+    gap_hop = renumber[gap_hop]
+    gap_order = np.flatnonzero(gap_hop >= 0)
+    gap_order = gap_order[np.argsort(gap_hop[gap_order], kind="stable")]
+
+    return BackendHopLatencies(
+        request_index=opener_rows[hop_order].astype(np.int64),
+        backend=columns.backend[opener_rows[hop_order]].astype(np.int32),
+        ttft=ttft[hop_order],
+        duration=duration[hop_order],
+        chunk_count=chunk_count[hop_order],
+        total_bytes=total_bytes[hop_order],
+        gaps=gaps[gap_order],
+        gap_hop=gap_hop[gap_order],
+    )
+
+
+def _first_per_group(
+    groups: npt.NDArray[np.int64], values: npt.NDArray[np.float64], size: int
+) -> npt.NDArray[np.float64]:
+    """First value per group for rows sorted by group (NaN where absent)."""
+    result = np.full(size, np.nan)
+    if groups.shape[0]:
+        unique, first = np.unique(groups, return_index=True)
+        result[unique] = values[first]
+    return result
+
+
+def _last_per_group(
+    groups: npt.NDArray[np.int64], values: npt.NDArray[np.float64], size: int
+) -> npt.NDArray[np.float64]:
+    """Last value per group for rows sorted by group (NaN where absent)."""
+    result = np.full(size, np.nan)
+    if groups.shape[0]:
+        last = np.r_[groups[1:] != groups[:-1], True]
+        result[groups[last]] = values[last]
+    return result
+
+
+def _percentile_text(values: npt.NDArray[np.float64]) -> str:
+    values = values[~np.isnan(values)]
+    if not values.shape[0]:
+        return "n/a"
+    p50, p90, p99 = np.percentile(values, _PERCENTILES)
+    return f"p50={p50:.3f}s p90={p90:.3f}s p99={p99:.3f}s max={values.max():.3f}s"
+
+
+def print_latency_summary(
+    columns: CaptureColumns,
+    *,
+    out: TextIO | None = None,
+    backend_filter: str | None = None,
+    start_time: float | None = None,
+    end_time: float | None = None,
+) -> BackendHopLatencies:
+    """Print per-backend TTFT, duration and inter-chunk gap distributions."""
+    out = out or sys.stdout
+    hops = compute_backend_hop_latencies(
+        columns, start_time=start_time, end_time=end_time
+    )
+
+    writeln(out)
+    writeln(out, "=" * 70)
+    writeln(out, "BACKEND LATENCY SUMMARY")
+    writeln(out, "=" * 70)
+    if backend_filter:
+        writeln(out, f"(Filtered to backend: {backend_filter})")
+        writeln(out, "=" * 70)
+
+    if backend_filter is not None:
+        wanted = np.array([columns.code_of("backend", backend_filter)])
+    else:
+        wanted = np.unique(hops.backend)
+
+    if not len(hops) or not wanted.shape[0]:
+        writeln(out, "No backend requests found")
+        return hops
+
+    for code in wanted:
+        in_backend = hops.backend == code
+        count = int(in_backend.sum())
+        if not count:
+            continue
+        name = columns.string_at("backend", int(code)) or "unknown"
+        gaps = hops.gaps[in_backend[hops.gap_hop]]
+        writeln(out, f"\n--- {name} ({count} requests) ---")
+        writeln(out, f"  TTFT:      {_percentile_text(hops.ttft[in_backend])}")
+        writeln(out, f"  Duration:  {_percentile_text(hops.duration[in_backend])}")
+        writeln(out, f"  Chunk gap: {_percentile_text(gaps)}")
+        writeln(
+            out,
+            f"  Chunks: {int(hops.chunk_count[in_backend].sum()):,}, "
+            f"Data: {int(hops.total_bytes[in_backend].sum()):,} bytes",
+        )
+    return hops
+
+
+__all__ = [
+    "BackendHopLatencies",
+    "compute_backend_hop_latencies",
+    "print_latency_summary",
+]
@@ -12,6 +12,7 @@ from src.core.wire_capture.inspection.correlation import (
     compute_backend_duration,
     compute_backend_ttft,
 )
+from src.core.wire_capture.inspection.metadata import entry_backend
 from src.core.wire_capture.inspection.payload import parse_all_sse_events
 from src.core.wire_capture.inspection.text_output import writeln
 
@@ -44,7 +45,7 @@ def analyze_request_response_pairs(
                 backend_entries = [
                     entry
                     for entry in backend_entries
-                    if entry.get("meta", {}).get("be") == backend_filter
+                    if entry_backend(entry) == backend_filter
                 ]
             if backend_filter is not None and not backend_entries:
                 i += 1
@@ -12,7 +12,7 @@ from src.core.wire_capture.inspection.correlation import (
     compute_backend_duration,
     compute_backend_ttft,
 )
-from src.core.wire_capture.inspection.metadata import meta_request_id
+from src.core.wire_capture.inspection.metadata import entry_backend, meta_request_id
 from src.core.wire_capture.inspection.text_output import writeln
 
 
@@ -38,7 +38,7 @@ def analyze_streaming(
     while i < len(entries):
         e = entries[i]
 
-        if backend_filter is not None and e.get("meta", {}).get("be") != backend_filter:
+        if backend_filter is not None and entry_backend(e) != backend_filter:
             i += 1
             continue
 
@@ -11,7 +11,7 @@ from src.core.wire_capture.inspection.correlation import (
     cp_window_end_index,
     find_enclosing_cp_index,
 )
-from src.core.wire_capture.inspection.metadata import meta_request_id
+from src.core.wire_capture.inspection.metadata import entry_backend, meta_request_id
 from src.core.wire_capture.inspection.payload import parse_all_sse_events
 from src.core.wire_capture.inspection.text_output import writeln
 
@@ -49,7 +49,7 @@ def track_request(
         req_count = 0
         for i, e in enumerate(entries):
             if e.get("dir") == 2 and (
-                backend_filter is None or e.get("meta", {}).get("be") == backend_filter
+                backend_filter is None or entry_backend(e) == backend_filter
             ):
                 req_count += 1
                 if req_count == request_num:
@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import sys
-from typing import TextIO
+from pathlib import Path
+from typing import Any, TextIO, cast
 
+from src.core.wire_capture.inspection.analysis_latency import print_latency_summary
 from src.core.wire_capture.inspection.analysis_pairs import (
     analyze_request_response_pairs,
 )
 from src.core.wire_capture.inspection.analysis_streaming import analyze_streaming
 from src.core.wire_capture.inspection.analysis_track import track_request
 from src.core.wire_capture.inspection.cli import build_parser, config_from_args
+from src.core.wire_capture.inspection.columnar import (
+    CaptureColumns,
+    build_capture_columns,
+    convert_capture_to_columnar,
+    is_columnar_capture,
+    load_columnar_capture,
+)
 from src.core.wire_capture.inspection.export_json import export_to_json
 from src.core.wire_capture.inspection.filters import (
     filter_entries_by_time,
@@ -20,8 +29,8 @@ from src.core.wire_capture.inspection.filters import (
     parse_time_arg,
 )
 from src.core.wire_capture.inspection.issues import detect_issues
-from src.core.wire_capture.inspection.loader import load_capture_file
-from src.core.wire_capture.inspection.metadata import meta_a_session_id
+from src.core.wire_capture.inspection.loader import open_indexed_capture
+from src.core.wire_capture.inspection.metadata import entry_a_session_id
 from src.core.wire_capture.inspection.render_console import (
     group_by_session,
     print_b2bua_leg_summary,
@@ -34,6 +43,65 @@ from src.core.wire_capture.inspection.text_output import writeln
 from src.core.wire_capture.inspection.types import InspectCliConfig
 
 
+def _parse_time_range(
+    cfg: InspectCliConfig, err: TextIO
+) -> tuple[float | None, float | None] | None:
+    """Parse ``--start-time``/``--end-time``; return None after reporting an error."""
+    start_time_f: float | None = None
+    end_time_f: float | None = None
+    try:
+        if cfg.start_time:
+            start_time_f = parse_time_arg(cfg.start_time)
+        if cfg.end_time:
+            end_time_f = parse_time_arg(cfg.end_time)
+    except ValueError as e:
+        writeln(err, f"Error: {e}")
+        return None
+    return start_time_f, end_time_f
+
+
+def _run_columnar(cfg: InspectCliConfig, out: TextIO, err: TextIO) -> int:
+    """Handle ``--to-columnar``/``--latency-summary`` and columnar inputs."""
+    time_range = _parse_time_range(cfg, err)
+    if time_range is None:
+        return 1
+
+    columns: CaptureColumns
+    try:
+        if is_columnar_capture(cfg.capture_path):
+            columns = load_columnar_capture(cfg.capture_path)
+        else:
+            capture = open_indexed_capture(cfg.capture_path)
+            try:
+                if cfg.to_columnar:
+                    columns = convert_capture_to_columnar(
+                        capture, Path(cfg.to_columnar)
+                    )
+                    writeln(
+                        out,
+                        f"Wrote {len(columns)} entries to columnar capture "
+                        f"{cfg.to_columnar}",
+                    )
+                else:
+                    columns = build_capture_columns(capture)
+            finally:
+                capture.close()
+    except Exception as e:
+        writeln(err, f"Error loading capture file: {e}")
+        return 1
+
+    if cfg.latency_summary:
+        start_time_f, end_time_f = time_range
+        print_latency_summary(
+            columns,
+            out=out,
+            backend_filter=cfg.backend,
+            start_time=start_time_f,
+            end_time=end_time_f,
+        )
+    return 0
+
+
 def run_inspection(
     cfg: InspectCliConfig,
     *,
@@ -49,12 +117,35 @@ def run_inspection(
         writeln(err, f"Error: File not found: {capture_path}")
         return 1
 
+    if cfg.to_columnar or cfg.latency_summary:
+        return _run_columnar(cfg, out, err)
+    if is_columnar_capture(capture_path):
+        writeln(
+            err,
+            "Error: columnar captures support --latency-summary only",
+        )
+        return 1
+
     try:
-        header, entries = load_capture_file(capture_path)
+        capture = open_indexed_capture(capture_path)
     except Exception as e:
         writeln(err, f"Error loading capture file: {e}")
         return 1
 
+    with capture:
+        # The analyses only read entries, so the lazy mappings stand in for dicts.
+        entries = cast("list[dict[str, Any]]", capture.entries())
+        return _inspect_entries(cfg, capture.header, entries, out, err)
+
+
+def _inspect_entries(
+    cfg: InspectCliConfig,
+    header: dict[str, Any],
+    entries: list[dict[str, Any]],
+    out: TextIO,
+    err: TextIO,
+) -> int:
+    """Run the entry-based inspections selected by ``cfg``."""
     backend_filter = cfg.backend
 
     if cfg.list_backends:
@@ -106,29 +197,17 @@ def run_inspection(
         direction_filter = direction_map[cfg.direction]
 
     if cfg.session_id:
-        entries = [
-            e for e in entries if meta_a_session_id(e.get("meta", {})) == cfg.session_id
-        ]
+        entries = [e for e in entries if entry_a_session_id(e) == cfg.session_id]
         if not entries:
             writeln(err, f"No entries found for session ID: {cfg.session_id}")
             return 1
         writeln(out, f"Filtered to session: {cfg.session_id}")
         writeln(out)
 
-    start_time_f: float | None = None
-    end_time_f: float | None = None
-    if cfg.start_time:
-        try:
-            start_time_f = parse_time_arg(cfg.start_time)
-        except ValueError as e:
-            writeln(err, f"Error: {e}")
-            return 1
-    if cfg.end_time:
-        try:
-            end_time_f = parse_time_arg(cfg.end_time)
-        except ValueError as e:
-            writeln(err, f"Error: {e}")
-            return 1
+    time_range = _parse_time_range(cfg, err)
+    if time_range is None:
+        return 1
+    start_time_f, end_time_f = time_range
 
     if start_time_f is not None or end_time_f is not None:
         original_count = len(entries)
@@ -16,7 +16,10 @@ def build_parser(
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=epilog,
     )
-    parser.add_argument("capture_file", help="Path to the CBOR capture file")
+    parser.add_argument(
+        "capture_file",
+        help="Path to the CBOR capture file (or a --to-columnar directory)",
+    )
     parser.add_argument(
         "--entries",
         "-e",
@@ -180,6 +183,22 @@ def build_parser(
             "Filter entries before this time (Unix timestamp, ISO datetime, or time-only)"
         ),
     )
+    parser.add_argument(
+        "--to-columnar",
+        metavar="DIR",
+        help=(
+            "Convert the capture into a columnar directory (NumPy columns plus "
+            "out-of-line payloads) that later runs can inspect directly"
+        ),
+    )
+    parser.add_argument(
+        "--latency-summary",
+        action="store_true",
+        help=(
+            "Show per-backend TTFT, duration and inter-chunk gap percentiles "
+            "(vectorized; also works on a --to-columnar directory)"
+        ),
+    )
     return parser
 
 
@@ -212,6 +231,8 @@ def config_from_args(args: argparse.Namespace) -> InspectCliConfig:
         session_id=args.session_id,
         start_time=args.start_time,
         end_time=args.end_time,
+        to_columnar=args.to_columnar,
+        latency_summary=args.latency_summary,
     )
 
 
@@ -0,0 +1,250 @@
+"""Columnar (NumPy) layout for CBOR wire captures.
+
+A capture converts into a directory of typed ``.npy`` columns: timestamp,
+direction, sequence, sessions, backend, request id, payload size and the
+latency metadata the analyses need. Payload bytes are stored out of line in
+``payloads.bin``, addressed by the ``payload_offset`` and ``data_size``
+columns. String fields are
+dictionary-encoded: each column holds int32 codes into a string table in
+``manifest.json`` (``-1`` means absent).
+
+Columns load with ``mmap_mode="r"``, so opening a converted capture is cheap
+regardless of its size and analyses run as array operations.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core.wire_capture.capture_index import IndexedCaptureFile
+
+COLUMNAR_FORMAT: Final[str] = "llmproxy-capture-columns"
+COLUMNAR_VERSION: Final[int] = 1
+MANIFEST_NAME: Final[str] = "manifest.json"
+PAYLOADS_NAME: Final[str] = "payloads.bin"
+
+NO_CODE: Final[int] = -1
+
+_COLUMN_DTYPES: Final[dict[str, npt.DTypeLike]] = {
+    "ts": np.float64,
+    "direction": np.int8,
+    "seq": np.int64,
+    "flags": np.uint8,
+    "data_size": np.int64,
+    "session": np.int32,
+    "b_session": np.int32,
+    "backend": np.int32,
+    "request_id": np.int32,
+    "ttfb_ms": np.float64,
+    "sdur_ms": np.float64,
+    "lat_ms": np.float64,
+    "payload_offset": np.int64,
+}
+_STRING_COLUMNS: Final[tuple[str, ...]] = (
+    "session",
+    "b_session",
+    "backend",
+    "request_id",
+)
+_FLOAT_META_KEYS: Final[dict[str, str]] = {
+    "ttfb_ms": "ttfb",
+    "sdur_ms": "sdur",
+    "lat_ms": "lat",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureColumns:
+    """Typed per-entry columns of one capture.
+
+    Row ``i`` describes capture entry ``i``. Missing latency metadata is NaN;
+    missing string fields are ``NO_CODE``. ``payload_offset`` is only
+    meaningful when ``payload_path`` is set (converted captures).
+    """
+
+    header: dict[str, Any]
+    ts: npt.NDArray[np.float64]
+    direction: npt.NDArray[np.int8]
+    seq: npt.NDArray[np.int64]
+    flags: npt.NDArray[np.uint8]
+    data_size: npt.NDArray[np.int64]
+    session: npt.NDArray[np.int32]
+    b_session: npt.NDArray[np.int32]
+    backend: npt.NDArray[np.int32]
+    request_id: npt.NDArray[np.int32]
+    ttfb_ms: npt.NDArray[np.float64]
+    sdur_ms: npt.NDArray[np.float64]
+    lat_ms: npt.NDArray[np.float64]
+    payload_offset: npt.NDArray[np.int64]
+    strings: dict[str, tuple[str, ...]]
+    payload_path: Path | None = None
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def string_at(self, column: str, code: int) -> str | None:
+        """Decode a dictionary code from one of the string columns."""
+        return None if code == NO_CODE else self.strings[column][code]
+
+    def code_of(self, column: str, value: str) -> int:
+        """Return the dictionary code of ``value`` (``NO_CODE`` if absent)."""
+        try:
+            return self.strings[column].index(value)
+        except ValueError:
+            return NO_CODE
+
+    def payload(self, index: int) -> bytes:
+        """Read entry ``index``'s (decompressed) payload from the blob file."""
+        if self.payload_path is None:
+            raise ValueError("Payloads are only available for converted captures")
+        size = int(self.data_size[index])
+        if not size:
+            return b""
+        with open(self.payload_path, "rb") as f:
+            f.seek(int(self.payload_offset[index]))
+            return f.read(size)
+
+
+class _StringTable:
+    """Dictionary encoder for one string column."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def encode(self, value: Any) -> int:
+        if not isinstance(value, str) or not value:
+            return NO_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def values(self) -> tuple[str, ...]:
+        return tuple(self.codes)
+
+
+def _float_or_nan(value: Any) -> float:
+    return float(value) if isinstance(value, int | float) else math.nan
+
+
+def _build(
+    capture: IndexedCaptureFile,
+    payload_sink: Callable[[bytes], object] | None,
+) -> CaptureColumns:
+    records = capture.records
+    count = len(records)
+    columns: dict[str, Any] = {
+        name: np.empty(count, dtype=dtype) for name, dtype in _COLUMN_DTYPES.items()
+    }
+    tables = {name: _StringTable() for name in _STRING_COLUMNS}
+
+    payload_offset = 0
+    for i, record in enumerate(records):
+        meta = capture.raw_entry(i).get("meta") or {}
+        columns["ts"][i] = record.timestamp
+        columns["direction"][i] = record.direction
+        columns["seq"][i] = record.sequence
+        columns["flags"][i] = record.flags
+        columns["data_size"][i] = record.data_size
+        columns["session"][i] = tables["session"].encode(record.effective_session_id)
+        columns["b_session"][i] = tables["b_session"].encode(record.b_session_id)
+        columns["backend"][i] = tables["backend"].encode(record.backend)
+        columns["request_id"][i] = tables["request_id"].encode(meta.get("rid"))
+        for column, key in _FLOAT_META_KEYS.items():
+            columns[column][i] = _float_or_nan(meta.get(key))
+        columns["payload_offset"][i] = payload_offset
+        if payload_sink is not None and record.data_size:
+            payload_sink(capture.payload(i))
+            payload_offset += record.data_size
+
+    return CaptureColumns(
+        header=capture.header,
+        strings={name: table.values() for name, table in tables.items()},
+        **columns,
+    )
+
+
+def build_capture_columns(capture: IndexedCaptureFile) -> CaptureColumns:
+    """Build in-memory columns for an open capture (payloads stay in the capture).
+
+    Filter fields come from the capture index; each entry's metadata is decoded
+    once, but payloads are never decompressed.
+    """
+    return _build(capture, None)
+
+
+def convert_capture_to_columnar(
+    capture: IndexedCaptureFile, output_dir: Path
+) -> CaptureColumns:
+    """Write ``capture`` as a columnar directory and return its columns."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    payload_path = output_dir / PAYLOADS_NAME
+    with open(payload_path, "wb") as payloads:
+        columns = _build(capture, payloads.write)
+
+    for name in _COLUMN_DTYPES:
+        np.save(output_dir / f"{name}.npy", getattr(columns, name))
+    manifest = {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "rows": len(columns),
+        "header": columns.header,
+        "strings": {name: list(values) for name, values in columns.strings.items()},
+    }
+    (output_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, default=str), encoding="utf-8"
+    )
+    return load_columnar_capture(output_dir)
+
+
+def is_columnar_capture(path: Path) -> bool:
+    """True when ``path`` is a directory written by :func:`convert_capture_to_columnar`."""
+    return path.is_dir() and (path / MANIFEST_NAME).is_file()
+
+
+def load_columnar_capture(path: Path) -> CaptureColumns:
+    """Open a columnar capture directory with memory-mapped columns."""
+    manifest = json.loads((path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Not a columnar capture directory: {path}")
+    if manifest.get("version") != COLUMNAR_VERSION:
+        raise ValueError(
+            f"Unsupported columnar capture version: {manifest.get('version')!r} "
+            f"(expected {COLUMNAR_VERSION})"
+        )
+
+    rows = manifest.get("rows")
+    arrays: dict[str, Any] = {}
+    for name, dtype in _COLUMN_DTYPES.items():
+        array = np.load(path / f"{name}.npy", mmap_mode="r")
+        if array.dtype != np.dtype(dtype) or array.shape != (rows,):
+            raise ValueError(f"Column {name!r} in {path} does not match manifest")
+        arrays[name] = array
+
+    strings = manifest.get("strings", {})
+    return CaptureColumns(
+        header=manifest.get("header") or {},
+        strings={name: tuple(strings.get(name, ())) for name in _STRING_COLUMNS},
+        payload_path=path / PAYLOADS_NAME,
+        **arrays,
+    )
+
+
+__all__ = [
+    "COLUMNAR_FORMAT",
+    "COLUMNAR_VERSION",
+    "NO_CODE",
+    "CaptureColumns",
+    "build_capture_columns",
+    "convert_capture_to_columnar",
+    "is_columnar_capture",
+    "load_columnar_capture",
+]
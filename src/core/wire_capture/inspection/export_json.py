@@ -7,7 +7,10 @@ import sys
 from typing import Any, TextIO
 
 from src.core.wire_capture.inspection.constants import DIRECTION_NAMES
-from src.core.wire_capture.inspection.metadata import normalize_metadata
+from src.core.wire_capture.inspection.metadata import (
+    entry_backend,
+    normalize_metadata,
+)
 from src.core.wire_capture.inspection.payload import parse_sse_chunk, safe_decode
 from src.core.wire_capture.inspection.text_output import writeln
 
@@ -33,7 +36,7 @@ def export_to_json(
     }
 
     for e in entries:
-        if backend_filter is not None and e.get("meta", {}).get("be") != backend_filter:
+        if backend_filter is not None and entry_backend(e) != backend_filter:
             continue
         meta = e.get("meta", {})
         entry_dict = {
@@ -5,7 +5,10 @@ from __future__ import annotations
 import datetime
 from typing import Any
 
-from src.core.wire_capture.inspection.metadata import meta_a_session_id
+from src.core.wire_capture.inspection.metadata import (
+    entry_a_session_id,
+    entry_backend,
+)
 
 
 def format_timestamp(ts: float) -> str:
@@ -88,8 +91,7 @@ def get_unique_backends(entries: list[dict[str, Any]]) -> dict[str, int]:
     """Extract unique backends from capture entries with their counts."""
     backend_counts: dict[str, int] = {}
     for e in entries:
-        meta = e.get("meta", {})
-        backend = meta.get("be")
+        backend = entry_backend(e)
         if backend:
             backend_counts[backend] = backend_counts.get(backend, 0) + 1
 
@@ -103,22 +105,21 @@ def filter_entries_by_backend(
     if backend_name is None:
         return entries
 
-    return [e for e in entries if e.get("meta", {}).get("be") == backend_name]
+    return [e for e in entries if entry_backend(e) == backend_name]
 
 
 def get_unique_sessions(entries: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     """Extract unique session IDs from capture entries with metadata."""
     sessions: dict[str, dict[str, Any]] = {}
     for e in entries:
-        meta = e.get("meta", {})
-        sid = meta_a_session_id(meta)
+        sid = entry_a_session_id(e)
         if sid:
             if sid not in sessions:
                 sessions[sid] = {
                     "count": 0,
                     "first_ts": e.get("ts", 0),
                     "last_ts": e.get("ts", 0),
-                    "backend": meta.get("be", "unknown"),
+                    "backend": entry_backend(e) or "unknown",
                 }
             sessions[sid]["count"] += 1
             sessions[sid]["last_ts"] = e.get("ts", 0)
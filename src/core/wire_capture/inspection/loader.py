@@ -3,40 +3,42 @@
 from __future__ import annotations
 
 import sys
-import zlib
 from pathlib import Path
 from typing import Any
 
-import cbor2
-
+from src.core.wire_capture.capture_index import IndexedCaptureFile
 from src.core.wire_capture.inspection.metadata import validate_capture_header
 from src.core.wire_capture.inspection.text_output import writeln
 
 
+def open_indexed_capture(path: Path) -> IndexedCaptureFile:
+    """Open a capture for indexed, lazily decoded access.
+
+    The header is validated before the entry index is built or loaded. Callers
+    own the returned object and should ``close()`` it when done.
+    """
+    capture = IndexedCaptureFile(path)
+    try:
+        validate_capture_header(capture.header)
+    except BaseException:
+        capture.close()
+        raise
+    if capture.decode_error is not None:
+        writeln(
+            sys.stderr,
+            "WARNING: stopping early due to CBOR decode error after "
+            f"{len(capture)} entries: {capture.decode_error}",
+        )
+    return capture
+
+
 def load_capture_file(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
     """Load a CBOR capture file and return header and entries.
 
     Unlike simulation ``CaptureReader``, this does not cap the number of entries,
-    so large captures can be inspected in full.
+    so large captures can be inspected in full. Entries are decoded into plain
+    dicts (payloads decompressed) and the capture is closed before returning;
+    use :func:`open_indexed_capture` for lazy access to large captures.
     """
-    entries: list[dict[str, Any]] = []
-    with open(path, "rb") as f:
-        header = cbor2.load(f)
-        validate_capture_header(header)
-        while True:
-            try:
-                entry = cbor2.load(f)
-                if entry.get("enc") == "zlib":
-                    entry["data"] = zlib.decompress(entry["data"])
-                    del entry["enc"]
-                entries.append(entry)
-            except (EOFError, cbor2.CBORDecodeEOF):
-                break
-            except cbor2.CBORDecodeError as e:
-                writeln(
-                    sys.stderr,
-                    "WARNING: stopping early due to CBOR decode error after "
-                    f"{len(entries)} entries: {e}",
-                )
-                break
-    return header, entries
+    with open_indexed_capture(path) as capture:
+        return capture.header, [dict(entry) for entry in capture.entries()]
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
+from src.core.wire_capture.capture_index import LazyCaptureEntry
 from src.core.wire_capture.inspection.constants import (
     CAPTURE_MAGIC,
     CAPTURE_VERSION,
@@ -43,6 +45,21 @@ def meta_a_session_id(meta: dict[str, Any]) -> str | None:
     return None
 
 
+def entry_a_session_id(entry: Mapping[str, Any]) -> str | None:
+    """Return an entry's A-leg session id, from the capture index when available."""
+    if isinstance(entry, LazyCaptureEntry):
+        return entry.index_record.effective_session_id
+    return meta_a_session_id(entry.get("meta", {}))
+
+
+def entry_backend(entry: Mapping[str, Any]) -> str | None:
+    """Return an entry's backend, from the capture index when available."""
+    if isinstance(entry, LazyCaptureEntry):
+        return entry.index_record.backend
+    backend = entry.get("meta", {}).get("be")
+    return backend if isinstance(backend, str) else None
+
+
 def meta_b_session_id(meta: dict[str, Any]) -> str | None:
     """Return B-leg session id when present."""
     b_session_id = meta.get("bsid")
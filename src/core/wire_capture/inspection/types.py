@@ -37,3 +37,5 @@ class InspectCliConfig:
     session_id: str | None = None
     start_time: str | None = None
     end_time: str | None = None
+    to_columnar: str | None = None
+    latency_summary: bool = False
@@ -17,6 +17,8 @@ from src.core.interfaces.model_bases import InternalDTO
 
 logger = logging.getLogger(__name__)
 
+_SHORT_DETECTOR_ENGINES = frozenset({"token_window", "rolling_hash"})
+
 
 def _coerce_to_bool(value: Any) -> bool:
     """Convert a loosely-typed configuration value into a boolean."""
@@ -84,6 +86,9 @@ class InternalLoopDetectionConfig(InternalDTO):
     # Maximum characters of recent history to keep when scanning
     # Maintain enough history to keep multiple repetitions of ~300 char patterns.
     max_history_length: int = 4096
+    # Engine used for short pattern detection inside HybridLoopDetector:
+    # "token_window" (gemini-cli port) or "rolling_hash" (O(1) per character).
+    short_detector_engine: str = "token_window"
 
     # Pattern thresholds
     short_pattern_threshold: PatternThresholds | None = None
@@ -140,6 +145,8 @@ class InternalLoopDetectionConfig(InternalDTO):
             config.content_loop_threshold = int(config_dict["content_loop_threshold"])
         if "max_history_length" in config_dict:
             config.max_history_length = int(config_dict["max_history_length"])
+        if "short_detector_engine" in config_dict:
+            config.short_detector_engine = str(config_dict["short_detector_engine"])
 
         if "whitelist" in config_dict:
             config.whitelist = list(config_dict["whitelist"])
@@ -225,6 +232,10 @@ class InternalLoopDetectionConfig(InternalDTO):
             config.max_history_length = int(
                 env_dict["LOOP_DETECTION_MAX_HISTORY_LENGTH"]
             )
+        if "LOOP_DETECTION_SHORT_DETECTOR_ENGINE" in env_dict:
+            config.short_detector_engine = env_dict[
+                "LOOP_DETECTION_SHORT_DETECTOR_ENGINE"
+            ].strip()
 
         # Threshold environment variables
         if (
@@ -296,6 +307,12 @@ class InternalLoopDetectionConfig(InternalDTO):
         if self.max_history_length <= 0:
             errors.append("max_history_length must be positive")
 
+        if self.short_detector_engine not in _SHORT_DETECTOR_ENGINES:
+            errors.append(
+                "short_detector_engine must be one of: "
+                + ", ".join(sorted(_SHORT_DETECTOR_ENGINES))
+            )
+
         # Allow pattern length to exceed buffer - the detector will handle
         # clipping automatically when the buffer is smaller than the maximum
         # pattern size requested by configuration/testing scenarios.
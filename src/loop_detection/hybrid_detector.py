@@ -20,6 +20,7 @@ from src.core.interfaces.loop_detector_interface import (
     LoopDetectionResult,
 )
 from src.loop_detection.event import LoopDetectionEvent
+from src.loop_detection.rolling_hash_detector import RollingHashLoopDetector
 from src.loop_detection.token_window_loop_detector import TokenWindowLoopDetector
 from src.loop_detection.types import (
     HybridDetectorInternalState,
@@ -38,6 +39,15 @@ MAX_LONG_PATTERN_LENGTH = 500  # Maximum pattern length to check (performance li
 LONG_PATTERN_MIN_REPETITIONS = 3  # Fewer repetitions needed for long patterns
 MAX_ROLLING_HISTORY = 2000  # Maximum content to keep for rolling hash analysis
 
+# Engines available for short pattern detection (``short_detector_config["engine"]``)
+SHORT_DETECTOR_ENGINES: dict[
+    str, type[TokenWindowLoopDetector] | type[RollingHashLoopDetector]
+] = {
+    "token_window": TokenWindowLoopDetector,
+    "rolling_hash": RollingHashLoopDetector,
+}
+DEFAULT_SHORT_DETECTOR_ENGINE = "token_window"
+
 
 @dataclass(frozen=True)
 class LongPatternMatch:
@@ -285,12 +295,21 @@ class HybridLoopDetector(ILoopDetector):
         Initialize hybrid detector.
 
         Args:
-            short_detector_config: Configuration for gemini-cli detector
+            short_detector_config: Configuration for the short pattern detector.
+                The optional ``engine`` key selects ``"token_window"`` (gemini-cli,
+                default) or ``"rolling_hash"`` (O(1) per character).
             long_detector_config: Configuration for rolling hash detector
         """
-        # Initialize short pattern detector (gemini-cli)
+        # Initialize short pattern detector (gemini-cli by default)
         short_config = short_detector_config or {}
-        self.short_detector = TokenWindowLoopDetector(
+        engine = short_config.get("engine") or DEFAULT_SHORT_DETECTOR_ENGINE
+        detector_cls = SHORT_DETECTOR_ENGINES.get(engine)
+        if detector_cls is None:
+            raise ValueError(
+                f"Unknown short loop detector engine '{engine}'. "
+                f"Expected one of: {', '.join(sorted(SHORT_DETECTOR_ENGINES))}"
+            )
+        self.short_detector = detector_cls(
             content_loop_threshold=short_config.get("content_loop_threshold", 10),
             content_chunk_size=short_config.get("content_chunk_size", 50),
             max_history_length=short_config.get("max_history_length", 1000),
@@ -0,0 +1,406 @@
+"""
+Streaming rolling-hash loop detector.
+
+Drop-in alternative to :class:`TokenWindowLoopDetector` that detects the same
+"fixed-size span repeated many times in close proximity" condition, but keeps a
+Rabin-Karp polynomial hash of the trailing window instead of slicing and
+re-hashing every window position.  Each streamed character costs a constant
+number of integer operations, so CPU per streamed megabyte no longer grows with
+``content_chunk_size``.
+
+Semantics intentionally mirror the token-window detector:
+1. Code fences and dividers reset tracking; content inside code blocks is skipped
+2. Windows that are less than 50% letters are ignored
+3. A loop is reported once ``content_loop_threshold`` identical windows occur
+   with an average spacing of at most ``1.5 * content_chunk_size``
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from src.core.interfaces.loop_detector_interface import (
+    ILoopDetector,
+    LoopDetectionResult,
+)
+from src.loop_detection.event import LoopDetectionEvent
+from src.loop_detection.token_window_loop_detector import (
+    _DIVIDER_PATTERN,
+    CONTENT_CHUNK_SIZE,
+    CONTENT_LOOP_THRESHOLD,
+    MAX_HISTORY_LENGTH,
+)
+from src.loop_detection.types import (
+    LoopDetectorConfig,
+    LoopDetectorInternalState,
+    LoopDetectorState,
+    LoopDetectorStats,
+)
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime modulus keeps collisions negligible; every hit is still verified
+# against the retained history before it counts as an occurrence.
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 911_382_323
+
+
+class RollingHashLoopDetector(ILoopDetector):
+    """
+    Loop detector with O(1) work per streamed character.
+
+    The detector keeps a rolling polynomial hash and a rolling letter count for
+    the trailing ``content_chunk_size`` characters.  Window hashes map to the
+    last ``content_loop_threshold`` start positions at which they were seen,
+    and entries that fall out of the retained history are swept periodically,
+    so both time and memory are amortised constant per character.
+    """
+
+    def __init__(
+        self,
+        content_loop_threshold: int = CONTENT_LOOP_THRESHOLD,
+        content_chunk_size: int = CONTENT_CHUNK_SIZE,
+        max_history_length: int = MAX_HISTORY_LENGTH,
+    ):
+        """
+        Initialize the loop detector.
+
+        Args:
+            content_loop_threshold: Number of span repetitions to trigger detection (default: 10)
+            content_chunk_size: Length of the repeated span to look for (default: 50 chars)
+            max_history_length: Content history retained for verification (default: 1000 chars)
+        """
+        self.content_loop_threshold = content_loop_threshold
+        self.content_chunk_size = content_chunk_size
+        self.max_history_length = max_history_length
+
+        self.loop_detected = False
+        self.in_code_block = False
+
+        self._is_enabled = True
+        self._loop_events: list[LoopDetectionEvent] = []
+
+        self._configure()
+        self._reset_content_tracking()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RollingHashLoopDetector initialized: chunk_size=%d, threshold=%d, max_history=%d",
+                self.content_chunk_size,
+                self.content_loop_threshold,
+                self.max_history_length,
+            )
+
+    def _configure(self) -> None:
+        """Derive constants that depend on the configuration."""
+        self._span = max(1, self.content_chunk_size or CONTENT_CHUNK_SIZE)
+        self._threshold = max(1, self.content_loop_threshold or CONTENT_LOOP_THRESHOLD)
+        # Retain at least one span so the outgoing character and the previous
+        # occurrence used for verification are always available.
+        self._keep = max(self.max_history_length or MAX_HISTORY_LENGTH, self._span)
+        self._max_spacing = self._span * 1.5
+        self._out_factor = pow(_HASH_BASE, self._span - 1, _HASH_MOD)
+
+    def _reset_content_tracking(self) -> None:
+        """Reset history, rolling window and occurrence tracking."""
+        self._history = ""
+        # Absolute stream position of ``_history[0]``.
+        self._offset = 0
+        # Absolute number of characters consumed since the last reset.
+        self._position = 0
+        self._hash = 0
+        self._letters = 0
+        self._occurrences: dict[int, deque[int]] = {}
+
+    def process_chunk(self, chunk: str) -> LoopDetectionEvent | None:
+        """
+        Process a chunk of content and check for loops.
+
+        Args:
+            chunk: Content chunk to process
+
+        Returns:
+            LoopDetectionEvent if a loop is detected, None otherwise
+        """
+        if self.loop_detected or not self._is_enabled or not chunk:
+            return None
+
+        self.loop_detected = self._check_content_loop(chunk)
+        if not self.loop_detected:
+            return None
+
+        event = LoopDetectionEvent(
+            pattern="Repetitive content pattern detected",
+            pattern_length=self._span,
+            repetition_count=self._threshold,
+            total_length=self._span * self._threshold,
+            confidence=1.0,
+            buffer_content=self._history[-200:],
+            timestamp=time.time(),
+        )
+        self._loop_events.append(event)
+        return event
+
+    def _check_content_loop(self, content: str) -> bool:
+        """Apply fence/divider handling, then feed the content to the rolling window."""
+        num_fences = content.count("```")
+        is_divider = bool(_DIVIDER_PATTERN.match(content.strip()))
+
+        if num_fences or is_divider:
+            self._reset_content_tracking()
+            self.loop_detected = False
+
+        was_in_code_block = self.in_code_block
+        if num_fences % 2 == 1:
+            self.in_code_block = not self.in_code_block
+
+        if was_in_code_block or self.in_code_block or is_divider:
+            return False
+
+        # Feed large chunks in history-sized slices so stale occurrences are
+        # swept and the history trimmed even within a single call.
+        for start in range(0, len(content), self._keep):
+            if self._feed(content[start : start + self._keep]):
+                return True
+        return False
+
+    def _feed(self, text: str) -> bool:
+        """Advance the rolling window over ``text``; return True on a loop."""
+        span = self._span
+        threshold = self._threshold
+        max_total_spacing = self._max_spacing * (threshold - 1)
+        out_factor = self._out_factor
+        min_letters = span // 2
+        occurrences = self._occurrences
+
+        self._history += text
+        history = self._history
+        offset = self._offset
+        position = self._position
+        h = self._hash
+        letters = self._letters
+        detected = False
+
+        for char in text:
+            code = ord(char)
+            if position >= span:
+                outgoing = history[position - span - offset]
+                h = (h - ord(outgoing) * out_factor) % _HASH_MOD
+                if outgoing.isalpha():
+                    letters -= 1
+            h = (h * _HASH_BASE + code) % _HASH_MOD
+            if char.isalpha():
+                letters += 1
+            position += 1
+
+            if position < span or letters < min_letters:
+                continue
+
+            window_start = position - span
+            positions = occurrences.get(h)
+            if positions is None:
+                occurrences[h] = deque((window_start,), maxlen=threshold)
+                continue
+
+            previous = positions[-1]
+            local_start = window_start - offset
+            local_previous = previous - offset
+            if (
+                local_previous < 0
+                or history[local_previous : local_previous + span]
+                != history[local_start : local_start + span]
+            ):
+                # Previous occurrence aged out of the history (or, very rarely,
+                # a hash collision): start counting afresh from this window.
+                positions.clear()
+                positions.append(window_start)
+                continue
+
+            positions.append(window_start)
+            if threshold <= 1 or (
+                len(positions) == threshold
+                and window_start - positions[0] <= max_total_spacing
+            ):
+                detected = True
+                break
+
+        self._position = position
+        self._hash = h
+        self._letters = letters
+
+        if detected:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Loop detected: span repeated %d times within short distance",
+                    threshold,
+                )
+            return True
+
+        self._trim_history()
+        return False
+
+    def _trim_history(self) -> None:
+        """Drop history older than the retention window and sweep stale hashes."""
+        excess = len(self._history) - self._keep
+        # Trimming at 2x retention keeps string copies amortised O(1) per char.
+        if excess < self._keep:
+            return
+        self._history = self._history[excess:]
+        self._offset += excess
+        offset = self._offset
+        self._occurrences = {
+            hash_val: positions
+            for hash_val, positions in self._occurrences.items()
+            if positions[-1] >= offset
+        }
+
+    # ILoopDetector interface implementation
+
+    async def check_for_loops(self, content: str) -> LoopDetectionResult:
+        """
+        Check the entire content for loops (non-streaming interface).
+
+        Args:
+            content: Full content to check
+
+        Returns:
+            LoopDetectionResult with detection status and details
+        """
+        if not content:
+            return LoopDetectionResult(has_loop=False)
+
+        original_state = self._save_state()
+        self.reset()
+        event = self.process_chunk(content)
+        self._restore_state(original_state)
+
+        if event is None:
+            return LoopDetectionResult(has_loop=False)
+
+        return LoopDetectionResult(
+            has_loop=True,
+            pattern=event.pattern,
+            repetitions=event.repetition_count,
+            details={
+                "pattern_length": self._span,
+                "total_repeated_chars": event.total_length,
+            },
+        )
+
+    def enable(self) -> None:
+        """Enable loop detection."""
+        self._is_enabled = True
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Loop detection enabled")
+
+    def disable(self) -> None:
+        """Disable loop detection."""
+        self._is_enabled = False
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Loop detection disabled")
+
+    def is_enabled(self) -> bool:
+        """Check if loop detection is enabled."""
+        return self._is_enabled
+
+    def reset(self) -> None:
+        """Reset all loop detection state."""
+        self._reset_content_tracking()
+        self.loop_detected = False
+        self.in_code_block = False
+        self._loop_events.clear()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Rolling hash loop detector state reset")
+
+    def get_stats(self) -> LoopDetectorStats:
+        """Get detector statistics."""
+        return LoopDetectorStats(
+            is_enabled=self._is_enabled,
+            loop_detected=self.loop_detected,
+            history_length=len(self._history),
+            in_code_block=self.in_code_block,
+            tracked_chunks=len(self._occurrences),
+            config=LoopDetectorConfig(
+                content_chunk_size=self._span,
+                content_loop_threshold=self._threshold,
+                max_history_length=self.max_history_length or MAX_HISTORY_LENGTH,
+            ),
+        )
+
+    def get_loop_history(self) -> list[LoopDetectionEvent]:
+        """Get history of detected loops."""
+        return self._loop_events.copy()
+
+    def get_current_state(self) -> LoopDetectorState:
+        """Get current internal state."""
+        return LoopDetectorState(
+            stream_content_history_length=len(self._history),
+            last_content_index=self._next_window_index(),
+            loop_detected=self.loop_detected,
+            in_code_block=self.in_code_block,
+            content_stats_size=len(self._occurrences),
+        )
+
+    def update_config(self, new_config: Any) -> None:
+        """
+        Update detector configuration.
+
+        Args:
+            new_config: New configuration (can be dict or config object)
+        """
+        for name, default in (
+            ("content_chunk_size", CONTENT_CHUNK_SIZE),
+            ("content_loop_threshold", CONTENT_LOOP_THRESHOLD),
+            ("max_history_length", MAX_HISTORY_LENGTH),
+        ):
+            if isinstance(new_config, dict):
+                if name not in new_config:
+                    continue
+                value = new_config[name]
+            elif hasattr(new_config, name):
+                value = getattr(new_config, name)
+            else:
+                continue
+            setattr(self, name, value if isinstance(value, int) else default)
+
+        self._configure()
+        self.reset()
+
+    def _next_window_index(self) -> int:
+        """Index into the history of the next window start to be hashed."""
+        return max(0, len(self._history) - self._span + 1)
+
+    def _save_state(self) -> LoopDetectorInternalState:
+        """Save current state for restoration."""
+        offset = self._offset
+        return LoopDetectorInternalState(
+            stream_content_history=self._history,
+            content_stats={
+                hash_val: [index - offset for index in positions if index >= offset]
+                for hash_val, positions in self._occurrences.items()
+            },
+            last_content_index=self._next_window_index(),
+            loop_detected=self.loop_detected,
+            in_code_block=self.in_code_block,
+        )
+
+    def _restore_state(self, state: LoopDetectorInternalState) -> None:
+        """Restore saved state, rebuilding the rolling window from the history."""
+        self._reset_content_tracking()
+        history = state.stream_content_history
+        self._history = history
+        self._position = len(history)
+        for char in history[-self._span :]:
+            self._hash = (self._hash * _HASH_BASE + ord(char)) % _HASH_MOD
+            if char.isalpha():
+                self._letters += 1
+        self._occurrences = {
+            hash_val: deque(indices, maxlen=self._threshold)
+            for hash_val, indices in state.content_stats.items()
+            if indices
+        }
+        self.loop_detected = state.loop_detected
+        self.in_code_block = state.in_code_block
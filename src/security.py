@@ -19,6 +19,12 @@ class APIKeyRedactor:
         unique_keys = {k for k in (api_keys or []) if k}
         self.api_keys = sorted(unique_keys, key=len, reverse=True)
         self.logger = logger_instance or logger
+        # Identifies the key set (without retaining it) for shared result caches
+        self.fingerprint = hashlib.blake2b(
+            "\0".join(sorted(unique_keys)).encode("utf-8", errors="surrogatepass"),
+            digest_size=16,
+            person=b"api-key-redactor",
+        ).digest()
 
         # Compile a single regex pattern for all keys
         if self.api_keys:
@@ -27,9 +27,7 @@ class TestToolCallProcessingE2E:
 
     def setup_method(self):
         """Reset metrics before each test."""
-        with metrics_service._lock:
-            metrics_service._counters.clear()
-            metrics_service._timers.clear()
+        metrics_service.reset()
 
     def test_large_conversation_history_processing(self):
         """Test processing a conversation with 70+ historical messages."""
@@ -67,9 +65,7 @@ class TestToolCallProcessingE2E:
         all_messages = [*historical_messages, new_message]
 
         # Reset metrics to only count messages processed during this operation
-        with metrics_service._lock:
-            metrics_service._counters.clear()
-            metrics_service._timers.clear()
+        metrics_service.reset()
 
         # Process messages
         processed_count = 0
@@ -298,8 +294,7 @@ class TestToolCallProcessingE2E:
     def test_metrics_tracking_accuracy(self):
         """Test that metrics accurately track processing statistics."""
         # Reset metrics
-        with metrics_service._lock:
-            metrics_service._counters.clear()
+        metrics_service.reset()
 
         messages = []
         for i in range(20):
@@ -311,8 +306,7 @@ class TestToolCallProcessingE2E:
             mark_message_processed(msg)
 
         # Reset metrics to only count messages processed during this operation
-        with metrics_service._lock:
-            metrics_service._counters.clear()
+        metrics_service.reset()
 
         # Track skipped messages
         for msg in messages:
@@ -340,8 +334,7 @@ class TestToolCallProcessingE2E:
             messages.append(msg)
 
         # Reset metrics to only count messages processed during this operation
-        with metrics_service._lock:
-            metrics_service._counters.clear()
+        metrics_service.reset()
 
         # Process messages and track metrics
         for msg in messages:
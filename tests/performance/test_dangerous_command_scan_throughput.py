@@ -0,0 +1,91 @@
+"""Throughput benchmark for dangerous-command scanning with many rules.
+
+Compares CPU time per command for a linear ``re.search`` over every rule and
+the anchored Aho-Corasick scanner, with the default rules plus a few hundred
+custom ones, and the cost of a repeated scan served from the verdict memo.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable
+
+import pytest
+from src.core.domain.configuration.dangerous_command_config import (
+    DEFAULT_DANGEROUS_COMMAND_RULES,
+    DangerousCommandConfig,
+    DangerousCommandRule,
+)
+from src.core.services.dangerous_command_scanner import DangerousCommandScanner
+from src.core.services.dangerous_command_service import DangerousCommandService
+
+CUSTOM_RULES = 400
+ROUNDS = 20
+
+COMMANDS = [
+    "git status && git diff --stat",
+    "python -m pytest -q tests/unit",
+    "ls -la /var/log | grep error | tail -n 50",
+    "npm run build -- --mode production",
+    "git reset --hard origin/main",
+    "deploytool-217 --purge-all-environments now",
+    "docker compose up -d && docker compose logs -f api",
+    "rm -rf ./build ./dist",
+]
+
+
+def _rules() -> list[DangerousCommandRule]:
+    custom = [
+        DangerousCommandRule(
+            pattern=re.compile(
+                rf"deploytool-{index}\s+--purge-(?:all|env)\S*", re.IGNORECASE
+            ),
+            name=f"custom-{index}",
+            description="Custom rule",
+        )
+        for index in range(CUSTOM_RULES)
+    ]
+    return [*DEFAULT_DANGEROUS_COMMAND_RULES, *custom]
+
+
+def _cpu_us_per_command(scan: Callable[[str], object]) -> float:
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        for command in COMMANDS:
+            scan(command)
+    elapsed = time.process_time() - started
+    return elapsed * 1_000_000 / (ROUNDS * len(COMMANDS))
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+def test_dangerous_command_scan_cpu_per_command() -> None:
+    rules = _rules()
+    scanner = DangerousCommandScanner(rules)
+    service = DangerousCommandService(
+        DangerousCommandConfig(tool_names=["bash"], rules=rules)
+    )
+
+    def linear(command: str) -> object:
+        return next((rule for rule in rules if rule.pattern.search(command)), None)
+
+    for command in COMMANDS:
+        assert scanner.first_match([command]) is linear(command)
+
+    results = {
+        "linear_regex": _cpu_us_per_command(linear),
+        "anchored_scanner": _cpu_us_per_command(
+            lambda command: scanner.first_match([command])
+        ),
+        "service_memoized": _cpu_us_per_command(
+            lambda command: service.scan("bash", command)
+        ),
+    }
+
+    print(f"\nDangerous command scan CPU per command ({len(rules)} rules):")
+    for name, us_per_command in results.items():
+        print(f"  {name:<18} {us_per_command:9.1f} us")
+
+    assert results["anchored_scanner"] < 1_000
+    assert results["anchored_scanner"] < results["linear_regex"]
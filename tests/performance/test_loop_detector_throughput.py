@@ -0,0 +1,91 @@
+"""Throughput benchmark for the streaming loop detector engines.
+
+Compares CPU time per streamed megabyte for the token-window (gemini-cli port),
+hybrid and rolling-hash detectors on long non-looping and looping outputs.
+Detectors are reset whenever they fire so every run streams the full payload.
+The payload is kept small because the existing engines re-scan their history on
+every chunk; results are normalised to milliseconds per megabyte.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+import time
+from collections.abc import Callable
+
+import pytest
+from src.core.interfaces.loop_detector_interface import ILoopDetector
+from src.loop_detection.hybrid_detector import HybridLoopDetector
+from src.loop_detection.rolling_hash_detector import RollingHashLoopDetector
+from src.loop_detection.token_window_loop_detector import TokenWindowLoopDetector
+
+PAYLOAD_BYTES = 32_000
+TOKEN_SIZE = 16
+
+DETECTORS: dict[str, Callable[[], ILoopDetector]] = {
+    "token_window": TokenWindowLoopDetector,
+    "hybrid": HybridLoopDetector,
+    "hybrid[rolling_hash]": lambda: HybridLoopDetector(
+        short_detector_config={"engine": "rolling_hash"}
+    ),
+    "rolling_hash": RollingHashLoopDetector,
+}
+
+
+def _non_looping_payload(size: int) -> str:
+    rng = random.Random(1234)
+    words = []
+    total = 0
+    while total < size:
+        word = "".join(
+            rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10))
+        )
+        words.append(word)
+        total += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _looping_payload(size: int) -> str:
+    paragraph = (
+        "Let me re-run the test suite to verify the fix. The failure appears to "
+        "come from the session repository, so I will open that file again and "
+        "look at the flush loop. "
+    )
+    return (paragraph * (size // len(paragraph) + 1))[:size]
+
+
+def _cpu_seconds_per_mb(factory: Callable[[], ILoopDetector], payload: str) -> float:
+    detector = factory()
+    tokens = [
+        payload[start : start + TOKEN_SIZE]
+        for start in range(0, len(payload), TOKEN_SIZE)
+    ]
+    started = time.process_time()
+    for token in tokens:
+        if detector.process_chunk(token) is not None:
+            detector.reset()
+    elapsed = time.process_time() - started
+    return elapsed / (len(payload.encode("utf-8")) / 1_000_000)
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.parametrize(
+    "payload_name,payload_builder",
+    [("non_looping", _non_looping_payload), ("looping", _looping_payload)],
+)
+def test_loop_detector_cpu_per_streamed_mb(
+    payload_name: str, payload_builder: Callable[[int], str]
+) -> None:
+    payload = payload_builder(PAYLOAD_BYTES)
+    results = {
+        name: _cpu_seconds_per_mb(factory, payload)
+        for name, factory in DETECTORS.items()
+    }
+
+    print(f"\nLoop detector CPU per streamed MB ({payload_name}):")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1000:9.1f} ms/MB")
+
+    assert results["rolling_hash"] < results["token_window"], results
@@ -0,0 +1,64 @@
+"""Throughput benchmark for the in-memory rate limiter engines.
+
+Compares CPU time per check-and-record for the exact timestamp-log limiter and
+the sliding-window counter limiter when many keys each run close to a high
+limit, the case where the timestamp log rescans and copies up to ``limit``
+entries per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from src.core.interfaces.rate_limiter_interface import IRateLimiter
+from src.core.services.rate_limiter import (
+    InMemoryRateLimiter,
+    SlidingWindowRateLimiter,
+)
+
+OPERATIONS = 20_000
+
+
+async def _drive(limiter: IRateLimiter, keys: list[str]) -> int:
+    limited = 0
+    for index in range(OPERATIONS):
+        key = keys[index % len(keys)]
+        info = await limiter.check_limit(key)
+        if info.is_limited:
+            limited += 1
+        else:
+            await limiter.record_usage(key)
+    return limited
+
+
+def _cpu_us_per_op(limiter: IRateLimiter, keys: list[str]) -> float:
+    started = time.process_time()
+    asyncio.run(_drive(limiter, keys))
+    elapsed = time.process_time() - started
+    return elapsed * 1_000_000 / OPERATIONS
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.parametrize(("key_count", "limit"), [(10, 5_000), (1_000, 100)])
+def test_rate_limiter_cpu_per_operation(key_count: int, limit: int) -> None:
+    keys = [f"backend:model-{index}" for index in range(key_count)]
+    results = {
+        "exact_timestamps": _cpu_us_per_op(
+            InMemoryRateLimiter(default_limit=limit, default_time_window=60), keys
+        ),
+        "sliding_window": _cpu_us_per_op(
+            SlidingWindowRateLimiter(default_limit=limit, default_time_window=60),
+            keys,
+        ),
+    }
+
+    print(f"\nRate limiter CPU per check+record ({key_count} keys, limit {limit}):")
+    for name, us_per_op in results.items():
+        print(f"  {name:<18} {us_per_op:9.2f} us/op")
+
+    if limit >= 1_000:
+        # Each exact check filters a timestamp list of up to ``limit`` entries
+        assert results["sliding_window"] < results["exact_timestamps"]
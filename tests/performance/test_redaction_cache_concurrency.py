@@ -0,0 +1,60 @@
+"""Concurrency benchmark for per-session redaction tracking.
+
+Thousands of sessions finish streams at once from several worker threads, each
+checking and marking a growing history. Compares a single session shard (the
+old one-lock layout) with the default lock-striped layout, at and beyond the
+session capacity so eviction runs on the hot path.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.core.services.redaction_cache import RedactionCache
+
+SESSIONS = 4_000
+TURNS = 4
+WORKERS = 8
+HISTORY = [{"role": "user", "content": f"message {index} " * 20} for index in range(32)]
+
+
+def _session_turns(cache: RedactionCache, session_ids: list[str]) -> None:
+    for turn in range(1, TURNS + 1):
+        for session_id in session_ids:
+            messages = HISTORY[: turn * 8]
+            pending = cache.get_unprocessed_indices(session_id, messages)
+            cache.mark_batch_processed(
+                session_id, [messages[index] for index in pending]
+            )
+
+
+def _wall_ms(cache: RedactionCache) -> float:
+    session_ids = [f"session-{index}" for index in range(SESSIONS)]
+    slices = [session_ids[worker::WORKERS] for worker in range(WORKERS)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        futures = [pool.submit(_session_turns, cache, part) for part in slices]
+        for future in futures:
+            future.result()
+    return (time.perf_counter() - started) * 1000
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.parametrize("max_sessions", [SESSIONS * 2, SESSIONS // 2])
+def test_redaction_session_tracking_under_concurrency(max_sessions: int) -> None:
+    results = {
+        "single_shard": _wall_ms(
+            RedactionCache(max_sessions=max_sessions, session_shards=1)
+        ),
+        "striped": _wall_ms(RedactionCache(max_sessions=max_sessions)),
+    }
+
+    print(
+        f"\nRedaction tracking, {SESSIONS} sessions x {TURNS} turns, "
+        f"{WORKERS} threads, capacity {max_sessions}:"
+    )
+    for name, wall_ms in results.items():
+        print(f"  {name:<14} {wall_ms:9.1f} ms")
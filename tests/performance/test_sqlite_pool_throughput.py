@@ -0,0 +1,92 @@
+"""Throughput benchmark for the SQLite connection strategies of DatabaseEngine.
+
+Compares ``sqlite_pool_mode="null"`` (a new aiosqlite connection and worker
+thread per session, default journal settings) with ``"pooled"`` (persistent
+WAL-mode writer and reader connections with tuned pragmas) on a file database,
+for usage-record batch inserts and concurrent aggregate statistics queries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from src.core.database.config import DatabaseConfig
+from src.core.database.engine import DatabaseEngine
+from src.core.database.repositories.usage_repository import UsageRecordRepository
+from src.core.domain.statistics_filter import StatisticsFilter
+from src.core.domain.traffic_leg import TrafficLeg
+from src.core.domain.usage_record import UsageRecord
+
+BATCHES = 40
+BATCH_SIZE = 50
+QUERIES = 200
+CONCURRENCY = 8
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _batch(batch_index: int) -> list[UsageRecord]:
+    return [
+        UsageRecord(
+            id=f"rec-{batch_index}-{index}",
+            timestamp=BASE + timedelta(seconds=batch_index * BATCH_SIZE + index),
+            session_id=f"session-{index % 13}",
+            turn_number=1,
+            backend_type="openai" if index % 2 else "anthropic",
+            model="gpt-4",
+            frontend_type="openai",
+            leg=TrafficLeg.PROXY_TO_BACKEND,
+            http_status_code=200,
+            total_tokens=index,
+            ttft_ms=50.0 + index,
+        )
+        for index in range(BATCH_SIZE)
+    ]
+
+
+async def _measure(url: str, pool_mode: str) -> dict[str, float]:
+    engine = DatabaseEngine(DatabaseConfig(url=url, sqlite_pool_mode=pool_mode))
+    await engine.initialize()
+    repository = UsageRecordRepository(engine)
+    try:
+        started = time.perf_counter()
+        for batch_index in range(BATCHES):
+            await repository.batch_insert(_batch(batch_index))
+        insert_seconds = time.perf_counter() - started
+
+        filters = StatisticsFilter(backend_type="openai")
+        started = time.perf_counter()
+        for _ in range(QUERIES // CONCURRENCY):
+            await asyncio.gather(
+                *(repository.get_aggregated_stats(filters) for _ in range(CONCURRENCY))
+            )
+        query_seconds = time.perf_counter() - started
+    finally:
+        await engine.close()
+
+    return {
+        "insert_records_per_s": BATCHES * BATCH_SIZE / insert_seconds,
+        "queries_per_s": QUERIES // CONCURRENCY * CONCURRENCY / query_seconds,
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+def test_sqlite_pool_mode_throughput(tmp_path: Path) -> None:
+    results = {
+        mode: asyncio.run(_measure(f"sqlite+aiosqlite:///{tmp_path}/{mode}.db", mode))
+        for mode in ("null", "pooled")
+    }
+
+    print("\nSQLite throughput (file database):")
+    for mode, stats in results.items():
+        print(
+            f"  {mode:<7} {stats['insert_records_per_s']:9.0f} inserted records/s"
+            f"  {stats['queries_per_s']:8.0f} aggregate queries/s"
+        )
+
+    # Each null-pool session opens a connection and starts a worker thread
+    assert results["pooled"]["queries_per_s"] > results["null"]["queries_per_s"]
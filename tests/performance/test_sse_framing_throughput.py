@@ -0,0 +1,96 @@
+"""Throughput benchmark for incremental SSE framing.
+
+Compares CPU time per streamed megabyte for the shared bytes-level parser and
+the per-chunk ``str`` decode/concatenate/split framing the connectors used
+before, on a stream delivered in large network-sized chunks and in tiny
+chunks (token-per-packet upstreams).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterable
+
+import pytest
+from src.connectors.utils.sse_framing import IncrementalSSEParser
+
+EVENT_COUNT = 4_000
+
+
+def _stream() -> bytes:
+    events = []
+    for index in range(EVENT_COUNT):
+        payload = {
+            "id": "chatcmpl-bench",
+            "choices": [{"index": 0, "delta": {"content": f"token {index} ✓ "}}],
+        }
+        events.append(f"data: {json.dumps(payload)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode("utf-8")
+
+
+def _legacy_framing(chunks: Iterable[bytes]) -> int:
+    buffer = ""
+    separator = "\n\n"
+    alt_separator = "\r\n\r\n"
+    events: list[str] = []
+    for chunk_bytes in chunks:
+        buffer += chunk_bytes.decode("utf-8", errors="replace")
+        while True:
+            if alt_separator in buffer:
+                event, buffer = buffer.split(alt_separator, 1)
+                separator_used = alt_separator
+            elif separator in buffer:
+                event, buffer = buffer.split(separator, 1)
+                separator_used = separator
+            else:
+                break
+            if event:
+                events.append(event + separator_used)
+    return len(events)
+
+
+def _shared_parser(chunks: Iterable[bytes]) -> int:
+    parser = IncrementalSSEParser()
+    events: list[str] = []
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            events.append(event.raw)
+    for event in parser.flush():
+        events.append(event.raw)
+    return len(events)
+
+
+FRAMERS: dict[str, Callable[[Iterable[bytes]], int]] = {
+    "legacy_str_split": _legacy_framing,
+    "incremental_bytes": _shared_parser,
+}
+
+
+def _cpu_ms_per_mb(
+    framer: Callable[[Iterable[bytes]], int], chunks: list[bytes]
+) -> tuple[float, int]:
+    total = sum(len(chunk) for chunk in chunks)
+    started = time.process_time()
+    events = framer(chunks)
+    elapsed = time.process_time() - started
+    return elapsed * 1000 / (total / 1_000_000), events
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.parametrize("chunk_size", [65_536, 16, 3])
+def test_sse_framing_cpu_per_streamed_mb(chunk_size: int) -> None:
+    data = _stream()
+    chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+    results = {name: _cpu_ms_per_mb(framer, chunks) for name, framer in FRAMERS.items()}
+
+    print(f"\nSSE framing CPU per streamed MB ({chunk_size}-byte chunks):")
+    for name, (ms_per_mb, _) in results.items():
+        print(f"  {name:<20} {ms_per_mb:9.1f} ms/MB")
+
+    assert results["incremental_bytes"][1] == EVENT_COUNT + 1
+    if chunk_size >= 65_536:
+        # The legacy split re-scans the whole buffer once per event
+        assert results["incremental_bytes"][0] < results["legacy_str_split"][0]
@@ -0,0 +1,84 @@
+"""Per-chunk cost of stream translation between client and backend formats.
+
+Times the backend -> domain -> client translation of one streamed token for
+three format pairs, with the canonical-chunk pass-through (default) and with
+the validating dict round trip enabled (``LLM_PROXY_VALIDATE_STREAM_CHUNKS``).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import time
+from typing import Any
+
+import pytest
+from src.core.services.translation_service import TranslationService
+
+ITERATIONS = 2_000
+
+OPENAI_CHUNK = "data: " + json.dumps(
+    {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": 1_700_000_000,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": {"content": "token"}}],
+    }
+)
+
+GEMINI_CHUNK: dict[str, Any] = {
+    "candidates": [{"content": {"parts": [{"text": "token"}], "role": "model"}}],
+    "modelVersion": "gemini-2.5-pro",
+}
+
+RESPONSES_CHUNK: dict[str, Any] = {
+    "type": "response.output_text.delta",
+    "item_id": "msg_bench",
+    "output_index": 0,
+    "content_index": 0,
+    "delta": "token",
+}
+
+# (backend format, client format, backend chunk)
+PAIRS: dict[str, tuple[str, str, Any]] = {
+    "openai->anthropic": ("openai", "anthropic", OPENAI_CHUNK),
+    "gemini->openai": ("gemini", "openai", GEMINI_CHUNK),
+    "responses->openai": ("responses", "openai", RESPONSES_CHUNK),
+}
+
+
+def _us_per_chunk(
+    service: TranslationService, source: str, target: str, chunk: Any
+) -> float:
+    # Translators may normalize dict chunks in place
+    chunks = [copy.deepcopy(chunk) for _ in range(ITERATIONS)]
+    started = time.process_time()
+    for item in chunks:
+        domain = service.to_domain_stream_chunk(item, source)
+        service.from_domain_stream_chunk(domain, target)
+    return (time.process_time() - started) * 1_000_000 / ITERATIONS
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.parametrize("pair", list(PAIRS))
+def test_stream_chunk_translation_cost(pair: str) -> None:
+    source, target, chunk = PAIRS[pair]
+    fast = TranslationService(validate_stream_chunks=False)
+    validated = TranslationService(validate_stream_chunks=True)
+    # Warm translator registries and pydantic validators
+    _us_per_chunk(fast, source, target, chunk)
+    _us_per_chunk(validated, source, target, chunk)
+
+    fast_us = _us_per_chunk(fast, source, target, chunk)
+    validated_us = _us_per_chunk(validated, source, target, chunk)
+
+    print(f"\nStream chunk translation {pair}:")
+    print(f"  pass-through         {fast_us:8.1f} us/chunk")
+    print(f"  validated round trip {validated_us:8.1f} us/chunk")
+
+    if source != "responses":
+        # The Responses translator emits dicts, which take the same path in
+        # both modes; the canonical formats skip two pydantic traversals.
+        assert fast_us < validated_us
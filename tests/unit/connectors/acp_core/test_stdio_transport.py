@@ -0,0 +1,228 @@
+"""Tests for the event-loop ACP stdio transport, against real child processes."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from src.connectors.acp_core.base_connector import BaseAcpConnector
+from src.connectors.acp_core.stdio_transport import AcpStdioTransport
+from src.connectors.acp_core.types import ACPNotification, ACPProcessRuntime
+from src.core.common.exceptions import BackendError
+
+pytestmark = pytest.mark.skipif(
+    os.name == "nt", reason="event-loop pipe transport is POSIX-only"
+)
+
+# Echoes every request back as a response, after a notification and, for
+# "session/new", a server request that must be answered first.
+_AGENT = r"""
+import json, sys
+for raw in sys.stdin:
+    msg = json.loads(raw)
+    if "method" not in msg:
+        continue
+    out = [{"jsonrpc": "2.0", "method": "session/update", "params": {"n": msg["id"]}}]
+    if msg["method"] == "session/new":
+        out.append({"jsonrpc": "2.0", "id": 900, "method": "fs/read", "params": {}})
+    out.append({"jsonrpc": "2.0", "id": msg["id"], "result": {"echo": msg["method"]}})
+    for item in out:
+        sys.stdout.write(json.dumps(item) + "\n")
+    sys.stdout.flush()
+    if msg["method"] == "session/new":
+        sys.stdin.readline()
+"""
+
+
+def _spawn(script: str) -> subprocess.Popen[bytes]:
+    return subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+@pytest.fixture
+async def child() -> AsyncIterator[tuple[subprocess.Popen[bytes], bytearray]]:
+    process = _spawn(
+        "import sys\n"
+        "sys.stderr.write('booting\\n'); sys.stderr.flush()\n"
+        'sys.stdout.write(\'{"jsonrpc":"2.0","method":"a"}\\n\')\n'
+        "sys.stdout.write('x' * 4096 + '\\n')\n"
+        "sys.stdout.write('[1]\\n')\n"
+        'sys.stdout.write(\'{"jsonrpc":"2.0","id":1,"result":{}}\\n\')\n'
+    )
+    yield process, bytearray()
+    process.kill()
+    process.wait()
+
+
+@pytest.mark.asyncio
+async def test_messages_errors_and_eof_arrive_in_order(
+    child: tuple[subprocess.Popen[bytes], bytearray],
+) -> None:
+    process, stderr = child
+    transport = await AcpStdioTransport.attach(
+        process, on_stderr=stderr.extend, max_line_bytes=1024
+    )
+    assert transport is not None
+
+    first = await transport.receive()
+    assert first is not None and first.method == "a"
+    with pytest.raises(BackendError, match="too large"):
+        await transport.receive()
+    with pytest.raises(BackendError, match="non-object"):
+        await transport.receive()
+    last = await transport.receive()
+    assert last is not None and last.id == 1
+    assert await transport.receive() is None
+    assert await transport.receive() is None
+
+    await transport.wait_stderr_closed(timeout=5.0)
+    assert bytes(stderr) == b"booting\n"
+    transport.close()
+    with pytest.raises(ConnectionResetError):
+        await transport.receive()
+
+
+@pytest.mark.asyncio
+async def test_attach_declines_objects_that_are_not_pipes() -> None:
+    process = MagicMock()
+
+    transport = await AcpStdioTransport.attach(
+        process, on_stderr=lambda _chunk: None, max_line_bytes=1024
+    )
+
+    assert transport is None
+
+
+@pytest.mark.asyncio
+async def test_attach_leaves_pipes_alone_when_one_is_not_a_pipe(
+    tmp_path: Path,
+) -> None:
+    with (tmp_path / "stderr.log").open("w+b") as stderr_file:
+        process = subprocess.Popen(
+            [sys.executable, "-c", "pass"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        real_stderr = process.stderr
+        process.stderr = stderr_file
+        try:
+            transport = await AcpStdioTransport.attach(
+                process, on_stderr=lambda _chunk: None, max_line_bytes=1024
+            )
+
+            assert transport is None
+            assert process.stdout is not None and not process.stdout.closed
+            assert os.get_blocking(process.stdout.fileno())
+            assert process.stdout.read() == b""
+        finally:
+            process.stderr = real_stderr
+            process.communicate()
+
+
+@pytest.mark.asyncio
+async def test_attach_raises_after_partial_registration(
+    monkeypatch: pytest.MonkeyPatch,
+    child: tuple[subprocess.Popen[bytes], bytearray],
+) -> None:
+    process, stderr = child
+
+    async def _refuse(*_args: Any) -> Any:
+        raise OSError("refused")
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "connect_write_pipe", _refuse)
+
+    with pytest.raises(BackendError, match="refused"):
+        await AcpStdioTransport.attach(
+            process, on_stderr=stderr.extend, max_line_bytes=1024
+        )
+
+
+class _EchoAcpConnector(BaseAcpConnector[ACPProcessRuntime]):
+    backend_type = "echo-acp"
+    VENDOR_PREFIX = "echo"
+
+    def __init__(self) -> None:
+        super().__init__(MagicMock())
+        self.server_requests: list[int | None] = []
+
+    async def _build_subprocess_command(self, runtime: ACPProcessRuntime) -> list[str]:
+        return [sys.executable, "-c", _AGENT]
+
+    def _create_runtime(
+        self, project_dir: Path, model: str, client_session_id: str = "default"
+    ) -> ACPProcessRuntime:
+        return ACPProcessRuntime(
+            project_dir=project_dir,
+            model=model,
+            client_session_id=client_session_id,
+            process_lock=asyncio.Lock(),
+            request_lock=asyncio.Lock(),
+            cancellation_lock=asyncio.Lock(),
+            cancellation_event=asyncio.Event(),
+        )
+
+    async def _perform_handshake(self, runtime: ACPProcessRuntime) -> None:
+        runtime.initialized = True
+
+    async def _handle_server_request(
+        self, runtime: ACPProcessRuntime, msg: ACPNotification
+    ) -> None:
+        self.server_requests.append(msg.id)
+        assert msg.id is not None
+        await self._send_jsonrpc_result(runtime, msg.id, {})
+
+    async def initialize(self, **kwargs: Any) -> None:
+        self.is_functional = True
+
+    def get_available_models(self) -> list[str]:
+        return ["echo/model"]
+
+
+@pytest.mark.asyncio
+async def test_connector_round_trips_over_event_loop_pipes(tmp_path: Path) -> None:
+    connector = _EchoAcpConnector()
+    runtime = connector._create_runtime(tmp_path, "m")
+    await connector._spawn_process(runtime)
+    try:
+        assert runtime.stdio_transport is not None
+        assert runtime.stderr_drain_thread is None
+
+        request_id = await connector._send_jsonrpc_message(runtime, "initialize", {})
+        response = await connector._await_response(runtime, request_id)
+        assert response.result == {"echo": "initialize"}
+
+        # Server requests are answered while awaiting the response
+        request_id = await connector._send_jsonrpc_message(runtime, "session/new", {})
+        response = await connector._await_response(runtime, request_id)
+        assert response.result == {"echo": "session/new"}
+        assert connector.server_requests == [900]
+
+        # Unawaited traffic stays queued for the streaming reader
+        request_id = await connector._send_jsonrpc_message(
+            runtime, "session/prompt", {}
+        )
+        update = await connector._read_jsonrpc_message(runtime)
+        prompt = await connector._read_jsonrpc_message(runtime)
+        assert update is not None and update.method == "session/update"
+        assert prompt is not None and prompt.id == request_id
+
+        connector._close_process_stdin(runtime, runtime.process)
+        with pytest.raises(BackendError, match="exited unexpectedly"):
+            while True:
+                await connector._read_jsonrpc_message(runtime)
+        assert runtime.process is None
+        assert runtime.stdio_transport is None
+    finally:
+        await connector._kill_runtime(runtime)
@@ -0,0 +1,203 @@
+"""Tests for the pre-warmed ACP runtime pool."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from src.connectors.acp_core.types import ACPProcessRuntime
+from src.connectors.acp_core.warm_pool import (
+    AcpWarmPoolSettings,
+    AcpWarmRuntimePool,
+)
+from tests.unit.connectors.acp_core.test_base_connector import (
+    DummyAcpConnector,
+    _make_request,
+)
+
+
+class _Runtime:
+    def __init__(self, project_dir: Path, model: str) -> None:
+        self.project_dir = project_dir
+        self.model = model
+        self.alive = True
+
+
+class _Harness:
+    def __init__(self, settings: AcpWarmPoolSettings) -> None:
+        self.now = 0.0
+        self.started: list[_Runtime] = []
+        self.retired: list[_Runtime] = []
+        self.fail = False
+        self.pool: AcpWarmRuntimePool[_Runtime] = AcpWarmRuntimePool(
+            settings,
+            warm=self._warm,
+            retire=self._retire,
+            is_ready=lambda runtime: runtime.alive,
+            clock=lambda: self.now,
+        )
+
+    async def _warm(self, project_dir: Path, model: str) -> _Runtime:
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("spawn failed")
+        runtime = _Runtime(project_dir, model)
+        self.started.append(runtime)
+        return runtime
+
+    async def _retire(self, runtime: _Runtime) -> None:
+        runtime.alive = False
+        self.retired.append(runtime)
+
+    async def settle(self) -> None:
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+
+WS = Path("/tmp/ws")
+
+
+def test_settings_from_backend_kwargs() -> None:
+    settings = AcpWarmPoolSettings.from_backend_kwargs(
+        {
+            "warm_pool_min_idle": 3,
+            "warm_pool_max_idle": 1,
+            "warm_pool_idle_ttl_seconds": "45",
+            "warm_pool_max_idle_rss_mb": 0,
+        }
+    )
+    assert settings.enabled
+    assert settings.min_idle == 3
+    assert settings.max_idle == 3
+    assert settings.idle_ttl_seconds == 45.0
+    assert settings.max_idle_rss_mb is None
+    assert not AcpWarmPoolSettings.from_backend_kwargs({}).enabled
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_never_warms() -> None:
+    harness = _Harness(AcpWarmPoolSettings())
+    assert harness.pool.claim(WS, "m") is None
+    await harness.settle()
+    assert harness.started == []
+
+
+@pytest.mark.asyncio
+async def test_claim_miss_refills_and_next_claim_hits() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=1, max_idle=1))
+    assert harness.pool.claim(WS, "m") is None
+    await harness.settle()
+    assert harness.pool.idle_count(WS, "m") == 1
+
+    claimed = harness.pool.claim(WS, "m")
+    assert claimed is harness.started[0]
+    await harness.settle()
+    assert harness.pool.idle_count(WS, "m") == 1
+    assert harness.pool.claim(WS, "other") is None
+    await harness.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_recent_claims_raise_target_up_to_max_idle() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=1, max_idle=3))
+    for _ in range(5):
+        harness.pool.claim(WS, "m")
+        await harness.settle()
+    assert harness.pool.idle_count(WS, "m") == 3
+
+    harness.now = 120.0
+    harness.pool.claim(WS, "m")
+    await harness.settle()
+    # Only the latest claim falls inside the demand window now.
+    assert harness.pool.idle_count(WS, "m") == 2
+    await harness.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_and_dead_runtimes_are_retired_on_claim() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=2, idle_ttl_seconds=10.0))
+    harness.pool.claim(WS, "m")
+    await harness.settle()
+    first, second = harness.started
+    first.alive = False
+    harness.now = 5.0
+    assert harness.pool.claim(WS, "m") is second
+    await harness.settle()
+    assert first in harness.retired
+
+    harness.now = 100.0
+    idle = harness.pool.idle_runtimes()
+    assert harness.pool.claim(WS, "m") is None
+    await harness.settle()
+    assert all(runtime in harness.retired for runtime in idle)
+    await harness.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_global_idle_cap_limits_spawns() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=2, max_total_idle=2))
+    harness.pool.claim(WS, "a")
+    harness.pool.claim(WS, "b")
+    await harness.settle()
+    assert harness.pool.idle_count() == 2
+    await harness.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_spawn_failure_stops_refill_until_next_claim() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=1, max_idle=1))
+    harness.fail = True
+    harness.pool.claim(WS, "m")
+    await harness.settle()
+    assert harness.pool.idle_count() == 0
+    assert harness.started == []
+
+    harness.fail = False
+    harness.pool.claim(WS, "m")
+    await harness.settle()
+    assert harness.pool.idle_count() == 1
+    await harness.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_retires_idle_runtimes() -> None:
+    harness = _Harness(AcpWarmPoolSettings(min_idle=2))
+    harness.pool.claim(WS, "m")
+    await harness.settle()
+    await harness.pool.close()
+    assert harness.pool.idle_count() == 0
+    assert sorted(map(id, harness.retired)) == sorted(map(id, harness.started))
+
+
+@pytest.mark.asyncio
+async def test_connector_claims_warm_runtime_for_new_session() -> None:
+    connector = DummyAcpConnector(MagicMock(), MagicMock())
+    await connector.initialize()
+    connector._configure_warm_pool({"warm_pool_min_idle": 1, "warm_pool_max_idle": 1})
+    warmed: list[ACPProcessRuntime] = []
+
+    async def _start(project_dir: Path, model: str) -> ACPProcessRuntime:
+        runtime = connector._create_runtime(project_dir, model, "__warm_pool__")
+        runtime.initialized = True
+        runtime.session_id = f"warm-{len(warmed)}"
+        runtime.process = MagicMock()
+        runtime.process.poll.return_value = None
+        warmed.append(runtime)
+        return runtime
+
+    connector._warm_pool._warm = _start
+    connector._warm_pool._retire = AsyncMock()
+    first = await connector._acquire_runtime(_make_request(session_id="s1"))
+    assert first.process is None
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert len(warmed) == 1
+
+    second = await connector._acquire_runtime(_make_request(session_id="s2"))
+    assert second is warmed[0]
+    assert second.client_session_id == "s2"
+    assert second.session_id == "warm-0"
+    assert connector._warm_pool.idle_count() == 0
+    await connector._warm_pool.close()
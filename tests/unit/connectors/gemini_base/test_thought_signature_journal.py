@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from src.connectors.gemini_base import thought_signature_journal
+from src.connectors.gemini_base.thought_signature_journal import (
+    ThoughtSignatureJournal,
+    iter_journal_records,
+)
+
+NOW = 1_700_000_000.0
+
+
+def test_journal_appends_coalesced_records(tmp_path) -> None:
+    path = tmp_path / "signatures.jsonl"
+    journal = ThoughtSignatureJournal(
+        path,
+        ttl_seconds=3600,
+        max_entries=100,
+        flush_interval_seconds=0.2,
+        clock=lambda: NOW + 2,
+    )
+    now = NOW
+    journal.record("anon:a", "sig-a", now)
+    journal.record("anon:a", "sig-a", now + 1)
+    journal.record("anon:b", "sig-b", now)
+    journal.remove("anon:b")
+    assert journal.flush(timeout=5.0)
+    journal.close()
+
+    assert list(iter_journal_records(path)) == [
+        ("anon:a", "sig-a", now + 1),
+        ("anon:b", None, now + 2),
+    ]
+
+
+def test_replay_skips_torn_lines(tmp_path) -> None:
+    path = tmp_path / "signatures.jsonl"
+    path.write_text(
+        '{"k":"anon:a","s":"sig-a","t":1.0}\n{"k":"anon:b","s":"si', encoding="utf-8"
+    )
+    assert list(iter_journal_records(path)) == [("anon:a", "sig-a", 1.0)]
+
+
+def test_journal_compacts_to_live_unexpired_records(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(thought_signature_journal, "_MIN_COMPACT_RECORDS", 4)
+    path = tmp_path / "signatures.jsonl"
+    journal = ThoughtSignatureJournal(
+        path,
+        ttl_seconds=60,
+        max_entries=100,
+        flush_interval_seconds=0.0,
+        clock=lambda: NOW,
+    )
+    now = NOW
+    journal.seed({"anon:old": ("sig-old", now - 3600)}, records_in_file=1)
+    for i in range(6):
+        journal.record("anon:hot", f"sig-{i}", now + i)
+        assert journal.flush(timeout=5.0)
+    journal.close()
+
+    records = list(iter_journal_records(path))
+    # Seven records were written; compaction dropped the expired seed and the
+    # superseded touches.
+    assert len(records) < 7
+    assert all(key == "anon:hot" for key, _, _ in records)
+    assert records[-1] == ("anon:hot", "sig-5", now + 5)
+
+
+def test_compaction_keeps_unexpired_removals(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(thought_signature_journal, "_MIN_COMPACT_RECORDS", 4)
+    path = tmp_path / "signatures.jsonl"
+    clock = [NOW]
+    journal = ThoughtSignatureJournal(
+        path,
+        ttl_seconds=60,
+        max_entries=100,
+        flush_interval_seconds=0.0,
+        clock=lambda: clock[0],
+    )
+    journal.seed({}, records_in_file=1, removed={"anon:stale": NOW - 3600})
+    journal.remove("anon:gone")
+    for i in range(6):
+        journal.record("anon:hot", f"sig-{i}", NOW + i)
+        assert journal.flush(timeout=5.0)
+
+    records = list(iter_journal_records(path))
+    assert len(records) < 8
+    assert ("anon:gone", None, NOW) in records
+    assert all(key != "anon:stale" for key, _, _ in records)
+
+    # Once the TTL has passed the removal is dropped by the next compaction.
+    clock[0] = NOW + 120
+    for i in range(6, 12):
+        journal.record("anon:hot", f"sig-{i}", clock[0] + i)
+        assert journal.flush(timeout=5.0)
+    journal.close()
+
+    assert all(key == "anon:hot" for key, _, _ in iter_journal_records(path))
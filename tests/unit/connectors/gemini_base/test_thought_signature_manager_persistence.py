@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import json
+import pathlib
+
+from src.connectors.gemini_base import thought_signature_journal
 from src.connectors.gemini_base.thought_signature_manager import ThoughtSignatureManager
 from src.core.domain.chat import ChatMessage, FunctionCall, ToolCall
 
+from tests.utils.fake_clock import FakeClockContext
+
+
+def _write_snapshot(path: pathlib.Path, timestamp: float) -> None:
+    path.write_text(
+        json.dumps(
+            {"version": 1, "entries": {"t-old": {"sig": "sig-old", "ts": timestamp}}}
+        ),
+        encoding="utf-8",
+    )
+
 
 def test_thought_signature_persists_across_restarts(tmp_path, monkeypatch) -> None:
     persist_path = tmp_path / "thought_signatures.json"
@@ -19,12 +34,8 @@ def test_thought_signature_persists_across_restarts(tmp_path, monkeypatch) -> No
         session_id="s1",
     )
 
-    # Give the background persistence thread time to write the file.
-    import time
-    for _ in range(50):
-        if persist_path.exists():
-            break
-        time.sleep(0.1)
+    assert manager.flush_persistence(timeout=5.0)
+    assert persist_path.with_suffix(".jsonl").exists()
 
     # Simulate process restart with a new manager instance.
     manager2 = ThoughtSignatureManager(ttl_seconds=86400)
@@ -61,14 +72,70 @@ def test_namespaced_signature_persists_with_colon_namespace(
         session_id=session_id,
     )
 
-    # Give the background persistence thread time to write the file.
-    import time
-    for _ in range(50):
-        # For namespaced persistence, we don't know the exact filename easily here,
-        # but we can check if any json file exists in the directory.
-        if any(tmp_path.glob("*.json")):
-            break
-        time.sleep(0.1)
+    assert manager.flush_persistence(timeout=5.0)
+    assert any(tmp_path.glob("*.jsonl"))
 
     manager2 = ThoughtSignatureManager(ttl_seconds=86400)
     assert manager2.get_cached_signature(session_id, "t-ns") == "sig-ns"
+
+
+def test_cleared_signatures_stay_cleared_after_restart(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("LLM_PROXY_THOUGHT_SIGNATURE_PERSIST_PATH", str(tmp_path))
+
+    manager = ThoughtSignatureManager(ttl_seconds=86400)
+    manager.store_signatures_from_tool_calls(
+        [
+            {"id": "keep", "extra_content": {"google": {"thought_signature": "a"}}},
+            {"id": "drop", "extra_content": {"google": {"thought_signature": "b"}}},
+        ],
+        session_id="s1",
+    )
+    manager.clear_session_cache("s1")
+    manager.store_signatures_from_tool_calls(
+        [{"id": "keep", "extra_content": {"google": {"thought_signature": "a"}}}],
+        session_id="s2",
+    )
+    assert manager.flush_persistence(timeout=5.0)
+
+    manager2 = ThoughtSignatureManager(ttl_seconds=86400)
+    assert manager2.get_cached_signature("s3", "keep") == "a"
+    assert manager2.get_cached_signature("s3", "drop") is None
+
+
+async def test_legacy_json_snapshot_is_still_loaded(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("LLM_PROXY_THOUGHT_SIGNATURE_PERSIST_PATH", str(tmp_path))
+    async with FakeClockContext() as clock:
+        _write_snapshot(tmp_path / "thought_signatures_1.json", clock.now())
+
+        manager = ThoughtSignatureManager(ttl_seconds=86400)
+        assert manager.get_cached_signature("s1", "t-old") == "sig-old"
+
+
+async def test_compaction_keeps_removal_of_snapshot_signature(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setenv("LLM_PROXY_THOUGHT_SIGNATURE_PERSIST_PATH", str(tmp_path))
+    monkeypatch.setattr(thought_signature_journal, "_MIN_COMPACT_RECORDS", 4)
+    async with FakeClockContext() as clock:
+        _write_snapshot(tmp_path / "thought_signatures_1.json", clock.now())
+
+        manager = ThoughtSignatureManager(ttl_seconds=86400)
+        assert manager._journal is not None
+        manager._journal._flush_interval_seconds = 0.0
+        assert manager.clear_all_anonymous() == 1
+        for i in range(6):
+            clock.advance(1.0)
+            manager.store_signatures_from_tool_calls(
+                [
+                    {
+                        "id": "t-new",
+                        "extra_content": {"google": {"thought_signature": f"sig-{i}"}},
+                    }
+                ],
+                session_id="s1",
+            )
+            assert manager.flush_persistence(timeout=5.0)
+
+        manager2 = ThoughtSignatureManager(ttl_seconds=86400)
+        assert manager2.get_cached_signature("s2", "t-new") == "sig-5"
+        assert manager2.get_cached_signature("s2", "t-old") is None
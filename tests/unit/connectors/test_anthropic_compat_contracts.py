@@ -62,11 +62,11 @@ def _make_streaming_mock_response(sse_chunks: list[str]) -> MagicMock:
     mock_response.status_code = 200
     mock_response.headers = {}
 
-    async def _aiter_text():
+    async def _aiter_bytes():
         for chunk in sse_chunks:
-            yield chunk
+            yield chunk.encode("utf-8")
 
-    mock_response.aiter_text = _aiter_text
+    mock_response.aiter_bytes = _aiter_bytes
     mock_response.aclose = AsyncMock()
     return mock_response
 
@@ -61,11 +61,11 @@ async def test_anthropic_streaming_handles_error_events():
         'event: error\ndata: {"type": "error", "error": {"type": "1113", "message": "Insufficient balance or no resource package. Please recharge."}, "request_id": "test123"}\n\n',
     ]
 
-    async def mock_aiter_text():
+    async def mock_aiter_bytes():
         for chunk in error_chunks:
-            yield chunk
+            yield chunk.encode("utf-8")
 
-    mock_response.aiter_text = mock_aiter_text
+    mock_response.aiter_bytes = mock_aiter_bytes
     mock_response.aclose = AsyncMock()
 
     with (
@@ -118,11 +118,11 @@ async def test_anthropic_streaming_handles_generic_error():
         'event: error\ndata: {"type": "error", "error": {"type": "rate_limit", "message": "Rate limit exceeded"}}\n\n',
     ]
 
-    async def mock_aiter_text():
+    async def mock_aiter_bytes():
         for chunk in error_chunks:
-            yield chunk
+            yield chunk.encode("utf-8")
 
-    mock_response.aiter_text = mock_aiter_text
+    mock_response.aiter_bytes = mock_aiter_bytes
     mock_response.aclose = AsyncMock()
 
     with (
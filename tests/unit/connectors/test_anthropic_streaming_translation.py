@@ -41,11 +41,11 @@ async def test_anthropic_streaming_translates_to_domain_format():
         'event: message_stop\ndata: {"type":"message_stop"}\n\n',
     ]
 
-    async def mock_aiter_text():
+    async def mock_aiter_bytes():
         for chunk in anthropic_chunks:
-            yield chunk
+            yield chunk.encode("utf-8")
 
-    mock_response.aiter_text = mock_aiter_text
+    mock_response.aiter_bytes = mock_aiter_bytes
     mock_response.aclose = AsyncMock()
 
     with (
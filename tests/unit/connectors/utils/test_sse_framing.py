@@ -0,0 +1,85 @@
+"""Tests for incremental SSE framing."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+from src.connectors.utils.sse_framing import (
+    IncrementalSSEParser,
+    SSEEvent,
+    aiter_sse_events,
+)
+
+STREAM = (
+    b'data: {"text":"h\xc3\xa9llo \xe2\x9c\x93"}\n\n'
+    b"event: ping\r\ndata: a\r\ndata:b\r\nid: 7\r\n\r\n"
+    b": comment only\n\n"
+    b"data: [DONE]\n\n"
+)
+
+
+def _feed_in_pieces(data: bytes, size: int) -> list[SSEEvent]:
+    parser = IncrementalSSEParser()
+    events: list[SSEEvent] = []
+    for start in range(0, len(data), size):
+        events.extend(parser.feed(data[start : start + size]))
+    events.extend(parser.flush())
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, len(STREAM)])
+def test_framing_is_independent_of_chunking(size: int) -> None:
+    events = _feed_in_pieces(STREAM, size)
+
+    assert [event.raw for event in events] == [
+        'data: {"text":"héllo ✓"}\n\n',
+        "event: ping\r\ndata: a\r\ndata:b\r\nid: 7\r\n\r\n",
+        ": comment only\n\n",
+        "data: [DONE]\n\n",
+    ]
+
+
+def test_fields_are_parsed_per_sse_spec() -> None:
+    first, second, comment, done = _feed_in_pieces(STREAM, 4)
+
+    assert first.data == '{"text":"héllo ✓"}'
+    assert first.event is None
+    assert (second.event, second.data, second.id) == ("ping", "a\nb", "7")
+    assert comment.data is None
+    assert done.data == "[DONE]"
+
+
+def test_blank_lines_and_unterminated_tail() -> None:
+    parser = IncrementalSSEParser()
+
+    assert parser.feed(b"\n\n\r\n\r\ndata: x\n\ndata: partial") == [
+        SSEEvent("data: x\n\n")
+    ]
+    assert parser.buffered_bytes == len(b"data: partial")
+    assert parser.flush() == [SSEEvent("data: partial")]
+    assert parser.flush() == []
+
+
+def test_unterminated_event_is_bounded() -> None:
+    parser = IncrementalSSEParser(max_buffer_bytes=64)
+
+    for _ in range(10):
+        assert parser.feed(b"x" * 50) == []
+        assert parser.buffered_bytes <= 64
+
+    assert parser.feed(b"\n\ndata: ok\n\n")[-1] == SSEEvent("data: ok\n\n")
+
+
+@pytest.mark.asyncio
+async def test_async_stream_flushes_tail_before_error() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"data: one\n\ndata: tw"
+        raise ConnectionError("lost")
+
+    received: list[str] = []
+    with pytest.raises(ConnectionError):
+        async for event in aiter_sse_events(chunks()):
+            received.append(event.raw)
+
+    assert received == ["data: one\n\n", "data: tw"]
@@ -12,8 +12,10 @@ from src.core.app.controllers.diagnostics_controller import (
     GlobalActivityInfo,
     get_activity,
     get_diagnostics,
+    get_metrics,
 )
 from src.core.domain.connection_activity import ConnectionType
+from src.core.services import metrics_service
 from src.core.services.connection_activity_tracker import (
     ConnectionActivityTracker,
     reset_activity_tracker,
@@ -187,6 +189,23 @@ class TestActivityEndpointDirect:
             assert result.total_bytes_tx == 0
 
 
+class TestMetricsEndpoint:
+    """Tests for the Prometheus metrics endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_get_metrics_renders_prometheus_text(self) -> None:
+        """Test get_metrics returns the text exposition of the registry."""
+        metrics_service.reset()
+        metrics_service.inc("diagnostics.test.counter", by=2)
+        try:
+            response = await get_metrics()
+        finally:
+            metrics_service.reset()
+
+        assert response.media_type.startswith("text/plain; version=0.0.4")
+        assert b"llm_proxy_diagnostics_test_counter_total 2" in response.body
+
+
 class TestRoutingDiagnostics:
     @pytest.mark.asyncio
     async def test_get_diagnostics_includes_routing_eligibility_metadata(self) -> None:
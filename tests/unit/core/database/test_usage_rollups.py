@@ -0,0 +1,259 @@
+"""Tests for the usage statistics rollups maintained by UsageRecordRepository."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from src.core.database.config import DatabaseConfig
+from src.core.database.engine import DatabaseEngine
+from src.core.database.models.usage import UsageRollupHourTable, UsageRollupMinuteTable
+from src.core.database.repositories.usage_repository import UsageRecordRepository
+from src.core.database.repositories.usage_rollups import plan_rollup_query
+from src.core.domain.statistics_filter import StatisticsFilter
+from src.core.domain.traffic_leg import TrafficLeg
+from src.core.domain.usage_record import UsageRecord
+from src.core.domain.usage_sketches import DistinctCountSketch, LatencySketch
+
+BASE = datetime(2024, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+
+# Averages differ in float rounding; percentiles only exist on rollups
+_APPROXIMATE_FIELDS = {
+    "avg_ttft",
+    "avg_proxy_processing",
+    "avg_duration",
+    "p50_ttft",
+    "p95_ttft",
+    "p99_ttft",
+    "p50_proxy_processing",
+    "p95_proxy_processing",
+    "p99_proxy_processing",
+}
+
+
+def _record(index: int, **overrides: object) -> UsageRecord:
+    values: dict = {
+        "id": f"rec-{index}",
+        "timestamp": BASE + timedelta(seconds=37 * index),
+        "session_id": f"session-{index % 7}",
+        "turn_number": 1 + index % 3,
+        "backend_type": "openai" if index % 2 else "anthropic",
+        "backend_instance_id": "openai.1" if index % 4 == 1 else None,
+        "model": "gpt-4" if index % 3 else "claude",
+        "frontend_type": "openai" if index % 5 else "anthropic",
+        "leg": TrafficLeg.PROXY_TO_BACKEND,
+        "mutated_prompt_tokens": 10 * index,
+        "mutated_completion_tokens": 3 * index,
+        "total_tokens": 13 * index,
+        "http_status_code": 500 if index % 11 == 0 else 200,
+        "tool_call_count": index % 2,
+        "ttft_ms": None if index % 6 == 0 else 50.0 + index,
+        "proxy_processing_ms": 2.0 + index % 9,
+        "total_duration_ms": 400.0 + 3 * index,
+        "proxy_user": "alice" if index % 2 else "bob",
+    }
+    values.update(overrides)
+    return UsageRecord(**values)
+
+
+@pytest.fixture
+async def engine() -> DatabaseEngine:
+    engine = DatabaseEngine(DatabaseConfig(url="sqlite+aiosqlite:///:memory:"))
+    await engine.initialize()
+    yield engine
+    await engine.close()
+
+
+@pytest.fixture
+def repository(engine: DatabaseEngine) -> UsageRecordRepository:
+    return UsageRecordRepository(engine)
+
+
+@pytest.fixture
+def raw_repository(engine: DatabaseEngine) -> UsageRecordRepository:
+    """Repository that treats every record as predating the rollups."""
+    repository = UsageRecordRepository(engine)
+    repository._covered_since = datetime(9999, 1, 1, tzinfo=timezone.utc)
+    return repository
+
+
+async def _assert_matches_raw(
+    repository: UsageRecordRepository,
+    raw_repository: UsageRecordRepository,
+    filters: StatisticsFilter | None,
+) -> None:
+    stats = await repository.get_aggregated_stats(filters)
+    expected = await raw_repository.get_aggregated_stats(filters)
+    assert stats.model_dump(exclude=_APPROXIMATE_FIELDS) == expected.model_dump(
+        exclude=_APPROXIMATE_FIELDS
+    )
+    for name in ("avg_ttft", "avg_proxy_processing", "avg_duration"):
+        assert getattr(stats, name) == pytest.approx(getattr(expected, name))
+    assert await repository.get_status_code_breakdown(
+        filters
+    ) == await raw_repository.get_status_code_breakdown(filters)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        None,
+        StatisticsFilter(model="gpt-4"),
+        StatisticsFilter(backend_type="openai", proxy_user="alice"),
+        StatisticsFilter(http_status_code=500),
+        StatisticsFilter(
+            start_date=BASE + timedelta(seconds=95),
+            end_date=BASE + timedelta(hours=1, minutes=7, seconds=12),
+        ),
+        StatisticsFilter(
+            start_date=BASE + timedelta(minutes=3),
+            end_date=BASE + timedelta(minutes=3, seconds=40),
+        ),
+    ],
+)
+async def test_rollups_match_raw_aggregation(
+    repository: UsageRecordRepository,
+    raw_repository: UsageRecordRepository,
+    filters: StatisticsFilter | None,
+) -> None:
+    await repository.batch_insert([_record(index) for index in range(150)])
+
+    await _assert_matches_raw(repository, raw_repository, filters)
+
+
+async def test_updates_move_contributions(
+    repository: UsageRecordRepository, raw_repository: UsageRecordRepository
+) -> None:
+    pending = [
+        _record(index, http_status_code=None, ttft_ms=None, total_tokens=0)
+        for index in range(20)
+    ]
+    await repository.batch_insert(pending)
+    await repository.batch_update([_record(index) for index in range(20)])
+
+    await _assert_matches_raw(repository, raw_repository, None)
+    stats = await repository.get_aggregated_stats()
+    assert stats.response_count == 20
+
+
+async def test_percentiles_and_unique_sessions(
+    repository: UsageRecordRepository,
+) -> None:
+    records = [_record(index) for index in range(150)]
+    await repository.batch_insert(records)
+
+    stats = await repository.get_aggregated_stats()
+
+    ttfts = sorted(r.ttft_ms for r in records if r.ttft_ms is not None)
+    assert stats.p50_ttft == pytest.approx(ttfts[len(ttfts) // 2], rel=0.02)
+    assert stats.p99_ttft == pytest.approx(ttfts[int(len(ttfts) * 0.99)], rel=0.02)
+    assert stats.p95_proxy_processing is not None
+    assert stats.unique_sessions == 7
+
+
+async def test_usage_stats_by_frontend_and_backend(
+    repository: UsageRecordRepository,
+) -> None:
+    records = [_record(index) for index in range(60)]
+    await repository.batch_insert(records)
+
+    frontends = await repository.get_frontend_stats()
+    backends = await repository.get_backend_instance_stats(
+        StatisticsFilter(model="gpt-4")
+    )
+
+    openai_frontend = [r for r in records if r.frontend_type == "openai"]
+    assert frontends["openai"].total_requests == len(openai_frontend)
+    assert frontends["openai"].successful_requests == sum(
+        1 for r in openai_frontend if r.http_status_code == 200
+    )
+    assert frontends["openai"].tokens_sent == sum(
+        r.mutated_prompt_tokens for r in openai_frontend
+    )
+    instance = [r for r in records if r.model == "gpt-4" and r.backend_instance_id]
+    assert backends["openai.1"].total_requests == len(instance)
+
+
+async def test_existing_records_are_queried_raw_until_rebuilt(
+    engine: DatabaseEngine,
+) -> None:
+    legacy = UsageRecordRepository(engine)
+    legacy._covered_since = datetime(9999, 1, 1, tzinfo=timezone.utc)
+    await legacy.batch_insert([_record(index) for index in range(30)])
+
+    repository = UsageRecordRepository(engine)
+    await repository.batch_insert([_record(100)])
+    assert repository._covered_since == BASE + timedelta(hours=1)
+    assert (await repository.get_aggregated_stats()).request_count == 31
+    assert (await repository.get_aggregated_stats()).p50_ttft is None
+
+    assert await repository.rebuild_rollups() == 31
+    stats = await repository.get_aggregated_stats()
+    assert stats.request_count == 31
+    assert stats.p50_ttft is not None
+
+
+async def test_delete_older_than_trims_rollups(
+    engine: DatabaseEngine,
+    repository: UsageRecordRepository,
+    raw_repository: UsageRecordRepository,
+) -> None:
+    await repository.batch_insert([_record(index) for index in range(200)])
+
+    await repository.delete_older_than(BASE + timedelta(minutes=75, seconds=20))
+
+    await _assert_matches_raw(repository, raw_repository, None)
+    async with engine.session() as session:
+        oldest_minute = await session.scalar(
+            select(func.min(UsageRollupMinuteTable.bucket_start))
+        )
+        oldest_hour = await session.scalar(
+            select(func.min(UsageRollupHourTable.bucket_start))
+        )
+    assert oldest_minute == BASE + timedelta(minutes=75)
+    assert oldest_hour == BASE + timedelta(hours=1)
+
+
+def test_plan_splits_range_into_hours_minutes_and_raw_edges() -> None:
+    def at(hour: int, minute: int = 0, second: int = 0) -> datetime:
+        return datetime(2024, 1, 1, hour, minute, second, tzinfo=timezone.utc)
+
+    start, end = at(9, 58, 30), at(12, 1, 15)
+
+    plan = plan_rollup_query(start, end, None)
+
+    assert plan is not None
+    assert plan.rollup_segments == (
+        (UsageRollupHourTable, at(10), at(12)),
+        (UsageRollupMinuteTable, at(9, 59), at(10)),
+        (UsageRollupMinuteTable, at(12), at(12, 1)),
+    )
+    assert plan.raw_segments == (
+        (start, at(9, 59)),
+        (at(12, 1), end + timedelta(microseconds=1)),
+    )
+    assert plan_rollup_query(start, end, at(10)) is None
+    assert plan_rollup_query(None, None, None).raw_segments == ()
+
+
+def test_latency_sketch_merge_and_remove() -> None:
+    first, second = LatencySketch(), LatencySketch()
+    for value in range(1, 101):
+        (first if value % 2 else second).add(float(value))
+    first.merge(LatencySketch.from_json(second.to_json()))
+    assert first.count == 100
+    assert first.quantile(0.5) == pytest.approx(51, rel=0.01)
+
+    for value in range(51, 101):
+        first.remove(float(value))
+    assert first.quantile(0.99) == pytest.approx(50, rel=0.01)
+
+
+def test_distinct_count_sketch_merges_by_register_maximum() -> None:
+    first, second = DistinctCountSketch(), DistinctCountSketch()
+    for index in range(3000):
+        (first if index % 2 else second).add(f"session-{index}")
+        first.add(f"session-{index % 10}")
+    first.merge(DistinctCountSketch.from_json(second.to_json()))
+    assert first.estimate() == pytest.approx(3000, rel=0.05)
@@ -13,7 +13,7 @@ from src.core.domain.configuration.loop_detection_config import (
     LoopDetectionConfiguration,
 )
 from src.core.domain.configuration.reasoning_config import ReasoningConfiguration
-from src.core.domain.session import Session, SessionState
+from src.core.domain.session import Session, SessionInteraction, SessionState
 from src.core.repositories.session_repository import PersistentSessionRepository
 
 
@@ -339,3 +339,146 @@ class TestPersistentSessionRepository:
         # Delete session
         await repository.delete(sample_session.session_id)
         assert len(repository._memory_repo._sessions) == initial_memory_sessions
+
+
+class TestPersistentSessionRepositoryWithStore:
+    """Tests for the durable SQLite-backed behaviour."""
+
+    @pytest.fixture
+    def storage_path(self, tmp_path) -> str:
+        return str(tmp_path / "sessions.sqlite3")
+
+    @staticmethod
+    def _make_session(session_id: str, user_id: str | None = None) -> Session:
+        state = SessionState(
+            backend_config=BackendConfiguration(backend_type="openai", model="gpt-4"),
+            project="proj",
+        )
+        return Session(session_id=session_id, state=state, user_id=user_id)
+
+    @pytest.mark.asyncio
+    async def test_sessions_survive_restart(self, storage_path: str) -> None:
+        repository = PersistentSessionRepository(storage_path)
+        session = self._make_session("s-1", user_id="u-1")
+        session.add_interaction(SessionInteraction(prompt="hi", handler="backend"))
+        await repository.add(session)
+        await repository.update_fingerprint("s-1", "fp-1")
+        await repository.update_client_session("s-1", "client-1")
+        await repository.dispose()
+
+        restarted = PersistentSessionRepository(storage_path)
+        restored = await restarted.get_by_id("s-1")
+
+        assert restored is not None
+        assert restored.user_id == "u-1"
+        assert restored.state.project == "proj"
+        assert restored.state.backend_config.model == "gpt-4"
+        assert [h.prompt for h in restored.history] == ["hi"]
+        assert await restarted.get_session_fingerprint("s-1") == "fp-1"
+        found = await restarted.find_by_client_and_fingerprint("client-1", "fp-1")
+        assert found is restored
+        await restarted.dispose()
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced_until_flush(self, storage_path: str) -> None:
+        repository = PersistentSessionRepository(
+            storage_path, flush_interval_seconds=60.0
+        )
+        session = self._make_session("s-1")
+        await repository.add(session)
+        await repository.update(session)
+        await repository.update_fingerprint("s-1", "fp")
+
+        assert list(repository._pending) == ["s-1"]
+        assert repository._store is not None
+        assert repository._store.load_many(["s-1"]) == {}
+
+        await repository.flush()
+
+        assert repository._pending == {}
+        assert "s-1" in repository._store.load_many(["s-1"])
+        await repository.dispose()
+
+    @pytest.mark.asyncio
+    async def test_evicted_sessions_are_restored_from_store(
+        self, storage_path: str
+    ) -> None:
+        repository = PersistentSessionRepository(storage_path, hot_cache_size=2)
+        for index in range(4):
+            await repository.add(self._make_session(f"s-{index}"))
+        await repository.flush()
+
+        assert len(repository._memory_repo._sessions) <= 2
+        for index in range(4):
+            restored = await repository.get_by_id(f"s-{index}")
+            assert restored is not None
+            assert restored.session_id == f"s-{index}"
+        assert len(await repository.get_all()) == 4
+        await repository.dispose()
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_bundle_round_trips(self, storage_path: str) -> None:
+        from src.core.services.conversation_fingerprint_service import (
+            ConversationFingerprint,
+            ConversationFingerprintBundle,
+        )
+
+        bundle = ConversationFingerprintBundle(
+            primary=ConversationFingerprint("abc", 3, "user"),
+            rolling_fingerprints=frozenset({"r1", "r2"}),
+            topic_tokens=frozenset({"alpha", "beta"}),
+            topic_hash="th",
+            last_user_hash="lu",
+            message_count=3,
+        )
+        repository = PersistentSessionRepository(storage_path)
+        await repository.add(self._make_session("s-1"))
+        await repository.update_fingerprint_bundle("s-1", bundle)
+        await repository.dispose()
+
+        restarted = PersistentSessionRepository(storage_path)
+        assert await restarted.get_fingerprint_bundle("s-1") == bundle
+        await restarted.dispose()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_from_store(self, storage_path: str) -> None:
+        repository = PersistentSessionRepository(storage_path)
+        await repository.add(self._make_session("s-1"))
+        await repository.flush()
+
+        assert await repository.delete("s-1") is True
+        await repository.dispose()
+
+        restarted = PersistentSessionRepository(storage_path)
+        assert await restarted.get_by_id("s-1") is None
+        await restarted.dispose()
+
+    @pytest.mark.asyncio
+    async def test_find_recent_sessions_by_client_includes_stored(
+        self, storage_path: str
+    ) -> None:
+        repository = PersistentSessionRepository(storage_path)
+        await repository.add(self._make_session("s-1"))
+        await repository.update_client_session("s-1", "client-1")
+        await repository.dispose()
+
+        restarted = PersistentSessionRepository(storage_path)
+        recent = await restarted.find_recent_sessions_by_client("client-1", 3600)
+
+        assert [session.session_id for session in recent] == ["s-1"]
+        await restarted.dispose()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expired_removes_stored_sessions(
+        self, storage_path: str
+    ) -> None:
+        repository = PersistentSessionRepository(storage_path)
+        stale = self._make_session("stale")
+        stale.last_active_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        await repository.add(stale)
+        await repository.dispose()
+
+        restarted = PersistentSessionRepository(storage_path)
+        assert await restarted.cleanup_expired(3600) == 1
+        assert await restarted.get_by_id("stale") is None
+        await restarted.dispose()
@@ -0,0 +1,85 @@
+"""Tests for the SQLite session store."""
+
+from pathlib import Path
+
+from src.core.interfaces.session_store_interface import StoredSessionRecord
+from src.core.repositories.sqlite_session_store import (
+    SqliteSessionStore,
+    resolve_session_store_path,
+)
+
+
+def _store(tmp_path: Path) -> SqliteSessionStore:
+    return SqliteSessionStore(tmp_path / "sessions.sqlite3")
+
+
+def test_resolve_session_store_path_accepts_file_or_directory() -> None:
+    assert resolve_session_store_path("var/s.sqlite3") == Path("var/s.sqlite3")
+    assert resolve_session_store_path("var/state") == Path("var/state/sessions.sqlite3")
+
+
+def test_save_and_load_many_round_trip(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save_many(
+        [
+            StoredSessionRecord("a", 1.0, payload="{}", client_key="c"),
+            StoredSessionRecord("b", 2.0, payload="{}", user_id="u"),
+        ]
+    )
+
+    records = store.load_many(["a", "b", "missing"])
+
+    assert set(records) == {"a", "b"}
+    assert records["a"].client_key == "c"
+    assert records["b"].user_id == "u"
+    store.close()
+
+
+def test_partial_upsert_keeps_existing_columns(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save_many(
+        [StoredSessionRecord("a", 1.0, payload="{}", fingerprint="fp", client_key="c")]
+    )
+    store.save_many([StoredSessionRecord("a", 5.0, user_id="u")])
+
+    record = store.load_many(["a"])["a"]
+
+    assert record.payload == "{}"
+    assert record.fingerprint == "fp"
+    assert record.client_key == "c"
+    assert record.user_id == "u"
+    assert record.last_access == 5.0
+    store.close()
+
+
+def test_client_and_fingerprint_queries(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save_many(
+        [
+            StoredSessionRecord("old", 1.0, client_key="c", fingerprint="fp"),
+            StoredSessionRecord("new", 9.0, client_key="c", fingerprint="fp"),
+            StoredSessionRecord("other", 9.0, client_key="d"),
+        ]
+    )
+
+    assert store.find_session_ids_by_client("c") == ["new", "old"]
+    assert store.find_session_ids_by_client("c", min_last_access=5.0) == ["new"]
+    assert store.find_session_id_by_client_and_fingerprint("c", "fp") == "new"
+    assert store.find_session_id_by_client_and_fingerprint("d", "fp") is None
+    store.close()
+
+
+def test_delete_many_and_inactive(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save_many(
+        [
+            StoredSessionRecord("a", 1.0, last_active_at=1.0),
+            StoredSessionRecord("b", 10.0, last_active_at=10.0),
+            StoredSessionRecord("c", 10.0),
+        ]
+    )
+
+    assert store.delete_inactive_before(5.0) == ["a"]
+    assert store.delete_many(["b", "missing"]) == 1
+    assert store.list_session_ids() == ["c"]
+    store.close()
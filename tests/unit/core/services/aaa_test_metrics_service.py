@@ -4,6 +4,7 @@ Unit tests for the metrics service.
 
 from __future__ import annotations
 
+import threading
 import time
 
 import pytest
@@ -15,10 +16,7 @@ class TestMetricsService:
 
     def setup_method(self):
         """Reset metrics before each test."""
-        # Clear counters and timers
-        with metrics_service._lock:
-            metrics_service._counters.clear()
-            metrics_service._timers.clear()
+        metrics_service.reset()
 
     def test_counter_increment(self):
         """Test basic counter increment functionality."""
@@ -130,3 +128,117 @@ class TestMetricsService:
 
         # Should not log anything when there's no data
         assert len(caplog.records) == 0
+
+    def test_counters_and_timers_merge_across_threads(self):
+        """Test that per-thread shards are summed, including exited threads."""
+        barrier = threading.Barrier(4)
+
+        def worker() -> None:
+            barrier.wait()
+            for _ in range(1000):
+                metrics_service.inc("threaded.counter")
+                metrics_service.record_duration("threaded.timer", 0.01)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics_service.inc("threaded.counter", by=3)
+
+        assert metrics_service.get("threaded.counter") == 4003
+        assert metrics_service.snapshot()["threaded.counter"] == 4003
+        stats = metrics_service.get_timer_stats("threaded.timer")
+        assert stats.count == 4000
+        assert stats.total == pytest.approx(40.0)
+
+    def test_timer_quantiles(self):
+        """Test histogram quantiles stay within the bucket resolution."""
+        for i in range(1, 1001):
+            metrics_service.record_duration("latency", i / 1000)
+
+        stats = metrics_service.get_timer_stats("latency")
+        assert stats.min == 0.001
+        assert stats.max == 1.0
+        assert stats.p50 == pytest.approx(0.5, rel=0.04)
+        assert stats.p90 == pytest.approx(0.9, rel=0.04)
+        assert stats.p99 == pytest.approx(0.99, rel=0.04)
+        assert stats.min <= stats.p50 <= stats.p90 <= stats.p99 <= stats.max
+
+    def test_timer_quantiles_with_zero_durations(self):
+        """Test that zero durations do not break the histogram."""
+        metrics_service.record_duration("fast", 0.0)
+        metrics_service.record_duration("fast", 0.0)
+        metrics_service.record_duration("fast", 2.0)
+
+        stats = metrics_service.get_timer_stats("fast")
+        assert stats.p50 == 0.0
+        assert stats.p99 == 2.0
+
+    def test_reset(self):
+        """Test that reset discards counters and timers."""
+        metrics_service.inc("reset.counter")
+        metrics_service.set_gauge("reset.gauge", 3)
+        metrics_service.record_duration("reset.timer", 0.1)
+
+        metrics_service.reset()
+
+        assert metrics_service.snapshot() == {}
+        assert metrics_service.get_gauge("reset.gauge") == 0.0
+        assert metrics_service.get_all_timer_stats() == {}
+
+    def test_eviction_keeps_recently_updated_metrics(self, monkeypatch):
+        """Test that full maps evict the least recently updated metric."""
+        monkeypatch.setattr(metrics_service, "_MAX_METRICS", 3)
+        metrics_service.inc("hot")
+        metrics_service.record_duration("hot.timer", 0.1)
+        for name in ("a", "b", "c", "d"):
+            metrics_service.inc("hot")
+            metrics_service.inc(name)
+            metrics_service.record_duration("hot.timer", 0.1)
+            metrics_service.record_duration(f"{name}.timer", 0.1)
+
+        assert metrics_service.get("hot") == 5
+        assert metrics_service.get("a") == 0
+        assert metrics_service.get("d") == 1
+        assert metrics_service.get_timer_stats("hot.timer").count == 5
+        assert metrics_service.get_timer_stats("a.timer").count == 0
+
+    def test_gauge_keeps_last_value(self):
+        """Test that a gauge reports the last value set from any thread."""
+        metrics_service.set_gauge("queue.depth", 4)
+        thread = threading.Thread(
+            target=metrics_service.set_gauge, args=("queue.depth", 2)
+        )
+        thread.start()
+        thread.join()
+
+        assert metrics_service.get_gauge("queue.depth") == 2
+        assert metrics_service.get_gauge("missing.gauge") == 0.0
+
+    def test_render_prometheus(self):
+        """Test the Prometheus text exposition output."""
+        metrics_service.inc("tool_call.messages.processed", by=5)
+        metrics_service.set_gauge("memory.analysis.queue_depth", 3)
+        metrics_service.record_duration("stream.ttft", 0.25)
+        metrics_service.record_duration("stream.ttft", 0.75)
+
+        text = metrics_service.render_prometheus()
+        lines = text.splitlines()
+
+        assert "# TYPE llm_proxy_tool_call_messages_processed_total counter" in lines
+        assert "llm_proxy_tool_call_messages_processed_total 5" in lines
+        assert "# TYPE llm_proxy_memory_analysis_queue_depth gauge" in lines
+        assert "llm_proxy_memory_analysis_queue_depth 3.0" in lines
+        assert "# TYPE llm_proxy_stream_ttft_seconds summary" in lines
+        assert any(
+            line.startswith('llm_proxy_stream_ttft_seconds{quantile="0.99"} ')
+            for line in lines
+        )
+        assert "llm_proxy_stream_ttft_seconds_sum 1.0" in lines
+        assert "llm_proxy_stream_ttft_seconds_count 2" in lines
+        assert text.endswith("\n")
+
+    def test_render_prometheus_empty(self):
+        """Test the exposition is empty without metrics."""
+        assert metrics_service.render_prometheus() == ""
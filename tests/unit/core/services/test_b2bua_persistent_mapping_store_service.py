@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -150,3 +151,184 @@ async def test_persistent_store_respects_expiration_across_restart(
     assert first.a_session_id == "a-1"
     assert second.a_session_id == "a-2"
     assert second.reused_existing is False
+
+
+def _make_unswept_store(
+    path: Path, *, clock: _MutableClock, max_entries: int = 1_000
+) -> PersistentB2buaMappingStore:
+    return PersistentB2buaMappingStore(
+        database_path=path,
+        continuity_ttl_seconds=10,
+        sliding_expiration=True,
+        max_entries=max_entries,
+        time_provider=clock,
+        sweep_interval_seconds=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_reuses_wal_connection_per_thread(
+    tmp_path: Path,
+) -> None:
+    clock = _MutableClock(initial=0.0)
+    store = _make_unswept_store(tmp_path / "b2bua-pool.sqlite3", clock=clock)
+    try:
+        resolution = await store.resolve_or_create_a_session_id(
+            auth_scope_id="token-1",
+            client_session_id="client-1",
+            create_a_session_id=_sequenced_factory(),
+        )
+        conn = store._connections.get()
+        await store.allocate_next_b_seq(resolution.a_session_id)
+
+        assert store._connections.get() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        store.dispose()
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_allocate_attempt_is_atomic(tmp_path: Path) -> None:
+    clock = _MutableClock(initial=0.0)
+    store = _make_unswept_store(tmp_path / "b2bua-batch.sqlite3", clock=clock)
+    try:
+        resolution = await store.resolve_or_create_a_session_id(
+            auth_scope_id="token-1",
+            client_session_id="client-1",
+            create_a_session_id=_sequenced_factory(),
+        )
+        first = await store.allocate_attempt(
+            a_session_id=resolution.a_session_id,
+            create_b_session_id=lambda seq: f"b-{seq}",
+            backend_type="openai",
+            effective_model="gpt-4.1",
+            reason="primary-attempt",
+        )
+        # A duplicate B-leg id fails the insert and must roll back the sequence.
+        with pytest.raises(sqlite3.IntegrityError):
+            await store.allocate_attempt(
+                a_session_id=resolution.a_session_id,
+                create_b_session_id=lambda _seq: "b-1",
+                backend_type=None,
+                effective_model=None,
+                reason=None,
+            )
+        second = await store.allocate_attempt(
+            a_session_id=resolution.a_session_id,
+            create_b_session_id=lambda seq: f"b-{seq}",
+            backend_type="openrouter",
+            effective_model=None,
+            reason="failover-attempt",
+        )
+
+        assert (first.seq, second.seq) == (1, 2)
+        records = await store.get_attempt_records(resolution.a_session_id)
+        assert [r.b_session_id for r in records] == ["b-1", "b-2"]
+        assert records[0].backend_type == "openai"
+        with pytest.raises(KeyError):
+            await store.allocate_attempt(
+                a_session_id="unknown",
+                create_b_session_id=lambda seq: f"b-{seq}",
+                backend_type=None,
+                effective_model=None,
+                reason=None,
+            )
+    finally:
+        store.dispose()
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_ignores_expired_mappings_before_sweep(
+    tmp_path: Path,
+) -> None:
+    clock = _MutableClock(initial=0.0)
+    store = _make_unswept_store(tmp_path / "b2bua-expiry.sqlite3", clock=clock)
+    factory = _sequenced_factory()
+    try:
+        first = await store.resolve_or_create_a_session_id(
+            auth_scope_id="token-1",
+            client_session_id="client-1",
+            create_a_session_id=factory,
+        )
+        await store.allocate_attempt(
+            a_session_id=first.a_session_id,
+            create_b_session_id=lambda seq: f"b-{seq}",
+            backend_type=None,
+            effective_model=None,
+            reason=None,
+        )
+        clock.advance(11)
+
+        assert await store.get_attempt_records(first.a_session_id) == []
+        with pytest.raises(KeyError):
+            await store.allocate_next_b_seq(first.a_session_id)
+        assert (
+            await store.try_resolve_echoed_a_session_id(
+                a_session_id=first.a_session_id,
+                requesting_auth_scope_id="token-1",
+            )
+            is None
+        )
+        second = await store.resolve_or_create_a_session_id(
+            auth_scope_id="token-1",
+            client_session_id="client-1",
+            create_a_session_id=factory,
+        )
+        assert second == B2buaContinuityResolution(
+            a_session_id="a-2", reused_existing=False, had_store_error=False
+        )
+    finally:
+        store.dispose()
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_sweep_expires_and_evicts(tmp_path: Path) -> None:
+    clock = _MutableClock(initial=0.0)
+    store = _make_unswept_store(
+        tmp_path / "b2bua-sweep.sqlite3", clock=clock, max_entries=2
+    )
+    factory = _sequenced_factory()
+    try:
+        for i in range(2):
+            await store.resolve_or_create_a_session_id(
+                auth_scope_id="token-1",
+                client_session_id=f"stale-{i}",
+                create_a_session_id=factory,
+            )
+        clock.advance(11)
+        for i in range(3):
+            clock.advance(1)
+            await store.resolve_or_create_a_session_id(
+                auth_scope_id="token-1",
+                client_session_id=f"live-{i}",
+                create_a_session_id=factory,
+            )
+
+        assert store.sweep() == 3
+        assert store.sweep() == 0
+
+        rows = (
+            store._connections.get()
+            .execute(
+                "SELECT client_session_id FROM b2bua_mappings"
+                " ORDER BY client_session_id"
+            )
+            .fetchall()
+        )
+        assert [row[0] for row in rows] == ["live-1", "live-2"]
+    finally:
+        store.dispose()
+
+
+def test_persistent_store_dispose_stops_sweeper(tmp_path: Path) -> None:
+    store = PersistentB2buaMappingStore(
+        database_path=tmp_path / "b2bua-dispose.sqlite3",
+        sweep_interval_seconds=60,
+    )
+    sweeper = store._sweeper
+    assert sweeper is not None and sweeper.is_alive()
+
+    store.dispose()
+
+    assert not sweeper.is_alive()
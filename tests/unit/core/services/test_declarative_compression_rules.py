@@ -524,11 +524,11 @@ async def test_builtin_declarative_rule_applies_when_no_code_rule_matches() -> N
 @pytest.mark.asyncio
 async def test_declarative_non_match_stage_timeout_fails_open(monkeypatch) -> None:
     class _TimeoutWorkerResult:
-        stdout = ""
+        results = ()
         timed_out = True
 
-    def _always_timeout_worker(self, *, snippet, payload):
-        del self, snippet, payload
+    def _always_timeout_worker(self, *, ops):
+        del self, ops
         return _TimeoutWorkerResult()
 
     monkeypatch.setattr(
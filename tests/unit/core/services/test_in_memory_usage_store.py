@@ -0,0 +1,195 @@
+"""Tests for InMemoryUsageStore indexes and its append-only record log."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from src.core.domain.statistics_filter import StatisticsFilter
+from src.core.domain.traffic_leg import TrafficLeg
+from src.core.domain.usage_record import UsageRecord
+from src.core.services.in_memory_usage_store import InMemoryUsageStore
+
+BASE = datetime(2024, 1, 1, 10, 0, 0)
+
+
+def _record(index: int, **overrides: object) -> UsageRecord:
+    values: dict = {
+        "id": f"rec-{index}",
+        "timestamp": BASE + timedelta(seconds=(index * 37) % 600),
+        "session_id": f"session-{index % 5}",
+        "turn_number": 1,
+        "backend_type": "openai" if index % 2 else "anthropic",
+        "model": "gpt-4" if index % 3 else "claude",
+        "frontend_type": "openai",
+        "leg": TrafficLeg.PROXY_TO_BACKEND,
+        "http_status_code": 200,
+        "total_tokens": index,
+    }
+    values.update(overrides)
+    return UsageRecord(**values)
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> InMemoryUsageStore:
+    return InMemoryUsageStore(persistence_path=tmp_path / "usage.json")
+
+
+def _scan(
+    store: InMemoryUsageStore, filters: StatisticsFilter | None
+) -> list[UsageRecord]:
+    return [r for r in store._records.values() if filters is None or filters.matches(r)]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        None,
+        StatisticsFilter(backend_type="openai"),
+        StatisticsFilter(model="claude", http_status_code=200),
+        StatisticsFilter(start_date=BASE + timedelta(minutes=8)),
+        StatisticsFilter(
+            backend_type="anthropic",
+            start_date=BASE + timedelta(minutes=2),
+            end_date=BASE + timedelta(minutes=4),
+        ),
+        StatisticsFilter(backend_type="missing"),
+    ],
+)
+def test_indexed_queries_match_full_scan(
+    store: InMemoryUsageStore, filters: StatisticsFilter | None
+) -> None:
+    for index in range(200):
+        store.add_record(_record(index))
+    store.update_record(_record(7, backend_type="anthropic", model="claude"))
+
+    assert store.get_records(filters) == _scan(store, filters)
+
+
+def test_session_lookup_and_eviction_keep_indexes_in_sync(tmp_path: Path) -> None:
+    store = InMemoryUsageStore(
+        persistence_path=tmp_path / "usage.json", max_records_in_memory=50
+    )
+    for index in range(120):
+        store.add_record(_record(index))
+
+    session_records = store.get_records(session_id="session-3")
+    assert [r.id for r in session_records] == [
+        f"rec-{index}" for index in range(70, 120) if index % 5 == 3
+    ]
+    late = StatisticsFilter(start_date=BASE + timedelta(minutes=9))
+    assert store.get_records(late) == _scan(store, late)
+
+    store.clear()
+    assert store.get_records(StatisticsFilter(backend_type="openai")) == []
+
+
+def test_mixed_timezone_records_are_not_dropped_by_range_index(
+    store: InMemoryUsageStore,
+) -> None:
+    store.add_record(_record(1))
+    store.add_record(_record(2, timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc)))
+    for index in range(3, 10):
+        store.add_record(_record(index, backend_type="other"))
+
+    aware = StatisticsFilter(
+        backend_type="other",
+        start_date=datetime(2023, 12, 31, tzinfo=timezone.utc),
+    )
+    with pytest.raises(TypeError):
+        store.get_records(aware)
+
+
+def test_flush_appends_changes_and_reload_replays_log(tmp_path: Path) -> None:
+    path = tmp_path / "usage.json"
+    store = InMemoryUsageStore(persistence_path=path)
+    for index in range(10):
+        store.add_record(_record(index))
+    store.flush_to_disk()
+    assert json.loads(path.read_text())["record_count"] == 10
+
+    store.add_record(_record(10))
+    store.update_record(_record(3, total_tokens=999))
+    store.flush_to_disk()
+
+    segments = sorted((tmp_path / "usage.json.segments").glob("*.jsonl"))
+    assert len(segments) == 1
+    assert len(segments[0].read_text().splitlines()) == 2
+    assert json.loads(path.read_text())["record_count"] == 10
+
+    reloaded = InMemoryUsageStore(persistence_path=path)
+    reloaded.load_from_disk()
+    assert [r.id for r in reloaded.get_records()] == [r.id for r in store.get_records()]
+    assert reloaded.get_record_by_id("rec-3").total_tokens == 999
+    assert not reloaded.is_dirty()
+
+
+def test_segments_rotate_and_compact_into_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "usage.json"
+    store = InMemoryUsageStore(
+        persistence_path=path, segment_max_bytes=1, max_segments=3
+    )
+    store.flush_to_disk()
+    store.add_record(_record(0))
+    store.flush_to_disk()
+
+    for index in range(1, 4):
+        store.add_record(_record(index))
+        store.flush_to_disk()
+    segment_dir = tmp_path / "usage.json.segments"
+    assert len(list(segment_dir.glob("*.jsonl"))) == 3
+
+    store.add_record(_record(4))
+    store.flush_to_disk()
+    snapshot = json.loads(path.read_text())
+    assert snapshot["record_count"] == 5
+    assert list(segment_dir.glob("*.jsonl")) == []
+
+    reloaded = InMemoryUsageStore(persistence_path=path)
+    reloaded.load_from_disk()
+    assert reloaded.get_record_count() == 5
+
+
+def test_load_skips_torn_last_line_and_reads_legacy_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "usage.json"
+    legacy = {
+        "version": 1,
+        "last_flush": BASE.isoformat(),
+        "record_count": 2,
+        "records": [_record(0).to_dict(), _record(1).to_dict()],
+    }
+    path.write_text(json.dumps(legacy, indent=2))
+    segment_dir = tmp_path / "usage.json.segments"
+    segment_dir.mkdir()
+    (segment_dir / "00000001.jsonl").write_text(
+        json.dumps(_record(2).to_dict()) + "\n" + '{"id": "rec-3", "tim'
+    )
+
+    store = InMemoryUsageStore(persistence_path=path)
+    store.load_from_disk()
+
+    assert [r.id for r in store.get_records()] == ["rec-0", "rec-1", "rec-2"]
+    store.add_record(_record(4))
+    store.flush_to_disk()
+    assert (segment_dir / "00000002.jsonl").exists()
+
+
+def test_failed_flush_keeps_changes_pending(tmp_path: Path) -> None:
+    path = tmp_path / "usage.json"
+    store = InMemoryUsageStore(persistence_path=path)
+    store.add_record(_record(0))
+    store.flush_to_disk()
+
+    store.add_record(_record(1))
+    (tmp_path / "usage.json.segments").write_text("not a directory")
+    with pytest.raises(OSError):
+        store.flush_to_disk()
+    assert store.is_dirty()
+
+    (tmp_path / "usage.json.segments").unlink()
+    store.flush_to_disk()
+    reloaded = InMemoryUsageStore(persistence_path=path)
+    reloaded.load_from_disk()
+    assert reloaded.get_record_count() == 2
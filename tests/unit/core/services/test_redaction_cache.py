@@ -5,6 +5,7 @@ Tests for RedactionCache to ensure session-level caching works correctly.
 from __future__ import annotations
 
 import pytest
+from src.core.services import redaction_cache
 from src.core.services.redaction_cache import (
     RedactionCache,
     get_global_redaction_cache,
@@ -182,6 +183,114 @@ class TestRedactionCache:
         # At least one old session should be evicted (the oldest one)
         # Note: exact eviction behavior depends on TTL and access patterns
 
+    def test_least_recently_used_session_is_evicted(self) -> None:
+        cache = RedactionCache(max_sessions=3)
+        for i in range(3):
+            cache.mark_processed(f"session{i}", f"content{i}")
+        cache.is_processed("session0", "content0")
+
+        cache.mark_processed("session3", "content3")
+
+        assert cache.session_count() == 3
+        assert not cache.has_session("session1")
+        assert cache.has_session("session0")
+
+    def test_expired_sessions_are_dropped_on_insert(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(redaction_cache.time, "time", lambda: now[0])
+        cache = RedactionCache(max_sessions=10, session_ttl_seconds=60)
+        cache.mark_processed("old1", "a")
+        cache.mark_processed("old2", "b")
+        now[0] += 30
+        cache.mark_processed("fresh", "c")
+
+        now[0] += 45
+        cache.mark_processed("new", "d")
+
+        assert not cache.has_session("old1")
+        assert not cache.has_session("old2")
+        assert cache.has_session("fresh")
+        assert cache.session_count() == 2
+
+    def test_sessions_are_spread_across_shards(self) -> None:
+        cache = RedactionCache(max_sessions=4096, session_shards=8)
+        assert len(cache._session_shards) == 8
+        for i in range(2000):
+            cache.mark_batch_processed(f"session{i}", [{"content": f"m{i}"}])
+
+        assert cache.session_count() == 2000
+        assert all(shard.states for shard in cache._session_shards)
+        assert cache.get_unprocessed_indices(
+            "session7", [{"content": "m7"}, {"content": "new"}]
+        ) == [1]
+
+    def test_small_caches_use_a_single_shard(self) -> None:
+        assert len(RedactionCache(max_sessions=3)._session_shards) == 1
+
+
+class TestRedactionResultStore:
+    """Tests for the shared, content-addressed redaction result store."""
+
+    def test_results_are_shared_across_callers(self, cache: RedactionCache) -> None:
+        calls: list[str] = []
+
+        def redact(text: str) -> str:
+            calls.append(text)
+            return text.replace("secret", "***")
+
+        assert cache.redact("my secret prompt", redact) == "my *** prompt"
+        assert cache.redact("my secret prompt", redact) == "my *** prompt"
+        assert cache.redact("plain text", redact) == "plain text"
+        assert cache.redact("plain text", redact) == "plain text"
+
+        assert calls == ["my secret prompt", "plain text"]
+        stats = cache.get_result_stats()
+        assert (stats.entries, stats.hits, stats.misses) == (2, 2, 2)
+
+    def test_namespaces_do_not_share_results(self, cache: RedactionCache) -> None:
+        assert cache.redact("abc", str.upper, namespace=b"upper") == "ABC"
+        assert cache.redact("abc", str.title, namespace=b"title") == "Abc"
+        assert cache.redact("abc", str.upper, namespace=b"upper") == "ABC"
+
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        cache = RedactionCache(max_result_bytes=4000, result_stripes=1)
+
+        def redact(text: str) -> str:
+            return text.upper()
+
+        for i in range(20):
+            cache.redact(f"{i:03d}" + "x" * 200, redact)
+
+        stats = cache.get_result_stats()
+        assert stats.bytes_used <= 4000
+        assert stats.evictions > 0
+        assert stats.entries + stats.evictions == 20
+
+        # Oldest entry was evicted and is recomputed; newest is still cached.
+        misses = stats.misses
+        cache.redact("019" + "x" * 200, redact)
+        assert cache.get_result_stats().misses == misses
+        cache.redact("000" + "x" * 200, redact)
+        assert cache.get_result_stats().misses == misses + 1
+
+    def test_oversized_results_are_not_cached(self) -> None:
+        cache = RedactionCache(max_result_bytes=1000, result_stripes=1)
+
+        assert cache.redact("y" * 5000, str.upper) == "Y" * 5000
+        assert cache.get_result_stats().entries == 0
+
+    def test_clear_session_keeps_shared_results(self, cache: RedactionCache) -> None:
+        cache.mark_processed("session1", "Hello world")
+        cache.redact("Hello world", str.upper)
+
+        cache.clear_session("session1")
+
+        assert cache.get_result_stats().entries == 1
+        cache.clear_results()
+        assert cache.get_result_stats().entries == 0
+
 
 class TestGlobalRedactionCache:
     """Tests for the global cache singleton."""
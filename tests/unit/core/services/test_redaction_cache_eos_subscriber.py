@@ -63,7 +63,7 @@ class TestRedactionCacheEosSubscriber:
             assert redaction_cache.is_processed(session_id, "test message") is False
             
             # Verify internal state is cleaned up
-            assert session_id not in redaction_cache._states
+            assert not redaction_cache.has_session(session_id)
         finally:
             await subscriber.stop()
 
@@ -0,0 +1,141 @@
+"""Tests for the persistent regex worker pool."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
+import pytest
+from src.core.domain.configuration.dynamic_compression_config import (
+    DynamicCompressionConfig,
+)
+from src.core.services.declarative_compression_rules import (
+    DeclarativeFilterPipeline,
+    DeclarativeRuleRegistry,
+)
+from src.core.services.regex_worker_pool import RegexWorkerError, RegexWorkerPool
+
+# Generous round-trip budget so loaded CI machines do not flake
+_TIMEOUT = 5.0
+
+
+@pytest.fixture
+def pool() -> Iterator[RegexWorkerPool]:
+    pool = RegexWorkerPool(size=1)
+    yield pool
+    pool.close()
+
+
+def test_batch_of_ops_is_evaluated_in_one_round_trip(pool: RegexWorkerPool) -> None:
+    results = pool.run(
+        [
+            {"op": "search", "pattern": r"err(or)?", "flags": 0, "text": "an error"},
+            {"op": "search", "pattern": r"(", "flags": 0, "text": "invalid"},
+            {
+                "op": "first_match",
+                "text": "BUILD SUCCESSFUL\nerror: x",
+                "rules": [
+                    {
+                        "pattern": "BUILD SUCCESSFUL",
+                        "flags": 0,
+                        "unless": "error:",
+                        "unless_flags": 0,
+                    },
+                    {"pattern": "build", "flags": int(re.IGNORECASE)},
+                ],
+            },
+            {
+                "op": "replace",
+                "lines": ["a1", "b22"],
+                "rules": [{"pattern": r"\d+", "flags": 0, "replacement": "#"}],
+            },
+            {
+                "op": "filter",
+                "lines": ["keep me", "drop me"],
+                "patterns": [{"pattern": "^drop", "flags": 0}],
+                "keep_matches": False,
+            },
+        ],
+        _TIMEOUT,
+    )
+
+    assert results == [True, False, 1, ["a#", "b#"], ["keep me"]]
+
+
+def test_workers_are_reused_across_requests(pool: RegexWorkerPool) -> None:
+    for _ in range(5):
+        assert pool.run(
+            [{"op": "search", "pattern": "x", "flags": 0, "text": "x"}], _TIMEOUT
+        ) == [True]
+
+    assert pool._started == 1
+
+
+def test_timed_out_worker_is_replaced(pool: RegexWorkerPool) -> None:
+    pool.warm()
+    catastrophic = {
+        "op": "search",
+        "pattern": r"(a+)+$",
+        "flags": 0,
+        "text": "a" * 30000 + "!",
+    }
+
+    with pytest.raises(RegexWorkerError):
+        pool.run([catastrophic], 0.05)
+
+    # The replacement starts in the background, not on the next request
+    replacement = pool._idle.get(timeout=_TIMEOUT)
+    assert replacement.alive
+    pool._idle.put(replacement)
+    assert pool._started == 1
+    assert pool.run(
+        [{"op": "search", "pattern": "ok", "flags": 0, "text": "ok"}], _TIMEOUT
+    ) == [True]
+
+
+def test_background_warm_starts_all_workers() -> None:
+    pool = RegexWorkerPool(size=2)
+    try:
+        pool.warm(wait=False)
+
+        assert pool._started == 2
+        workers = [pool._idle.get(timeout=_TIMEOUT) for _ in range(2)]
+        assert all(worker.alive for worker in workers)
+        for worker in workers:
+            pool._idle.put(worker)
+        assert pool.run(
+            [{"op": "search", "pattern": "x", "flags": 0, "text": "x"}], _TIMEOUT
+        ) == [True]
+        assert pool._started == 2
+    finally:
+        pool.close()
+
+
+def test_closed_pool_rejects_requests(pool: RegexWorkerPool) -> None:
+    pool.close()
+
+    with pytest.raises(RegexWorkerError):
+        pool.run([{"op": "search", "pattern": "x", "flags": 0, "text": "x"}], 1.0)
+
+
+def test_pipeline_routes_risky_patterns_through_pool(pool: RegexWorkerPool) -> None:
+    pipeline = DeclarativeFilterPipeline(
+        regex_timeout_ms=int(_TIMEOUT * 1000), worker_pool=pool
+    )
+    resolved = DeclarativeRuleRegistry().resolve(
+        DynamicCompressionConfig(
+            declarative_rules=[
+                {
+                    "name": "nested",
+                    "match_command": r"^x\b",
+                    "strip_lines": [r"^(\s+)+noise$"],
+                }
+            ]
+        )
+    )
+    rule = next(rule for rule in resolved.rules if rule.name == "nested")
+
+    result = pipeline.apply(rule=rule, content="keep\n  noise\nalso keep\n")
+
+    assert result == "keep\nalso keep\n"
+    assert pool._started == 1
@@ -0,0 +1,108 @@
+"""Unit tests for RequestContentHasher."""
+
+from __future__ import annotations
+
+import hashlib
+
+from src.core.domain.chat import ChatMessage, ChatRequest
+from src.core.services.request_content_hasher import (
+    RequestContentHasher,
+    update_canonical,
+)
+
+
+def _digest(value: object) -> str:
+    hasher = hashlib.sha256()
+    update_canonical(hasher, value)
+    return hasher.hexdigest()
+
+
+def _request(*contents: str, tools: list | None = None) -> ChatRequest:
+    return ChatRequest(
+        model="gpt-4",
+        messages=[ChatMessage(role="user", content=text) for text in contents],
+        tools=tools,
+    )
+
+
+def test_canonical_encoding_ignores_key_order() -> None:
+    assert _digest({"a": 1, "b": [1, "x"]}) == _digest({"b": [1, "x"], "a": 1})
+
+
+def test_canonical_encoding_distinguishes_types_and_boundaries() -> None:
+    assert _digest(1) != _digest(True)
+    assert _digest(1) != _digest(1.0)
+    assert _digest("1") != _digest(1)
+    assert _digest(["ab", "c"]) != _digest(["a", "bc"])
+    assert _digest({"a": None}) != _digest({})
+
+
+def test_hash_is_stable_across_equal_requests() -> None:
+    hasher = RequestContentHasher()
+    first = hasher.hash_request(_request("hello", "world"), "s1")
+    assert len(first) == 32
+    assert hasher.hash_request(_request("hello", "world"), "s1") == first
+    assert RequestContentHasher().hash_request(_request("hello", "world"), "s1") == (
+        first
+    )
+
+
+def test_hash_covers_session_messages_and_tools() -> None:
+    hasher = RequestContentHasher()
+    base = hasher.hash_request(_request("hello"), "s1")
+    assert hasher.hash_request(_request("hello"), "s2") != base
+    assert hasher.hash_request(_request("hello!"), "s1") != base
+    assert hasher.hash_request(_request("hello", "again"), "s1") != base
+    tool = {"type": "function", "function": {"name": "f"}}
+    assert hasher.hash_request(_request("hello", tools=[tool]), "s1") != base
+
+
+def test_repeated_history_reuses_message_digests() -> None:
+    hasher = RequestContentHasher()
+    history = [f"turn {index}" for index in range(50)]
+    hasher.hash_request(_request(*history), "s1")
+    assert hasher.cache_misses == 50
+
+    hasher.hash_request(_request(*history, "new turn"), "s1")
+    assert hasher.cache_hits == 50
+    assert hasher.cache_misses == 51
+
+
+def test_messages_with_tool_calls_are_hashed_without_memoization() -> None:
+    hasher = RequestContentHasher()
+    message = ChatMessage(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            {"id": "call_1", "function": {"name": "f", "arguments": "{}"}},
+        ],
+    )
+    first = hasher.message_digest(message)
+    assert hasher.message_digest(message) == first
+    assert hasher.cache_hits == hasher.cache_misses == 0
+
+
+def test_cache_is_bounded() -> None:
+    hasher = RequestContentHasher(max_cached_messages=2)
+    for text in ("a", "b", "c"):
+        hasher.message_digest({"role": "user", "content": text})
+    assert len(hasher._message_digests) == 2
+
+
+def test_cache_is_bounded_by_retained_characters() -> None:
+    hasher = RequestContentHasher(max_cached_chars=3 * (256 + 1000))
+    for text in ("a", "b", "c", "d"):
+        hasher.message_digest({"role": "user", "content": text * 996})
+    assert len(hasher._message_digests) == 3
+    assert hasher._cached_chars <= 3 * (256 + 1000)
+
+
+def test_large_messages_are_hashed_without_memoization() -> None:
+    hasher = RequestContentHasher()
+    message = {"role": "tool", "content": "x" * (1024 * 1024)}
+
+    first = hasher.message_digest(message)
+
+    assert hasher.message_digest(message) == first
+    assert hasher.cache_misses == 0
+    assert hasher._message_digests == {}
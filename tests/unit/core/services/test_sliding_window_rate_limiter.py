@@ -0,0 +1,201 @@
+"""
+Tests for SlidingWindowRateLimiter.
+
+This module tests the O(1) sliding-window counter engine and its selection
+through ``create_rate_limiter``.
+"""
+
+import asyncio
+from typing import cast
+
+import pytest
+from src.core.config.app_config import AppConfig
+from src.core.di.container import ServiceCollection
+from src.core.di.registrations._backend.infrastructure import register_rate_limiter
+from src.core.interfaces.rate_limiter_interface import IRateLimiter
+from src.core.services.rate_limiter import (
+    ConfigurableRateLimiter,
+    InMemoryRateLimiter,
+    RateLimiter,
+    SlidingWindowRateLimiter,
+    create_rate_limiter,
+)
+
+from tests.utils.fake_clock import FakeClock, FakeClockContext
+
+
+@pytest.fixture
+def limiter() -> SlidingWindowRateLimiter:
+    return SlidingWindowRateLimiter(
+        default_limit=10, default_time_window=60, sweep_interval_seconds=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_limits_within_a_single_window(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    async with FakeClockContext(FakeClock(initial_time=6000.0)):
+        await limiter.record_usage("key", cost=9)
+        info = await limiter.check_limit("key")
+        assert not info.is_limited
+        assert info.remaining == 1
+
+        await limiter.record_usage("key")
+        info = await limiter.check_limit("key")
+        assert info.is_limited
+        assert info.remaining == 0
+        # The current count only decays once it becomes the previous window.
+        assert info.reset_at is not None
+        assert 6060.0 <= info.reset_at <= 6120.0
+
+
+@pytest.mark.asyncio
+async def test_previous_window_decays_linearly(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    async with FakeClockContext(FakeClock(initial_time=6000.0)) as clock:
+        await limiter.record_usage("key", cost=10)
+
+        clock.advance(60.0)  # next window: estimate 10 + 5
+        await limiter.record_usage("key", cost=5)
+        info = await limiter.check_limit("key")
+        assert info.is_limited
+        assert info.reset_at == pytest.approx(6090.0)
+
+        clock.advance(45.0)  # previous window weighted by 0.25: estimate 7.5
+        info = await limiter.check_limit("key")
+        assert not info.is_limited
+        assert info.remaining == 3
+
+        clock.advance(120.0)  # both windows elapsed
+        info = await limiter.check_limit("key")
+        assert info.remaining == 10
+
+
+@pytest.mark.asyncio
+async def test_large_cost_is_counted_without_per_unit_state(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    await limiter.record_usage("key", cost=1_000_000)
+    info = await limiter.check_limit("key")
+    assert info.is_limited
+    assert limiter._counters["key"].current == 1_000_000
+
+
+@pytest.mark.asyncio
+async def test_custom_limit_cooldown_and_reset(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    await limiter.set_limit("key", 2, 30)
+    await limiter.record_usage("key", cost=2)
+    info = await limiter.check_limit("key")
+    assert info.is_limited
+    assert info.limit == 2
+    assert info.time_window == 30
+
+    await limiter.reset("key")
+    await limiter.apply_cooldown("key", 10)
+    info = await limiter.check_limit("key")
+    assert info.is_limited
+    assert info.remaining == 0
+
+    await limiter.reset("key")
+    assert not (await limiter.check_limit("key")).is_limited
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_counters_are_evicted(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    limiter._max_usage_entries = 3
+    for key in ("a", "b", "c"):
+        await limiter.record_usage(key)
+    await limiter.check_limit("a")
+    await limiter.record_usage("d")
+    assert list(limiter._counters) == ["c", "a", "d"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_idle_counters_and_expired_state(
+    limiter: SlidingWindowRateLimiter,
+) -> None:
+    async with FakeClockContext(FakeClock(initial_time=6000.0)) as clock:
+        await limiter.record_usage("idle")
+        await limiter.apply_cooldown("cooling", 5)
+        await limiter.set_limit("stale", 5, 60)
+
+        clock.advance(100.0)
+        await limiter.record_usage("active")
+        assert limiter.sweep() == 1  # the cooldown
+        assert "idle" in limiter._counters
+
+        clock.advance(limiter._limits_ttl_seconds)
+        assert limiter.sweep() == 3
+        assert limiter._counters == {}
+        assert limiter._limits == {}
+
+
+@pytest.mark.asyncio
+async def test_background_sweeper_runs_and_stops_on_close() -> None:
+    limiter = SlidingWindowRateLimiter(
+        default_limit=10, default_time_window=1, sweep_interval_seconds=5.0
+    )
+    async with FakeClockContext(FakeClock(initial_time=100.0)) as clock:
+        await limiter.record_usage("key")
+        assert limiter._sweeper_task is not None
+        await asyncio.sleep(0)  # let the sweeper start waiting
+
+        clock.advance(5.0)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert limiter._counters == {}
+
+        await limiter.close()
+        assert limiter._sweeper_task is None
+
+
+def test_create_rate_limiter_selects_engine() -> None:
+    limiter = create_rate_limiter(
+        {"rate_limiter_engine": "sliding_window", "default_rate_limit": 5}
+    )
+    assert isinstance(limiter, ConfigurableRateLimiter)
+    assert isinstance(limiter._limiter, SlidingWindowRateLimiter)
+    assert limiter._limiter._default_limit == 5
+
+    assert isinstance(create_rate_limiter({})._limiter, InMemoryRateLimiter)
+    fallback = create_rate_limiter({"rate_limiter_engine": "bogus"})
+    assert isinstance(fallback._limiter, InMemoryRateLimiter)
+
+
+def test_di_resolves_rate_limiter_from_app_config() -> None:
+    services = ServiceCollection()
+    services.add_instance(
+        AppConfig,
+        AppConfig(rate_limiter_engine="sliding_window", default_rate_limit=7),
+    )
+    register_rate_limiter(services)
+    provider = services.build_service_provider()
+
+    limiter = provider.get_required_service(RateLimiter)
+    assert isinstance(limiter, ConfigurableRateLimiter)
+    assert isinstance(limiter._limiter, SlidingWindowRateLimiter)
+    assert limiter._limiter._default_limit == 7
+    assert provider.get_required_service(cast(type, IRateLimiter)) is limiter
+
+
+@pytest.mark.asyncio
+async def test_disposing_provider_stops_sweeper() -> None:
+    services = ServiceCollection()
+    services.add_instance(AppConfig, AppConfig(rate_limiter_engine="sliding_window"))
+    register_rate_limiter(services)
+    provider = services.build_service_provider()
+    limiter = provider.get_required_service(RateLimiter)
+    await limiter.record_usage("key")
+    sweeper = limiter._limiter._sweeper_task
+    assert sweeper is not None
+
+    await provider.dispose()
+
+    assert sweeper.cancelled()
+    assert limiter._limiter._sweeper_task is None
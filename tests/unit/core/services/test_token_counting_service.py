@@ -0,0 +1,164 @@
+"""Tests for the shared token counting service."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+import pytest
+from src.core.services.token_counting_service import (
+    TiktokenEncoder,
+    TokenCountingService,
+    heuristic_token_count,
+)
+
+
+class _RecordingEncoder:
+    """One token per whitespace-separated word; records what it encoded."""
+
+    def __init__(self, name: str = "words") -> None:
+        self._name = name
+        self.calls: list[str] = []
+        self.threads: set[int] = set()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def count(self, text: str) -> int:
+        self.calls.append(text)
+        self.threads.add(threading.get_ident())
+        return len(text.split()) or 1
+
+
+@pytest.fixture
+def encoder() -> _RecordingEncoder:
+    return _RecordingEncoder()
+
+
+@pytest.fixture
+def service(encoder: _RecordingEncoder) -> Iterator[TokenCountingService]:
+    service = TokenCountingService()
+    service.register_encoder([""], encoder)
+    yield service
+    service.dispose()
+
+
+def test_resent_history_is_not_reencoded(
+    service: TokenCountingService, encoder: _RecordingEncoder
+) -> None:
+    history = [
+        {"role": "system", "content": "You are terse"},
+        {"role": "user", "content": "hello there"},
+    ]
+
+    first = service.count_messages(history)
+    second = service.count_messages([*history, {"role": "user", "content": "more"}])
+
+    # "system: You are terse" + sep + "user: hello there"
+    assert first == 4 + 1 + 3
+    assert second == first + 1 + 2
+    assert encoder.calls == [
+        "system: You are terse",
+        "user: hello there",
+        "\n",
+        "user: more",
+    ]
+    stats = service.get_stats()
+    assert stats.entries == 4
+    assert stats.hits >= 3
+
+
+def test_encoders_are_selected_by_model_family() -> None:
+    service = TokenCountingService()
+    claude = _RecordingEncoder("claude")
+    generic = _RecordingEncoder("generic")
+    service.register_encoder(["gpt"], generic)
+    service.register_encoder(["claude"], claude)
+
+    service.count("a b", model="anthropic:Claude-Sonnet-4")
+    service.count("a b", model="gpt-4o")
+
+    assert claude.calls == ["a b"]
+    assert generic.calls == ["a b"]
+    assert service.encoder_for("mistral-large").name == "tiktoken:cl100k_base"
+    assert service.encoder_for("o3-mini").name == "tiktoken:o200k_base"
+
+
+def test_counts_are_cached_per_encoder(encoder: _RecordingEncoder) -> None:
+    service = TokenCountingService()
+    other = _RecordingEncoder("other")
+    service.register_encoder(["a"], encoder)
+    service.register_encoder(["b"], other)
+
+    service.count("same text", model="a")
+    service.count("same text", model="b")
+
+    assert encoder.calls == ["same text"]
+    assert other.calls == ["same text"]
+
+
+def test_lru_evicts_least_recently_used(encoder: _RecordingEncoder) -> None:
+    service = TokenCountingService(max_cached_counts=2)
+    service.register_encoder([""], encoder)
+
+    service.count_many(["one", "two"])
+    service.count("one")
+    service.count("three")
+    service.count("one")
+    service.count("two")
+
+    assert encoder.calls == ["one", "two", "three", "two"]
+
+
+def test_large_batches_use_worker_threads(encoder: _RecordingEncoder) -> None:
+    service = TokenCountingService(parallel_min_chars=1, max_workers=2)
+    service.register_encoder([""], encoder)
+    texts = [" ".join(["w"] * n) for n in range(1, 50)] + [""]
+
+    try:
+        assert service.count_many(texts) == [*range(1, 50), 0]
+        assert service._executor is not None
+    finally:
+        service.dispose()
+    assert service._executor is None
+
+
+@pytest.mark.asyncio
+async def test_async_batch_matches_sync(encoder: _RecordingEncoder) -> None:
+    service = TokenCountingService(parallel_min_chars=1)
+    service.register_encoder([""], encoder)
+    messages = [{"role": "user", "content": f"message {i} " * i} for i in range(20)]
+
+    try:
+        async_total = await service.count_messages_async(messages)
+        calls = len(encoder.calls)
+        assert service.count_messages(messages) == async_total
+        assert len(encoder.calls) == calls
+    finally:
+        service.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_counts_small_batches_off_the_event_loop(
+    service: TokenCountingService, encoder: _RecordingEncoder
+) -> None:
+    assert await service.count_many_async(["one two"]) == [2]
+    assert await service.count_messages_async([{"role": "user", "content": "hi"}])
+
+    assert encoder.calls
+    assert threading.get_ident() not in encoder.threads
+
+
+def test_tiktoken_encoder_falls_back_when_encoding_unavailable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import tiktoken
+
+    def _unavailable(name: str) -> None:
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", _unavailable)
+    encoder = TiktokenEncoder("cl100k_base")
+
+    assert encoder.count("x" * 10) == heuristic_token_count("x" * 10) == 3
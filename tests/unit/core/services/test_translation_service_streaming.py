@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 from src.core.services.translation_service_streaming import (
@@ -163,3 +164,107 @@ class TestDictToCanonicalStreamChunkReasoningSummary(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestCanonicalStreamChunkFastPath(unittest.TestCase):
+    """The pass-through path must match the validating dict round trip."""
+
+    CHUNKS = [
+        (
+            "openai",
+            'data: {"id":"chatcmpl-1","object":"chat.completion.chunk",'
+            '"created":1,"model":"m","choices":[{"index":0,'
+            '"delta":{"role":"assistant","content":"hi"}}]}\n\n',
+        ),
+        (
+            "openai",
+            {
+                "id": "chatcmpl-2",
+                "created": 1,
+                "model": "m",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {
+                            "content": "",
+                            "tool_calls": [
+                                {
+                                    "index": 0,
+                                    "id": "call_1",
+                                    "type": "function",
+                                    "function": {"name": "f", "arguments": "{}"},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            },
+        ),
+        (
+            "openai",
+            {
+                "id": "chatcmpl-3",
+                "created": 1,
+                "model": "m",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": "", "reasoning_summary": "planning"},
+                        "finish_reason": None,
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 2,
+                    "total_tokens": 3,
+                },
+            },
+        ),
+        (
+            "gemini",
+            {
+                "candidates": [
+                    {
+                        "content": {"parts": [{"text": "hello"}]},
+                        "finishReason": "STOP",
+                    }
+                ]
+            },
+        ),
+        ("openai", "data: [DONE]\n\n"),
+    ]
+
+    def test_fast_path_matches_validated_round_trip(self):
+        from src.core.domain.chat import CanonicalStreamChunk
+        from src.core.services.translation_service import TranslationService
+
+        fast = TranslationService(validate_stream_chunks=False)
+        validated = TranslationService(validate_stream_chunks=True)
+
+        for source_format, chunk in self.CHUNKS:
+            with self.subTest(source_format=source_format, chunk=chunk):
+                # Translators normalize dict chunks in place
+                expected = validated.to_domain_stream_chunk(
+                    copy.deepcopy(chunk), source_format
+                )
+                actual = fast.to_domain_stream_chunk(
+                    copy.deepcopy(chunk), source_format
+                )
+
+                self.assertIsInstance(actual, CanonicalStreamChunk)
+                ignored = {"id", "created"}
+                self.assertEqual(
+                    actual.model_dump(exclude_none=True, exclude=ignored),
+                    expected.model_dump(exclude_none=True, exclude=ignored),
+                )
+
+    def test_fast_path_cleans_empty_content_next_to_reasoning(self):
+        from src.core.services.translation_service import TranslationService
+
+        result = TranslationService(
+            validate_stream_chunks=False
+        ).to_domain_stream_chunk(copy.deepcopy(self.CHUNKS[2][1]), "openai")
+
+        delta = result.choices[0].delta
+        self.assertIsNone(delta.content)
+        self.assertEqual(delta.reasoning_content, "planning")
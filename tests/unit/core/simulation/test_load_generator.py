@@ -0,0 +1,203 @@
+"""Tests for the capture-driven load generator and backend stand-in."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from src.core.domain.cbor_capture import (
+    CaptureDirection,
+    CapturedWireEvent,
+    CaptureFileHeader,
+    CaptureSession,
+)
+from src.core.services import metrics_service
+from src.core.simulation.load_backend import (
+    CapturedBackendResponses,
+    create_load_backend_app,
+)
+from src.core.simulation.load_generator import (
+    LoadGenerator,
+    LoadTestConfig,
+    StageTiming,
+    diff_stage_timings,
+    extract_exchanges,
+    parse_prometheus_timers,
+)
+
+
+def _event(
+    timestamp: float,
+    direction: CaptureDirection,
+    sequence: int,
+    data: bytes,
+    **kwargs,
+) -> CapturedWireEvent:
+    return CapturedWireEvent(
+        timestamp, direction, sequence, data, session_id="cap", **kwargs
+    )
+
+
+def _streaming_session(prompt: str = "hi") -> CaptureSession:
+    """One client request, a retried backend attempt and a 3-chunk stream."""
+    body = f'{{"messages":[{{"role":"user","content":"{prompt}"}}]}}'.encode()
+    backend_body = f'{{"prompt":"{prompt}"}}'.encode()
+    entries = [
+        _event(
+            0.0,
+            CaptureDirection.CLIENT_TO_PROXY,
+            0,
+            body,
+            url="http://proxy/v1/chat/completions",
+            http_method="POST",
+        ),
+        _event(0.01, CaptureDirection.PROXY_TO_BACKEND, 1, b'{"prompt":"stale"}'),
+        _event(0.02, CaptureDirection.BACKEND_TO_PROXY, 2, b"", status_code=500),
+        _event(0.03, CaptureDirection.PROXY_TO_BACKEND, 3, backend_body),
+        _event(0.05, CaptureDirection.BACKEND_TO_PROXY, 4, b"", is_stream_start=True),
+        _event(
+            0.10,
+            CaptureDirection.BACKEND_TO_PROXY,
+            5,
+            b"data: one\n\n",
+            chunk_index=0,
+            status_code=200,
+        ),
+        _event(
+            0.15,
+            CaptureDirection.BACKEND_TO_PROXY,
+            6,
+            b"data: two\n\n",
+            chunk_index=1,
+        ),
+        _event(
+            0.20,
+            CaptureDirection.BACKEND_TO_PROXY,
+            7,
+            b"data: [DONE]\n\n",
+            chunk_index=2,
+        ),
+        _event(0.20, CaptureDirection.BACKEND_TO_PROXY, 8, b"", is_stream_end=True),
+        _event(0.21, CaptureDirection.PROXY_TO_CLIENT, 9, b"data: one\n\n"),
+    ]
+    return CaptureSession(header=CaptureFileHeader(session_id="cap"), entries=entries)
+
+
+class TestExtractExchanges:
+    def test_pairs_request_with_last_backend_attempt(self) -> None:
+        (exchange,) = extract_exchanges(_streaming_session())
+
+        assert exchange.request.sequence == 0
+        assert exchange.backend_request is not None
+        assert exchange.backend_request.sequence == 3
+        assert [e.data for e in exchange.backend_chunks] == [
+            b"data: one\n\n",
+            b"data: two\n\n",
+            b"data: [DONE]\n\n",
+        ]
+        assert exchange.backend_ttft == pytest.approx(0.07)
+        assert exchange.backend_duration == pytest.approx(0.17)
+
+    def test_request_without_backend_leg(self) -> None:
+        session = CaptureSession(
+            header=CaptureFileHeader(session_id="cap"),
+            entries=[_event(0.0, CaptureDirection.CLIENT_TO_PROXY, 0, b"{}")],
+        )
+
+        (exchange,) = extract_exchanges(session)
+
+        assert exchange.backend_request is None
+        assert exchange.backend_ttft is None
+
+
+class TestLoadBackend:
+    @pytest.mark.asyncio
+    async def test_serves_matching_captured_stream(self) -> None:
+        responses = CapturedBackendResponses(
+            [_streaming_session("a"), _streaming_session("b")]
+        )
+        app = create_load_backend_app(responses, time_compression=0)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://backend"
+        ) as client:
+            response = await client.post("/v1/anything", content=b'{"prompt":"b"}')
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.content == b"data: one\n\ndata: two\n\ndata: [DONE]\n\n"
+        assert responses.exact_matches == 1
+        assert responses.fallback_matches == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_body_falls_back_to_round_robin(self) -> None:
+        responses = CapturedBackendResponses([_streaming_session()])
+        app = create_load_backend_app(responses, time_compression=0)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://backend"
+        ) as client:
+            response = await client.post("/v1/chat", content=b"unrelated")
+
+        assert response.status_code == 200
+        assert responses.fallback_matches == 1
+
+
+class TestLoadGenerator:
+    @pytest.mark.asyncio
+    async def test_reports_every_virtual_client_request(self) -> None:
+        captures = {"a": _streaming_session("a"), "b": _streaming_session("b")}
+        # The stand-in plays the proxy so the run needs no server.
+        app = create_load_backend_app(
+            CapturedBackendResponses(captures.values()), time_compression=0
+        )
+        generator = LoadGenerator(
+            LoadTestConfig(
+                proxy_base_url="http://proxy",
+                fan_out=5,
+                concurrency=4,
+                time_compression=10.0,
+                iterations=2,
+                scrape_proxy_metrics=False,
+            ),
+            transport=httpx.ASGITransport(app=app),
+        )
+
+        report = await generator.run(captures)
+
+        assert len(report.samples) == 2 * 5 * 2
+        assert report.error_count == 0
+        assert all(s.ttft is not None for s in report.samples)
+        assert all(
+            s.expected_backend_ttft == pytest.approx(0.007) for s in report.samples
+        )
+        assert report.requests_per_second > 0
+
+        data = report.to_dict()
+        assert data["requests"] == 20
+        assert data["latency_seconds"]["ttft"]["p99"] >= 0
+        assert "LOAD TEST REPORT" in report.summary
+
+    def test_rejects_invalid_config(self) -> None:
+        with pytest.raises(ValueError):
+            LoadGenerator(LoadTestConfig(fan_out=0))
+        with pytest.raises(ValueError):
+            LoadGenerator(LoadTestConfig(time_compression=-1))
+
+
+class TestStageTimings:
+    def setup_method(self) -> None:
+        metrics_service.reset()
+
+    def test_diffs_exported_proxy_timers(self) -> None:
+        metrics_service.record_duration("stage.redaction", 0.5)
+        before = parse_prometheus_timers(metrics_service.render_prometheus())
+        metrics_service.record_duration("stage.redaction", 0.25)
+        metrics_service.record_duration("stage.redaction", 0.25)
+        metrics_service.record_duration("stage.translation", 0.1)
+        after = parse_prometheus_timers(metrics_service.render_prometheus())
+
+        delta = diff_stage_timings(before, after)
+
+        assert delta["llm_proxy_stage_redaction_seconds"] == StageTiming(2, 0.5)
+        assert delta["llm_proxy_stage_redaction_seconds"].mean_seconds == 0.25
+        assert delta["llm_proxy_stage_translation_seconds"].count == 1
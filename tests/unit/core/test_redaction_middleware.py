@@ -382,3 +382,42 @@ async def test_redaction_still_applies_to_new_messages_with_api_keys() -> None:
     new_msg_content = processed.messages[1].content
     assert "(API_KEY_HAS_BEEN_REDACTED)" in str(new_msg_content)
     assert api_keys[0] not in str(new_msg_content)
+
+
+@pytest.mark.asyncio
+async def test_redaction_results_are_shared_across_sessions() -> None:
+    """Identical text from different sessions is redacted once."""
+    api_keys = ["sk-TESTSECRET12345"]
+    mw = RedactionMiddleware(api_keys=api_keys)
+    req = ChatRequest(
+        model="gpt-4o",
+        messages=[
+            ChatMessage(role="system", content=f"Shared prompt {api_keys[0]}"),
+        ],
+    )
+
+    first = await mw.process(req, context={"session_id": "session-a"})
+    second = await mw.process(req, context={"session_id": "session-b"})
+
+    assert first.messages[0].content == second.messages[0].content
+    assert api_keys[0] not in str(second.messages[0].content)
+    stats = get_global_redaction_cache().get_result_stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_redaction_results_follow_api_key_updates() -> None:
+    """Cached results are not reused after the key set changes."""
+    mw = RedactionMiddleware(api_keys=["sk-OLDKEY00000000"])
+    req = ChatRequest(
+        model="gpt-4o",
+        messages=[ChatMessage(role="user", content="Use sk-NEWKEY11111111 now")],
+    )
+
+    before = await mw.process(req)
+    mw.update_api_keys(["sk-NEWKEY11111111"])
+    after = await mw.process(req)
+
+    assert "sk-NEWKEY11111111" in str(before.messages[0].content)
+    assert "sk-NEWKEY11111111" not in str(after.messages[0].content)
@@ -1,6 +1,10 @@
 """Unit tests for database engine."""
 
+import asyncio
+from pathlib import Path
+
 import pytest
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from src.core.database.config import DatabaseConfig
 from src.core.database.engine import DatabaseEngine, get_async_session, init_database
@@ -151,9 +155,7 @@ class TestDatabaseEngine:
         assert db_engine._session_factory is None
         assert db_engine._initialized is False
 
-    async def test_dispose_calls_close(
-        self, in_memory_config: DatabaseConfig
-    ) -> None:
+    async def test_dispose_calls_close(self, in_memory_config: DatabaseConfig) -> None:
         """Test that dispose() properly closes the engine.
 
         This ensures that the DI container can call dispose() during shutdown
@@ -171,6 +173,115 @@ class TestDatabaseEngine:
         assert db_engine._initialized is False
 
 
+class TestPooledSQLiteEngine:
+    """Tests for the pooled SQLite writer/reader mode."""
+
+    @pytest.fixture
+    async def db_engine(self, tmp_path: Path) -> DatabaseEngine:
+        """Create an initialized pooled engine on a file database."""
+        config = DatabaseConfig(
+            url=f"sqlite+aiosqlite:///{tmp_path}/proxy.db",
+            sqlite_pool_mode="pooled",
+            sqlite_reader_pool_size=2,
+            pool_timeout=2,
+        )
+        db_engine = DatabaseEngine(config)
+        await db_engine.initialize()
+        yield db_engine
+        await db_engine.close()
+
+    async def test_connections_use_wal_and_readers_are_read_only(
+        self, db_engine: DatabaseEngine
+    ) -> None:
+        """Test pragmas applied to writer and reader connections."""
+        assert db_engine.is_pooled_sqlite
+        _ = db_engine.read_session_factory
+        assert db_engine._reader_engine is not None
+
+        async with db_engine.engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+            assert (await conn.scalar(text("PRAGMA synchronous"))) == 1
+            assert (await conn.scalar(text("PRAGMA query_only"))) == 0
+        async with db_engine._reader_engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA query_only"))) == 1
+
+    async def test_only_readonly_sessions_use_readers(
+        self, db_engine: DatabaseEngine
+    ) -> None:
+        """Test default sessions stay on the writer for read-modify-write."""
+        from src.core.database.models.sso import RateLimitTable
+
+        count = select(func.count()).select_from(RateLimitTable)
+        async with db_engine.session() as session:
+            assert await session.scalar(count) == 0
+            assert session.get_bind() is db_engine.engine.sync_engine
+            if await session.get(RateLimitTable, "pooled-ip") is None:
+                session.add(RateLimitTable(identifier="pooled-ip"))
+
+        async with db_engine.session(readonly=True) as session:
+            assert await session.scalar(count) == 1
+            assert session.sync_session._writing is False
+
+    async def test_readonly_sessions_switch_to_writer(
+        self, db_engine: DatabaseEngine
+    ) -> None:
+        """Test lookups, locking reads and writes move to the writer."""
+        from src.core.database.models.sso import RateLimitTable
+
+        count = select(func.count()).select_from(RateLimitTable)
+        async with db_engine.session(readonly=True) as session:
+            session.add(RateLimitTable(identifier="pooled-ip"))
+            await session.flush()
+            assert session.sync_session._writing is True
+            assert await session.scalar(count) == 1
+
+        async with db_engine.session(readonly=True) as session:
+            assert await session.get(RateLimitTable, "pooled-ip") is not None
+            assert session.sync_session._writing is True
+
+        async with db_engine.session(readonly=True) as session:
+            await session.execute(select(RateLimitTable).with_for_update())
+            assert session.sync_session._writing is True
+
+    async def test_cancelled_writer_returns_connection_to_pool(
+        self, db_engine: DatabaseEngine
+    ) -> None:
+        """Test a cancelled write session releases the single writer."""
+        from src.core.database.models.sso import RateLimitTable
+
+        entered = asyncio.Event()
+
+        async def _writer() -> None:
+            async with db_engine.session() as session:
+                session.add(RateLimitTable(identifier="cancelled"))
+                await session.flush()
+                entered.set()
+                await asyncio.Event().wait()
+
+        task = asyncio.create_task(_writer())
+        await asyncio.wait_for(entered.wait(), timeout=2.0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        async with db_engine.session() as session:
+            session.add(RateLimitTable(identifier="after-cancel"))
+        async with db_engine.session() as session:
+            assert await session.get(RateLimitTable, "cancelled") is None
+            assert await session.get(RateLimitTable, "after-cancel") is not None
+
+    async def test_close_disposes_reader_engine(
+        self, db_engine: DatabaseEngine
+    ) -> None:
+        """Test that close() disposes both pooled engines."""
+        _ = db_engine.read_session_factory
+
+        await db_engine.close()
+
+        assert db_engine._engine is None
+        assert db_engine._reader_engine is None
+
+
 class TestModuleFunctions:
     """Tests for module-level convenience functions."""
 
@@ -0,0 +1,190 @@
+"""Unit tests for the session summary search index."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from freezegun import freeze_time
+from sqlalchemy import func, select
+from src.core.database.config import DatabaseConfig
+from src.core.database.engine import DatabaseEngine
+from src.core.database.models.memory import SessionSummaryTermTable
+from src.core.database.repositories.memory_repository import SQLModelMemoryRepository
+from src.core.memory.config import MemoryConfiguration
+from src.core.memory.context_injector import ContextInjector
+from src.core.memory.models import FileChange, SessionSummary, TaskItem
+from src.core.memory.search_index import bm25_scores, query_terms, tokenize
+
+NOW = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _summary(
+    index: int,
+    title: str,
+    *,
+    days_ago: int = 30,
+    user_id: str = "user-1",
+    project_id: str | None = None,
+    files: tuple[str, ...] = (),
+    tasks: tuple[str, ...] = (),
+) -> SessionSummary:
+    start = NOW - timedelta(days=days_ago)
+    return SessionSummary(
+        id=f"sum-{index}",
+        user_id=user_id,
+        project_id=project_id,
+        session_id=f"sess-{index}",
+        session_start=start,
+        backend_model="openai:gpt-4",
+        title=title,
+        scope="General maintenance",
+        modified_files=[FileChange(path=path, status="modified") for path in files],
+        remaining_tasks=[TaskItem(description=task, status="open") for task in tasks],
+        completion_status="completed",
+        full_analysis="",
+        summary_version="v1",
+        created_at=start,
+    )
+
+
+@pytest.fixture
+async def engine() -> DatabaseEngine:
+    engine = DatabaseEngine(DatabaseConfig(url="sqlite+aiosqlite:///:memory:"))
+    await engine.initialize()
+    yield engine
+    await engine.close()
+
+
+@pytest.fixture
+def repository(engine: DatabaseEngine) -> SQLModelMemoryRepository:
+    repo = SQLModelMemoryRepository(engine)
+    repo._initialized = True
+    return repo
+
+
+def test_tokenize_splits_paths_and_drops_stop_words() -> None:
+    assert tokenize("Fix the src/core/auth_service.py login!") == [
+        "fix",
+        "src",
+        "core",
+        "auth",
+        "service",
+        "py",
+        "login",
+    ]
+    assert query_terms("auth AUTH token") == ["auth", "token"]
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents() -> None:
+    common = [(f"doc-{i}", "fix", 1, 10) for i in range(6)]
+    scores = bm25_scores(
+        [("short", "oauth", 1, 5), ("long", "oauth", 1, 50), *common],
+        document_count=10,
+        average_length=10.0,
+    )
+    assert scores["short"] > scores["long"]
+    assert scores["short"] > scores["doc-0"]
+    assert set(scores) == {"short", "long"} | {doc for doc, *_ in common}
+
+
+async def test_search_ranks_whole_history_by_relevance(
+    repository: SQLModelMemoryRepository,
+) -> None:
+    await repository.save_session_summary(
+        _summary(0, "Migrate OAuth token refresh", days_ago=400)
+    )
+    for index in range(1, 30):
+        await repository.save_session_summary(
+            _summary(index, f"Tweak logging format {index}", days_ago=index)
+        )
+    await repository.save_session_summary(
+        _summary(30, "Document logging", files=("docs/oauth.md",), days_ago=200)
+    )
+
+    hits = await repository.search_sessions("user-1", "oauth token refresh", limit=5)
+
+    assert [hit.summary.id for hit in hits] == ["sum-0", "sum-30"]
+    assert hits[0].score > hits[1].score > 0
+    assert await repository.search_sessions("user-2", "oauth", limit=5) == []
+    assert await repository.search_sessions("user-1", "the and", limit=5) == []
+
+
+async def test_search_respects_project_scope(
+    repository: SQLModelMemoryRepository,
+) -> None:
+    await repository.save_session_summary(
+        _summary(1, "Cache invalidation", project_id="proj-1")
+    )
+    await repository.save_session_summary(
+        _summary(2, "Cache warmup", project_id="proj-2")
+    )
+
+    hits = await repository.search_sessions(
+        "user-1", "cache", limit=5, project_id="proj-2"
+    )
+
+    assert [hit.summary.id for hit in hits] == ["sum-2"]
+
+
+async def test_resave_and_delete_keep_postings_in_sync(
+    engine: DatabaseEngine, repository: SQLModelMemoryRepository
+) -> None:
+    await repository.save_session_summary(_summary(1, "Parser rewrite"))
+    await repository.save_session_summary(_summary(1, "Lexer rewrite"))
+    await repository.save_session_summary(_summary(2, "Parser fix", days_ago=1))
+
+    parser_hits = await repository.search_sessions("user-1", "parser", limit=5)
+    assert [hit.summary.id for hit in parser_hits] == ["sum-2"]
+
+    await repository.delete_old_sessions(NOW - timedelta(days=7))
+    assert await repository.search_sessions("user-1", "lexer", limit=5) == []
+    async with engine.session() as session:
+        remaining = await session.scalar(
+            select(func.count()).select_from(SessionSummaryTermTable)
+        )
+    assert remaining == len(tokenize("Parser fix General maintenance"))
+
+
+async def test_rebuild_search_index_backfills_unindexed_summaries(
+    engine: DatabaseEngine, repository: SQLModelMemoryRepository
+) -> None:
+    await repository.save_session_summary(_summary(1, "Quota enforcement"))
+    async with engine.session() as session:
+        await session.execute(SessionSummaryTermTable.__table__.delete())
+    assert await repository.search_sessions("user-1", "quota", limit=5) == []
+
+    assert await repository.rebuild_search_index() == 1
+
+    hits = await repository.search_sessions("user-1", "quota", limit=5)
+    assert [hit.summary.id for hit in hits] == ["sum-1"]
+
+
+@freeze_time(NOW, real_asyncio=True)
+async def test_context_injector_includes_old_relevant_sessions(
+    repository: SQLModelMemoryRepository,
+) -> None:
+    await repository.save_session_summary(
+        _summary(
+            0,
+            "Rate limiter redesign",
+            days_ago=300,
+            files=("src/core/services/rate_limiter.py",),
+            tasks=("Add burst rate limiter tests",),
+        )
+    )
+    for index in range(1, 20):
+        await repository.save_session_summary(
+            _summary(index, f"Unrelated chore {index}", days_ago=index)
+        )
+    config = MemoryConfiguration(
+        max_sessions_to_consider=3, context_relevance_threshold=0.5
+    )
+    injector = ContextInjector(config, repository)
+
+    context = await injector.get_context_for_session(
+        user_id="user-1",
+        current_prompt="The rate limiter drops burst traffic",
+    )
+
+    assert context is not None
+    assert "Rate limiter redesign" in context
+    assert "Unrelated chore" not in context
@@ -0,0 +1,161 @@
+"""Tests for :mod:`src.loop_detection.rolling_hash_detector`."""
+
+import random
+import string
+
+import pytest
+from src.loop_detection.config import InternalLoopDetectionConfig
+from src.loop_detection.hybrid_detector import HybridLoopDetector
+from src.loop_detection.rolling_hash_detector import RollingHashLoopDetector
+from src.loop_detection.token_window_loop_detector import TokenWindowLoopDetector
+
+LOOPING_TEXT = "I will check the file again to make sure it works. " * 40
+
+
+def _random_prose(length: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        for _ in range(length // 4)
+    ]
+    return " ".join(words)[:length]
+
+
+def _stream(detector, text: str, size: int = 7):
+    for start in range(0, len(text), size):
+        event = detector.process_chunk(text[start : start + size])
+        if event is not None:
+            return event, start
+    return None, None
+
+
+class TestRollingHashLoopDetector:
+    def test_detects_loop_in_streamed_content(self) -> None:
+        detector = RollingHashLoopDetector()
+
+        event, _ = _stream(detector, LOOPING_TEXT)
+
+        assert event is not None
+        assert event.pattern_length == 50
+        assert event.repetition_count == 10
+        assert detector.loop_detected is True
+        assert detector.get_loop_history() == [event]
+
+    def test_matches_token_window_detection_point(self) -> None:
+        """Both engines flag the loop on the same streamed chunk."""
+
+        _, rolling_at = _stream(RollingHashLoopDetector(), LOOPING_TEXT)
+        _, window_at = _stream(TokenWindowLoopDetector(), LOOPING_TEXT)
+
+        assert rolling_at is not None
+        assert rolling_at == window_at
+
+    def test_ignores_non_repetitive_content(self) -> None:
+        detector = RollingHashLoopDetector()
+
+        event, _ = _stream(detector, _random_prose(20_000), size=31)
+
+        assert event is None
+        # History and tracked hashes stay bounded on long streams.
+        assert detector.get_stats().history_length <= 3 * 1000
+        assert detector.get_stats().tracked_chunks <= 3 * 1000
+
+    def test_ignores_mostly_symbolic_windows(self) -> None:
+        detector = RollingHashLoopDetector(content_chunk_size=10)
+
+        assert detector.process_chunk("1234567890 " * 100) is None
+
+    def test_spread_out_repeats_are_not_a_loop(self) -> None:
+        detector = RollingHashLoopDetector(
+            content_loop_threshold=3, content_chunk_size=20
+        )
+        phrase = "the quick brown fox jumps"
+        text = "".join(
+            phrase + " " + _random_prose(200, seed=i) + " " for i in range(6)
+        )
+
+        assert detector.process_chunk(text) is None
+
+    def test_content_inside_code_blocks_is_skipped(self) -> None:
+        detector = RollingHashLoopDetector()
+
+        assert detector.process_chunk("```python\n") is None
+        assert detector.process_chunk(LOOPING_TEXT) is None
+        assert detector.in_code_block is True
+        assert detector.process_chunk("```\n") is None
+        assert detector.in_code_block is False
+        assert detector.process_chunk(LOOPING_TEXT) is not None
+
+    def test_reset_and_disable(self) -> None:
+        detector = RollingHashLoopDetector()
+        detector.process_chunk(LOOPING_TEXT)
+        assert detector.loop_detected
+
+        detector.reset()
+        assert detector.loop_detected is False
+        assert detector.get_current_state().stream_content_history_length == 0
+
+        detector.disable()
+        assert detector.process_chunk(LOOPING_TEXT) is None
+        detector.enable()
+        assert detector.process_chunk(LOOPING_TEXT) is not None
+
+    def test_save_and_restore_state_continues_rolling_window(self) -> None:
+        detector = RollingHashLoopDetector()
+        half = len(LOOPING_TEXT) // 8
+        assert detector.process_chunk(LOOPING_TEXT[:half]) is None
+
+        saved = detector._save_state()
+        detector.reset()
+        detector._restore_state(saved)
+
+        event, _ = _stream(detector, LOOPING_TEXT[half:])
+        assert event is not None
+
+    @pytest.mark.asyncio
+    async def test_check_for_loops_does_not_disturb_stream_state(self) -> None:
+        detector = RollingHashLoopDetector()
+        detector.process_chunk("some unrelated prefix text ")
+        before = detector.get_current_state()
+
+        result = await detector.check_for_loops(LOOPING_TEXT)
+
+        assert result.has_loop is True
+        assert result.details["pattern_length"] == 50
+        assert detector.get_current_state() == before
+
+    def test_update_config_resets_state(self) -> None:
+        detector = RollingHashLoopDetector()
+        detector.process_chunk(LOOPING_TEXT[:200])
+
+        detector.update_config({"content_chunk_size": 20, "content_loop_threshold": 4})
+
+        stats = detector.get_stats()
+        assert stats.config.content_chunk_size == 20
+        assert stats.config.content_loop_threshold == 4
+        assert stats.history_length == 0
+
+
+class TestRollingHashEngineSelection:
+    def test_hybrid_uses_rolling_hash_engine(self) -> None:
+        detector = HybridLoopDetector(short_detector_config={"engine": "rolling_hash"})
+
+        assert isinstance(detector.short_detector, RollingHashLoopDetector)
+        event, _ = _stream(detector, LOOPING_TEXT)
+        assert event is not None
+
+    def test_hybrid_rejects_unknown_engine(self) -> None:
+        with pytest.raises(ValueError, match="Unknown short loop detector engine"):
+            HybridLoopDetector(short_detector_config={"engine": "suffix_tree"})
+
+    def test_config_parses_engine(self) -> None:
+        config = InternalLoopDetectionConfig.from_env_vars(
+            {"LOOP_DETECTION_SHORT_DETECTOR_ENGINE": "rolling_hash"}
+        )
+        assert config.short_detector_engine == "rolling_hash"
+        assert config.validate() == []
+
+        invalid = InternalLoopDetectionConfig.from_dict(
+            {"short_detector_engine": "nope"}
+        )
+        assert any("short_detector_engine" in error for error in invalid.validate())
@@ -0,0 +1,221 @@
+"""Unit tests for the AnalysisWorker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from src.core.memory.analysis_worker import AnalysisWorker
+from src.core.memory.config import MemoryConfiguration
+from src.core.memory.models import CapturedInteraction
+from src.core.memory.service import MemoryService
+from src.core.memory.sqlite_repository import MemoryRepository
+from src.core.memory.summary_generator import SummaryGenerator
+from src.core.services import metrics_service
+
+START = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _summary_xml(session_id: str) -> str:
+    return f"""<session_summary version="v1">
+  <metadata>
+    <session_id>{session_id}</session_id>
+    <analysis_timestamp>2024-01-01T00:00:00Z</analysis_timestamp>
+    <summary_version>v1</summary_version>
+  </metadata>
+  <title>Summary of {session_id}</title>
+  <completion_status>completed</completion_status>
+</session_summary>"""
+
+
+@pytest.fixture
+def config() -> MemoryConfiguration:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield MemoryConfiguration(
+            available=True,
+            database_path=str(Path(tmpdir) / "memory.sqlite3"),
+            summarization_delay_seconds=0,
+            require_project_discovery=False,
+            max_concurrent_analyses=2,
+            analysis_batch_size=3,
+            analysis_batch_max_bytes=1000,
+        )
+
+
+@pytest.fixture
+async def repository(config: MemoryConfiguration) -> MemoryRepository:
+    repo = MemoryRepository(config)
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture
+def service(config: MemoryConfiguration, repository: MemoryRepository) -> MemoryService:
+    return MemoryService(config, repository)
+
+
+@pytest.fixture
+def prompts() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def worker(
+    config: MemoryConfiguration,
+    repository: MemoryRepository,
+    service: MemoryService,
+    prompts: list[str],
+) -> AnalysisWorker:
+    async def llm_caller(prompt: str, *, max_tokens: int | None = None) -> str:
+        prompts.append(prompt)
+        session_ids = [
+            session_id
+            for session_id in ("old-large", "a-1", "a-2", "b-1")
+            if f'session_id="{session_id}"' in prompt
+        ]
+        if not session_ids:
+            return _summary_xml("single")
+        return "\n".join(_summary_xml(session_id) for session_id in session_ids)
+
+    generator = SummaryGenerator(config, repository, llm_caller=llm_caller)
+    return AnalysisWorker(service, generator, config)
+
+
+async def _complete_session(
+    service: MemoryService,
+    session_id: str,
+    user_id: str,
+    *,
+    minutes_ago: int,
+    content: str = "Fix the build",
+) -> None:
+    await service.enable_for_session(session_id, user_id)
+    await service.capture_interaction(
+        session_id,
+        CapturedInteraction(role="user", content=content, timestamp=START),
+    )
+    state = await service.get_session_state(session_id)
+    state.enabled_at = START - timedelta(minutes=minutes_ago)
+    assert await service.mark_session_complete(session_id)
+
+
+async def _queue_burst(service: MemoryService, worker: AnalysisWorker) -> None:
+    await _complete_session(service, "a-2", "user-a", minutes_ago=5)
+    await _complete_session(service, "b-1", "user-b", minutes_ago=20)
+    await _complete_session(
+        service, "old-large", "user-a", minutes_ago=30, content="x" * 5000
+    )
+    await _complete_session(service, "a-1", "user-a", minutes_ago=10)
+    while (session_id := await service.get_pending_analysis_session()) is not None:
+        await worker._enqueue(session_id)
+
+
+async def test_sessions_are_prioritized_by_age_and_batched_per_user(
+    service: MemoryService, worker: AnalysisWorker
+) -> None:
+    await _queue_burst(service, worker)
+    assert worker.get_queue_size() == 4
+    assert metrics_service.get_gauge("memory.analysis.queue_depth") == 4
+
+    batches = [
+        [entry.session_id for entry in await worker._next_batch()] for _ in range(3)
+    ]
+
+    assert batches == [["old-large"], ["b-1"], ["a-1", "a-2"]]
+    assert worker.get_queue_size() == 0
+    assert metrics_service.get_gauge("memory.analysis.queue_depth") == 0
+
+
+async def test_batch_is_summarized_in_one_llm_call(
+    service: MemoryService,
+    repository: MemoryRepository,
+    worker: AnalysisWorker,
+    prompts: list[str],
+) -> None:
+    await _queue_burst(service, worker)
+    batched_before = metrics_service.get("memory.analysis.batched")
+    waits_before = metrics_service.get_timer_stats(
+        "memory.analysis.queue_wait.duration"
+    ).count
+
+    for _ in range(3):
+        await worker._process_batch(await worker._next_batch())
+
+    assert len(prompts) == 3
+    titles = {
+        summary.session_id: summary.title
+        for summary in await repository.get_recent_sessions("user-a", limit=5)
+    }
+    assert titles == {
+        "old-large": "Summary of single",
+        "a-1": "Summary of a-1",
+        "a-2": "Summary of a-2",
+    }
+    assert metrics_service.get("memory.analysis.batched") - batched_before == 2
+    assert (
+        metrics_service.get_timer_stats("memory.analysis.queue_wait.duration").count
+        - waits_before
+        == 4
+    )
+    assert service.get_active_session_count() == 0
+
+
+async def test_dispatcher_stops_taking_sessions_while_pending_is_full(
+    config: MemoryConfiguration,
+    repository: MemoryRepository,
+    service: MemoryService,
+) -> None:
+    config = config.model_copy(
+        update={"max_concurrent_analyses": 1, "analysis_batch_size": 2}
+    )
+    worker = AnalysisWorker(
+        service, SummaryGenerator(config, repository, llm_caller=None), config
+    )
+    for index in range(4):
+        await _complete_session(service, f"s-{index}", "user-a", minutes_ago=index + 1)
+
+    worker._running = True
+    dispatcher = asyncio.create_task(worker._dispatch_loop())
+    try:
+        for _ in range(100):
+            if len(worker._pending) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        assert len(worker._pending) == 2
+        assert service.get_analysis_queue_size() == 2
+
+        await worker._next_batch()
+        for _ in range(100):
+            if service.get_analysis_queue_size() == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert len(worker._pending) == 2
+    finally:
+        worker._running = False
+        dispatcher.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await dispatcher
+
+
+async def test_running_worker_picks_up_sessions_without_polling(
+    service: MemoryService, repository: MemoryRepository, worker: AnalysisWorker
+) -> None:
+    await worker.start()
+    try:
+        assert len(worker._tasks) == 3
+        await _complete_session(service, "b-1", "user-b", minutes_ago=1)
+
+        for _ in range(100):
+            if await repository.get_recent_sessions("user-b", limit=1):
+                break
+            await asyncio.sleep(0.01)
+        else:
+            pytest.fail("Session was not summarized")
+    finally:
+        await worker.stop()
+
+    assert worker._tasks == []
@@ -13,6 +13,7 @@ from src.core.memory.models import CapturedInteraction
 from src.core.memory.sqlite_repository import MemoryRepository
 from src.core.memory.summary_generator import (
     SummaryGenerator,
+    SummaryRequest,
     SummaryValidator,
 )
 
@@ -192,6 +193,48 @@ class TestSummaryGenerator:
         assert result.success is False
         assert "no interactions" in result.error.lower()
 
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_call_and_retries_missing_sessions(
+        self, config: MemoryConfiguration, repository: MemoryRepository
+    ) -> None:
+        """Test batched summaries share an LLM call and fall back per session."""
+        prompts: list[str] = []
+
+        def block(session_id: str) -> str:
+            return (
+                f"<session_summary><metadata><session_id>{session_id}</session_id>"
+                "<analysis_timestamp>2024-01-01T00:00:00Z</analysis_timestamp>"
+                "<summary_version>v1</summary_version></metadata>"
+                f"<title>Summary of {session_id}</title>"
+                "<completion_status>completed</completion_status></session_summary>"
+            )
+
+        async def llm_caller(prompt: str, *, max_tokens: int | None = None) -> str:
+            prompts.append(prompt)
+            if '<summary_request session_id="sess-1">' in prompt:
+                # The batched response only covers the first session
+                return "Here you go:\n" + block("sess-1")
+            return block("sess-2")
+
+        generator = SummaryGenerator(config, repository, llm_caller=llm_caller)
+        requests = [
+            SummaryRequest(
+                session_id=f"sess-{index}",
+                user_id="user-1",
+                interactions=[create_interaction(f"Task {index}", "user")],
+            )
+            for index in (1, 2)
+        ] + [SummaryRequest(session_id="sess-3", user_id="user-1", interactions=[])]
+
+        results = await generator.generate_summary_batch(requests)
+
+        assert [result.success for result in results] == [True, True, False]
+        assert results[0].summary.title == "Summary of sess-1"
+        assert results[1].summary.session_id == "sess-2"
+        assert len(prompts) == 2
+        assert '<summary_request session_id="sess-2">' in prompts[0]
+        assert "<summary_request" not in prompts[1]
+
     @pytest.mark.asyncio
     async def test_builds_transcript(self, generator: SummaryGenerator) -> None:
         """Test transcript building from interactions."""
@@ -302,3 +302,91 @@ class TestConversationFingerprintService:
         manual_fp_last = service.compute_fingerprint(last_window)
 
         assert rolling_fps[-1] == manual_fp_last.fingerprint
+
+
+class TestIncrementalFingerprintBundle:
+    """Tests for session-keyed incremental bundle computation."""
+
+    @staticmethod
+    def _conversation(turns: int) -> list[ChatMessage]:
+        messages = [ChatMessage(role="system", content="You are a coding agent.")]
+        for turn in range(turns):
+            messages.append(
+                ChatMessage(role="user", content=f"Please refactor module {turn}")
+            )
+            messages.append(
+                ChatMessage(
+                    role="assistant",
+                    content=None,
+                    tool_calls=[
+                        ToolCall(
+                            id=f"call_{turn}",
+                            function=FunctionCall(name="edit_file", arguments="{}"),
+                        )
+                    ],
+                )
+            )
+            messages.append(
+                ChatMessage(role="tool", content=f"edited file_{turn}.py successfully")
+            )
+        return messages
+
+    def test_incremental_bundle_matches_full_computation_per_turn(self) -> None:
+        service = ConversationFingerprintService()
+        messages = self._conversation(8)
+
+        for end in range(1, len(messages) + 1):
+            prefix = messages[:end]
+            incremental = service.compute_fingerprint_bundle(
+                prefix, session_key="session-1"
+            )
+            assert incremental == service.compute_fingerprint_bundle(prefix)
+
+    def test_only_appended_suffix_is_processed(self) -> None:
+        service = ConversationFingerprintService()
+        messages = self._conversation(6)
+        service.compute_fingerprint_bundle(messages[:-3], session_key="s")
+
+        calls: list[ChatMessage] = []
+        original = service._extract_content_signature
+
+        def tracking(message: ChatMessage) -> str:
+            calls.append(message)
+            return original(message)
+
+        service._extract_content_signature = tracking  # type: ignore[method-assign]
+        service.compute_fingerprint_bundle(messages, session_key="s")
+
+        assert calls == messages[-3:]
+
+    def test_edited_history_rebuilds_state(self) -> None:
+        service = ConversationFingerprintService()
+        messages = self._conversation(4)
+        service.compute_fingerprint_bundle(messages, session_key="s")
+
+        edited = list(messages)
+        edited[3] = ChatMessage(role="tool", content="edited a different file")
+
+        assert service.compute_fingerprint_bundle(
+            edited, session_key="s"
+        ) == service.compute_fingerprint_bundle(edited)
+
+    def test_truncated_history_rebuilds_state(self) -> None:
+        service = ConversationFingerprintService()
+        messages = self._conversation(4)
+        service.compute_fingerprint_bundle(messages, session_key="s")
+
+        shorter = messages[:5]
+
+        assert service.compute_fingerprint_bundle(
+            shorter, session_key="s"
+        ) == service.compute_fingerprint_bundle(shorter)
+
+    def test_incremental_states_are_bounded(self) -> None:
+        service = ConversationFingerprintService(max_incremental_states=2)
+        messages = self._conversation(1)
+
+        for index in range(5):
+            service.compute_fingerprint_bundle(messages, session_key=f"s-{index}")
+
+        assert len(service._incremental_states) == 2
@@ -0,0 +1,196 @@
+"""Unit tests for columnar capture conversion and vectorized latency analysis."""
+
+from __future__ import annotations
+
+import io
+import zlib
+from pathlib import Path
+
+import cbor2
+import numpy as np
+import pytest
+from src.core.wire_capture.capture_index import IndexedCaptureFile
+from src.core.wire_capture.inspection.analysis_latency import (
+    compute_backend_hop_latencies,
+)
+from src.core.wire_capture.inspection.app import run
+from src.core.wire_capture.inspection.columnar import (
+    NO_CODE,
+    build_capture_columns,
+    convert_capture_to_columnar,
+    is_columnar_capture,
+    load_columnar_capture,
+)
+from src.core.wire_capture.inspection.correlation import (
+    collect_backend_response_for_pb,
+    compute_backend_duration,
+    compute_backend_ttft,
+)
+
+HEADER = {
+    "magic": "LLMPROXY-CAPTURE-V2",
+    "version": 2,
+    "session_id": "fixture-session",
+    "created_at": 1234567890.0,
+    "metadata": {},
+}
+
+
+def _e(seq: int, direction: int, ts: float, data: bytes = b"", **meta) -> dict:
+    return {"seq": seq, "dir": direction, "ts": ts, "data": data, "meta": meta}
+
+
+ENTRIES = [
+    # Request-id correlated hop with a stream-end marker carrying sdur.
+    _e(0, 0, 1.0, b'{"model": "m"}', rid="r1", asid="s1"),
+    _e(1, 2, 1.1, b"{}", rid="r1", asid="s1", be="openai"),
+    _e(2, 3, 1.3, b"data: a\n\n", rid="r1", be="openai"),
+    _e(3, 3, 1.6, b"data: b\n\n", rid="r1", be="openai"),
+    _e(4, 3, 2.1, b"", rid="r1", be="openai", se=True, sdur=1500),
+    _e(5, 1, 2.2, b"data: a\n\n", rid="r1", asid="s1"),
+    # B-leg session correlated hop with explicit ttfb metadata.
+    _e(6, 0, 5.0, b"{}", asid="s2"),
+    _e(7, 2, 5.1, b"{}", asid="s2", bsid="b2", be="gemini"),
+    _e(8, 3, 5.5, b"chunk", bsid="b2", be="gemini", ttfb=250),
+    _e(9, 3, 6.5, b"chunk", bsid="b2", be="gemini"),
+    # Uncorrelated hop, closed by the next client request.
+    _e(10, 2, 10.0, b"{}", be="openai"),
+    _e(11, 3, 10.4, b"x", be="openai"),
+    _e(12, 3, 10.9, b"yy", be="openai"),
+    _e(13, 0, 11.0, b"{}"),
+    _e(14, 3, 11.5, b"orphan", be="openai"),
+]
+
+
+def _write_capture(path: Path, entries: list[dict], *, compress: bool = False) -> None:
+    with open(path, "wb") as f:
+        cbor2.dump(HEADER, f)
+        for entry in entries:
+            if compress and entry["data"]:
+                entry = {**entry, "data": zlib.compress(entry["data"]), "enc": "zlib"}
+            cbor2.dump(entry, f)
+
+
+@pytest.fixture
+def capture_path(tmp_path: Path) -> Path:
+    path = tmp_path / "capture.cbor"
+    _write_capture(path, ENTRIES, compress=True)
+    return path
+
+
+def test_build_columns_from_index_and_metadata(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        columns = build_capture_columns(capture)
+
+    assert len(columns) == len(ENTRIES)
+    assert columns.header == HEADER
+    assert columns.direction.tolist() == [e["dir"] for e in ENTRIES]
+    assert columns.data_size.tolist() == [len(e["data"]) for e in ENTRIES]
+    assert columns.string_at("backend", int(columns.backend[7])) == "gemini"
+    assert columns.string_at("request_id", int(columns.request_id[2])) == "r1"
+    assert columns.request_id[8] == NO_CODE
+    assert columns.ttfb_ms[8] == 250.0
+    assert np.isnan(columns.ttfb_ms[9])
+    with pytest.raises(ValueError):
+        columns.payload(2)
+
+
+def test_columnar_round_trip_with_out_of_line_payloads(
+    capture_path: Path, tmp_path: Path
+) -> None:
+    out_dir = tmp_path / "columns"
+    with IndexedCaptureFile(capture_path) as capture:
+        built = build_capture_columns(capture)
+        convert_capture_to_columnar(capture, out_dir)
+
+    assert is_columnar_capture(out_dir)
+    assert not is_columnar_capture(capture_path)
+
+    loaded = load_columnar_capture(out_dir)
+    assert isinstance(loaded.ts, np.memmap)
+    assert loaded.header == HEADER
+    assert loaded.strings == built.strings
+    np.testing.assert_array_equal(loaded.seq, built.seq)
+    np.testing.assert_array_equal(loaded.sdur_ms, built.sdur_ms)
+    assert [loaded.payload(i) for i in range(len(loaded))] == [
+        e["data"] for e in ENTRIES
+    ]
+
+
+def test_hop_latencies_match_entry_by_entry_analysis(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        columns = build_capture_columns(capture)
+        entries = [dict(entry) for entry in capture.entries()]
+
+    hops = compute_backend_hop_latencies(columns)
+
+    assert hops.request_index.tolist() == [1, 7, 10]
+    for row, pb_idx in enumerate(hops.request_index.tolist()):
+        chunks = collect_backend_response_for_pb(entries, pb_idx)
+        assert hops.ttft[row] == pytest.approx(
+            compute_backend_ttft(entries[pb_idx], chunks)
+        )
+        assert hops.duration[row] == pytest.approx(
+            compute_backend_duration(entries[pb_idx], chunks)
+        )
+
+    assert hops.ttft.tolist() == pytest.approx([0.2, 0.25, 0.4])
+    assert hops.duration.tolist() == pytest.approx([1.5, 1.4, 0.9])
+    assert hops.chunk_count.tolist() == [2, 2, 2]
+    assert hops.total_bytes.tolist() == [18, 10, 3]
+    assert hops.gaps.tolist() == pytest.approx([0.3, 1.0, 0.5])
+    assert hops.gap_hop.tolist() == [0, 1, 2]
+
+
+def test_hop_latencies_time_window(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        columns = build_capture_columns(capture)
+
+    hops = compute_backend_hop_latencies(columns, start_time=5.0, end_time=9.0)
+
+    assert hops.request_index.tolist() == [7]
+    assert hops.gap_hop.tolist() == [0]
+
+
+def test_hop_latencies_empty_capture(tmp_path: Path) -> None:
+    path = tmp_path / "empty.cbor"
+    _write_capture(path, [])
+    with IndexedCaptureFile(path) as capture:
+        hops = compute_backend_hop_latencies(build_capture_columns(capture))
+
+    assert len(hops) == 0
+    assert hops.gaps.shape == (0,)
+
+
+def test_cli_latency_summary_and_columnar_conversion(
+    capture_path: Path, tmp_path: Path
+) -> None:
+    out_dir = tmp_path / "columns"
+    out, err = io.StringIO(), io.StringIO()
+
+    code = run(
+        [str(capture_path), "--to-columnar", str(out_dir)],
+        out=out,
+        err=err,
+        epilog=None,
+    )
+    assert code == 0, err.getvalue()
+    assert f"Wrote {len(ENTRIES)} entries" in out.getvalue()
+
+    for source in (capture_path, out_dir):
+        out = io.StringIO()
+        code = run(
+            [str(source), "--latency-summary", "--backend", "openai"],
+            out=out,
+            err=err,
+            epilog=None,
+        )
+        assert code == 0, err.getvalue()
+        text = out.getvalue()
+        assert "BACKEND LATENCY SUMMARY" in text
+        assert "openai (2 requests)" in text
+        assert "gemini" not in text.split("=" * 70)[-1]
+
+    err = io.StringIO()
+    assert run([str(out_dir), "--analyze"], out=out, err=err, epilog=None) == 1
+    assert "--latency-summary" in err.getvalue()
@@ -0,0 +1,194 @@
+"""Unit tests for the capture sidecar index and lazy capture access."""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+
+import cbor2
+import pytest
+from src.core.wire_capture.capture_index import (
+    CaptureIndexError,
+    CaptureIndexRecord,
+    CaptureIndexWriter,
+    IndexedCaptureFile,
+    index_path_for,
+)
+
+HEADER = {"magic": "LLMPROXY-CAPTURE-V2", "version": 2, "created_at": 0.0}
+
+
+def _entry(seq: int, *, direction: int = 0, compress: bool = False) -> dict:
+    data = f"payload-{seq}".encode() * 4
+    entry = {
+        "ts": 1000.0 + seq,
+        "dir": direction,
+        "seq": seq,
+        "data": zlib.compress(data) if compress else data,
+        "meta": {"asid": f"session-{seq % 2}", "be": "openai" if seq % 2 else "gemini"},
+    }
+    if compress:
+        entry["enc"] = "zlib"
+    return entry
+
+
+def _write_capture(path: Path, entries: list[dict], *, mode: str = "wb") -> None:
+    with open(path, mode) as f:
+        if mode == "wb":
+            f.write(cbor2.dumps(HEADER))
+        for entry in entries:
+            f.write(cbor2.dumps(entry))
+
+
+@pytest.fixture
+def capture_path(tmp_path: Path) -> Path:
+    path = tmp_path / "capture.cbor"
+    _write_capture(path, [_entry(i, direction=i % 3) for i in range(6)])
+    return path
+
+
+def test_builds_and_persists_index_on_first_open(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        assert capture.header == HEADER
+        assert len(capture) == 6
+        assert [r.sequence for r in capture.records] == list(range(6))
+
+    assert index_path_for(capture_path).exists()
+
+    with IndexedCaptureFile(capture_path) as reopened:
+        assert [r.to_row() for r in reopened.records] == [
+            r.to_row() for r in capture.records
+        ]
+
+
+def test_entries_are_decoded_on_access(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        entry = capture.entry(3)
+
+        assert entry["seq"] == 3
+        assert entry["ts"] == 1003.0
+        assert entry["data"] == b"payload-3" * 4
+        assert entry["meta"]["be"] == "openai"
+        assert dict(entry) == _entry(3, direction=0)
+
+
+def test_compressed_payload_is_inflated_when_read(tmp_path: Path) -> None:
+    path = tmp_path / "capture.cbor"
+    _write_capture(path, [_entry(0, compress=True)])
+
+    with IndexedCaptureFile(path) as capture:
+        record = capture.records[0]
+        assert record.is_compressed
+        assert record.data_size == len(b"payload-0" * 4)
+
+        entry = capture.entry(0)
+        assert "enc" not in entry
+        assert entry["data"] == b"payload-0" * 4
+
+
+def test_large_compressed_payload_size_is_counted(tmp_path: Path) -> None:
+    path = tmp_path / "capture.cbor"
+    entry = _entry(0, compress=True)
+    entry["data"] = zlib.compress(b"\0" * (8 << 20))
+    _write_capture(path, [entry])
+
+    with IndexedCaptureFile(path, persist_index=False) as capture:
+        assert capture.records[0].data_size == 8 << 20
+
+
+def test_max_entries_stops_indexing(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path, max_entries=4) as capture:
+        assert [r.sequence for r in capture.records] == list(range(4))
+        assert capture.truncated
+
+    # A persisted index longer than the limit is cut back to it.
+    with IndexedCaptureFile(capture_path, max_entries=2) as capture:
+        assert len(capture) == 2
+        assert capture.truncated
+
+    with IndexedCaptureFile(capture_path) as capture:
+        assert len(capture) == 6
+        assert not capture.truncated
+
+    with IndexedCaptureFile(capture_path, max_entries=6) as capture:
+        assert len(capture) == 6
+        assert not capture.truncated
+
+
+def test_reopen_indexes_appended_tail(capture_path: Path) -> None:
+    IndexedCaptureFile(capture_path).close()
+    _write_capture(capture_path, [_entry(6), _entry(7)], mode="ab")
+
+    with IndexedCaptureFile(capture_path) as capture:
+        assert [r.sequence for r in capture.records] == list(range(8))
+        assert capture.entry(7)["data"] == b"payload-7" * 4
+
+
+def test_stale_index_is_rebuilt(capture_path: Path) -> None:
+    IndexedCaptureFile(capture_path).close()
+    # Rewrite the capture with different entries behind the existing index.
+    _write_capture(capture_path, [_entry(i + 10) for i in range(6)])
+
+    with IndexedCaptureFile(capture_path) as capture:
+        assert [r.sequence for r in capture.records] == list(range(10, 16))
+
+
+def test_torn_index_row_keeps_valid_prefix(capture_path: Path) -> None:
+    IndexedCaptureFile(capture_path).close()
+    index_path = index_path_for(capture_path)
+    index_path.write_bytes(index_path.read_bytes()[:-3])
+
+    with IndexedCaptureFile(capture_path) as capture:
+        assert len(capture) == 6
+
+    with IndexedCaptureFile(capture_path) as capture:
+        assert len(capture) == 6
+
+
+def test_writer_produced_index_is_used(tmp_path: Path) -> None:
+    path = tmp_path / "capture.cbor"
+    header_bytes = cbor2.dumps(HEADER)
+    writer = CaptureIndexWriter(path)
+    writer.reset(len(header_bytes))
+
+    records = []
+    offset = len(header_bytes)
+    with open(path, "wb") as f:
+        f.write(header_bytes)
+        for i in range(3):
+            encoded = cbor2.dumps(_entry(i))
+            f.write(encoded)
+            records.append(
+                CaptureIndexRecord.from_entry(_entry(i), offset, len(encoded))
+            )
+            offset += len(encoded)
+    writer.append(records)
+
+    with IndexedCaptureFile(path, persist_index=False) as capture:
+        assert capture.records == records
+
+
+def test_decode_error_keeps_entries_before_it(capture_path: Path) -> None:
+    with open(capture_path, "ab") as f:
+        f.write(b"\xff\xff\xff")
+
+    with IndexedCaptureFile(capture_path, persist_index=False) as capture:
+        assert len(capture) == 6
+        assert capture.decode_error is not None
+        assert capture.decode_error_offset is not None
+
+
+def test_select_filters_on_index_fields(capture_path: Path) -> None:
+    with IndexedCaptureFile(capture_path) as capture:
+        assert capture.select(directions=[1]) == [1, 4]
+        assert capture.select(session_id="session-1") == [1, 3, 5]
+        assert capture.select(backend="gemini", start_time=1002.0) == [2, 4]
+        assert capture.select(end_time=1001.0) == [0, 1]
+
+
+def test_rejects_non_map_header(tmp_path: Path) -> None:
+    path = tmp_path / "capture.cbor"
+    path.write_bytes(cbor2.dumps([1, 2, 3]))
+
+    with pytest.raises(CaptureIndexError):
+        IndexedCaptureFile(path)